@@ -552,11 +552,12 @@ def send_message(req: SendMessageRequest, manager = Depends(get_manager)):
         import json
         import logging
 
-        def response_generator():
+        async def response_generator():
             # Yield an initial status event to flush headers (with padding for buffering)
             yield json.dumps({"type": "status", "content": "processing"}, ensure_ascii=False) + " " * 2048 + "\n"
             
-            stream = manager.handle_user_input_stream(
+            # Events are pushed from SEA threads onto the event loop; no polling thread per request
+            stream = manager.handle_user_input_stream_async(
                 req.message,
                 metadata=metadata,
                 meta_playbook=req.meta_playbook,
@@ -564,7 +565,7 @@ def send_message(req: SendMessageRequest, manager = Depends(get_manager)):
                 building_id=building_id,
             )
             
-            for chunk in stream:
+            async for chunk in stream:
                 yield chunk
 
         return StreamingResponse(response_generator(), media_type="application/x-ndjson")
@@ -746,6 +746,65 @@ def get_startup_warnings(manager=Depends(get_manager)):
     return {"warnings": warnings}
 
 
+@router.get("/startup-diagnostics")
+def get_startup_diagnostics(manager=Depends(get_manager)):
+    """Return startup diagnostics such as per-phase persona loading timings."""
+    diagnostics = getattr(manager, "startup_diagnostics", [])
+    return {"diagnostics": diagnostics}
+
+
+@router.get("/pulse-traces")
+def list_pulse_traces(persona_id: Optional[str] = None, limit: int = 20):
+    """Return latency breakdowns of recent pulses (newest first)."""
+    from sea.pulse_trace import get_pulse_trace_store, tracing_enabled
+
+    traces = get_pulse_trace_store().recent(persona_id=persona_id, limit=max(1, min(limit, 200)))
+    return {"enabled": tracing_enabled(), "traces": [trace.summary() for trace in traces]}
+
+
+@router.get("/pulse-traces/{pulse_id}")
+def get_pulse_trace(pulse_id: str, format: str = "json"):
+    """Return every span of one pulse; ``format=chrome`` gives Chrome trace JSON."""
+    from sea.pulse_trace import get_pulse_trace_store
+
+    trace = get_pulse_trace_store().get(pulse_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Pulse trace '{pulse_id}' not found")
+    if format == "chrome":
+        return trace.to_chrome_trace()
+    if format != "json":
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'chrome'")
+    return trace.to_dict()
+
+
+@router.get("/sql-stats")
+def get_sql_stats(limit: int = 50, order_by: str = "total_ms"):
+    """Return per-statement SQLite latency stats and the slow-query log (SAIVERSE_SQL_PROFILE=1)."""
+    from saiverse.sql_profiler import profile_report
+
+    return profile_report(limit=max(1, min(limit, 500)), order_by=order_by)
+
+
+@router.delete("/sql-stats")
+def reset_sql_stats():
+    """Clear collected SQL statistics."""
+    from saiverse.sql_profiler import get_sql_profiler, sql_profiling_enabled
+
+    if not sql_profiling_enabled():
+        raise HTTPException(status_code=400, detail="SQL profiling is disabled (SAIVERSE_SQL_PROFILE)")
+    get_sql_profiler().reset()
+    return {"success": True}
+
+
+@router.get("/unity-gateway-stats")
+def get_unity_gateway_stats(manager=Depends(get_manager)):
+    """Return Unity Gateway send-queue depth, dropped frames and spatial update counters."""
+    gateway = getattr(manager, "unity_gateway", None)
+    if gateway is None:
+        return {"enabled": False}
+    return {"enabled": True, **gateway.get_stats()}
+
+
 @router.get("/reembed-check")
 def check_reembed_needed(manager=Depends(get_manager)):
     """Return list of personas that need re-embedding due to model changes."""
@@ -60,21 +60,22 @@ def _run_extension_import_task(
         from saiverse_memory import SAIMemoryAdapter
         adapter = SAIMemoryAdapter(persona_id)
         
+        def _report(current: int, count: int, message: str) -> None:
+            with _extension_import_lock:
+                _extension_import_status[persona_id] = {
+                    "running": True, "progress": current, "total": count,
+                    "message": message,
+                }
+
         try:
             msg_count = 0
-            for i, payload in enumerate(payloads):
-                if skip_embedding:
-                    payload["embedding_chunks"] = 0
-                adapter.append_persona_message(payload, thread_suffix=thread_suffix)
-                msg_count += 1
-                
-                # Update progress every 10 messages
-                if msg_count % 10 == 0:
-                    with _extension_import_lock:
-                        _extension_import_status[persona_id] = {
-                            "running": True, "progress": msg_count, "total": total,
-                            "message": f"Importing {msg_count}/{total} messages..."
-                        }
+            # 行はバッチ単位でコミットし、埋め込みは全件投入後にまとめて生成する
+            with adapter.bulk_import(
+                total=total, embed=not skip_embedding, progress_callback=_report
+            ) as bulk:
+                for payload in payloads:
+                    bulk.append_persona_message(payload, thread_suffix=thread_suffix)
+                    msg_count += 1
             
             with _extension_import_lock:
                 _extension_import_status[persona_id] = {
@@ -155,39 +156,51 @@ def _run_official_import_task(
         from saiverse_memory import SAIMemoryAdapter
         adapter = SAIMemoryAdapter(persona_id)
         
+        def _report(current: int, count: int, message: str) -> None:
+            with _official_import_lock:
+                _official_import_status[persona_id] = {
+                    "running": True, "progress": current, "total": count,
+                    "message": message,
+                }
+
         try:
-            total_conversations = len(selected_records)
             imported_count = 0
             msg_count = 0
+            roles = ["user", "assistant"]
+            # 件数だけ先に数え、ペイロードは会話ごとに取り出しながら投入する
+            total_messages = sum(
+                sum(1 for _ in record.iter_memory_payloads(include_roles=roles))
+                for record in selected_records
+            )
+            batches = (
+                (
+                    record.conversation_id or record.identifier,
+                    record.iter_memory_payloads(include_roles=roles),
+                )
+                for record in selected_records
+            )
             
-            for conv_idx, record in enumerate(selected_records):
-                payloads = list(record.iter_memory_payloads(include_roles=["user", "assistant"]))
-                thread_suffix = record.conversation_id or record.identifier
-                
-                for payload in payloads:
-                    meta = payload.get("metadata", {})
-                    tags = meta.get("tags", [])
-                    if "conversation" not in tags:
-                        tags.append("conversation")
-                    meta["tags"] = tags
-                    if skip_embedding:
-                        payload["embedding_chunks"] = 0
-                    payload["metadata"] = meta
+            # 行はバッチ単位でコミットし、埋め込みは全件投入後にまとめて生成する
+            with adapter.bulk_import(
+                total=total_messages, embed=not skip_embedding, progress_callback=_report
+            ) as bulk:
+                for thread_suffix, payloads in batches:
+                    for payload in payloads:
+                        meta = payload.get("metadata", {})
+                        tags = meta.get("tags", [])
+                        if "conversation" not in tags:
+                            tags.append("conversation")
+                        meta["tags"] = tags
+                        payload["metadata"] = meta
+                        
+                        bulk.append_persona_message(payload, thread_suffix=thread_suffix)
+                        msg_count += 1
                     
-                    adapter.append_persona_message(payload, thread_suffix=thread_suffix)
-                    msg_count += 1
-                
-                imported_count += 1
-                
-                with _official_import_lock:
-                    _official_import_status[persona_id] = {
-                        "running": True, "progress": imported_count, "total": total_conversations,
-                        "message": f"Imported {imported_count}/{total_conversations} conversations ({msg_count} messages)..."
-                    }
+                    imported_count += 1
             
             with _official_import_lock:
                 _official_import_status[persona_id] = {
-                    "running": False, "progress": imported_count, "total": total_conversations,
+                    "running": False, "progress": msg_count, "total": total_messages,
                     "message": f"Imported {imported_count} conversations ({msg_count} messages).",
                     "success": True, "conversations": imported_count, "messages": msg_count
                 }
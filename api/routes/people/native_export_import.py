@@ -9,13 +9,14 @@ import logging
 import tempfile
 import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 
 from api.deps import get_manager
 from .models import NativeImportStatusResponse
+from .utils import get_adapter
 
 LOGGER = logging.getLogger(__name__)
 router = APIRouter()
@@ -29,38 +30,80 @@ _native_import_lock = threading.Lock()
 # Export
 # ---------------------------------------------------------------------------
 
+_UPLOAD_BLOCK = 1024 * 1024
+
+
+def _streaming_export(
+    persona_id: str,
+    thread_ids: Optional[List[str]],
+    filename_stem: str,
+    *,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    fmt: str = "json",
+    compress: bool = False,
+) -> StreamingResponse:
+    """Chunked download of :func:`iter_export_native` output."""
+    from saiverse_memory.native_export import iter_export_native
+
+    try:
+        chunks = iter_export_native(
+            persona_id, thread_ids, start, end, fmt=fmt, compress=compress
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    extension = ".ndjson" if fmt == "ndjson" else ".json"
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "application/json"
+    if compress:
+        extension += ".gz"
+        media_type = "application/gzip"
+    safe_stem = filename_stem.replace("/", "_").replace("\\", "_")
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{safe_stem}{extension}"',
+        },
+    )
+
+
 @router.get("/{persona_id}/threads/{thread_id}/export-native")
 def export_thread_native(
     persona_id: str,
     thread_id: str,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    gzip: bool = False,
     manager=Depends(get_manager),
 ):
     """Export a single thread as native SAIVerse JSON.
 
-    Returns a downloadable JSON file with all metadata preserved.
+    Streams a downloadable file with all metadata preserved
+    (``format=ndjson`` / ``gzip=true`` for the streaming-friendly variants).
     """
-    from saiverse_memory.native_export import export_thread_by_id
-
-    try:
-        data = export_thread_by_id(persona_id, thread_id)
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        LOGGER.exception("Failed to export thread %s for persona %s", thread_id, persona_id)
-        raise HTTPException(status_code=500, detail=f"Export failed: {e}")
-
     # Build filename from thread suffix
     suffix = thread_id.split(":", 1)[1] if ":" in thread_id else thread_id
-    safe_suffix = suffix.replace("/", "_").replace("\\", "_")
-    filename = f"{persona_id}_{safe_suffix}.json"
+    return _streaming_export(
+        persona_id, [thread_id], f"{persona_id}_{suffix}", fmt=format, compress=gzip
+    )
 
-    content = json.dumps(data, ensure_ascii=False, indent=2)
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-        },
+
+@router.get("/{persona_id}/export/native")
+def export_persona_native(
+    persona_id: str,
+    threads: Optional[List[str]] = Query(None),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    format: str = Query("ndjson", pattern="^(json|ndjson)$"),
+    gzip: bool = True,
+    manager=Depends(get_manager),
+):
+    """Export all (or the selected) threads of a persona as a chunked download."""
+    return _streaming_export(
+        persona_id, threads, f"{persona_id}_saimemory",
+        start=start, end=end, fmt=format, compress=gzip,
     )
 
 
@@ -72,9 +115,17 @@ def _run_native_import_task(
     persona_id: str,
     data: Dict[str, Any],
     skip_embedding: bool,
+    manager: Any,
+    upload_path: Optional[Path] = None,
 ) -> None:
-    """Background task to import native JSON."""
-    from saiverse_memory.native_export import import_threads_native
+    """Background task to import native JSON.
+
+    With ``upload_path`` the spooled upload is streamed from disk instead of
+    using the pre-parsed ``data``; the file is deleted afterwards. Rows are
+    written through the persona's adapter under its lock, and the message
+    indexes stay in place because the persona may be reading meanwhile.
+    """
+    from saiverse_memory.native_export import import_threads_native, import_threads_native_stream
 
     def progress_callback(current: int, total: int, message: str) -> None:
         with _native_import_lock:
@@ -94,13 +145,27 @@ def _run_native_import_task(
         }
 
     try:
-        result = import_threads_native(
-            persona_id,
-            data,
-            replace=True,
-            skip_embed=skip_embedding,
-            progress_callback=progress_callback,
-        )
+        with get_adapter(persona_id, manager) as adapter:
+            target = {"conn": adapter.conn, "lock": adapter._db_lock, "defer_indexes": False}
+            if upload_path is not None:
+                with open(upload_path, "rb") as source:
+                    result = import_threads_native_stream(
+                        persona_id,
+                        source,
+                        replace=True,
+                        skip_embed=skip_embedding,
+                        progress_callback=progress_callback,
+                        **target,
+                    )
+            else:
+                result = import_threads_native(
+                    persona_id,
+                    data,
+                    replace=True,
+                    skip_embed=skip_embedding,
+                    progress_callback=progress_callback,
+                    **target,
+                )
         with _native_import_lock:
             _native_import_status[persona_id] = {
                 "running": False,
@@ -124,6 +189,9 @@ def _run_native_import_task(
                 "message": f"Import failed: {e}",
                 "success": False,
             }
+    finally:
+        if upload_path is not None:
+            upload_path.unlink(missing_ok=True)
 
 
 @router.post("/{persona_id}/import/native")
@@ -165,7 +233,7 @@ async def import_native(
     # Start background task
     thread = threading.Thread(
         target=_run_native_import_task,
-        args=(persona_id, data, skip_embedding),
+        args=(persona_id, data, skip_embedding, manager),
         daemon=True,
     )
     thread.start()
@@ -177,6 +245,45 @@ async def import_native(
     }
 
 
+@router.post("/{persona_id}/import/native/stream")
+async def import_native_stream(
+    persona_id: str,
+    file: UploadFile = File(...),
+    skip_embedding: bool = Form(False),
+    manager=Depends(get_manager),
+):
+    """Import a native export (JSON or NDJSON, optionally gzipped) of any size.
+
+    The upload is spooled to a temporary file block by block and imported
+    from disk in the background; poll ``/import/native/status``.
+    """
+    with _native_import_lock:
+        status = _native_import_status.get(persona_id, {})
+        if status.get("running"):
+            raise HTTPException(status_code=409, detail="An import is already running for this persona")
+
+    fd, tmp_name = tempfile.mkstemp(prefix="saimemory_import_", suffix=".upload")
+    tmp_path = Path(tmp_name)
+    size = 0
+    try:
+        with open(fd, "wb") as out:
+            while block := await file.read(_UPLOAD_BLOCK):
+                out.write(block)
+                size += len(block)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    thread = threading.Thread(
+        target=_run_native_import_task,
+        args=(persona_id, {}, skip_embedding, manager, tmp_path),
+        daemon=True,
+    )
+    thread.start()
+
+    return {"status": "started", "bytes": size}
+
+
 @router.get("/{persona_id}/import/native/status", response_model=NativeImportStatusResponse)
 def get_native_import_status(
     persona_id: str,
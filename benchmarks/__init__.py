@@ -0,0 +1 @@
+"""Benchmark suite for pulse-latency hot paths (run with ``python -m benchmarks.run``)."""
@@ -0,0 +1,170 @@
+"""Timing / memory measurement helpers for the benchmark suite."""
+from __future__ import annotations
+
+import gc
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def max_rss_mb() -> Optional[float]:
+    """Process-wide resident set high-water mark in MiB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    repeat: int
+    min_ms: float
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_alloc_mb: Optional[float]
+    rss_high_water_mb: Optional[float]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    *,
+    repeat: int = 20,
+    warmup: int = 2,
+    trace_memory: bool = True,
+    describe: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> BenchResult:
+    """Run ``fn`` ``warmup + repeat`` times and summarise the timed runs.
+
+    Timings are taken without tracemalloc (it slows Python code several
+    times over); the allocation high-water mark comes from one extra traced
+    run. ``describe(result)`` can attach result sizes to the report so a
+    "faster" run that returns less is visible.
+    """
+    last: Any = None
+    for _ in range(max(0, warmup)):
+        last = fn()
+
+    samples: List[float] = []
+    gc.collect()
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter_ns()
+        last = fn()
+        samples.append((time.perf_counter_ns() - started) / 1e6)
+
+    peak_mb: Optional[float] = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            last = fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = round(peak / (1024 * 1024), 3)
+
+    ordered = sorted(samples)
+    return BenchResult(
+        name=name,
+        repeat=len(samples),
+        min_ms=round(ordered[0], 3),
+        mean_ms=round(sum(ordered) / len(ordered), 3),
+        p50_ms=round(percentile(ordered, 50), 3),
+        p90_ms=round(percentile(ordered, 90), 3),
+        p95_ms=round(percentile(ordered, 95), 3),
+        p99_ms=round(percentile(ordered, 99), 3),
+        max_ms=round(ordered[-1], 3),
+        peak_alloc_mb=peak_mb,
+        rss_high_water_mb=max_rss_mb(),
+        extra=describe(last) if describe else {},
+    )
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": int(time.time()),
+    }
+
+
+def write_report(path: Path, payload: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    metric: str = "p50_ms",
+    threshold: float = 1.25,
+    min_delta_ms: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """Benchmarks whose ``metric`` grew by more than ``threshold`` x (and ``min_delta_ms``).
+
+    Results are matched by (dataset key, benchmark name).
+    """
+    def _index(report: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
+        return {
+            (run.get("dataset", {}).get("key"), result["name"]): result
+            for run in report.get("runs", [])
+            for result in run.get("results", [])
+        }
+
+    base = _index(baseline)
+    regressions: List[Dict[str, Any]] = []
+    for key, result in _index(current).items():
+        before = base.get(key)
+        if not before:
+            continue
+        old = before.get(metric) or 0.0
+        new = result.get(metric) or 0.0
+        if old > 0 and new > old * threshold and new - old >= min_delta_ms:
+            regressions.append({
+                "dataset": key[0],
+                "name": key[1],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "ratio": round(new / old, 2),
+            })
+    return regressions
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Benchmark the context-preview / prompt-assembly hot paths.
+
+Builds synthetic personas on top of the test environment from
+``test_fixtures/setup_test_env.py`` (``test_data/.saiverse``) and times:
+
+- ``sea.runtime_context.prepare_context`` (preview mode, balanced history + Memory Weave)
+- ``SAIMemoryAdapter.recent_persona_messages_balanced``
+- ``SAIMemoryAdapter.recall_hybrid``
+- ``sai_memory.arasuji.context.get_episode_context``
+- ``Memopedia.get_tree_markdown``
+- ``saiverse.token_estimator.estimate_messages_tokens``
+
+Usage:
+    python -m benchmarks.run                                   # 10k messages
+    python -m benchmarks.run --messages 10000 100000 1000000   # several sizes
+    python -m benchmarks.run --pages 2000 --levels 4 --repeat 50
+    python -m benchmarks.run --output bench.json --compare baseline.json
+
+Embeddings come from a deterministic hashing embedder (see
+``benchmarks.synthetic.HashingEmbedder``), so ``recall_hybrid`` numbers
+cover SAIVerse's retrieval and scoring code but not model inference.
+
+Exit status is 1 when ``--compare`` finds a regression beyond ``--threshold``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# The test environment replaces ~/.saiverse; these must be set before any SAIVerse import
+TEST_DATA_DIR = PROJECT_ROOT / "test_data"
+os.environ.setdefault("SAIVERSE_HOME", str(TEST_DATA_DIR / ".saiverse"))
+os.environ.setdefault("SAIVERSE_USER_DATA_DIR", str(TEST_DATA_DIR / "user_data"))
+os.environ.setdefault("SAIMEMORY_BACKUP_ON_START", "false")
+
+from benchmarks.harness import (  # noqa: E402
+    BenchResult,
+    compare_reports,
+    environment_info,
+    measure,
+    write_report,
+)
+from benchmarks.synthetic import DatasetSpec, HashingEmbedder, build_dataset  # noqa: E402
+
+LOGGER = logging.getLogger("benchmarks")
+
+BENCH_BUILDING_ID = "test_lobby"
+QUERY_TEXT = "図書館 で 話した 約束 について"
+QUERY_KEYWORDS = ["約束", "archive"]
+DEFAULT_MODEL = "gemini-2.5-flash-lite-preview-09-2025"
+
+
+def ensure_test_environment() -> Dict[str, Any]:
+    """Create the setup_test_env tree and DB if missing; returns the fixture definitions."""
+    from test_fixtures import setup_test_env
+
+    definitions = setup_test_env.load_definitions()
+    if not setup_test_env.TEST_DB_PATH.exists():
+        setup_test_env.create_directory_structure()
+        setup_test_env.seed_database(json.loads(json.dumps(definitions)))
+    return definitions
+
+
+def register_persona(definitions: Dict[str, Any], persona_id: str) -> Dict[str, Any]:
+    """Add the synthetic persona to the test DB, cloned from the first fixture persona."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from database.models import AI
+    from test_fixtures import setup_test_env
+
+    template = dict(definitions["personas"][0])
+    template.pop("start_building", None)
+    template.update(AIID=persona_id, AINAME=f"Bench {persona_id}")
+    engine = create_engine(f"sqlite:///{setup_test_env.TEST_DB_PATH}")
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        if session.get(AI, persona_id) is None:
+            session.add(AI(HOME_CITYID=definitions["city"]["CITYID"], **template))
+            session.commit()
+    return {"template": template, "session_factory": session_factory}
+
+
+@contextmanager
+def open_adapter(spec: DatasetSpec, persona_dir: Path) -> Iterator[Any]:
+    from sai_memory.config import load_settings
+    from saiverse_memory.adapter import SAIMemoryAdapter
+
+    settings = replace(load_settings(), embed_model=HashingEmbedder.MODEL_NAME, embed_model_path=None,
+                       embed_model_dim=spec.embed_dim)
+    with mock.patch("saiverse_memory.adapter.Embedder", partial(HashingEmbedder, dim=spec.embed_dim)):
+        adapter = SAIMemoryAdapter(spec.key, persona_dir=persona_dir, settings=settings)
+    try:
+        yield adapter
+    finally:
+        adapter.close()
+
+
+def _resolve_model(model: str | None) -> str:
+    """Fixture model if it has a config here, else the built-in default (for the token budget step)."""
+    from saiverse.model_configs import get_model_config
+
+    if model and get_model_config(model):
+        return model
+    return DEFAULT_MODEL
+
+
+def build_context_fixture(spec: DatasetSpec, adapter: Any, persona_dir: Path, persona_env: Dict[str, Any]) -> SimpleNamespace:
+    from persona.history_manager import HistoryManager
+    from saiverse.data_paths import load_prompt
+    from sea.runtime import SEARuntime
+
+    template = persona_env["template"]
+    manager = SimpleNamespace(
+        SessionLocal=persona_env["session_factory"],
+        occupants={BENCH_BUILDING_ID: spec.participant_ids()[1:] + [spec.key]},
+        items_by_building={},
+        item_registry={},
+        building_histories={},
+        metabolism_enabled=False,
+        max_history_messages_override=None,
+    )
+    history_manager = HistoryManager(
+        persona_id=spec.key,
+        persona_log_path=persona_dir / "log.json",
+        building_memory_paths={},
+        memory_adapter=adapter,
+    )
+    persona = SimpleNamespace(
+        persona_id=spec.key,
+        persona_name=template["AINAME"],
+        persona_system_instruction=template.get("SYSTEMPROMPT", ""),
+        common_prompt=load_prompt("common"),
+        buildings={},
+        current_city_id="test_city",
+        linked_user_name="test_user",
+        history_manager=history_manager,
+        sai_memory=adapter,
+        persona_dir=persona_dir,
+        model=_resolve_model(template.get("DEFAULT_MODEL")),
+        context_length=120_000,
+    )
+    return SimpleNamespace(runtime=SEARuntime(manager), persona=persona)
+
+
+def run_dataset(spec: DatasetSpec, args: argparse.Namespace, definitions: Dict[str, Any]) -> Dict[str, Any]:
+    from sai_memory.arasuji.context import get_episode_context
+    from sai_memory.memopedia.core import Memopedia
+    from saiverse.model_configs import get_model_provider
+    from saiverse.token_estimator import estimate_messages_tokens
+    from sea.playbook_models import ContextRequirements
+    from sea.runtime_context import prepare_context
+    from test_fixtures import setup_test_env
+
+    persona_dir = build_dataset(spec, setup_test_env.TEST_SAIVERSE_HOME / "personas", rebuild=args.rebuild)
+    persona_env = register_persona(definitions, spec.key)
+    bench = partial(measure, repeat=args.repeat, warmup=args.warmup, trace_memory=not args.no_memory)
+    participants = spec.participant_ids()
+    results: List[BenchResult] = []
+
+    with open_adapter(spec, persona_dir) as adapter:
+        results.append(bench(
+            "recent_persona_messages_balanced",
+            lambda: adapter.recent_persona_messages_balanced(
+                args.history_chars, participants, required_tags=["conversation"],
+            ),
+            describe=lambda msgs: {"messages": len(msgs)},
+        ))
+        results.append(bench(
+            "recall_hybrid",
+            lambda: adapter.recall_hybrid(QUERY_TEXT, QUERY_KEYWORDS, max_chars=1200),
+            describe=lambda text: {"chars": len(text)},
+        ))
+
+        conn = sqlite3.connect(str(persona_dir / "memory.db"), check_same_thread=False)
+        try:
+            results.append(bench(
+                "get_episode_context",
+                lambda: get_episode_context(conn, max_entries=50),
+                describe=lambda entries: {"entries": len(entries)},
+            ))
+            memopedia = Memopedia(conn)
+            results.append(bench(
+                "memopedia_get_tree_markdown",
+                lambda: memopedia.get_tree_markdown(),
+                describe=lambda text: {"chars": len(text)},
+            ))
+        finally:
+            conn.close()
+
+        fixture = build_context_fixture(spec, adapter, persona_dir, persona_env)
+        requirements = ContextRequirements(
+            history_depth=args.history_chars,
+            history_balanced=True,
+            memory_weave=True,
+            inventory=False,
+            building_items=False,
+            realtime_context=False,
+        )
+
+        def _prepare() -> List[Dict[str, Any]]:
+            return prepare_context(
+                fixture.runtime, fixture.persona, BENCH_BUILDING_ID, "こんにちは",
+                requirements, preview_only=True,
+            )
+
+        results.append(bench(
+            "prepare_context",
+            _prepare,
+            describe=lambda msgs: {"messages": len(msgs), "chars": sum(len(str(m.get("content", ""))) for m in msgs)},
+        ))
+
+        messages = _prepare()
+        provider = get_model_provider(fixture.persona.model)
+        results.append(bench(
+            "estimate_messages_tokens",
+            lambda: estimate_messages_tokens(messages, provider),
+            describe=lambda tokens: {"tokens": tokens, "messages": len(messages)},
+        ))
+
+    for result in results:
+        LOGGER.info(
+            "[%s] %-34s p50 %9.2fms  p95 %9.2fms  max %9.2fms  peak %s MiB",
+            spec.key, result.name, result.p50_ms, result.p95_ms, result.max_ms, result.peak_alloc_mb,
+        )
+    return {
+        "dataset": {"key": spec.key, **asdict(spec)},
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, nargs="+", default=[10_000],
+                        help="History sizes to benchmark (one dataset per size)")
+    parser.add_argument("--pages", type=int, default=200, help="Memopedia pages per persona")
+    parser.add_argument("--levels", type=int, default=3, help="Chronicle (arasuji) levels")
+    parser.add_argument("--participants", type=int, default=3, help="Conversation partners incl. user")
+    parser.add_argument("--embedded", type=int, default=5_000,
+                        help="Most recent messages that get embeddings")
+    parser.add_argument("--embed-dim", type=int, default=384)
+    parser.add_argument("--history-chars", type=int, default=20_000, help="History budget for balanced retrieval")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate datasets even if cached")
+    parser.add_argument("--output", type=Path, default=TEST_DATA_DIR / "bench_output.json")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Regression ratio on p50 (default 1.25 = 25%% slower)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    for noisy in ("sea", "saiverse_memory", "sai_memory", "tools", "builtin_data"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+    args = parse_args(argv)
+    definitions = ensure_test_environment()
+
+    runs = []
+    for size in args.messages:
+        spec = DatasetSpec(
+            messages=size,
+            pages=args.pages,
+            arasuji_levels=args.levels,
+            participants=args.participants,
+            embedded=args.embedded,
+            embed_dim=args.embed_dim,
+        )
+        runs.append(run_dataset(spec, args, definitions))
+
+    report = {"environment": environment_info(), "runs": runs}
+    write_report(args.output, report)
+    LOGGER.info("Wrote %s", args.output)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, threshold=args.threshold)
+        for item in regressions:
+            LOGGER.error(
+                "Regression %s / %s: %.2fms -> %.2fms (x%.2f)",
+                item["dataset"], item["name"], item["baseline"], item["current"], item["ratio"],
+            )
+        if regressions:
+            return 1
+        LOGGER.info("No regressions against %s", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Synthetic persona memory for benchmarks.
+
+Builds a SAIMemory ``memory.db`` with a configurable number of messages,
+Memopedia pages and Chronicle (arasuji) levels using the real schema
+initialisers, so the benchmarked code reads exactly what a long-running
+persona would have on disk. Datasets are deterministic for a given
+:class:`DatasetSpec` and reused across runs (1M messages takes minutes to
+generate).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+_WORDS_JA = [
+    "今日", "昨日", "散歩", "図書館", "コーヒー", "約束", "音楽", "プロジェクト", "記憶", "夢",
+    "天気", "旅行", "ケーキ", "会議", "星空", "手紙", "猫", "実験", "物語", "練習",
+    "について", "だった", "してみた", "思う", "楽しい", "少し", "また", "一緒に", "明日", "話した",
+]
+_WORDS_EN = [
+    "memory", "garden", "signal", "window", "river", "lantern", "archive", "compass", "harbor", "meadow",
+    "draft", "sketch", "puzzle", "journey", "promise", "orbit", "echo", "canvas", "thread", "season",
+]
+
+DATASET_TABLE = "_bench_dataset"
+MESSAGES_PER_LEVEL1 = 20
+ENTRIES_PER_HIGHER_LEVEL = 10
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    messages: int = 10_000
+    pages: int = 200
+    arasuji_levels: int = 3
+    participants: int = 3  # "user" + N-1 other personas
+    embedded: int = 5_000  # most recent messages that carry embeddings
+    embed_dim: int = 384
+    seed: int = 0
+
+    @property
+    def key(self) -> str:
+        return (
+            f"bench_m{self.messages}_p{self.pages}_l{self.arasuji_levels}"
+            f"_e{min(self.embedded, self.messages)}x{self.embed_dim}_s{self.seed}"
+        )
+
+    def participant_ids(self) -> List[str]:
+        return ["user"] + [f"bench_partner_{i}" for i in range(1, max(1, self.participants))]
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder used in place of the fastembed model.
+
+    Benchmarks measure SAIVerse's own retrieval code, not ONNX inference, and
+    must run without downloading a model. Same constructor/``embed`` shape as
+    :class:`sai_memory.memory.recall.Embedder`.
+    """
+
+    MODEL_NAME = "bench-hashing"
+
+    def __init__(self, model: str = MODEL_NAME, *, local_model_path: Any = None,
+                 model_dim: int | None = None, cuda: Any = None, dim: int | None = None) -> None:
+        self.model_name = model
+        self.dim = int(dim or model_dim or 384)
+
+    def _vector(self, text: str) -> List[float]:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token in text.split():
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = float(np.linalg.norm(vec))
+        if norm:
+            vec /= norm
+        return [round(float(v), 5) for v in vec]
+
+    def embed(self, texts: List[str], *, is_query: bool = False) -> List[List[float]]:
+        return [self._vector(text) for text in texts]
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    count = rng.randint(min_words, max_words)
+    words = [rng.choice(_WORDS_JA) if rng.random() < 0.7 else rng.choice(_WORDS_EN) for _ in range(count)]
+    return " ".join(words)
+
+
+def _batched(iterable: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(iterable), size):
+        yield iterable[start:start + size]
+
+
+def thread_id_for(persona_id: str) -> str:
+    from saiverse_memory.adapter import SAIMemoryAdapter
+
+    return f"{persona_id}:{SAIMemoryAdapter._PERSONA_THREAD_SUFFIX}"
+
+
+def _existing_spec(db_path: Path) -> Dict[str, Any] | None:
+    if not db_path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            row = conn.execute(f"SELECT spec FROM {DATASET_TABLE} LIMIT 1").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def build_dataset(spec: DatasetSpec, personas_root: Path, *, rebuild: bool = False) -> Path:
+    """Create (or reuse) the persona directory for ``spec`` under ``personas_root``."""
+    persona_dir = Path(personas_root) / spec.key
+    db_path = persona_dir / "memory.db"
+    if not rebuild and _existing_spec(db_path) == asdict(spec):
+        LOGGER.info("Reusing dataset %s", persona_dir)
+        return persona_dir
+
+    from sai_memory.arasuji.storage import init_arasuji_tables
+    from sai_memory.memopedia.storage import init_memopedia_tables
+    from sai_memory.memory.storage import init_db, set_embed_metadata
+
+    persona_dir.mkdir(parents=True, exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        candidate = Path(str(db_path) + suffix)
+        if candidate.exists():
+            candidate.unlink()
+
+    started = time.perf_counter()
+    conn = init_db(str(db_path))
+    try:
+        conn.execute("PRAGMA synchronous=OFF")
+        init_arasuji_tables(conn)
+        init_memopedia_tables(conn)
+        rng = random.Random(spec.seed)
+        message_rows = _insert_messages(conn, spec, rng)
+        _insert_arasuji(conn, spec, rng, message_rows)
+        _insert_memopedia(conn, spec, rng)
+        set_embed_metadata(conn, "embed_model", HashingEmbedder.MODEL_NAME)
+        conn.execute(f"CREATE TABLE {DATASET_TABLE} (spec TEXT NOT NULL)")
+        conn.execute(f"INSERT INTO {DATASET_TABLE}(spec) VALUES (?)", (json.dumps(asdict(spec)),))
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    LOGGER.info("Built dataset %s in %.1fs", spec.key, time.perf_counter() - started)
+    return persona_dir
+
+
+def _insert_messages(conn: sqlite3.Connection, spec: DatasetSpec, rng: random.Random) -> List[Tuple[str, int]]:
+    """Insert the conversation; returns ``[(message_id, created_at), ...]`` in order."""
+    persona_id = spec.key
+    thread_id = thread_id_for(persona_id)
+    conn.execute(
+        "INSERT OR IGNORE INTO threads(id, resource_id) VALUES (?, ?)",
+        (thread_id, persona_id),
+    )
+    partners = spec.participant_ids()
+    base_ts = int(time.time()) - spec.messages * 60
+    embedder = HashingEmbedder(dim=spec.embed_dim)
+    first_embedded = spec.messages - min(spec.embedded, spec.messages)
+
+    rows: List[Tuple[str, int]] = []
+    for chunk_start in range(0, spec.messages, 5_000):
+        chunk_end = min(spec.messages, chunk_start + 5_000)
+        message_batch = []
+        embedding_batch = []
+        for idx in range(chunk_start, chunk_end):
+            message_id = f"bench-{idx:09d}"
+            created_at = base_ts + idx * 60
+            partner = partners[(idx // 2) % len(partners)]
+            internal = rng.random() < 0.1
+            if internal:
+                role = "assistant"
+                metadata = {"tags": ["internal"]}
+            else:
+                role = "user" if idx % 2 == 0 else "assistant"
+                metadata = {"tags": ["conversation"], "with": [partner]}
+            content = _sentence(rng, 8, 80)
+            message_batch.append(
+                (message_id, thread_id, role, content, persona_id, created_at, json.dumps(metadata))
+            )
+            if idx >= first_embedded:
+                embedding_batch.append((message_id, 0, json.dumps(embedder.embed([content])[0])))
+            rows.append((message_id, created_at))
+        conn.executemany(
+            "INSERT INTO messages(id, thread_id, role, content, resource_id, created_at, metadata)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            message_batch,
+        )
+        if embedding_batch:
+            conn.executemany(
+                "INSERT INTO message_embeddings(message_id, chunk_index, vector) VALUES (?, ?, ?)",
+                embedding_batch,
+            )
+        conn.commit()
+    return rows
+
+
+def _insert_arasuji(
+    conn: sqlite3.Connection,
+    spec: DatasetSpec,
+    rng: random.Random,
+    message_rows: List[Tuple[str, int]],
+) -> None:
+    """Level 1 summarises 20 messages; each higher level summarises 10 entries below it."""
+    if spec.arasuji_levels <= 0:
+        return
+    now = int(time.time())
+    # (id, start, end, message_count) of the level below
+    lower: List[Tuple[str, int, int, int]] = [(mid, ts, ts, 1) for mid, ts in message_rows]
+    group_size = MESSAGES_PER_LEVEL1
+    for level in range(1, spec.arasuji_levels + 1):
+        current: List[Tuple[str, int, int, int]] = []
+        rows = []
+        parent_updates = []
+        complete = len(lower) - len(lower) % group_size
+        for group_index, group in enumerate(_batched(lower[:complete], group_size)):
+            entry_id = f"arasuji-{level}-{group_index:07d}"
+            start, end = group[0][1], group[-1][2]
+            message_count = sum(item[3] for item in group)
+            rows.append((
+                entry_id, level, _sentence(rng, 40, 120), json.dumps([item[0] for item in group]),
+                start, end, len(group), message_count, now,
+            ))
+            if level > 1:
+                parent_updates.extend((entry_id, item[0]) for item in group)
+            current.append((entry_id, start, end, message_count))
+        conn.executemany(
+            "INSERT INTO arasuji_entries (id, level, content, source_ids_json, start_time, end_time,"
+            " source_count, message_count, parent_id, is_consolidated, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, 0, ?)",
+            rows,
+        )
+        if parent_updates:
+            conn.executemany(
+                "UPDATE arasuji_entries SET parent_id = ?, is_consolidated = 1 WHERE id = ?",
+                parent_updates,
+            )
+        conn.commit()
+        if not current:
+            break
+        lower = current
+        group_size = ENTRIES_PER_HIGHER_LEVEL
+
+
+def _insert_memopedia(conn: sqlite3.Connection, spec: DatasetSpec, rng: random.Random) -> None:
+    from sai_memory.memopedia.storage import CATEGORY_PEOPLE, CATEGORY_PLANS, CATEGORY_TERMS, create_page
+
+    categories = [CATEGORY_PEOPLE, CATEGORY_TERMS, CATEGORY_PLANS]
+    by_category: Dict[str, List[str]] = {category: [f"root_{category}"] for category in categories}
+    for index in range(spec.pages):
+        category = categories[index % len(categories)]
+        candidates = by_category[category]
+        # Early pages become trunks directly under the root; later ones nest under earlier pages
+        is_trunk = len(candidates) <= 4
+        parent_id = candidates[0] if is_trunk else rng.choice(candidates)
+        page_id = f"page-{index:06d}"
+        create_page(
+            conn,
+            parent_id=parent_id,
+            title=f"{_sentence(rng, 1, 3)} {index}",
+            summary=_sentence(rng, 10, 30),
+            content=_sentence(rng, 60, 200),
+            category=category,
+            keywords=[rng.choice(_WORDS_JA) for _ in range(3)],
+            vividness=rng.choice(["vivid", "rough", "faint"]),
+            is_trunk=is_trunk,
+            page_id=page_id,
+        )
+        candidates.append(page_id)
@@ -29,29 +29,7 @@ def document_read(
     if manager is None:
         raise RuntimeError("Manager context is not available.")
 
-    # Get item from ItemService
-    item = manager.item_service.items.get(item_id)
-    if not item:
-        raise RuntimeError(f"Item '{item_id}' not found.")
-
-    if (item.get("type") or "").lower() != "document":
-        raise RuntimeError(f"Item '{item_id}' is not a document type.")
-
-    file_path_str = item.get("file_path")
-    if not file_path_str:
-        raise RuntimeError("This document has no file_path set.")
-
-    file_path = manager.item_service._resolve_file_path(file_path_str)
-    if not file_path.exists():
-        raise RuntimeError(f"File not found: {file_path}")
-
-    try:
-        content = file_path.read_text(encoding="utf-8")
-    except OSError as exc:
-        raise RuntimeError(f"Failed to read file: {exc}") from exc
-
-    lines = content.split('\n')
-    total_lines = len(lines)
+    item, file_path = manager.item_service.resolve_document(item_id)
 
     # Normalize parameters (SEA runtime may pass empty strings)
     if start_line == "" or start_line is None:
@@ -71,13 +49,16 @@ def document_read(
 
     # 1-based to 0-based
     start_idx = max(0, start_line - 1)
+    end_idx = end_line if end_line is not None else start_idx + limit
 
-    if end_line is not None:
-        end_idx = min(total_lines, end_line)
-    else:
-        end_idx = min(total_lines, start_idx + limit)
-
-    selected_lines = lines[start_idx:end_idx]
+    # Seek straight to the requested range via the line-offset index
+    try:
+        selected_lines, total_lines = manager.item_service.document_index.read_lines(
+            item_id, file_path, start_idx, end_idx
+        )
+    except OSError as exc:
+        raise RuntimeError(f"Failed to read file: {exc}") from exc
+    end_idx = min(total_lines, end_idx)
 
     # Format with line numbers (cat -n style)
     result_lines = []
@@ -1,25 +1,27 @@
-"""Document search tool - Search for patterns in a document item."""
+"""Document search tool - Search for patterns in document items."""
 from __future__ import annotations
 
 import re
-from typing import Optional, List
+from pathlib import Path
+from typing import Dict, List, Optional
 
-from tools.context import get_active_manager
+from tools.context import get_active_manager, get_active_persona_id
 from tools.core import ToolSchema
 
 
 def document_search(
-    item_id: str,
     pattern: str,
+    item_id: Optional[str] = None,
     case_sensitive: bool = False,
     context_lines: int = 2,
     max_matches: int = 10
 ) -> str:
-    """Search for a pattern in a document item.
+    """Search for a pattern in a document item, or in every accessible document.
 
     Args:
-        item_id: Identifier of the document item.
         pattern: Search pattern (supports regex).
+        item_id: Identifier of the document item. If omitted, searches all documents
+            in the persona's inventory and current building.
         case_sensitive: Whether the search is case-sensitive. Default: False
         context_lines: Number of context lines to show before and after each match. Default: 2
         max_matches: Maximum number of matches to return. Default: 10
@@ -32,28 +34,7 @@ def document_search(
     if manager is None:
         raise RuntimeError("Manager context is not available.")
 
-    item = manager.item_service.items.get(item_id)
-    if not item:
-        raise RuntimeError(f"Item '{item_id}' not found.")
-
-    if (item.get("type") or "").lower() != "document":
-        raise RuntimeError(f"Item '{item_id}' is not a document type.")
-
-    file_path_str = item.get("file_path")
-    if not file_path_str:
-        raise RuntimeError("This document has no file_path set.")
-
-    file_path = manager.item_service._resolve_file_path(file_path_str)
-    if not file_path.exists():
-        raise RuntimeError(f"File not found: {file_path}")
-
-    try:
-        content = file_path.read_text(encoding="utf-8")
-    except OSError as exc:
-        raise RuntimeError(f"Failed to read file: {exc}") from exc
-
-    lines = content.split('\n')
-    total_lines = len(lines)
+    item_service = manager.item_service
 
     # Normalize parameters (SEA runtime may pass empty strings)
     if case_sensitive == "" or case_sensitive is None:
@@ -67,40 +48,58 @@ def document_search(
     else:
         max_matches = int(max_matches)
 
-    # Compile regex
-    flags = 0 if case_sensitive else re.IGNORECASE
+    documents: Dict[str, Path] = {}
+    if item_id:
+        _, documents[item_id] = item_service.resolve_document(item_id)
+    else:
+        persona_id = get_active_persona_id()
+        if not persona_id:
+            raise RuntimeError("item_id is required when no persona is active.")
+        for doc_id in item_service.accessible_document_ids(persona_id):
+            try:
+                _, documents[doc_id] = item_service.resolve_document(doc_id)
+            except RuntimeError:
+                continue
+        if not documents:
+            return "No documents are available to search."
+
+    index = item_service.document_index
     try:
-        regex = re.compile(pattern, flags)
+        matches = index.search(pattern, documents, case_sensitive=bool(case_sensitive), limit=max_matches)
     except re.error as exc:
         raise RuntimeError(f"Invalid regex pattern: {exc}") from exc
-
-    # Find matching lines
-    matches: List[int] = []
-    for i, line in enumerate(lines):
-        if regex.search(line):
-            matches.append(i)
-            if len(matches) >= max_matches:
-                break
+    except OSError as exc:
+        raise RuntimeError(f"Failed to read file: {exc}") from exc
 
     if not matches:
         return f"No matches found for pattern '{pattern}'."
 
     # Build result
-    results = []
-    item_name = item.get("name", item_id)
-    results.append(f"[{item_name}] Search results: {len(matches)} matches (total {total_lines} lines)\n")
+    results: List[str] = []
+    if item_id:
+        item_name = item_service.items[item_id].get("name", item_id)
+        total_lines = index.ensure(item_id, documents[item_id]).line_count
+        results.append(f"[{item_name}] Search results: {len(matches)} matches (total {total_lines} lines)\n")
+    else:
+        results.append(f"Search results: {len(matches)} matches across {len(documents)} documents\n")
     results.append(f"Pattern: {pattern}\n")
     results.append("=" * 60)
 
-    for match_idx in matches:
-        start = max(0, match_idx - context_lines)
-        end = min(total_lines, match_idx + context_lines + 1)
+    for match in matches:
+        start = max(0, match.line_index - context_lines)
+        lines, _ = index.read_lines(
+            match.item_id, documents[match.item_id], start, match.line_index + context_lines + 1
+        )
 
-        results.append(f"\n--- Line {match_idx + 1} ---")
+        if item_id:
+            results.append(f"\n--- Line {match.line_index + 1} ---")
+        else:
+            doc_name = item_service.items[match.item_id].get("name", match.item_id)
+            results.append(f"\n--- [{doc_name}] (item_id: {match.item_id}) Line {match.line_index + 1} ---")
 
-        for i in range(start, end):
-            prefix = ">" if i == match_idx else " "
-            results.append(f"{prefix}{i + 1:6d}  {lines[i]}")
+        for i, line in enumerate(lines, start=start):
+            prefix = ">" if i == match.line_index else " "
+            results.append(f"{prefix}{i + 1:6d}  {line}")
 
     if len(matches) >= max_matches:
         results.append(f"\n... (showing first {max_matches} matches only)")
@@ -114,14 +113,18 @@ def schema() -> ToolSchema:
         description=(
             "Search for a pattern in a document item using regex. "
             "Returns matching lines with context. "
-            "Similar to grep with context lines."
+            "Similar to grep with context lines. "
+            "Omit item_id to search every document in your inventory and current building."
         ),
         parameters={
             "type": "object",
             "properties": {
                 "item_id": {
                     "type": "string",
-                    "description": "Identifier of the document item to search.",
+                    "description": (
+                        "Identifier of the document item to search. "
+                        "If omitted, all accessible documents are searched."
+                    ),
                 },
                 "pattern": {
                     "type": "string",
@@ -143,7 +146,7 @@ def schema() -> ToolSchema:
                     "default": 10,
                 },
             },
-            "required": ["item_id", "pattern"],
+            "required": ["pattern"],
         },
         result_type="string",
     )
@@ -5,6 +5,7 @@ import copy
 import logging
 from typing import Any, Dict, List, Optional
 
+from persona.building_history import messages_after, seq_of
 from tools.context import get_active_persona_id, get_active_manager
 from tools.core import ToolSchema
 
@@ -14,11 +15,11 @@ LOGGER = logging.getLogger(__name__)
 def get_building_messages(building_id: Optional[str] = None) -> str:
     """Get new messages from building history that this persona hasn't seen yet.
 
+    - Looks up messages after the pulse cursor by seq (bisect, O(new messages))
     - Filters by heard_by (messages the persona could hear)
-    - Filters by ingested_by (messages not yet processed)
+    - Skips messages already ingested (persona.ingested_seqs, legacy ingested_by)
     - Converts other personas' messages to user role with speaker prefix
     - Adds messages to persona history
-    - Marks messages as ingested
 
     Returns a summary of perceived messages.
     """
@@ -59,19 +60,15 @@ def get_building_messages(building_id: Optional[str] = None) -> str:
     # Get id_to_name_map for speaker name resolution
     id_to_name_map = getattr(persona, "id_to_name_map", {})
 
+    # Seqs this persona already ingested ahead of the cursor (e.g. its own user input)
+    ingested = getattr(persona, "ingested_seqs", {}).get(building_id)
+
     # Find new messages
     new_msgs: List[Dict[str, Any]] = []
     max_seen_seq = last_cursor
 
-    for msg in hist:
-        try:
-            seq = int(msg.get("seq", 0))
-        except (TypeError, ValueError):
-            seq = 0
-
-        if seq <= last_cursor:
-            max_seen_seq = max(max_seen_seq, seq)
-            continue
+    for msg in messages_after(hist, last_cursor):
+        seq = seq_of(msg)
         max_seen_seq = max(max_seen_seq, seq)
 
         if seq <= entry_limit:
@@ -82,10 +79,16 @@ def get_building_messages(building_id: Optional[str] = None) -> str:
         if persona_id not in heard_by:
             continue
 
+        # Skip if already ingested
+        if ingested is not None and seq in ingested:
+            continue
+
         new_msgs.append(msg)
 
-    # Update pulse cursor
+    # Update pulse cursor; ingestion marks behind the cursor are no longer needed
     pulse_cursors[building_id] = max_seen_seq
+    if ingested is not None:
+        ingested.discard_through(max_seen_seq)
 
     if not new_msgs:
         return "新規メッセージはありません"
@@ -100,9 +103,9 @@ def get_building_messages(building_id: Optional[str] = None) -> str:
             pid = m.get("persona_id")
             content = m.get("content", "")
 
-            # Skip if already ingested
-            ingested = m.get("ingested_by") or []
-            if isinstance(ingested, list) and persona_id in ingested:
+            # Logs written before ingestion moved to the persona still carry ingested_by
+            legacy_ingested = m.get("ingested_by") or []
+            if isinstance(legacy_ingested, list) and persona_id in legacy_ingested:
                 continue
 
             # Skip empty and system-like summary notes
@@ -130,7 +133,6 @@ def get_building_messages(building_id: Optional[str] = None) -> str:
                     entry["timestamp"] = ts_value
 
                 history_manager.add_to_persona_only(entry)
-                _mark_ingested(m, persona_id)
                 perceived_count += 1
                 speaker_counts[speaker] = speaker_counts.get(speaker, 0) + 1
 
@@ -153,7 +155,6 @@ def get_building_messages(building_id: Optional[str] = None) -> str:
                     entry["timestamp"] = ts_value
 
                 history_manager.add_to_persona_only(entry)
-                _mark_ingested(m, persona_id)
                 perceived_count += 1
                 speaker_counts["ユーザー"] = speaker_counts.get("ユーザー", 0) + 1
 
@@ -169,16 +170,6 @@ def get_building_messages(building_id: Optional[str] = None) -> str:
     return f"{perceived_count}件の新規メッセージを認識しました（{details}）"
 
 
-def _mark_ingested(msg: Dict[str, Any], persona_id: str) -> None:
-    """Mark a message as ingested by this persona."""
-    try:
-        bucket = msg.setdefault("ingested_by", [])
-        if isinstance(bucket, list) and persona_id not in bucket:
-            bucket.append(persona_id)
-    except Exception:
-        LOGGER.warning("Failed to mark message as ingested by %s", persona_id, exc_info=True)
-
-
 def schema() -> ToolSchema:
     return ToolSchema(
         name="get_building_messages",
@@ -2,17 +2,60 @@
 
 from __future__ import annotations
 
+import copy
 import logging
 import os
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
 # Marker to identify Memory Weave context messages
 MEMORY_WEAVE_CONTEXT_MARKER = "__memory_weave_context__"
 
+# Rendered-context cache, keyed by memory.db path.
+# The entry key is (file identity, arasuji version, memopedia version,
+# max_chronicle_entries); the versions come from the ``data_versions`` counters
+# that SQLite triggers bump on every arasuji / memopedia write. When nothing
+# changed the previous messages are returned unchanged, which also keeps the
+# provider prompt-cache prefix stable across pulses.
+_CacheKey = Tuple[int, int, int, int, int]
+_CACHE: Dict[str, Tuple[_CacheKey, List[Dict[str, Any]]]] = {}
+_INITIALISED: Set[Tuple[str, int, int]] = set()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("SAIVERSE_MEMORY_WEAVE_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def invalidate_memory_weave_cache(persona_dir: Optional[str] = None) -> None:
+    """Drop cached Memory Weave context (one persona, or all when omitted)."""
+    with _CACHE_LOCK:
+        if persona_dir is None:
+            _CACHE.clear()
+            _INITIALISED.clear()
+            return
+        path = str(Path(persona_dir) / "memory.db")
+        _CACHE.pop(path, None)
+        _INITIALISED.difference_update({item for item in _INITIALISED if item[0] == path})
+
+
+def _ensure_tables(conn: sqlite3.Connection, path: str, identity: Tuple[int, int]) -> None:
+    """Run the arasuji / memopedia DDL (and install change triggers) once per DB file."""
+    marker = (path, *identity)
+    if marker in _INITIALISED:
+        return
+    from sai_memory.arasuji import init_arasuji_tables
+    from sai_memory.memopedia import init_memopedia_tables
+
+    init_arasuji_tables(conn)
+    init_memopedia_tables(conn)
+    with _CACHE_LOCK:
+        _INITIALISED.add(marker)
+
 
 def get_memory_weave_context(
     *,
@@ -65,28 +108,39 @@ def get_memory_weave_context(
         LOGGER.debug("get_memory_weave_context: memory.db not found at %s", memory_db_path)
         return []
 
+    use_cache = _cache_enabled()
+    path = str(memory_db_path)
+    try:
+        conn = sqlite3.connect(path)
+    except Exception as exc:
+        LOGGER.warning("get_memory_weave_context: Failed to open %s: %s", path, exc)
+        return []
+
     try:
-        conn = sqlite3.connect(str(memory_db_path))
-        context_parts: List[str] = []
+        cache_key: Optional[_CacheKey] = None
+        if use_cache:
+            from sai_memory.change_tracking import get_data_versions
+
+            stat = os.stat(path)
+            identity = (stat.st_dev, stat.st_ino)  # restore は os.replace で別ファイルになる
+            _ensure_tables(conn, path, identity)
+            versions = get_data_versions(conn)
+            cache_key = (*identity, versions["arasuji"], versions["memopedia"], max_chronicle_entries)
+            with _CACHE_LOCK:
+                cached = _CACHE.get(path)
+            if cached is not None and cached[0] == cache_key:
+                LOGGER.debug("get_memory_weave_context: cache hit for %s", persona_id)
+                return copy.deepcopy(cached[1])
 
         # 1. Get Chronicle context (hierarchical episode memory)
         chronicle_text = _get_chronicle_context(conn, max_entries=max_chronicle_entries)
-        if chronicle_text:
-            context_parts.append("## これまでの出来事（Chronicle）\n\n" + chronicle_text)
 
         # 2. Get Memopedia context (semantic memory)
-        memopedia_text = _get_memopedia_context(conn)
+        memopedia_text = _get_memopedia_context(conn, init_tables=not use_cache)
         LOGGER.info("get_memory_weave_context: Memopedia text length=%d", len(memopedia_text))
-        if memopedia_text:
-            context_parts.append("## 記憶ベース（Memopedia）\n\n" + memopedia_text)
-        else:
+        if not memopedia_text:
             LOGGER.warning("get_memory_weave_context: Memopedia context is empty")
 
-        conn.close()
-
-        if not context_parts:
-            return []
-
         # Build separate messages for Chronicle and Memopedia
         # so the context preview can show token breakdown per source
         messages: List[Dict[str, Any]] = []
@@ -114,11 +168,18 @@ def get_memory_weave_context(
             "get_memory_weave_context: Generated %d messages (%d chars total)",
             len(messages), total_chars,
         )
+        if cache_key is not None:
+            # Versions were read before rendering, so a concurrent write only
+            # makes the next call re-render; it can never pin stale text.
+            with _CACHE_LOCK:
+                _CACHE[path] = (cache_key, copy.deepcopy(messages))
         return messages
 
     except Exception as exc:
         LOGGER.warning("get_memory_weave_context: Failed to build context: %s", exc)
         return []
+    finally:
+        conn.close()
 
 
 def _get_chronicle_context(conn: sqlite3.Connection, max_entries: int = 50) -> str:
@@ -139,18 +200,17 @@ def _get_chronicle_context(conn: sqlite3.Connection, max_entries: int = 50) -> s
         return ""
 
 
-def _get_memopedia_context(conn: sqlite3.Connection) -> str:
+def _get_memopedia_context(conn: sqlite3.Connection, *, init_tables: bool = True) -> str:
     """Get Memopedia context (page titles, summaries, optionally content for vivid pages).
     
     Uses the unified get_tree_markdown() method for consistent formatting.
     Keywords are excluded to reduce token usage.
     """
     try:
-        from sai_memory.memopedia import Memopedia, init_memopedia_tables
-        
-        # Initialize tables if needed
-        init_memopedia_tables(conn)
-        memopedia = Memopedia(conn)
+        from sai_memory.memopedia import Memopedia
+
+        # Tables are already initialised once per DB when the cache is on
+        memopedia = Memopedia(conn, init_tables=init_tables)
         
         # Use the unified get_tree_markdown method
         # - include_keywords=False for lighter context
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from saiverse_memory import SAIMemoryAdapter
-from sai_memory.memory.recall import semantic_recall_groups
+from sai_memory.memory.recall import embed_query, semantic_recall_groups
 from sai_memory.memory.storage import (
     get_all_messages_for_search,
     get_messages_last,
@@ -110,16 +110,16 @@ def memory_search_brief(
     guard_ids: set = set()
     guard_count = max(0, adapter.settings.last_messages)
     if guard_count > 0:
-        with adapter._db_lock:
-            recent_msgs = get_messages_last(adapter.conn, thread_id, guard_count)
+        with adapter.read_connection() as conn:
+            recent_msgs = get_messages_last(conn, thread_id, guard_count)
             guard_ids = {m.id for m in recent_msgs}
 
     # 1. Keyword search
     keyword_matches: Dict[str, List[str]] = {}  # msg_id -> matched keywords
     if keywords:
-        with adapter._db_lock:
+        with adapter.read_connection() as conn:
             all_msgs = get_all_messages_for_search(
-                adapter.conn,
+                conn,
                 required_tags=["conversation"],
             )
         keyword_scored = []
@@ -145,9 +145,10 @@ def memory_search_brief(
     # 2. Semantic search
     if query and query.strip():
         search_topk = topk * 2 + len(guard_ids)
-        with adapter._db_lock:
+        query_vector = embed_query(adapter.embedder, query)
+        with adapter.read_connection() as conn:
             groups_raw = semantic_recall_groups(
-                adapter.conn,
+                conn,
                 adapter.embedder,
                 query,
                 thread_id=None,
@@ -158,6 +159,7 @@ def memory_search_brief(
                 scope=adapter.settings.scope,
                 exclude_message_ids=guard_ids,
                 required_tags=["conversation"],
+                query_vector=query_vector,
             )
         rank_counter = 0
         for seed, _bundle, _score in groups_raw:
@@ -42,6 +42,37 @@ def needs_migration(db_path: str) -> bool:
         engine.dispose()
 
 
+def ensure_indexes(db_path: str) -> list[str]:
+    """Create secondary indexes declared on the models that the DB lacks.
+
+    ``needs_migration`` only compares columns, so indexes added to existing
+    tables would never trigger a rebuild. Indexes are created in place with
+    ``CREATE INDEX IF NOT EXISTS`` semantics and the names of newly created
+    indexes are returned.
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    created: list[str] = []
+    try:
+        db_inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table in Base.metadata.tables.values():
+                if not db_inspector.has_table(table.name):
+                    continue
+                existing = {ix["name"] for ix in db_inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name in existing:
+                        continue
+                    index.create(bind=conn, checkfirst=True)
+                    created.append(index.name)
+                    logging.info(f"インデックスを作成しました: {table.name}.{index.name}")
+        return created
+    finally:
+        engine.dispose()
+
+
 def migrate_database_in_place(db_path: str):
     """
     指定されたデータベースファイルをその場でマイグレーションします。
@@ -88,6 +119,11 @@ def migrate_database_in_place(db_path: str):
             table_name = table.name
             logging.info(f"テーブル '{table_name}' のデータ移行を開始...")
 
+            if table.info.get("derived"):
+                # トリガーで他テーブルから再構築される派生テーブルはコピーしない
+                logging.info(f"  - テーブル '{table_name}' は派生テーブルのため、スキップします。")
+                continue
+
             if not source_inspector.has_table(table_name):
                 logging.warning(f"  - ソースにテーブル '{table_name}' が存在しないため、スキップします。")
                 continue
@@ -184,4 +220,5 @@ if __name__ == "__main__":
     if not args.force and not needs_migration(db_path):
         logging.info("スキーマに変更はありません。マイグレーションは不要です。")
     else:
-        migrate_database_in_place(db_path)
\ No newline at end of file
+        migrate_database_in_place(db_path)
+    ensure_indexes(db_path)
\ No newline at end of file
@@ -6,7 +6,11 @@ from sqlalchemy import (
     ForeignKey,
     Boolean,
     UniqueConstraint,
+    Index,
+    DDL,
+    event,
     func,
+    text,
     Text,
     Float,
 )
@@ -111,6 +115,85 @@ class BuildingOccupancyLog(Base):
     AIID = Column(String(255), ForeignKey("ai.AIID"), nullable=False)
     ENTRY_TIMESTAMP = Column(DateTime, nullable=False)
     EXIT_TIMESTAMP = Column(DateTime)
+    __table_args__ = (
+        Index("ix_occupancy_building_exit", "BUILDINGID", "EXIT_TIMESTAMP"),
+        Index("ix_occupancy_city_exit", "CITYID", "EXIT_TIMESTAMP"),
+        Index("ix_occupancy_ai_building_exit", "AIID", "BUILDINGID", "EXIT_TIMESTAMP"),
+        Index("ix_occupancy_open", "CITYID", "BUILDINGID", sqlite_where=text("EXIT_TIMESTAMP IS NULL")),
+    )
+
+
+class BuildingOccupancyCurrent(Base):
+    """現在の在室状況のスナップショット（building_occupancy_log の EXIT_TIMESTAMP IS NULL 行）。
+
+    building_occupancy_log へのトリガーで同一トランザクション内に更新されるため、
+    アプリケーションから直接書き込まない。マイグレーション時はコピーせずトリガーで再構築する。
+    """
+    __tablename__ = "building_occupancy_current"
+    LOG_ID = Column(Integer, ForeignKey("building_occupancy_log.ID"), primary_key=True)
+    CITYID = Column(Integer, nullable=False)
+    BUILDINGID = Column(String(255), nullable=False)
+    AIID = Column(String(255), nullable=False)
+    ENTRY_TIMESTAMP = Column(DateTime, nullable=False)
+    __table_args__ = (
+        Index("ix_occupancy_current_city", "CITYID"),
+        Index("ix_occupancy_current_ai", "AIID"),
+        {"info": {"derived": True}},
+    )
+
+
+class BuildingOccupancyDaily(Base):
+    """コンパクション済みの在室履歴（日別・建物別・AI別の集計）。"""
+    __tablename__ = "building_occupancy_daily"
+    ID = Column(Integer, primary_key=True, autoincrement=True)
+    CITYID = Column(Integer, ForeignKey("city.CITYID"), nullable=False)
+    BUILDINGID = Column(String(255), nullable=False)
+    AIID = Column(String(255), nullable=False)
+    DAY = Column(String(10), nullable=False)  # YYYY-MM-DD
+    VISIT_COUNT = Column(Integer, default=0, nullable=False)
+    TOTAL_SECONDS = Column(Float, default=0.0, nullable=False)
+    __table_args__ = (
+        UniqueConstraint("BUILDINGID", "AIID", "DAY", name="uq_occupancy_daily"),
+        Index("ix_occupancy_daily_city_day", "CITYID", "DAY"),
+    )
+
+
+# building_occupancy_current をログと同一トランザクションで維持するトリガー
+_OCCUPANCY_SNAPSHOT_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_occupancy_log_insert
+    AFTER INSERT ON building_occupancy_log
+    WHEN NEW.EXIT_TIMESTAMP IS NULL
+    BEGIN
+        INSERT OR REPLACE INTO building_occupancy_current (LOG_ID, CITYID, BUILDINGID, AIID, ENTRY_TIMESTAMP)
+        VALUES (NEW.ID, NEW.CITYID, NEW.BUILDINGID, NEW.AIID, NEW.ENTRY_TIMESTAMP);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_occupancy_log_update
+    AFTER UPDATE ON building_occupancy_log
+    BEGIN
+        DELETE FROM building_occupancy_current WHERE LOG_ID = OLD.ID;
+        INSERT OR REPLACE INTO building_occupancy_current (LOG_ID, CITYID, BUILDINGID, AIID, ENTRY_TIMESTAMP)
+        SELECT NEW.ID, NEW.CITYID, NEW.BUILDINGID, NEW.AIID, NEW.ENTRY_TIMESTAMP
+        WHERE NEW.EXIT_TIMESTAMP IS NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_occupancy_log_delete
+    AFTER DELETE ON building_occupancy_log
+    BEGIN
+        DELETE FROM building_occupancy_current WHERE LOG_ID = OLD.ID;
+    END
+    """,
+)
+
+for _trigger_sql in _OCCUPANCY_SNAPSHOT_TRIGGERS:
+    event.listen(
+        BuildingOccupancyCurrent.__table__,
+        "after_create",
+        DDL(_trigger_sql).execute_if(dialect="sqlite"),
+    )
 
 class ThinkingRequest(Base):
     __tablename__ = "thinking_request"
@@ -122,6 +205,7 @@ class ThinkingRequest(Base):
     response_text = Column(String)
     status = Column(String(32), default='pending', nullable=False) # pending, processed, error
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    __table_args__ = (Index("ix_thinking_request_city_status", "city_id", "status"),)
 
 class VisitingAI(Base):
     __tablename__ = "visiting_ai"
@@ -132,7 +216,10 @@ class VisitingAI(Base):
     status = Column(String(32), default='requested', nullable=False) # requested, accepted, rejected
     reason = Column(String(255)) # 拒否された場合の理由など
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    __table_args__ = (UniqueConstraint('city_id', 'persona_id', name='uq_visiting_city_persona'),)
+    __table_args__ = (
+        UniqueConstraint('city_id', 'persona_id', name='uq_visiting_city_persona'),
+        Index("ix_visiting_ai_city_status", "city_id", "status"),
+    )
 
 
 class Playbook(Base):
@@ -218,6 +305,11 @@ class PersonaEventLog(Base):
     STATUS = Column(String(32), default="pending", nullable=False)  # pending / archived
     EVENT_TYPE = Column(String(64), nullable=True)  # "x_mention", "switchbot_open", etc.
     PAYLOAD = Column(Text, nullable=True)  # JSON structured data
+    __table_args__ = (
+        Index("ix_persona_event_log_persona_status", "PERSONA_ID", "STATUS"),
+        # City-wide pending scan joins AI after filtering on STATUS
+        Index("ix_persona_event_log_status_persona", "STATUS", "PERSONA_ID"),
+    )
 
 
 class PersonaSchedule(Base):
@@ -247,6 +339,11 @@ class PersonaSchedule(Base):
 
     CREATED_AT = Column(DateTime, server_default=func.now(), nullable=False)
     UPDATED_AT = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    __table_args__ = (
+        # ScheduleManager の有効スケジュール優先度順スキャン用
+        Index("ix_persona_schedule_enabled_priority", "ENABLED", "PRIORITY", "SCHEDULE_ID"),
+        Index("ix_persona_schedule_persona", "PERSONA_ID"),
+    )
 
 
 class PhenomenonRule(Base):
@@ -291,6 +388,11 @@ class LLMUsageLog(Base):
     NODE_TYPE = Column(String(64), nullable=True)  # llm, router, tool_detection, etc.
     PLAYBOOK_NAME = Column(String(255), nullable=True)
     CATEGORY = Column(String(64), nullable=True)  # persona_speak, memory_weave_generate, etc.
+    __table_args__ = (
+        # 期間集計（/api/usage）は TIMESTAMP 範囲 + MODEL_ID/PERSONA_ID で GROUP BY する
+        Index("ix_llm_usage_log_timestamp_model_persona", "TIMESTAMP", "MODEL_ID", "PERSONA_ID"),
+        Index("ix_llm_usage_log_persona_timestamp", "PERSONA_ID", "TIMESTAMP"),
+    )
 
 
 class XReplyLog(Base):
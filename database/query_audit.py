@@ -0,0 +1,193 @@
+"""EXPLAIN QUERY PLAN audit for the hot ORM queries of the manager and API.
+
+Each entry in ``QUERY_CATALOGUE`` mirrors a query issued by the manager
+(polling loops, occupancy, schedules) or the API (usage aggregation). The
+audit compiles them against the SQLite dialect, runs ``EXPLAIN QUERY PLAN``
+and flags plans that fall back to a full-table scan.
+
+Usage:
+    python database/query_audit.py --db ~/.saiverse/user_data/database/saiverse.db
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from database.models import (  # noqa: E402
+    AI,
+    BuildingOccupancyCurrent,
+    BuildingOccupancyLog,
+    LLMUsageLog,
+    PersonaEventLog,
+    PersonaSchedule,
+    ThinkingRequest,
+    VisitingAI,
+)
+from database.paths import default_db_path  # noqa: E402
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _since(days: int = 30) -> datetime:
+    return datetime.now() - timedelta(days=days)
+
+
+# name -> builder(session) returning the ORM query as used in the codebase
+QUERY_CATALOGUE: Dict[str, Callable[[Session], Query]] = {
+    # manager/background.py::_process_thinking_requests
+    "thinking_request.pending_for_city": lambda s: s.query(ThinkingRequest).filter(
+        ThinkingRequest.city_id == 1,
+        ThinkingRequest.status == "pending",
+    ),
+    # manager/background.py::_check_for_visitors
+    "visiting_ai.requested_for_city": lambda s: s.query(VisitingAI).filter(
+        VisitingAI.city_id == 1,
+        VisitingAI.status == "requested",
+    ),
+    # manager/persona_events.py
+    "persona_event_log.pending_for_city": lambda s: (
+        s.query(PersonaEventLog)
+        .join(AI, PersonaEventLog.PERSONA_ID == AI.AIID)
+        .filter(AI.HOME_CITYID == 1, PersonaEventLog.STATUS == "pending")
+    ),
+    # saiverse/schedule_manager.py::_check_and_execute_schedules
+    "persona_schedule.enabled_by_priority": lambda s: (
+        s.query(PersonaSchedule)
+        .filter(PersonaSchedule.ENABLED == True)  # noqa: E712
+        .order_by(PersonaSchedule.PRIORITY.desc(), PersonaSchedule.SCHEDULE_ID.desc())
+    ),
+    # api/routes/people/schedule.py
+    "persona_schedule.for_persona": lambda s: s.query(PersonaSchedule).filter(
+        PersonaSchedule.PERSONA_ID == "persona"
+    ),
+    # api/routes/usage.py::get_usage_summary
+    "llm_usage_log.summary": lambda s: s.query(
+        func.coalesce(func.sum(LLMUsageLog.COST_USD), 0.0),
+        func.count(LLMUsageLog.ID),
+    ).filter(LLMUsageLog.TIMESTAMP >= _since()),
+    # api/routes/usage.py::get_daily_usage
+    "llm_usage_log.daily_by_model": lambda s: (
+        s.query(
+            func.date(LLMUsageLog.TIMESTAMP),
+            LLMUsageLog.MODEL_ID,
+            func.count(LLMUsageLog.ID),
+        )
+        .filter(LLMUsageLog.TIMESTAMP >= _since(), LLMUsageLog.TIMESTAMP < datetime.now())
+        .group_by(func.date(LLMUsageLog.TIMESTAMP), LLMUsageLog.MODEL_ID)
+    ),
+    # api/routes/usage.py::get_usage_summary (persona filter)
+    "llm_usage_log.summary_for_persona": lambda s: s.query(
+        func.count(LLMUsageLog.ID),
+    ).filter(LLMUsageLog.PERSONA_ID == "persona", LLMUsageLog.TIMESTAMP >= _since()),
+    # manager/persona.py::_load_occupancy_from_db
+    "building_occupancy_current.for_city": lambda s: s.query(
+        BuildingOccupancyCurrent
+    ).filter(BuildingOccupancyCurrent.CITYID == 1),
+    # manager/admin.py::delete_building / update_building
+    "building_occupancy_log.current_for_building": lambda s: s.query(
+        BuildingOccupancyLog
+    ).filter_by(BUILDINGID="building", EXIT_TIMESTAMP=None),
+    # saiverse/occupancy_manager.py::move_entity
+    "building_occupancy_log.open_entry_for_ai": lambda s: (
+        s.query(BuildingOccupancyLog)
+        .filter_by(AIID="persona", BUILDINGID="building", EXIT_TIMESTAMP=None)
+        .order_by(BuildingOccupancyLog.ENTRY_TIMESTAMP.desc())
+    ),
+}
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    sql: str
+    plan: List[str] = field(default_factory=list)
+
+    @property
+    def full_scans(self) -> List[str]:
+        """Plan lines that scan a whole table rather than an index."""
+        return [
+            line for line in self.plan
+            if line.startswith("SCAN ") and " USING " not in line
+        ]
+
+
+def _bind_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def explain_query(engine: Engine, name: str, query: Query) -> QueryPlan:
+    """Run ``EXPLAIN QUERY PLAN`` for a single ORM query."""
+    compiled = query.statement.compile(dialect=engine.dialect)
+    params = compiled.construct_params()
+    positional = tuple(_bind_value(params[key]) for key in (compiled.positiontup or []))
+    sql = str(compiled)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", positional).fetchall()
+    # Row layout: (id, parent, notused, detail)
+    return QueryPlan(name=name, sql=sql, plan=[str(row[-1]) for row in rows])
+
+
+def audit_queries(engine: Engine) -> List[QueryPlan]:
+    """Explain every catalogued query against ``engine``."""
+    plans: List[QueryPlan] = []
+    with Session(engine) as session:
+        for name, build in QUERY_CATALOGUE.items():
+            plans.append(explain_query(engine, name, build(session)))
+    return plans
+
+
+def main(argv: List[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="SAIVerse クエリプラン監査ツール")
+    parser.add_argument(
+        "--db",
+        default=None,
+        help="SQLiteデータベースへのパス（省略時は ~/.saiverse/user_data/database/saiverse.db）",
+    )
+    parser.add_argument("--verbose", action="store_true", help="全クエリのプランを表示する")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or str(default_db_path())
+    if not os.path.exists(db_path):
+        logging.error(f"データベースファイルが見つかりません: {db_path}")
+        return 2
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        plans = audit_queries(engine)
+    finally:
+        engine.dispose()
+
+    flagged = 0
+    for plan in plans:
+        scans = plan.full_scans
+        status = "FULL SCAN" if scans else "ok"
+        print(f"[{status}] {plan.name}")
+        if scans or args.verbose:
+            for line in plan.plan:
+                print(f"    {line}")
+        flagged += bool(scans)
+
+    if flagged:
+        print(f"\n{flagged} query(s) fall back to full-table scans. Run database/migrate.py to add missing indexes.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
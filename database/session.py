@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker
 from pathlib import Path
 from .paths import default_db_path
 from .models import Base
+from saiverse.sql_profiler import instrument_engine, sql_profiling_enabled
 
 # Determine Database URL
 # Try to reuse the logic or just point to default path
@@ -31,6 +32,10 @@ def _set_sqlite_pragmas(dbapi_connection, connection_record):
 
 event.listen(engine, "connect", _set_sqlite_pragmas)
 
+# Opt-in statement timing / slow-query log (SAIVERSE_SQL_PROFILE=1)
+if sql_profiling_enabled():
+    instrument_engine(engine, "main")
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
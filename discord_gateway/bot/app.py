@@ -22,7 +22,10 @@ class BotApplication:
     def __init__(self, settings: BotSettings | None = None):
         self.settings = settings or get_settings()
         configure_logging(self.settings.log_level)
-        self.database = BotDatabase(self.settings.database_url)
+        self.database = BotDatabase(
+            self.settings.database_url,
+            owner_cache_ttl=self.settings.owner_cache_ttl_seconds,
+        )
         self.database.migrate()
         self._is_shutting_down = False
 
@@ -56,9 +59,9 @@ class BotApplication:
         self._is_shutting_down = True
         logger.info("Shutting down bot application.")
         await self.websocket_server.stop()
-        if self.discord_client.is_closed():
-            return
-        await self.discord_client.close()
+        if not self.discord_client.is_closed():
+            await self.discord_client.close()
+        self.database.close()
 
     def _install_signal_handlers(self) -> None:
         loop = asyncio.get_running_loop()
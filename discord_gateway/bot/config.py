@@ -28,6 +28,7 @@ class BotSettings(BaseSettings):
     )
 
     database_url: str = Field("sqlite:///./saiverse_bot.db", alias="SAIVERSE_BOT_DATABASE_URL")
+    owner_cache_ttl_seconds: float = Field(60.0, alias="SAIVERSE_OWNER_CACHE_TTL")
 
     oauth_client_id: str = Field(..., alias="DISCORD_OAUTH_CLIENT_ID")
     oauth_client_secret: SecretStr = Field(..., alias="DISCORD_OAUTH_CLIENT_SECRET")
@@ -43,6 +44,7 @@ class BotSettings(BaseSettings):
     max_message_length: int = Field(1800, alias="SAIVERSE_MAX_MESSAGE_LENGTH")
     pending_replay_limit: int = Field(250, alias="SAIVERSE_PENDING_REPLAY_LIMIT", ge=1)
     replay_batch_size: int = Field(50, alias="SAIVERSE_REPLAY_BATCH_SIZE", ge=1)
+    outbox_batch_max: int = Field(50, alias="SAIVERSE_OUTBOX_BATCH_MAX", ge=1)
 
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
         "INFO", alias="SAIVERSE_BOT_LOG_LEVEL"
@@ -89,7 +91,7 @@ class BotSettings(BaseSettings):
             raise ValueError("SAIVERSE_MAX_MESSAGE_LENGTH must be positive")
         return value
 
-    @field_validator("pending_replay_limit", "replay_batch_size")
+    @field_validator("pending_replay_limit", "replay_batch_size", "outbox_batch_max")
     @classmethod
     def _ensure_positive_int(cls, value: int) -> int:
         if value <= 0:
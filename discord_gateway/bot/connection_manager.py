@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 import json
 import logging
 import uuid
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -17,6 +16,10 @@ from .database import AuthenticatedSession, BotDatabase
 
 logger = logging.getLogger(__name__)
 
+# Protocol features negotiated in the hello handshake
+CAPABILITY_EVENT_BATCH = "event_batch"
+SUPPORTED_CAPABILITIES = frozenset({CAPABILITY_EVENT_BATCH})
+
 
 @dataclass(slots=True)
 class ConnectedClient:
@@ -26,13 +29,36 @@ class ConnectedClient:
     session: AuthenticatedSession
     connected_at: datetime = field(default_factory=datetime.utcnow)
     last_heartbeat: datetime = field(default_factory=datetime.utcnow)
+    capabilities: frozenset[str] = frozenset()
+    # (outbox_seq, serialized event) waiting for the in-flight flush to pick them up
+    outbox: list[tuple[int, str]] = field(default_factory=list)
+    flushing: bool = False
+    # outbox_seq values actually written to this connection and not yet acknowledged;
+    # a cumulative ACK only ever covers these
+    delivered: set[int] = field(default_factory=set)
 
     async def send_json(self, payload: dict) -> None:
         await self.websocket.send(json.dumps(payload))
 
+    async def send_events(self, bodies: list[str]) -> None:
+        """Send pre-serialized events, as one ``event_batch`` frame when supported."""
+
+        if len(bodies) > 1 and CAPABILITY_EVENT_BATCH in self.capabilities:
+            await self.websocket.send(
+                '{"type": "event_batch", "payload": {"events": [' + ", ".join(bodies) + "]}}"
+            )
+            return
+        for body in bodies:
+            await self.websocket.send(body)
+
 
 class ConnectionManager:
-    """Tracks and manages `ローカルアプリケーション` WebSocket connections."""
+    """Tracks and manages `ローカルアプリケーション` WebSocket connections.
+
+    Outbound events are written to the ``outbox_events`` table before they are
+    sent and deleted once acknowledged, so a bot restart keeps the backlog.
+    Only counters live in memory; replay pages through the database.
+    """
 
     def __init__(self, settings: BotSettings, database: BotDatabase):
         self._settings = settings
@@ -40,19 +66,29 @@ class ConnectionManager:
         self._connections: dict[str, ConnectedClient] = {}
         self._lock = asyncio.Lock()
 
-        self._pending_events: defaultdict[str, OrderedDict[str, dict]] = defaultdict(OrderedDict)
+        self._pending_counts: dict[str, int] = {}
         self._channel_sequences: defaultdict[str, int] = defaultdict(int)
+        self._outbox_seq = 0
+        self._outbox_loaded = False
         self._resync_needed: set[str] = set()
         self._resync_sent: set[str] = set()
 
     async def authenticate(
-        self, token: str, websocket: WebSocketServerProtocol
+        self,
+        token: str,
+        websocket: WebSocketServerProtocol,
+        *,
+        capabilities: Iterable[str] = (),
     ) -> ConnectedClient | None:
-        session = self._database.authenticate_token(token)
+        session = await self._database.run(self._database.authenticate_token, token)
         if not session:
             return None
 
-        client = ConnectedClient(websocket=websocket, session=session)
+        client = ConnectedClient(
+            websocket=websocket,
+            session=session,
+            capabilities=SUPPORTED_CAPABILITIES.intersection(capabilities),
+        )
         async with self._lock:
             previous = self._connections.get(session.discord_user_id)
             if previous:
@@ -77,7 +113,7 @@ class ConnectionManager:
         )
 
     async def send_to_owner(self, owner_discord_id: str, payload: dict) -> bool:
-        event, client = await self._enqueue_event(owner_discord_id, payload)
+        seq, body, client = await self._enqueue_event(owner_discord_id, payload)
         if not client:
             logger.warning(
                 "No active connection for owner_discord_id=%s. Queued for later dispatch.",
@@ -86,37 +122,99 @@ class ConnectionManager:
             return False
 
         try:
-            await client.send_json(event)
+            await self._flush(client, seq, body)
             await self._maybe_emit_resync(owner_discord_id, client)
             return True
         except Exception:
             logger.exception("Failed to dispatch payload to owner_discord_id=%s", owner_discord_id)
             return False
 
+    async def _flush(self, client: ConnectedClient, seq: int, body: str) -> None:
+        """Queue ``body`` on the client and drain the queue unless a flush is running.
+
+        Events that arrive while a send is in flight are coalesced into the
+        next frame, so a busy channel costs one WebSocket write per batch
+        instead of one per message.
+        """
+
+        client.outbox.append((seq, body))
+        if client.flushing:
+            return
+        client.flushing = True
+        batch_max = self._settings.outbox_batch_max
+        try:
+            while client.outbox:
+                batch = client.outbox[:batch_max]
+                del client.outbox[:batch_max]
+                await client.send_events([item for _, item in batch])
+                client.delivered.update(item_seq for item_seq, _ in batch)
+        except Exception:
+            # Everything is still in the database and will be replayed on reconnect.
+            client.outbox.clear()
+            raise
+        finally:
+            client.flushing = False
+
     async def _enqueue_event(
         self, owner_discord_id: str, payload: dict
-    ) -> tuple[dict, ConnectedClient | None]:
-        event = copy.deepcopy(payload)
-        event_payload = event.setdefault("payload", {})
-        event_id = str(uuid.uuid4())
-        event_payload.setdefault("event_id", event_id)
-
-        channel_id = event_payload.get("channel_id")
-        channel_id_str = str(channel_id) if channel_id is not None else None
-        if channel_id_str:
-            event_payload["channel_id"] = channel_id_str
-            sequence = self._next_channel_sequence(channel_id_str)
-            event_payload.setdefault("channel_seq", sequence)
+    ) -> tuple[int, str, ConnectedClient | None]:
+        event = dict(payload)
+        event_payload = dict(event.get("payload") or {})
+        event["payload"] = event_payload
+        event_payload.setdefault("event_id", str(uuid.uuid4()))
 
         async with self._lock:
-            pending = self._pending_events[owner_discord_id]
-            pending[event_id] = event
-            pending_length = len(pending)
-            if pending_length > max(1, self._settings.pending_replay_limit):
+            await self._load_outbox_state()
+            channel_id = event_payload.get("channel_id")
+            if channel_id is not None:
+                channel_id_str = str(channel_id)
+                event_payload["channel_id"] = channel_id_str
+                event_payload.setdefault("channel_seq", self._next_channel_sequence(channel_id_str))
+            seq, body = await self._persist_locked(owner_discord_id, event)
+            if self._pending_counts[owner_discord_id] > max(1, self._settings.pending_replay_limit):
                 self._resync_needed.add(owner_discord_id)
             client = self._connections.get(owner_discord_id)
 
-        return event, client
+        return seq, body, client
+
+    async def _load_outbox_state(self) -> None:
+        """Restore sequence counters from the outbox once (caller holds the lock)."""
+
+        if self._outbox_loaded:
+            return
+        self._outbox_seq = await self._database.run(self._database.max_outbox_seq)
+        channel_sequences = await self._database.run(self._database.outbox_channel_sequences)
+        for channel_id, seq in channel_sequences.items():
+            self._channel_sequences[channel_id] = max(self._channel_sequences[channel_id], seq)
+        self._outbox_loaded = True
+
+    async def _persist_locked(self, owner_discord_id: str, event: dict) -> tuple[int, str]:
+        """Assign ``outbox_seq``, serialize once and write the event to the outbox."""
+
+        event_payload = event["payload"]
+        pending = await self._pending_total(owner_discord_id)
+        self._outbox_seq += 1
+        event_payload["outbox_seq"] = self._outbox_seq
+        body = json.dumps(event)
+        channel_id = event_payload.get("channel_id")
+        await self._database.run(
+            self._database.enqueue_outbox_event,
+            owner_discord_id,
+            self._outbox_seq,
+            str(event_payload["event_id"]),
+            body,
+            channel_id=str(channel_id) if channel_id is not None else None,
+            channel_seq=event_payload.get("channel_seq"),
+        )
+        self._pending_counts[owner_discord_id] = pending + 1
+        return self._outbox_seq, body
+
+    async def _pending_total(self, owner_discord_id: str) -> int:
+        count = self._pending_counts.get(owner_discord_id)
+        if count is None:
+            count = await self._database.run(self._database.count_outbox_events, owner_discord_id)
+            self._pending_counts[owner_discord_id] = count
+        return count
 
     def _next_channel_sequence(self, channel_id: str) -> int:
         self._channel_sequences[channel_id] += 1
@@ -126,73 +224,104 @@ class ConnectionManager:
         async with self._lock:
             if owner_discord_id not in self._resync_needed or owner_discord_id in self._resync_sent:
                 return
-            event_id = str(uuid.uuid4())
             event = {
                 "type": "resync_required",
                 "payload": {
-                    "event_id": event_id,
+                    "event_id": str(uuid.uuid4()),
                     "reason": "pending_backlog",
                 },
             }
-            pending = self._pending_events[owner_discord_id]
-            pending[event_id] = event
+            seq, body = await self._persist_locked(owner_discord_id, event)
             self._resync_sent.add(owner_discord_id)
 
         try:
-            await client.send_json(event)
+            await self._flush(client, seq, body)
         except Exception:
             logger.exception(
                 "Failed to notify owner_discord_id=%s about resync requirement.",
                 owner_discord_id,
             )
 
-    async def process_ack(self, owner_discord_id: str, event_ids: Iterable[str]) -> None:
+    async def process_ack(
+        self,
+        owner_discord_id: str,
+        event_ids: Iterable[str] | None,
+        *,
+        through_seq: int | None = None,
+    ) -> None:
+        """Drop acknowledged events.
+
+        ``event_ids`` acknowledges individual events; ``through_seq`` is a
+        cumulative ACK, honoured only for events with ``outbox_seq <= through_seq``
+        that were actually written to the owner's current connection. Backlog
+        the client has not been sent yet (a replay still in progress, or a
+        batch dropped by a failed send) therefore stays in the outbox.
+        """
+
         event_ids = list(event_ids or [])
-        if not event_ids:
+        if not event_ids and through_seq is None:
             return
 
         async with self._lock:
-            pending = self._pending_events.get(owner_discord_id)
-            if not pending:
+            if not await self._pending_total(owner_discord_id):
                 return
-
-            for event_id in event_ids:
-                event = pending.pop(str(event_id), None)
-                if not event:
-                    continue
-                if event.get("type") == "resync_required":
-                    # keep resync flags until client explicitly requests sync
-                    pass
-
-            if not pending:
-                self._resync_needed.discard(owner_discord_id)
-                self._resync_sent.discard(owner_discord_id)
-            elif len(pending) <= self._settings.pending_replay_limit:
+            seqs: list[int] = []
+            client = self._connections.get(owner_discord_id)
+            if through_seq is not None and client is not None:
+                seqs = sorted(seq for seq in client.delivered if seq <= through_seq)
+                client.delivered.difference_update(seqs)
+            if not event_ids and not seqs:
+                return
+            removed = await self._database.run(
+                self._database.delete_outbox_events,
+                owner_discord_id,
+                event_ids=event_ids,
+                seqs=seqs,
+            )
+            if client is not None:
+                # event_id で ACK された分も送信済み集合から外す
+                client.delivered.difference_update(removed)
+            # resync_required が ACK されても、state_sync_request までフラグは維持する
+            remaining = max(0, self._pending_counts[owner_discord_id] - len(removed))
+            self._pending_counts[owner_discord_id] = remaining
+            if not remaining and client is not None:
+                client.delivered.clear()
+            if remaining <= self._settings.pending_replay_limit:
                 self._resync_needed.discard(owner_discord_id)
                 self._resync_sent.discard(owner_discord_id)
 
     async def replay_pending(self, client: ConnectedClient, *, full: bool = False) -> int:
-        owner_id = client.session.discord_user_id
-        async with self._lock:
-            events = list(self._pending_events.get(owner_id, {}).values())
-        if not events:
-            return 0
-
-        batch_size = None if full else self._settings.replay_batch_size
-        if batch_size is not None and batch_size > 0:
-            events = events[:batch_size]
+        """Resend unacknowledged events, paging through the outbox in sequence order."""
 
+        owner_id = client.session.discord_user_id
+        page_size = self._settings.replay_batch_size
+        after_seq = 0
         sent = 0
-        for event in events:
+        while True:
+            async with self._lock:
+                records = await self._database.run(
+                    self._database.load_outbox_events,
+                    owner_id,
+                    after_seq=after_seq,
+                    limit=page_size,
+                )
+            if not records:
+                break
             try:
-                await client.send_json(event)
-                sent += 1
+                for start in range(0, len(records), self._settings.outbox_batch_max):
+                    chunk = records[start : start + self._settings.outbox_batch_max]
+                    await client.send_events([record.body for record in chunk])
+                    client.delivered.update(record.seq for record in chunk)
+                    sent += len(chunk)
             except Exception:
                 logger.exception(
                     "Failed during replay dispatch to owner_discord_id=%s",
                     owner_id,
                 )
                 break
+            after_seq = records[-1].seq
+            if not full or len(records) < page_size:
+                break
         return sent
 
     async def handle_state_sync_request(self, client: ConnectedClient) -> None:
@@ -215,4 +344,4 @@ class ConnectionManager:
 
     async def pending_count(self, owner_discord_id: str) -> int:
         async with self._lock:
-            return len(self._pending_events.get(owner_discord_id, {}))
+            return await self._pending_total(owner_discord_id)
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
-from collections.abc import Iterable
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from sqlalchemy import (
     Column,
@@ -14,15 +19,21 @@ from sqlalchemy import (
     Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
     and_,
     create_engine,
+    delete,
+    func,
     or_,
     select,
+    text,
 )
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+T = TypeVar("T")
+
 
 class Base(DeclarativeBase):
     pass
@@ -82,6 +93,31 @@ class LocalAppSession(Base):
     created_by_state_id: int | None = Column(Integer, ForeignKey("oauth_states.id"), nullable=True)
 
 
+class OutboxEvent(Base):
+    """Event queued for a local app until it is acknowledged.
+
+    ``id`` doubles as the outbox sequence number. It is allocated by the
+    ConnectionManager; AUTOINCREMENT makes SQLite remember the highest value
+    even after the newest rows are deleted, so numbering never goes backwards
+    across restarts, which is what cumulative ACKs (``through_seq``) rely on.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        UniqueConstraint("event_id", name="uq_outbox_events_event_id"),
+        Index("ix_outbox_events_owner_seq", "owner_discord_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: int = Column(Integer, primary_key=True)
+    owner_discord_id: str = Column(String(32), nullable=False)
+    event_id: str = Column(String(64), nullable=False)
+    channel_id: str | None = Column(String(32), nullable=True)
+    channel_seq: int | None = Column(Integer, nullable=True)
+    body: str = Column(Text, nullable=False)
+    created_at: datetime = Column(DateTime, default=utcnow, nullable=False)
+
+
 def hash_token(raw_token: str) -> str:
     """Return a deterministic hash for secure token storage."""
 
@@ -111,6 +147,13 @@ class AuthenticatedSession:
         return self.expires_at >= now
 
 
+@dataclass(slots=True)
+class OutboxRecord:
+    seq: int
+    event_id: str
+    body: str
+
+
 @dataclass(slots=True)
 class IssuedToken:
     token: str
@@ -120,9 +163,21 @@ class IssuedToken:
 
 
 class BotDatabase:
-    """Thin wrapper around SQLAlchemy primitives tailored for the bot service."""
+    """Thin wrapper around SQLAlchemy primitives tailored for the bot service.
+
+    Methods are synchronous. Coroutines should go through :meth:`run`, which
+    offloads the call to a dedicated worker thread so a DB round trip never
+    stalls the gateway event loop. Channel→owner lookups are additionally
+    served from an in-memory cache that bind/unbind invalidate.
+    """
 
-    def __init__(self, database_url: str, *, engine_options: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        engine_options: dict[str, Any] | None = None,
+        owner_cache_ttl: float = 60.0,
+    ):
         options: dict[str, Any] = {"future": True}
         if engine_options:
             options.update(engine_options)
@@ -131,6 +186,35 @@ class BotDatabase:
             bind=self._engine, expire_on_commit=False, class_=Session, future=True
         )
 
+        # channel_id -> (owner or None, cached_at). None も記録して未登録チャンネルの連投を吸収する
+        self._owner_cache: dict[str, tuple[str | None, float]] = {}
+        self._owner_cache_ttl = owner_cache_ttl
+        self._owner_cache_lock = threading.Lock()
+
+        is_sqlite = self._engine.dialect.name == "sqlite"
+        in_memory = is_sqlite and self._engine.url.database in (None, "", ":memory:")
+        # In-memory SQLite is bound to the creating thread, so it stays inline.
+        # File SQLite gets one worker to serialize writers; other backends a few.
+        self._executor: ThreadPoolExecutor | None = None
+        if not in_memory:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1 if is_sqlite else 4, thread_name_prefix="bot-db"
+            )
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run a blocking database call off the event loop."""
+
+        if self._executor is None:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._engine.dispose()
+
     def migrate(self) -> None:
         """Create tables if they do not exist yet."""
 
@@ -148,16 +232,79 @@ class BotDatabase:
         finally:
             session.close()
 
+    def cached_city_owner(self, channel_id: int | str) -> tuple[bool, str | None]:
+        """Return ``(hit, owner)`` from the owner cache without touching the database."""
+
+        if self._owner_cache_ttl <= 0:
+            return False, None
+        with self._owner_cache_lock:
+            entry = self._owner_cache.get(str(channel_id))
+        if entry is None or time.monotonic() - entry[1] > self._owner_cache_ttl:
+            return False, None
+        return True, entry[0]
+
     def find_city_owner(self, channel_id: int | str) -> str | None:
         """Return the owner Discord user ID for a given channel, if any."""
 
+        hit, owner = self.cached_city_owner(channel_id)
+        if hit:
+            return owner
         channel_str = str(channel_id)
         with self.session() as session:
             binding = session.execute(
                 select(CityBinding.owner_user_id).where(CityBinding.channel_id == channel_str)
             ).scalar_one_or_none()
+        if self._owner_cache_ttl > 0:
+            with self._owner_cache_lock:
+                self._owner_cache[channel_str] = (binding, time.monotonic())
         return binding
 
+    async def afind_city_owner(self, channel_id: int | str) -> str | None:
+        """Async variant: cache hits return immediately, misses go to the worker thread."""
+
+        hit, owner = self.cached_city_owner(channel_id)
+        if hit:
+            return owner
+        return await self.run(self.find_city_owner, channel_id)
+
+    def invalidate_city_owner(self, channel_id: int | str | None = None) -> None:
+        with self._owner_cache_lock:
+            if channel_id is None:
+                self._owner_cache.clear()
+            else:
+                self._owner_cache.pop(str(channel_id), None)
+
+    def bind_city_channel(self, *, guild_id: int | str, channel_id: int | str, owner_user_id: str) -> None:
+        """Create or update the binding of a channel to its City owner."""
+
+        channel_str = str(channel_id)
+        with self.session() as session:
+            record = session.execute(
+                select(CityBinding).where(CityBinding.channel_id == channel_str)
+            ).scalar_one_or_none()
+            if record:
+                record.guild_id = str(guild_id)
+                record.owner_user_id = str(owner_user_id)
+            else:
+                session.add(
+                    CityBinding(
+                        guild_id=str(guild_id),
+                        channel_id=channel_str,
+                        owner_user_id=str(owner_user_id),
+                    )
+                )
+        self.invalidate_city_owner(channel_str)
+
+    def unbind_city_channel(self, channel_id: int | str) -> bool:
+        channel_str = str(channel_id)
+        with self.session() as session:
+            result = session.execute(
+                delete(CityBinding).where(CityBinding.channel_id == channel_str)
+            )
+            removed = bool(result.rowcount)
+        self.invalidate_city_owner(channel_str)
+        return removed
+
     def create_oauth_state(self, state: str, redirect_uri: str, ttl: timedelta) -> OAuthStateRecord:
         expires_at = utcnow() + ttl
         with self.session() as session:
@@ -299,3 +446,107 @@ class BotDatabase:
                 label=record.label,
                 expires_at=record.expires_at,
             )
+
+    def enqueue_outbox_event(
+        self,
+        owner_discord_id: str,
+        seq: int,
+        event_id: str,
+        body: str,
+        *,
+        channel_id: str | None = None,
+        channel_seq: int | None = None,
+    ) -> None:
+        """Persist a serialized event under a caller-allocated sequence number."""
+
+        with self.session() as session:
+            session.add(
+                OutboxEvent(
+                    id=seq,
+                    owner_discord_id=owner_discord_id,
+                    event_id=event_id,
+                    channel_id=channel_id,
+                    channel_seq=channel_seq,
+                    body=body,
+                )
+            )
+
+    def load_outbox_events(
+        self, owner_discord_id: str, *, after_seq: int = 0, limit: int | None = None
+    ) -> list[OutboxRecord]:
+        """Return pending events for an owner in sequence order."""
+
+        query = (
+            select(OutboxEvent.id, OutboxEvent.event_id, OutboxEvent.body)
+            .where(OutboxEvent.owner_discord_id == owner_discord_id, OutboxEvent.id > after_seq)
+            .order_by(OutboxEvent.id)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        with self.session() as session:
+            rows = session.execute(query).all()
+        return [OutboxRecord(seq=row[0], event_id=row[1], body=row[2]) for row in rows]
+
+    def delete_outbox_events(
+        self,
+        owner_discord_id: str,
+        *,
+        event_ids: Iterable[str] = (),
+        seqs: Iterable[int] = (),
+    ) -> list[int]:
+        """Drop acknowledged events by event id and/or outbox sequence number.
+
+        Returns the outbox sequence numbers of the rows actually deleted.
+        """
+
+        event_ids = [str(event_id) for event_id in event_ids]
+        seqs = [int(seq) for seq in seqs]
+        conditions = []
+        if event_ids:
+            conditions.append(OutboxEvent.event_id.in_(event_ids))
+        if seqs:
+            conditions.append(OutboxEvent.id.in_(seqs))
+        if not conditions:
+            return []
+        with self.session() as session:
+            deleted = list(
+                session.execute(
+                    select(OutboxEvent.id).where(
+                        OutboxEvent.owner_discord_id == owner_discord_id, or_(*conditions)
+                    )
+                ).scalars()
+            )
+            if deleted:
+                session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(deleted)))
+            return deleted
+
+    def count_outbox_events(self, owner_discord_id: str) -> int:
+        with self.session() as session:
+            return session.execute(
+                select(func.count())
+                .select_from(OutboxEvent)
+                .where(OutboxEvent.owner_discord_id == owner_discord_id)
+            ).scalar_one()
+
+    def max_outbox_seq(self) -> int:
+        """Highest sequence ever allocated (including already-deleted rows)."""
+
+        with self.session() as session:
+            current = session.execute(select(func.max(OutboxEvent.id))).scalar_one()
+            if self._engine.dialect.name == "sqlite":
+                allocated = session.execute(
+                    text("SELECT seq FROM sqlite_sequence WHERE name = 'outbox_events'")
+                ).scalar_one_or_none()
+                current = max(current or 0, allocated or 0)
+        return int(current or 0)
+
+    def outbox_channel_sequences(self) -> dict[str, int]:
+        """Highest queued ``channel_seq`` per channel, so numbering survives restarts."""
+
+        with self.session() as session:
+            rows = session.execute(
+                select(OutboxEvent.channel_id, func.max(OutboxEvent.channel_seq))
+                .where(OutboxEvent.channel_id.isnot(None))
+                .group_by(OutboxEvent.channel_id)
+            ).all()
+        return {channel_id: int(seq) for channel_id, seq in rows if seq is not None}
@@ -95,7 +95,7 @@ class SAIVerseDiscordClient(commands.Bot):
             await ctx.send("This command must be used in a server text channel.")
             return
 
-        owner_id = self.router.get_owner_id(target_channel.id)
+        owner_id = await self.router.resolve_owner_id(target_channel.id)
         if not owner_id:
             await ctx.send("This channel is not linked to a SAIVerse City.")
             return
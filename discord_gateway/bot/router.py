@@ -30,7 +30,7 @@ class MessageRouter:
         if message.author.bot:
             return
 
-        owner_id = self.get_owner_id(message.channel.id)
+        owner_id = await self.resolve_owner_id(message.channel.id)
         if not owner_id:
             logger.debug(
                 "No city binding found for channel_id=%s. Ignoring message.",
@@ -67,8 +67,15 @@ class MessageRouter:
             )
 
     def get_owner_id(self, channel_id: int | str) -> str | None:
+        """Synchronous lookup (served from the owner cache after the first call)."""
+
         return self.database.find_city_owner(channel_id)
 
+    async def resolve_owner_id(self, channel_id: int | str) -> str | None:
+        """Event-loop friendly lookup; cache misses are offloaded to the DB worker."""
+
+        return await self.database.afind_city_owner(channel_id)
+
     def attach_discord_client(self, client: SAIVerseDiscordClient) -> None:
         self.discord_client = client
 
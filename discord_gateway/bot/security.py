@@ -10,6 +10,8 @@ class HandshakePayload(BaseModel):
 
     type: Literal["hello"]
     token: str = Field(min_length=8, max_length=512)
+    # Optional protocol features the client understands (e.g. "event_batch")
+    capabilities: list[str] = Field(default_factory=list, max_length=16)
 
     class Config:
         extra = "forbid"
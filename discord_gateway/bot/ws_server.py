@@ -101,7 +101,9 @@ class GatewayWebSocketServer:
                 await websocket.close(code=4000, reason="Invalid handshake payload")
                 return
 
-            client = await self._connections.authenticate(handshake.token, websocket)
+            client = await self._connections.authenticate(
+                handshake.token, websocket, capabilities=handshake.capabilities
+            )
             if not client:
                 await websocket.close(code=4003, reason="Invalid token")
                 return
@@ -112,6 +114,7 @@ class GatewayWebSocketServer:
                         "type": "hello_ack",
                         "status": "ok",
                         "session_id": client.session.session_id,
+                        "capabilities": sorted(client.capabilities),
                     }
                 )
             )
@@ -155,8 +158,13 @@ class GatewayWebSocketServer:
                     single = payload.get("event_id")
                     if single:
                         event_ids = [single]
-                if event_ids:
-                    await self._connections.process_ack(client.session.discord_user_id, event_ids)
+                through_seq = payload.get("through_seq")
+                if not isinstance(through_seq, int) or isinstance(through_seq, bool):
+                    through_seq = None
+                if event_ids or through_seq is not None:
+                    await self._connections.process_ack(
+                        client.session.discord_user_id, event_ids, through_seq=through_seq
+                    )
             elif event_type == "state_sync_request":
                 await self._connections.handle_state_sync_request(client)
                 await websocket.send(
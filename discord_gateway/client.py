@@ -12,6 +12,9 @@ from .config import GatewaySettings
 
 logger = logging.getLogger(__name__)
 
+# hello で Bot に通知する対応機能（event_batch: 複数イベントを1フレームで受信可能）
+CLIENT_CAPABILITIES = ("event_batch",)
+
 
 class GatewayClientError(RuntimeError):
     """Gatewayクライアントの致命的なエラー。"""
@@ -51,7 +54,11 @@ class WebSocketGatewayClient:
         if self._ws is None:
             raise GatewayClientError("WebSocket is not connected")
 
-        handshake_payload = {"type": "hello", "token": token}
+        handshake_payload = {
+            "type": "hello",
+            "token": token,
+            "capabilities": list(CLIENT_CAPABILITIES),
+        }
         await self.send_json(handshake_payload)
 
         try:
@@ -110,8 +110,8 @@ class DiscordGatewayService:
     async def _receiver_loop(self, client: WebSocketGatewayClient) -> None:
         while not self._stop_event.is_set():
             message = await client.recv_json()
-            event = self.translator.decode_event(message)
-            await self.incoming_queue.put(event)
+            for event in self.translator.decode_events(message):
+                await self.incoming_queue.put(event)
 
     async def _sender_loop(self, client: WebSocketGatewayClient) -> None:
         while not self._stop_event.is_set():
@@ -119,8 +119,28 @@ class DiscordGatewayService:
                 command = await asyncio.wait_for(self.outgoing_queue.get(), timeout=0.5)
             except TimeoutError:
                 continue
-            payload = self.translator.encode_command(command)
-            await client.send_json(payload)
+            follow_up: GatewayCommand | None = None
+            if command.type == "ack":
+                command, follow_up = self._coalesce_acks(command)
+            await client.send_json(self.translator.encode_command(command))
+            if follow_up is not None:
+                await client.send_json(self.translator.encode_command(follow_up))
+
+    def _coalesce_acks(self, first: GatewayCommand) -> tuple[GatewayCommand, GatewayCommand | None]:
+        """キューに溜まっている後続の ack をまとめて1フレームにする。
+
+        ack 以外のコマンドに当たったらそこで止め、順序を保つため直後に送る。
+        """
+
+        acks = [first]
+        follow_up: GatewayCommand | None = None
+        while not self.outgoing_queue.empty():
+            command = self.outgoing_queue.get_nowait()
+            if command.type != "ack":
+                follow_up = command
+                break
+            acks.append(command)
+        return self.translator.merge_acks(acks), follow_up
 
     async def _sleep_with_backoff(self, delay: float) -> None:
         jitter = delay * self.settings.reconnect_jitter
@@ -0,0 +1,386 @@
+"""記憶同期（memory_sync）のストリーミング転送プロトコル v2。
+
+送信側 (:class:`OutgoingMemoryTransfer`) はペイロードを逐次 JSON 化・圧縮して
+チャンクに切り出し、未ACKのチャンクを ``window`` 個までしか送らない。
+受信側 (:class:`MemorySpool`) は検証済みチャンクをディスクへ追記し、
+プロセスが再起動しても最後に ACK したチャンクから再開できる。
+
+v1（``chunk_index`` なし・非圧縮・全チャンク一括送信）の送信元からの受信も
+``MemorySpool.append`` で引き続き扱える。
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:  # optional: zstd は zlib より速く・よく縮む
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+PROTOCOL_VERSION = 2
+ENCODING_IDENTITY = "identity"
+ENCODING_ZLIB = "zlib"
+ENCODING_ZSTD = "zstd"
+
+_STATE_FILE = "state.json"
+_DATA_FILE = "data.part"
+_COPY_BLOCK = 1024 * 1024
+
+
+class MemoryTransferError(ValueError):
+    """Raised when a chunk or the finished stream fails verification."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def available_encodings() -> list[str]:
+    encodings = [ENCODING_IDENTITY, ENCODING_ZLIB]
+    if zstandard is not None:
+        encodings.append(ENCODING_ZSTD)
+    return encodings
+
+
+def default_encoding() -> str:
+    """``SAIVERSE_GATEWAY_MEMORY_ENCODING`` (default: zstd when installed, else zlib)."""
+
+    requested = os.getenv("SAIVERSE_GATEWAY_MEMORY_ENCODING", "").strip().lower()
+    if requested in available_encodings():
+        return requested
+    return ENCODING_ZSTD if zstandard is not None else ENCODING_ZLIB
+
+
+class _Identity:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    decompress = compress
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _compressor(encoding: str):
+    if encoding == ENCODING_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    if encoding == ENCODING_ZLIB:
+        return zlib.compressobj(6)
+    if encoding == ENCODING_IDENTITY:
+        return _Identity()
+    raise MemoryTransferError("unsupported_encoding")
+
+
+def _iter_decompressed(src: BinaryIO, encoding: str) -> Iterator[bytes]:
+    """Decompress ``src`` in blocks of at most ``_COPY_BLOCK`` bytes each."""
+
+    if encoding == ENCODING_ZSTD and zstandard is not None:
+        with zstandard.ZstdDecompressor().stream_reader(src, closefd=False) as reader:
+            while block := reader.read(_COPY_BLOCK):
+                yield block
+        return
+    if encoding == ENCODING_ZLIB:
+        decompressor = zlib.decompressobj()
+        while data := src.read(_COPY_BLOCK):
+            # max_length で出力を区切り、残りは unconsumed_tail から続ける
+            while data:
+                block = decompressor.decompress(data, _COPY_BLOCK)
+                if block:
+                    yield block
+                data = decompressor.unconsumed_tail
+            if decompressor.eof:
+                break
+        if tail := decompressor.flush():
+            yield tail
+        return
+    if encoding == ENCODING_IDENTITY:
+        while block := src.read(_COPY_BLOCK):
+            yield block
+        return
+    raise MemoryTransferError("unsupported_encoding")
+
+
+def iter_json_document(header: dict[str, Any], list_key: str, items: Iterable[Any]) -> Iterator[bytes]:
+    """Yield ``{**header, list_key: [*items]}`` as UTF-8 JSON without building it in memory."""
+
+    head = json.dumps(header, ensure_ascii=False)[:-1]
+    separator = ", " if header else ""
+    yield f"{head}{separator}{json.dumps(list_key)}: [".encode()
+    for index, item in enumerate(items):
+        prefix = ", " if index else ""
+        yield (prefix + json.dumps(item, ensure_ascii=False)).encode("utf-8")
+    yield b"]}"
+
+
+class OutgoingMemoryTransfer:
+    """Sender side: lazily encodes, compresses and chunks a byte stream.
+
+    Chunks are produced only when the window has room, so at most
+    ``window`` chunks (the unacknowledged ones) are held in memory. They are
+    kept until acknowledged so a resume can retransmit from the receiver's
+    ``next_index``.
+    """
+
+    def __init__(
+        self,
+        transfer_id: str,
+        source: Iterable[bytes],
+        *,
+        encoding: str,
+        chunk_size: int,
+        window: int,
+    ):
+        self.transfer_id = transfer_id
+        self.encoding = encoding
+        self.chunk_size = max(1024, chunk_size)
+        self.window = max(1, window)
+        self._source = iter(source)
+        self._compressor = _compressor(encoding)
+        self._pending = bytearray()
+        self._exhausted = False
+        self._inflight: OrderedDict[int, bytes] = OrderedDict()
+        self._digest = hashlib.sha256()
+        self._generated = 0
+        self._send_from = 0
+        self.acked = 0
+        self.total_size = 0
+
+    def _produce(self) -> bytes | None:
+        while len(self._pending) < self.chunk_size and not self._exhausted:
+            piece = next(self._source, None)
+            if piece is None:
+                self._exhausted = True
+                self._pending += self._compressor.flush()
+            else:
+                self._pending += self._compressor.compress(piece)
+        if not self._pending:
+            return None
+        chunk = bytes(self._pending[: self.chunk_size])
+        del self._pending[: self.chunk_size]
+        self._digest.update(chunk)
+        self.total_size += len(chunk)
+        self._generated += 1
+        return chunk
+
+    def sendable(self) -> list[tuple[int, bytes]]:
+        """Chunks that may be sent now without exceeding the window."""
+
+        ready: list[tuple[int, bytes]] = []
+        while self._send_from < self.acked + self.window:
+            chunk = self._inflight.get(self._send_from)
+            if chunk is None:
+                if self._send_from < self._generated:
+                    break  # 既に ACK 済みで破棄したチャンク（起こらないはず）
+                chunk = self._produce()
+                if chunk is None:
+                    break
+                self._inflight[self._send_from] = chunk
+            ready.append((self._send_from, chunk))
+            self._send_from += 1
+        return ready
+
+    def acknowledge(self, next_index: int) -> None:
+        """Cumulative ACK: the receiver holds every chunk below ``next_index``."""
+
+        next_index = min(max(0, next_index), self._generated)
+        while self._inflight and next(iter(self._inflight)) < next_index:
+            self._inflight.popitem(last=False)
+        self.acked = max(self.acked, next_index)
+        self._send_from = max(self._send_from, self.acked)
+
+    def rewind(self, next_index: int) -> None:
+        """Resume: retransmit everything from the receiver's ``next_index``."""
+
+        self.acknowledge(next_index)
+        self._send_from = self.acked
+
+    @property
+    def finished(self) -> bool:
+        return self._exhausted and not self._pending and self.acked >= self._generated
+
+    def chunk_payload(self, index: int, chunk: bytes) -> dict[str, Any]:
+        return {
+            "transfer_id": self.transfer_id,
+            "chunk_index": index,
+            "data": base64.b64encode(chunk).decode("ascii"),
+            "chunk_sha256": hashlib.sha256(chunk).hexdigest(),
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "transfer_id": self.transfer_id,
+            "total_size": self.total_size,
+            "total_chunks": self._generated,
+            "checksum": self._digest.hexdigest(),
+        }
+
+
+class MemorySpool:
+    """Receiver side: verified chunks are appended to ``data.part`` on disk.
+
+    ``state.json`` records the transfer metadata and how many chunks/bytes
+    are durable, so a re-sent initiate for the same transfer resumes from
+    ``next_index`` instead of starting over.
+    """
+
+    def __init__(self, directory: Path, meta: dict[str, Any]):
+        self.directory = directory
+        self.meta = meta
+        self.next_index = 0
+        self.size = 0
+        self._digest = hashlib.sha256()
+
+    @classmethod
+    def open(cls, root: Path, transfer_id: str, meta: dict[str, Any]) -> tuple[MemorySpool, bool]:
+        """Open (or resume) the spool for ``transfer_id``. Returns ``(spool, resumed)``."""
+
+        directory = Path(root) / re.sub(r"[^A-Za-z0-9._-]", "_", transfer_id)
+        spool = cls(directory, meta)
+        state_path = directory / _STATE_FILE
+        if state_path.exists():
+            try:
+                state = json.loads(state_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                state = {}
+            if state.get("meta") == meta:
+                spool._restore(int(state.get("next_index", 0)), int(state.get("size", 0)))
+                return spool, True
+        shutil.rmtree(directory, ignore_errors=True)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / _DATA_FILE).touch()
+        spool._save_state()
+        return spool, False
+
+    @staticmethod
+    def sweep(root: Path, max_age: float) -> int:
+        """Delete spools under ``root`` untouched for ``max_age`` seconds. Returns the count."""
+
+        root = Path(root)
+        if not root.is_dir():
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        for directory in root.iterdir():
+            if not directory.is_dir():
+                continue
+            state_path = directory / _STATE_FILE
+            try:
+                touched = (state_path if state_path.exists() else directory).stat().st_mtime
+            except OSError:
+                continue
+            if touched < cutoff:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _restore(self, next_index: int, size: int) -> None:
+        data_path = self.directory / _DATA_FILE
+        with open(data_path, "r+b") as handle:
+            handle.truncate(size)  # 状態保存前に書かれた端数を捨てる
+            handle.seek(0)
+            while block := handle.read(_COPY_BLOCK):
+                self._digest.update(block)
+        self.next_index = next_index
+        self.size = size
+
+    def _save_state(self) -> None:
+        state = {"meta": self.meta, "next_index": self.next_index, "size": self.size}
+        tmp = self.directory / (_STATE_FILE + ".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.directory / _STATE_FILE)
+
+    def append(
+        self,
+        data: bytes,
+        *,
+        index: int | None = None,
+        chunk_sha256: str | None = None,
+        max_size: int | None = None,
+    ) -> bool:
+        """Append one chunk. Returns False for an already-stored duplicate.
+
+        Raises :class:`MemoryTransferError` on a gap, bad checksum or overflow.
+        """
+
+        if index is not None:
+            if index < self.next_index:
+                return False
+            if index > self.next_index:
+                raise MemoryTransferError("out_of_order")
+        if chunk_sha256 and hashlib.sha256(data).hexdigest() != chunk_sha256:
+            raise MemoryTransferError("chunk_checksum_mismatch")
+        if max_size is not None and self.size + len(data) > max_size:
+            raise MemoryTransferError("overflow")
+        with open(self.directory / _DATA_FILE, "ab") as handle:
+            handle.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+        self.next_index += 1
+        self._save_state()
+        return True
+
+    def finalize(
+        self, target: Path, *, encoding: str, checksum: str, max_output: int | None = None
+    ) -> None:
+        """Verify the whole stream and decompress it into ``target``.
+
+        Raises ``overflow`` once more than ``max_output`` bytes come out, so a
+        small, highly compressed stream cannot fill the disk.
+        """
+
+        if self._digest.hexdigest() != checksum:
+            raise MemoryTransferError("checksum_mismatch")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        written = 0
+        try:
+            with open(self.directory / _DATA_FILE, "rb") as src, open(tmp, "wb") as dst:
+                for block in _iter_decompressed(src, encoding):
+                    written += len(block)
+                    if max_output is not None and written > max_output:
+                        raise MemoryTransferError("overflow")
+                    dst.write(block)
+        except MemoryTransferError as exc:
+            tmp.unlink(missing_ok=True)
+            if exc.reason in {"overflow", "unsupported_encoding"}:
+                raise
+            raise MemoryTransferError("decode_error") from exc
+        except zlib.error as exc:
+            tmp.unlink(missing_ok=True)
+            raise MemoryTransferError("decode_error") from exc
+        except Exception as exc:
+            if zstandard is not None and isinstance(exc, zstandard.ZstdError):
+                tmp.unlink(missing_ok=True)
+                raise MemoryTransferError("decode_error") from exc
+            raise
+        os.replace(tmp, target)
+        self.discard()
+
+    def discard(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+__all__ = [
+    "ENCODING_IDENTITY",
+    "ENCODING_ZLIB",
+    "ENCODING_ZSTD",
+    "MemorySpool",
+    "MemoryTransferError",
+    "OutgoingMemoryTransfer",
+    "PROTOCOL_VERSION",
+    "available_encodings",
+    "default_encoding",
+    "iter_json_document",
+]
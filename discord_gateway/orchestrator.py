@@ -6,6 +6,7 @@ from abc import ABC, abstractmethod
 from collections import deque
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from typing import Any
 
 from .gateway_service import DiscordGatewayService
 from .mapping import ChannelContext, ChannelMapping
@@ -21,6 +22,10 @@ class MemorySyncHandshakeResult:
     accepted: bool
     reason: str | None = None
     commands: Sequence[GatewayCommand] | None = None
+    # 再開時: 受信済みチャンク数（送信側はここから再送する）
+    resume_from: int | None = None
+    # 受信側が対応する最大プロトコルバージョン（送信側は ack を見て v1 に落とすか決める）
+    version: int | None = None
 
 
 @dataclass(slots=True)
@@ -73,6 +78,10 @@ class GatewayHostAdapter(ABC):
         """記憶同期完了時の処理。"""
         return MemorySyncCompletionResult(success=True)
 
+    async def handle_memory_sync_progress(self, payload: dict) -> Sequence[GatewayCommand] | None:
+        """送信側: 受信側からの ack（memory_sync_ack / memory_sync_chunk_ack）を処理する。"""
+        return None
+
 
 class DiscordGatewayOrchestrator:
     """GatewayService と SAIVerse 本体の橋渡しを行うハイレベルオーケストレータ。"""
@@ -98,6 +107,9 @@ class DiscordGatewayOrchestrator:
         self._recent_event_ids: deque[str] = deque()
         self._recent_event_set: set[str] = set()
         self._dedupe_max = 2048
+        # 累積ACK用: 受信順の outbox_seq と、先頭より後ろで処理済みのもの
+        self._unacked_seqs: deque[int] = deque()
+        self._acked_ahead: set[int] = set()
 
     async def start(self) -> None:
         await self.service.start()
@@ -126,6 +138,7 @@ class DiscordGatewayOrchestrator:
     async def _handle_event(self, event: GatewayEvent) -> None:
         payload = event.payload if isinstance(event.payload, dict) else {}
         event_id = payload.get("event_id")
+        self._track_outbox_seq(payload.get("outbox_seq"))
         if event_id and self._is_duplicate(event_id):
             await self._ack_event(event)
             return
@@ -137,6 +150,8 @@ class DiscordGatewayOrchestrator:
             "memory_sync_initiate": self._handle_memory_initiate,
             "memory_sync_chunk": self._handle_memory_chunk,
             "memory_sync_complete": self._handle_memory_complete,
+            "memory_sync_ack": self._handle_memory_progress,
+            "memory_sync_chunk_ack": self._handle_memory_progress,
             "resync_required": self._handle_resync_required,
             "state_sync_ack": self._handle_state_sync_ack,
         }
@@ -296,8 +311,14 @@ class DiscordGatewayOrchestrator:
         await self._dispatch_commands(getattr(result, "commands", None))
 
         status_payload = {"transfer_id": transfer_id}
+        version = getattr(result, "version", None)
+        if version is not None:
+            status_payload["version"] = version
         if getattr(result, "accepted", False):
             status_payload["status"] = "ok"
+            resume_from = getattr(result, "resume_from", None)
+            if resume_from is not None:
+                status_payload["next_index"] = resume_from
         else:
             status_payload["status"] = "error"
             reason = getattr(result, "reason", None)
@@ -315,6 +336,13 @@ class DiscordGatewayOrchestrator:
         commands = await self.host.handle_memory_sync_chunk(visitor, event.payload)
         await self._dispatch_commands(commands)
 
+    async def _handle_memory_progress(self, event: GatewayEvent) -> None:
+        if not event.payload.get("transfer_id"):
+            logger.warning("Memory sync ack missing transfer_id: %s", event.payload)
+            return
+        commands = await self.host.handle_memory_sync_progress(event.payload)
+        await self._dispatch_commands(commands)
+
     async def _handle_memory_complete(self, event: GatewayEvent) -> None:
         visitor = self._visitor_from_event(event)
         if not visitor:
@@ -369,8 +397,31 @@ class DiscordGatewayOrchestrator:
         channel_seq = payload.get("channel_seq")
         if channel_seq is not None:
             ack_payload["channel_seq"] = channel_seq
+        through_seq = self._advance_ack_floor(payload.get("outbox_seq"))
+        if through_seq is not None:
+            ack_payload["through_seq"] = through_seq
         await self.service.outgoing_queue.put(GatewayCommand(type="ack", payload=ack_payload))
 
+    def _track_outbox_seq(self, seq: Any) -> None:
+        if not isinstance(seq, int) or (self._unacked_seqs and seq <= self._unacked_seqs[-1]):
+            return
+        self._unacked_seqs.append(seq)
+        if len(self._unacked_seqs) > self._dedupe_max:
+            # 処理できずに残った先頭は諦め、個別ACK（再送時）に任せる
+            self._acked_ahead.discard(self._unacked_seqs.popleft())
+
+    def _advance_ack_floor(self, seq: Any) -> int | None:
+        """Return the highest seq such that every earlier received event was acked."""
+
+        if not isinstance(seq, int) or not self._unacked_seqs or seq < self._unacked_seqs[0]:
+            return None
+        self._acked_ahead.add(seq)
+        floor: int | None = None
+        while self._unacked_seqs and self._unacked_seqs[0] in self._acked_ahead:
+            floor = self._unacked_seqs.popleft()
+            self._acked_ahead.discard(floor)
+        return floor
+
     def _remember_event(self, event_id: str) -> None:
         if event_id in self._recent_event_set:
             return
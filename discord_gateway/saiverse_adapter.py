@@ -70,6 +70,12 @@ class SAIVerseGatewayAdapter(GatewayHostAdapter):
     ) -> MemorySyncCompletionResult:
         return await self.host.handle_memory_sync_complete(visitor, payload)
 
+    async def handle_memory_sync_progress(self, payload: dict) -> Sequence[GatewayCommand] | None:
+        return await self.host.handle_memory_sync_progress(payload)
+
+    async def handle_resync_required(self, payload: dict) -> None:
+        await self.host.handle_resync_required(payload)
+
     def _build_message(
         self,
         context: ChannelContext,
@@ -136,6 +142,9 @@ class GatewayHost:
             self.manager.gateway_handle_memory_sync_complete, visitor, payload
         )
 
+    async def handle_memory_sync_progress(self, payload: dict) -> Sequence[GatewayCommand] | None:
+        return await self._run_blocking(self.manager.gateway_handle_memory_sync_progress, payload)
+
     async def handle_resync_required(self, payload: dict) -> None:
         handler = getattr(self.manager, "gateway_handle_resync_required", None)
         if not handler:
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from datetime import timedelta
 
@@ -197,3 +198,138 @@ async def test_pending_replayed_after_authentication(connection_manager, bot_dat
     assert websocket.sent
     message = json.loads(websocket.sent[-1])
     assert message["type"] == "ping"
+
+
+class SlowWebSocket(DummyWebSocket):
+    async def send(self, payload: str) -> None:
+        await asyncio.sleep(0.05)  # slow link: concurrent sends pile up behind the first
+        self._sent.append(payload)
+
+
+def _add_session(bot_database, token: str = "secret") -> None:
+    with bot_database.session() as session:
+        session.add(
+            LocalAppSession(
+                discord_user_id="user-1",
+                token_hash=hash_token(token),
+                expires_at=utcnow() + timedelta(hours=1),
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_outbox_survives_restart_and_cumulative_ack(bot_settings, bot_database):
+    manager = ConnectionManager(bot_settings, bot_database)
+    for idx in range(3):
+        await manager.send_to_owner("user-1", {"type": "ping", "payload": {"channel_id": "c", "n": idx}})
+
+    restarted = ConnectionManager(bot_settings, bot_database)
+    assert await restarted.pending_count("user-1") == 3
+    await restarted.send_to_owner("user-1", {"type": "ping", "payload": {"channel_id": "c", "n": 3}})
+
+    _add_session(bot_database)
+    websocket = DummyWebSocket()
+    client = await restarted.authenticate("secret", websocket)
+    assert await restarted.replay_pending(client, full=True) == 4
+    payloads = [json.loads(raw)["payload"] for raw in websocket.sent]
+    assert [p["n"] for p in payloads] == [0, 1, 2, 3]
+    assert [p["channel_seq"] for p in payloads] == [1, 2, 3, 4]
+    assert [p["outbox_seq"] for p in payloads] == sorted(p["outbox_seq"] for p in payloads)
+
+    await restarted.process_ack("user-1", [], through_seq=payloads[2]["outbox_seq"])
+    assert await restarted.pending_count("user-1") == 1
+
+
+@pytest.mark.asyncio
+async def test_cumulative_ack_keeps_backlog_not_yet_replayed(connection_manager, bot_database):
+    for idx in range(3):
+        await connection_manager.send_to_owner("user-1", {"type": "ping", "payload": {"n": idx}})
+
+    _add_session(bot_database)
+    websocket = DummyWebSocket()
+    client = await connection_manager.authenticate("secret", websocket)
+    # A live event overtakes the replay of the queued backlog
+    assert await connection_manager.send_to_owner("user-1", {"type": "ping", "payload": {"n": 3}})
+    live = json.loads(websocket.sent[-1])["payload"]
+
+    await connection_manager.process_ack("user-1", [live["event_id"]], through_seq=live["outbox_seq"])
+    assert await connection_manager.pending_count("user-1") == 3
+
+    assert await connection_manager.replay_pending(client, full=True) == 3
+    await connection_manager.process_ack("user-1", [], through_seq=live["outbox_seq"])
+    assert await connection_manager.pending_count("user-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_cumulative_ack_skips_events_lost_in_failed_send(connection_manager, bot_database):
+    class FlakyWebSocket(DummyWebSocket):
+        fail = True
+
+        async def send(self, payload: str) -> None:
+            if self.fail:
+                self.fail = False
+                raise ConnectionError("send failed")
+            await super().send(payload)
+
+    _add_session(bot_database)
+    websocket = FlakyWebSocket()
+    await connection_manager.authenticate("secret", websocket)
+    assert not await connection_manager.send_to_owner("user-1", {"type": "ping", "payload": {"n": 0}})
+    assert await connection_manager.send_to_owner("user-1", {"type": "ping", "payload": {"n": 1}})
+    delivered = json.loads(websocket.sent[-1])["payload"]
+
+    await connection_manager.process_ack("user-1", [], through_seq=delivered["outbox_seq"])
+    assert await connection_manager.pending_count("user-1") == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_are_coalesced_into_batch_frames(connection_manager, bot_database):
+    _add_session(bot_database)
+    websocket = SlowWebSocket()
+    await connection_manager.authenticate("secret", websocket, capabilities=["event_batch", "x"])
+
+    results = await asyncio.gather(
+        *(
+            connection_manager.send_to_owner("user-1", {"type": "ping", "payload": {"n": idx}})
+            for idx in range(5)
+        )
+    )
+
+    assert all(results)
+    frames = [json.loads(raw) for raw in websocket.sent]
+    delivered = []
+    for frame in frames:
+        events = frame["payload"]["events"] if frame["type"] == "event_batch" else [frame]
+        delivered.extend(event["payload"]["n"] for event in events)
+    assert sorted(delivered) == [0, 1, 2, 3, 4]
+    assert any(frame["type"] == "event_batch" for frame in frames)
+    assert len(frames) < 5
+
+
+@pytest.mark.asyncio
+async def test_owner_lookup_is_cached_and_invalidated_on_bind(bot_database):
+    bot_database.bind_city_channel(guild_id="g", channel_id=42, owner_user_id="owner-1")
+    assert await bot_database.afind_city_owner(42) == "owner-1"
+    assert bot_database.cached_city_owner("42") == (True, "owner-1")
+
+    bot_database.bind_city_channel(guild_id="g", channel_id="42", owner_user_id="owner-2")
+    assert bot_database.cached_city_owner("42") == (False, None)
+    assert await bot_database.afind_city_owner("42") == "owner-2"
+
+    assert bot_database.unbind_city_channel(42)
+    assert await bot_database.afind_city_owner(42) is None
+    assert bot_database.cached_city_owner(42) == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_event_id_ack_forgets_delivered_seq(connection_manager, bot_database):
+    _add_session(bot_database)
+    websocket = DummyWebSocket()
+    client = await connection_manager.authenticate("secret", websocket)
+    for idx in range(2):
+        assert await connection_manager.send_to_owner("user-1", {"type": "ping", "payload": {"n": idx}})
+    first, second = (json.loads(raw)["payload"] for raw in websocket.sent)
+
+    await connection_manager.process_ack("user-1", [first["event_id"]])
+    assert client.delivered == {second["outbox_seq"]}
+    assert await connection_manager.pending_count("user-1") == 1
@@ -33,6 +33,17 @@ def _create_visitor() -> VisitorProfile:
     )
 
 
+def _make_sender(tmp_path: Path, visitor: VisitorProfile, history: list) -> tuple[SAIVerseManager, list]:
+    sender = _create_manager(tmp_path / "sender")
+    sender._gateway_memory_outgoing = {}
+    sender.gateway_runtime = sender.gateway_mapping = object()
+    sender.city_name = "CityA"
+    sender.building_histories = {"Hall": history}
+    sent: list = []
+    sender._gateway_send_command = sent.append
+    return sender, sent
+
+
 def test_memory_sync_success(tmp_path: Path):
     manager = _create_manager(tmp_path)
     visitor = _create_visitor()
@@ -120,3 +131,149 @@ def test_memory_sync_initiate_rejects_invalid_metadata(tmp_path: Path):
     )
     assert not result.accepted
     assert result.reason in {"invalid_metadata", "missing_checksum"}
+
+
+def test_memory_sync_v2_streams_compressed_windowed_and_resumes(tmp_path: Path, monkeypatch):
+    import json
+
+    monkeypatch.setenv("SAIVERSE_GATEWAY_MEMORY_CHUNK_SIZE", "1024")
+    monkeypatch.setenv("SAIVERSE_GATEWAY_MEMORY_WINDOW", "2")
+    visitor = _create_visitor()
+    history = [
+        {"persona_id": visitor.persona_id, "content": os.urandom(200).hex()} for _ in range(40)
+    ]
+    history.append({"persona_id": "someone-else", "content": "not mine"})
+
+    sender, sent = _make_sender(tmp_path, visitor, history)
+    sender._gateway_initiate_memory_sync(visitor, "Hall")
+
+    initiate = sent[0].payload
+    assert initiate["version"] == 2
+    assert len(sent) == 1  # chunks wait for the receiver to confirm v2
+
+    receiver = _create_manager(tmp_path / "receiver")
+    handshake = receiver.gateway_handle_memory_sync_initiate(visitor, initiate)
+    assert handshake.resume_from == 0 and handshake.version == 2
+    chunks = [
+        cmd.payload
+        for cmd in sender.gateway_handle_memory_sync_progress(
+            {"transfer_id": initiate["transfer_id"], "status": "ok", "next_index": 0, "version": 2}
+        )
+    ]
+    assert [c["chunk_index"] for c in chunks] == [0, 1]  # window limits what is in flight
+    ack = receiver.gateway_handle_memory_sync_chunk(visitor, chunks[0])[0]
+    assert ack.type == "memory_sync_chunk_ack" and ack.payload["next_index"] == 1
+    spool_dir = tmp_path / "receiver" / "gateway_memory_incoming"
+    assert any(spool_dir.iterdir())
+
+    # receiver restarts after chunk 0; chunk 1 was lost with it
+    receiver = _create_manager(tmp_path / "receiver")
+    sent.clear()
+    sender.gateway_handle_resync_required({})
+    resumed = receiver.gateway_handle_memory_sync_initiate(visitor, sent[0].payload)
+    assert resumed.accepted and resumed.resume_from == 1
+    pending = sender.gateway_handle_memory_sync_progress(
+        {"transfer_id": initiate["transfer_id"], "status": "ok", "next_index": 1}
+    )
+    assert pending[0].payload["chunk_index"] == 1
+
+    complete = None
+    while pending:
+        command = pending.pop(0)
+        if command.type == "memory_sync_complete":
+            complete = command.payload
+            break
+        acks = receiver.gateway_handle_memory_sync_chunk(visitor, command.payload)
+        pending.extend(sender.gateway_handle_memory_sync_progress(acks[0].payload))
+
+    assert complete is not None and sender._gateway_memory_outgoing == {}
+    result = receiver.gateway_handle_memory_sync_complete(visitor, complete)
+    assert result.success, result.reason
+    stored = tmp_path / "receiver" / "gateway_memory" / f"{visitor.persona_id}-{initiate['transfer_id']}.bin"
+    document = json.loads(stored.read_bytes())
+    assert document["history"] == history[:-1]
+    assert complete["total_size"] < len(stored.read_bytes())  # compressed on the wire
+    assert not any(spool_dir.iterdir())
+
+
+def test_memory_sync_falls_back_to_v1_for_legacy_receiver(tmp_path: Path):
+    import json
+
+    visitor = _create_visitor()
+    history = [{"persona_id": visitor.persona_id, "content": f"line {i}"} for i in range(5)]
+    sender, sent = _make_sender(tmp_path, visitor, history)
+    sender._gateway_initiate_memory_sync(visitor, "Hall")
+    transfer_id = sent[0].payload["transfer_id"]
+
+    # v1 しか知らない受信側は total_size の無い initiate を invalid_metadata で断り、version も返さない
+    commands = sender.gateway_handle_memory_sync_progress(
+        {"transfer_id": transfer_id, "status": "error", "reason": "invalid_metadata"}
+    )
+    initiate = commands[0].payload
+    assert "version" not in initiate and initiate["total_size"] > 0
+
+    receiver = _create_manager(tmp_path / "receiver")
+    assert receiver.gateway_handle_memory_sync_initiate(visitor, initiate).accepted
+    for command in commands[1:-1]:
+        assert receiver.gateway_handle_memory_sync_chunk(visitor, command.payload) == []
+    result = receiver.gateway_handle_memory_sync_complete(visitor, commands[-1].payload)
+    assert result.success, result.reason
+    stored = tmp_path / "receiver" / "gateway_memory" / f"{visitor.persona_id}-{transfer_id}.bin"
+    assert json.loads(stored.read_bytes())["history"] == history
+    assert sender._gateway_memory_outgoing == {}
+
+
+def test_memory_sync_v2_rejects_missing_chunk_index(tmp_path: Path):
+    manager = _create_manager(tmp_path)
+    visitor = _create_visitor()
+    assert manager.gateway_handle_memory_sync_initiate(
+        visitor, {"transfer_id": "t", "version": 2, "encoding": "identity"}
+    ).accepted
+
+    commands = manager.gateway_handle_memory_sync_chunk(
+        visitor,
+        {"transfer_id": "t", "chunk_index": None, "data": base64.b64encode(b"x").decode("ascii")},
+    )
+    assert commands[0].payload["reason"] == "invalid_metadata"
+    assert manager._gateway_memory_transfers == {}
+
+
+def test_memory_sync_v2_rejects_decompression_bomb(tmp_path: Path, monkeypatch):
+    import zlib
+
+    monkeypatch.setenv("SAIVERSE_GATEWAY_MEMORY_MAX_BYTES", "65536")
+    manager = _create_manager(tmp_path)
+    visitor = _create_visitor()
+    data = zlib.compress(b"\0" * (4 * 1024 * 1024))
+    assert manager.gateway_handle_memory_sync_initiate(
+        visitor, {"transfer_id": "t", "version": 2, "encoding": "zlib"}
+    ).accepted
+    ack = manager.gateway_handle_memory_sync_chunk(
+        visitor,
+        {"transfer_id": "t", "chunk_index": 0, "data": base64.b64encode(data).decode("ascii")},
+    )
+    assert ack[0].payload["next_index"] == 1
+
+    result = manager.gateway_handle_memory_sync_complete(
+        visitor,
+        {
+            "transfer_id": "t",
+            "total_size": len(data),
+            "total_chunks": 1,
+            "checksum": hashlib.sha256(data).hexdigest(),
+        },
+    )
+    assert not result.success and result.reason == "overflow"
+    assert not any((tmp_path / "gateway_memory").iterdir())
+
+
+def test_abandoned_spools_are_swept(tmp_path: Path):
+    from discord_gateway.memory_transfer import MemorySpool
+
+    root = tmp_path / "gateway_memory_incoming"
+    old, _ = MemorySpool.open(root, "old", {"persona_id": "p"})
+    fresh, _ = MemorySpool.open(root, "fresh", {"persona_id": "p"})
+    os.utime(old.directory / "state.json", (0, 0))
+
+    assert MemorySpool.sweep(root, 3600) == 1
+    assert not old.directory.exists() and fresh.directory.exists()
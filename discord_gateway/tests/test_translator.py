@@ -13,3 +13,25 @@ def test_translator_roundtrip():
     assert event.type == "discord_message"
     assert event.payload["text"] == "hello"
     assert event.raw == message
+
+
+def test_translator_expands_event_batch_and_merges_acks():
+    translator = GatewayTranslator()
+    batch = {
+        "type": "event_batch",
+        "payload": {
+            "events": [
+                {"type": "discord_message", "payload": {"event_id": "a", "outbox_seq": 1}},
+                {"type": "discord_message", "payload": {"event_id": "b", "outbox_seq": 2}},
+            ]
+        },
+    }
+    assert [event.payload["event_id"] for event in translator.decode_events(batch)] == ["a", "b"]
+
+    merged = translator.merge_acks(
+        [
+            GatewayCommand(type="ack", payload={"event_id": "a", "through_seq": 1}),
+            GatewayCommand(type="ack", payload={"event_id": "b", "through_seq": 2}),
+        ]
+    )
+    assert merged.payload == {"event_ids": ["a", "b"], "through_seq": 2}
@@ -31,5 +31,37 @@ class GatewayTranslator:
             payload = {"value": payload}
         return GatewayEvent(type=event_type, payload=payload, raw=message)
 
+    def decode_events(self, message: dict[str, Any]) -> list[GatewayEvent]:
+        """``event_batch`` フレームを個別イベントへ展開する（通常フレームは1件）。"""
+
+        if message.get("type") != "event_batch":
+            return [self.decode_event(message)]
+        payload = message.get("payload") or {}
+        events = payload.get("events") if isinstance(payload, dict) else None
+        return [self.decode_event(item) for item in events or [] if isinstance(item, dict)]
+
+    def merge_acks(self, commands: list[GatewayCommand]) -> GatewayCommand:
+        """連続した ack コマンドを1フレームにまとめる。
+
+        ``through_seq`` は各 ack が持つ累積 ACK の最大値を採用する。
+        """
+
+        if len(commands) == 1:
+            return commands[0]
+        event_ids: list[str] = []
+        through_seq: int | None = None
+        for command in commands:
+            payload = command.payload
+            if payload.get("event_id"):
+                event_ids.append(payload["event_id"])
+            event_ids.extend(payload.get("event_ids") or [])
+            seq = payload.get("through_seq")
+            if isinstance(seq, int) and (through_seq is None or seq > through_seq):
+                through_seq = seq
+        merged: dict[str, Any] = {"event_ids": event_ids}
+        if through_seq is not None:
+            merged["through_seq"] = through_seq
+        return GatewayCommand(type="ack", payload=merged)
+
     def encode_command(self, command: GatewayCommand) -> dict[str, Any]:
         return {"type": command.type, "payload": command.payload}
@@ -1,27 +1,54 @@
-"""Public API for LLM clients."""
+"""Public API for LLM clients.
+
+Provider clients pull in heavy SDKs (anthropic, openai, google-genai), so
+they are resolved on first attribute access instead of at package import.
+``from llm_clients.exceptions import LLMError`` therefore costs nothing.
+"""
 from __future__ import annotations
 
+import importlib
+from typing import Any
+
 import requests  # re-exported for backward-compatible test patching
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from .anthropic import AnthropicClient
 from .base import LLMClient, log_llm_request, log_llm_response, get_llm_logger
-from .factory import get_llm_client
-from .gemini import (
-    GEMINI_SAFETY_CONFIG,
-    GROUNDING_TOOL,
-    GeminiClient,
-    genai,
-    merge_tools_for_gemini,
-)
-from .gemini_utils import build_gemini_clients
-from .ollama import OllamaClient
-from .openai import OpenAI, OpenAIClient
-from .xai import XAIClient
-from tools import OPENAI_TOOLS_SPEC
+
+# public name -> (module, attribute); module is relative to this package unless absolute
+_LAZY_EXPORTS = {
+    "AnthropicClient": (".anthropic", "AnthropicClient"),
+    "get_llm_client": (".factory", "get_llm_client"),
+    "GEMINI_SAFETY_CONFIG": (".gemini", "GEMINI_SAFETY_CONFIG"),
+    "GROUNDING_TOOL": (".gemini", "GROUNDING_TOOL"),
+    "GeminiClient": (".gemini", "GeminiClient"),
+    "genai": (".gemini", "genai"),
+    "merge_tools_for_gemini": (".gemini", "merge_tools_for_gemini"),
+    "build_gemini_clients": (".gemini_utils", "build_gemini_clients"),
+    "OllamaClient": (".ollama", "OllamaClient"),
+    "OpenAI": (".openai", "OpenAI"),
+    "OpenAIClient": (".openai", "OpenAIClient"),
+    "XAIClient": (".xai", "XAIClient"),
+    "OPENAI_TOOLS_SPEC": ("tools", "OPENAI_TOOLS_SPEC"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__ if module_name.startswith(".") else None)
+    value = getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "AnthropicClient",
@@ -43,4 +70,3 @@ __all__ = [
     "merge_tools_for_gemini",
     "requests",
 ]
-
@@ -1,20 +1,40 @@
 """Factory helpers for LLM clients."""
 from __future__ import annotations
 
+import importlib
 import logging
 from typing import Dict
 
 from saiverse.model_configs import get_model_config, get_model_parameter_defaults
 
-from .anthropic import AnthropicClient
-from .gemini import GeminiClient
-from .ollama import OllamaClient
-from .openai import OpenAIClient
-from .nvidia_nim import NvidiaNIMClient
-from .llama_cpp import LlamaCppClient
-from .xai import XAIClient
 from .base import LLMClient
 
+# Client classes are imported on first use so only the SDKs of providers
+# actually configured get loaded.
+_CLIENT_MODULES = {
+    "AnthropicClient": ".anthropic",
+    "GeminiClient": ".gemini",
+    "OllamaClient": ".ollama",
+    "OpenAIClient": ".openai",
+    "NvidiaNIMClient": ".nvidia_nim",
+    "LlamaCppClient": ".llama_cpp",
+    "XAIClient": ".xai",
+}
+
+
+def __getattr__(name: str):
+    module_name = _CLIENT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def _client_class(name: str):
+    # Module globals first so tests patching ``llm_clients.factory.<Client>`` still apply
+    return globals().get(name) or __getattr__(name)
+
 
 def _supports_images(provider: str, config: Dict | None) -> bool:
     if isinstance(config, dict) and "supports_images" in config:
@@ -87,7 +107,7 @@ def get_llm_client(model: str, provider: str, context_length: int, config: Dict
                 extra_kwargs["reasoning_passback_field"] = reasoning_passback.strip()
 
         logging.debug("Creating OpenAI client for model '%s' with kwargs: %s", api_model, extra_kwargs)
-        client = OpenAIClient(api_model, supports_images=supports_images, **extra_kwargs)
+        client = _client_class("OpenAIClient")(api_model, supports_images=supports_images, **extra_kwargs)
     elif provider == "nvidia_nim":
         extra_kwargs: Dict[str, object] = {}
         if isinstance(config, dict):
@@ -112,12 +132,12 @@ def get_llm_client(model: str, provider: str, context_length: int, config: Dict
                 extra_kwargs["reasoning_passback_field"] = reasoning_passback.strip()
 
         logging.debug("Creating Nvidia NIM client for model '%s' with kwargs: %s", api_model, extra_kwargs)
-        client = NvidiaNIMClient(api_model, supports_images=supports_images, **extra_kwargs)
+        client = _client_class("NvidiaNIMClient")(api_model, supports_images=supports_images, **extra_kwargs)
     elif provider == "anthropic":
-        client = AnthropicClient(api_model, config=config, supports_images=supports_images)
+        client = _client_class("AnthropicClient")(api_model, config=config, supports_images=supports_images)
     elif provider == "gemini":
         logging.info("[factory] Creating GeminiClient with api_model='%s'", api_model)
-        client = GeminiClient(api_model, config=config, supports_images=supports_images)
+        client = _client_class("GeminiClient")(api_model, config=config, supports_images=supports_images)
     elif provider == "llama_cpp":
         extra_kwargs: Dict[str, object] = {}
         if isinstance(config, dict):
@@ -135,7 +155,7 @@ def get_llm_client(model: str, provider: str, context_length: int, config: Dict
             model_path = api_model
 
         logging.debug("Creating llama.cpp client for model path '%s' with kwargs: %s", model_path, extra_kwargs)
-        client = LlamaCppClient(model_path, context_length, supports_images=supports_images, **extra_kwargs)
+        client = _client_class("LlamaCppClient")(model_path, context_length, supports_images=supports_images, **extra_kwargs)
     elif provider == "xai":
         extra_kwargs: Dict[str, object] = {}
         if isinstance(config, dict):
@@ -148,7 +168,7 @@ def get_llm_client(model: str, provider: str, context_length: int, config: Dict
                 extra_kwargs["reasoning_effort"] = reasoning_effort.strip()
 
         logging.debug("Creating xAI client for model '%s' with kwargs: %s", api_model, extra_kwargs)
-        client = XAIClient(api_model, supports_images=supports_images, **extra_kwargs)
+        client = _client_class("XAIClient")(api_model, supports_images=supports_images, **extra_kwargs)
     elif provider == "ollama":
         extra_kwargs: Dict[str, object] = {}
         if isinstance(config, dict):
@@ -161,7 +181,7 @@ def get_llm_client(model: str, provider: str, context_length: int, config: Dict
                 extra_kwargs["request_kwargs"] = request_kwargs
 
         logging.debug("Creating Ollama client for model '%s' with kwargs: %s", api_model, extra_kwargs)
-        client = OllamaClient(api_model, context_length, supports_images=supports_images, **extra_kwargs)
+        client = _client_class("OllamaClient")(api_model, context_length, supports_images=supports_images, **extra_kwargs)
     else:
         raise ValueError(
             f"Unknown provider '{provider}' for model '{model}'. "
@@ -35,6 +35,7 @@ from .openai_reasoning import (
     merge_streaming_reasoning_details,
     process_openai_stream_content,
 )
+from .structured_output import compile_schema, decode_json_object
 from .utils import merge_reasoning_strings
 
 
@@ -95,67 +96,15 @@ def _prepare_openai_messages(messages: List[Any], supports_images: bool, max_ima
     )
 
 
-def _extract_json_object_candidate(text: str) -> str:
-    """Extract first JSON object candidate from a model response."""
-    candidate = (text or "").strip()
-    if not candidate:
-        return ""
-
-    if candidate.startswith("```"):
-        for segment in candidate.split("```"):
-            segment = segment.strip()
-            if segment.startswith("json"):
-                segment = segment[4:].strip()
-            if segment.startswith("{") and segment.endswith("}"):
-                return segment
-
-    if candidate.startswith("{") and candidate.endswith("}"):
-        return candidate
-
-    start = candidate.find("{")
-    end = candidate.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        return candidate[start : end + 1]
-    return candidate
-
-
 def _validate_required_schema_keys(payload: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """Validate that payload satisfies required keys defined in schema.
 
     This intentionally performs a minimal validation focused on required
     properties so that structured output can fail fast when mandatory fields are
     missing, while leaving full schema validation to upstream strict mode when
-    available.
+    available. The schema is compiled once and cached (see structured_output).
     """
-
-    def _validate(data: Any, node: Dict[str, Any]) -> bool:
-        node_type = node.get("type")
-
-        if node_type == "object":
-            if not isinstance(data, dict):
-                return False
-            required_keys = node.get("required", [])
-            if any(key not in data for key in required_keys):
-                return False
-
-            properties = node.get("properties", {})
-            for key, child_schema in properties.items():
-                if key in data and isinstance(child_schema, dict):
-                    if not _validate(data[key], child_schema):
-                        return False
-            return True
-
-        if node_type == "array":
-            if not isinstance(data, list):
-                return False
-            item_schema = node.get("items")
-            if isinstance(item_schema, dict):
-                return all(_validate(item, item_schema) for item in data)
-            return True
-
-        return True
-
-    return _validate(payload, schema)
+    return compile_schema(schema).validate(payload)
 
 
 class OpenAIClient(LLMClient):
@@ -202,41 +151,11 @@ class OpenAIClient(LLMClient):
         return self.client.chat.completions.create(**kwargs)
 
     def _add_additional_properties(self, schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively add additionalProperties: false and normalize schema for OpenAI strict mode."""
-        import copy
-        schema = copy.deepcopy(schema)
-
-        def _process(node: Any) -> Any:
-            if isinstance(node, dict):
-                # Normalize type names (int -> integer, bool -> boolean, float -> number)
-                if "type" in node:
-                    type_value = node["type"]
-                    if type_value == "int":
-                        node["type"] = "integer"
-                    elif type_value == "bool":
-                        node["type"] = "boolean"
-                    elif type_value == "float":
-                        node["type"] = "number"
-
-                # Add additionalProperties: false to objects
-                if node.get("type") == "object" and "additionalProperties" not in node:
-                    node["additionalProperties"] = False
-
-                # Complete required array to include all properties (OpenAI strict mode requirement)
-                if node.get("type") == "object" and "properties" in node:
-                    all_keys = list(node["properties"].keys())
-                    existing_required = node.get("required", [])
-                    # Add all properties to required if not already present
-                    node["required"] = list(set(existing_required + all_keys))
-
-                # Recursively process all values
-                return {k: _process(v) for k, v in node.items()}
-            elif isinstance(node, list):
-                return [_process(item) for item in node]
-            else:
-                return node
+        """Return the schema normalized for OpenAI strict mode (additionalProperties: false, all keys required).
 
-        return _process(schema)
+        The result is cached per schema content and shared between requests; do not mutate it.
+        """
+        return compile_schema(schema).openai_strict
 
     @staticmethod
     def _inject_schema_prompt(
@@ -350,15 +269,13 @@ class OpenAIClient(LLMClient):
                     return parsed_payload
                 logging.warning("[openai] Structured output(parsed) missing required keys")
 
-            candidate = _extract_json_object_candidate(text_body)
-
             try:
-                parsed = json.loads(candidate)
-                if isinstance(parsed, dict):
-                    if _validate_required_schema_keys(parsed, response_schema):
-                        return parsed
-                    logging.warning("[openai] Structured output missing required keys")
+                parsed = decode_json_object(text_body)
+                if _validate_required_schema_keys(parsed, response_schema):
+                    return parsed
+                logging.warning("[openai] Structured output missing required keys")
             except json.JSONDecodeError as e:
+                candidate = (text_body or "").strip()
                 preview = candidate.replace("\n", "\\n")[:300]
                 logging.warning("[openai] Failed to parse structured output: %s (candidate=%r)", e, preview)
                 if not candidate:
@@ -0,0 +1,193 @@
+"""Precompiled structured-output schemas and single-pass JSON extraction.
+
+Router nodes send the same ``response_schema`` on every pulse. Instead of
+deep-copying and re-walking the schema per request/response, a schema is
+compiled once into a :class:`CompiledSchema` holding
+
+* a validator built from closures (required keys / object / array shape),
+* the OpenAI strict-mode variant of the schema (built lazily, then reused).
+
+Compiled schemas are cached by their canonical JSON, so dynamically rebuilt
+schemas (e.g. the router's playbook enum) still hit the cache as long as the
+content is unchanged.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+Validator = Callable[[Any], bool]
+
+_DECODER = json.JSONDecoder()
+_TYPE_ALIASES = {"int": "integer", "bool": "boolean", "float": "number"}
+_CACHE_MAX_ENTRIES = 128
+
+
+def decode_json_object(text: str) -> Dict[str, Any]:
+    """Decode the JSON object embedded in ``text``.
+
+    Handles bare JSON, ```json fenced blocks and prose around the object:
+    decoding starts at the first ``{`` inside the first fenced block (or of
+    the whole text when there is no fence) and nowhere else, so a malformed
+    or truncated object is an error rather than a nested sub-object being
+    returned in its place. Raises ``json.JSONDecodeError`` when that object
+    cannot be decoded.
+    """
+    text = text or ""
+    fence = text.find("```")
+    # フェンスがあればその中の最初の {、無ければ全体の最初の { だけを試す
+    start = text.find("{", fence + 3) if fence != -1 else -1
+    if start == -1:
+        start = text.find("{")
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object found", text, 0)
+    value, _ = _DECODER.raw_decode(text, start)
+    if not isinstance(value, dict):
+        raise json.JSONDecodeError("No JSON object found", text, start)
+    return value
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Like :func:`decode_json_object` but returns None instead of raising."""
+    try:
+        return decode_json_object(text)
+    except json.JSONDecodeError:
+        return None
+
+
+def _always_valid(_data: Any) -> bool:
+    return True
+
+
+def _compile_validator(node: Any) -> Validator:
+    """Build a validator for ``node`` checking required keys and container types.
+
+    Intentionally minimal (full validation is left to upstream strict mode):
+    objects must be dicts containing their ``required`` keys, arrays must be
+    lists, and declared properties / items are validated recursively.
+    """
+    if not isinstance(node, dict):
+        return _always_valid
+    node_type = node.get("type")
+
+    if node_type == "object":
+        required = tuple(node.get("required", []) or ())
+        children = tuple(
+            (key, _compile_validator(child))
+            for key, child in (node.get("properties") or {}).items()
+            if isinstance(child, dict)
+        )
+        children = tuple((key, check) for key, check in children if check is not _always_valid)
+
+        def _validate_object(data: Any) -> bool:
+            if not isinstance(data, dict):
+                return False
+            for key in required:
+                if key not in data:
+                    return False
+            for key, check in children:
+                if key in data and not check(data[key]):
+                    return False
+            return True
+
+        return _validate_object
+
+    if node_type == "array":
+        item_schema = node.get("items")
+        item_check = _compile_validator(item_schema) if isinstance(item_schema, dict) else _always_valid
+
+        def _validate_array(data: Any) -> bool:
+            if not isinstance(data, list):
+                return False
+            if item_check is _always_valid:
+                return True
+            return all(item_check(item) for item in data)
+
+        return _validate_array
+
+    return _always_valid
+
+
+def _to_openai_strict(node: Any) -> Any:
+    """Normalize type names and add OpenAI strict-mode object constraints."""
+    if isinstance(node, dict):
+        node = dict(node)
+        type_value = node.get("type")
+        # "type" は union (["string", "null"]) や、properties 内では "type" という名前の子スキーマのこともある
+        if isinstance(type_value, str):
+            node["type"] = _TYPE_ALIASES.get(type_value, type_value)
+        elif isinstance(type_value, list):
+            node["type"] = [
+                _TYPE_ALIASES.get(item, item) if isinstance(item, str) else item for item in type_value
+            ]
+        if node.get("type") == "object":
+            if "additionalProperties" not in node:
+                node["additionalProperties"] = False
+            if "properties" in node:
+                # Strict mode requires every property to be listed in required
+                required = list(node.get("required", []))
+                required.extend(key for key in node["properties"] if key not in required)
+                node["required"] = required
+        return {key: _to_openai_strict(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_to_openai_strict(item) for item in node]
+    return node
+
+
+class CompiledSchema:
+    """A response schema compiled once and reused across requests."""
+
+    __slots__ = ("schema", "validate", "_openai_strict", "_lock")
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        # Private copy so later mutation of the source dict cannot desync the cache
+        self.schema = copy.deepcopy(schema)
+        self.validate: Validator = _compile_validator(self.schema)
+        self._openai_strict: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def openai_strict(self) -> Dict[str, Any]:
+        """OpenAI strict-mode schema. Shared between requests: treat as read-only."""
+        if self._openai_strict is None:
+            with self._lock:
+                if self._openai_strict is None:
+                    self._openai_strict = _to_openai_strict(self.schema)
+        return self._openai_strict
+
+
+_cache: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    """Return the cached :class:`CompiledSchema` for ``schema`` (LRU, keyed by content)."""
+    key = json.dumps(schema, sort_keys=True, ensure_ascii=False, default=str)
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+    compiled = CompiledSchema(schema)
+    with _cache_lock:
+        _cache[key] = compiled
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def clear_schema_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+__all__ = [
+    "CompiledSchema",
+    "clear_schema_cache",
+    "compile_schema",
+    "decode_json_object",
+    "extract_json_object",
+]
@@ -9,12 +9,25 @@ import argparse
 import atexit
 import signal
 import asyncio
+
 from dotenv import load_dotenv
 from typing import Optional
 from pathlib import Path
 
+# .env の SAIVERSE_PROFILE_STARTUP も効くよう、フラグ判定より先に読む
 load_dotenv()
 
+# --profile-startup: 重い import より前にフックを入れる
+from saiverse.startup_profiler import (
+    PhaseClock,
+    enable_startup_profiling,
+    finish_startup_profiling,
+    get_startup_profiler,
+    profiling_requested,
+)
+if profiling_requested():
+    enable_startup_profiling()
+
 # Migrate legacy user_data/ to ~/.saiverse/user_data/ if needed
 from saiverse.data_paths import migrate_legacy_user_data
 migrate_legacy_user_data()
@@ -278,8 +291,18 @@ def main():
     )
     default_sds_url = os.getenv("SDS_URL", "http://127.0.0.1:8080")
     parser.add_argument("--sds-url", type=str, default=default_sds_url, help="URL of the SAIVerse Directory Service (or from .env).")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Record per-module import time and per-phase startup time (also SAIVERSE_PROFILE_STARTUP=1).",
+    )
     args = parser.parse_args()
 
+    profiler = get_startup_profiler()
+    if profiler is not None:
+        profiler.record_phase("main.imports", time.perf_counter() - profiler.started_at)
+    clock = PhaseClock("main")
+
     if args.db_file:
         provided_path = Path(args.db_file)
         if provided_path.is_absolute():
@@ -294,11 +317,13 @@ def main():
         db_path = default_db_path()
 
     # Auto-migrate database schema if needed (must run before backup to avoid file lock conflicts)
-    from database.migrate import needs_migration, migrate_database_in_place
+    from database.migrate import needs_migration, migrate_database_in_place, ensure_indexes
     if needs_migration(str(db_path)):
         logging.info("Database schema change detected. Running auto-migration...")
         migrate_database_in_place(str(db_path))
         logging.info("Database migration completed.")
+    ensure_indexes(str(db_path))
+    clock.lap("db_migration")
 
     # Start database backup in background thread
     threading.Thread(target=run_startup_backup, args=(db_path,), daemon=True).start()
@@ -309,8 +334,10 @@ def main():
         db_path=str(db_path),
         sds_url=args.sds_url
     )
+    clock.lap("manager")
     if ensure_gateway_runtime:
         ensure_gateway_runtime(manager)
+    clock.lap("gateway_runtime")
 
     app_state.bind_manager(manager)
     app_state.set_model_choices(MODEL_CHOICES)
@@ -322,6 +349,7 @@ def main():
     # Sync builtin playbook flags from JSON definitions to DB.
     # Fixes seed.py bug where user_selectable/dev_only/display_name were not set.
     _sync_builtin_playbook_flags(manager.SessionLocal)
+    clock.lap("playbook_sync")
 
     # Unity Gateway の起動（オプション）
     unity_gateway_port = int(os.getenv("UNITY_GATEWAY_PORT", "8765"))
@@ -340,6 +368,7 @@ def main():
             logging.warning("Unity Gateway: websockets package not installed")
     else:
         manager.unity_gateway = None
+    clock.lap("unity_gateway")
 
     api_server_process = cleanup_and_start_server_with_args(
         manager.api_port,
@@ -348,6 +377,7 @@ def main():
         str(db_path),
     )
     app_state.child_processes.append(api_server_process)
+    clock.lap("api_server")
 
     # --- アプリケーション終了時のクリーンアップ ---
     shutdown_called = False
@@ -420,6 +450,8 @@ def main():
     # Mount API Routes
     from api.main import api_router
     app.include_router(api_router, prefix="/api")
+    clock.lap("api_routes")
+    finish_startup_profiling(SESSION_LOG_DIR / "startup_profile.json")
 
     logging.info(f"Starting SAIVerse backend on http://0.0.0.0:{manager.ui_port}")
     logging.info(f"API endpoints available at http://0.0.0.0:{manager.ui_port}/api")
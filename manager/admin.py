@@ -12,6 +12,7 @@ from saiverse.buildings import Building
 from database.models import (
     AI as AIModel,
     Building as BuildingModel,
+    BuildingOccupancyDaily,
     BuildingOccupancyLog,
     BuildingToolLink,
     City as CityModel,
@@ -22,6 +23,7 @@ from database.models import (
 )
 from manager.blueprints import BlueprintMixin
 from manager.history import HistoryMixin
+from persona.building_history import ensure_building_history
 from manager.persona import PersonaMixin
 from manager.state import CoreState
 from scripts.import_playbook import infer_scope_from_path
@@ -319,7 +321,11 @@ class AdminService(BlueprintMixin, HistoryMixin, PersonaMixin):
                     "contains buildings."
                 )
 
-            if db.query(BuildingOccupancyLog).filter_by(CITYID=city_id).first():
+            # コンパクション済みの日別集計も同じ CITYID を参照している
+            if (
+                db.query(BuildingOccupancyLog).filter_by(CITYID=city_id).first()
+                or db.query(BuildingOccupancyDaily).filter_by(CITYID=city_id).first()
+            ):
                 return (
                     f"Error: Cannot delete city '{city.CITYNAME}' due to remaining "
                     "occupancy logs. Please clean up buildings first."
@@ -423,6 +429,7 @@ class AdminService(BlueprintMixin, HistoryMixin, PersonaMixin):
                 )
 
             db.query(BuildingOccupancyLog).filter_by(BUILDINGID=building_id).delete()
+            db.query(BuildingOccupancyDaily).filter_by(BUILDINGID=building_id).delete()
             db.delete(building)
             db.commit()
             logging.info("Deleted building '%s'.", building.BUILDINGNAME)
@@ -679,6 +686,10 @@ class AdminService(BlueprintMixin, HistoryMixin, PersonaMixin):
         finally:
             db.close()
 
+        try:
+            self.manager.item_service.document_index.remove(item_id)
+        except Exception as exc:
+            logging.warning("Failed to drop document index entry for '%s': %s", item_id, exc)
         self.manager._load_items_from_db()
         return f"Item '{item_name}' deleted successfully."
 
@@ -1041,7 +1052,7 @@ class AdminService(BlueprintMixin, HistoryMixin, PersonaMixin):
                 f"<b>{event_message}</b></div>"
             )
             for building_id in self.building_map.keys():
-                self.building_histories.setdefault(building_id, []).append(
+                ensure_building_history(self.building_histories, building_id).append(
                     {"role": "host", "content": formatted_message}
                 )
             self._save_building_histories()
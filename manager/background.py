@@ -1,9 +1,11 @@
 import json
 import logging
+import time
 
 from google.genai import errors
 
 from database.models import ThinkingRequest, VisitingAI
+from persona.utils import env_float, env_int
 
 
 class DatabasePollingMixin:
@@ -18,6 +20,39 @@ class DatabasePollingMixin:
                 self.run_scheduled_prompts()
             except Exception as exc:
                 logging.error("Error in DB polling loop: %s", exc, exc_info=True)
+            # 保守処理は互いに独立: 片方が失敗してももう片方は毎回試す
+            for step in (self._maybe_compact_occupancy_history, self._maybe_flush_session_metadata):
+                try:
+                    step()
+                except Exception as exc:
+                    logging.error("Error in DB polling maintenance (%s): %s", step.__name__, exc, exc_info=True)
+
+    def _maybe_compact_occupancy_history(self):
+        """Roll old closed occupancy intervals into daily aggregates (at most once per interval)."""
+        interval = env_int("SAIVERSE_OCCUPANCY_COMPACT_INTERVAL_SEC", 86400)
+        if interval <= 0:
+            return
+        now = time.monotonic()
+        last = getattr(self, "_last_occupancy_compaction", None)
+        if last is not None and now - last < interval:
+            return
+        self._last_occupancy_compaction = now
+        retention_days = env_int("SAIVERSE_OCCUPANCY_RETENTION_DAYS", 30)
+        compacted = self.occupancy_manager.compact_history(retention_days=retention_days)
+        if compacted:
+            logging.info("Occupancy history compaction removed %d log row(s).", compacted)
+
+    def _maybe_flush_session_metadata(self):
+        """Persist session state changed outside user turns (autonomous pulses etc.)."""
+        interval = env_float("SAIVERSE_SESSION_FLUSH_INTERVAL_SEC", 30.0)
+        if interval <= 0:
+            return
+        now = time.monotonic()
+        last = getattr(self, "_last_session_flush", None)
+        if last is not None and now - last < interval:
+            return
+        self._last_session_flush = now
+        self._flush_session_metadata()
 
     def _process_thinking_requests(self):
         db = self.SessionLocal()
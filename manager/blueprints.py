@@ -14,6 +14,7 @@ from database.models import (
     City as CityModel,
     Tool as ToolModel,
 )
+from persona.building_history import ensure_building_history
 from persona.core import PersonaCore
 from saiverse.buildings import Building
 from saiverse.model_configs import get_context_length, get_model_provider
@@ -251,7 +252,7 @@ class BlueprintMixin:
                     / private_room_id
                     / "log.json"
                 )
-                self.building_histories[private_room_id] = []
+                ensure_building_history(self.building_histories, private_room_id)
 
             if blueprint.CITYID == self.city_id:
                 blueprint_model = self.model
@@ -301,7 +302,7 @@ class BlueprintMixin:
                 "<div class=\"note-box\">✨ Blueprint Spawn:<br>"
                 f"<b>{entity_name}がこの世界に現れました</b></div>"
             )
-            self.building_histories.setdefault(target_building_id, []).append(
+            ensure_building_history(self.building_histories, target_building_id).append(
                 {"role": "host", "content": arrival_message}
             )
             self._save_building_histories()
@@ -0,0 +1,376 @@
+"""Full-text and line-offset index for document items.
+
+Document tools used to ``read_text`` the whole file and split it into lines
+on every call. This index keeps, per document item:
+
+- the byte offset of every line start, so ``read_lines`` seeks straight to
+  the requested range instead of reading the file;
+- an FTS5 table (trigram tokenizer when available, so Japanese text without
+  spaces is searchable) with one row per line, for searching across every
+  document a persona can reach.
+
+Entries are keyed by item_id and validated against the file's size/mtime, so
+files edited outside ItemService are re-indexed on next access. PDFs are
+indexed through their extracted text (``pypdf`` optional), which is cached
+next to the index.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# FTS の rowid = doc_key << _LINE_BITS | 行番号（文書単位の削除を範囲指定で済ませる）
+_LINE_BITS = 24
+_LINE_MASK = (1 << _LINE_BITS) - 1
+_REGEX_META = set(".^$*+?{}[]\\|()")
+_ENTRY_CACHE_SIZE = 64
+
+
+@dataclass
+class DocumentEntry:
+    doc_key: int
+    source_path: str
+    text_path: Path
+    mtime_ns: int
+    size: int
+    offsets: array  # 各行の開始バイト位置
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets)
+
+
+@dataclass
+class DocumentMatch:
+    item_id: str
+    line_index: int  # 0-based
+    text: str
+
+
+def _line_offsets(data: bytes, base: int = 0) -> array:
+    offsets = array("q", [base])
+    find = data.find
+    pos = find(b"\n")
+    while pos != -1:
+        offsets.append(base + pos + 1)
+        pos = find(b"\n", pos + 1)
+    return offsets
+
+
+def _split_lines(data: bytes) -> List[str]:
+    # read_text() と同じく CRLF の CR は行内容に含めない
+    return [line[:-1] if line.endswith("\r") else line for line in data.decode("utf-8", errors="replace").split("\n")]
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def is_literal_pattern(pattern: str) -> bool:
+    """True when ``pattern`` has no regex metacharacters."""
+    return not any(ch in _REGEX_META for ch in pattern)
+
+
+class DocumentIndex:
+    """SQLite-backed index shared by all document items of one SAIVerse home."""
+
+    def __init__(self, db_path: Path, text_cache_dir: Optional[Path] = None) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.text_cache_dir = Path(text_cache_dir) if text_cache_dir else self.db_path.parent / "document_text"
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, DocumentEntry]" = OrderedDict()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_key INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id TEXT NOT NULL UNIQUE,
+                source_path TEXT NOT NULL,
+                text_path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                offsets BLOB NOT NULL
+            )
+            """
+        )
+        self.fts_tokenizer = self._init_fts()
+        self._conn.commit()
+
+    def _init_fts(self) -> Optional[str]:
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS document_lines "
+                    f"USING fts5(content, tokenize='{tokenizer}')"
+                )
+                return tokenizer
+            except sqlite3.OperationalError:
+                continue
+        LOGGER.warning("SQLite FTS5 is unavailable; document search falls back to scanning")
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def ensure(self, item_id: str, path: Path) -> DocumentEntry:
+        """Return an up-to-date entry, (re)indexing the document if needed."""
+        path = Path(path)
+        stat = path.stat()
+        with self._lock:
+            entry = self._get_entry(item_id)
+            if (
+                entry is not None
+                and entry.source_path == str(path)
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+                and entry.text_path.exists()
+            ):
+                return entry
+            return self._index(item_id, path, stat)
+
+    def index(self, item_id: str, path: Path) -> DocumentEntry:
+        """Index (or fully re-index) one document."""
+        path = Path(path)
+        with self._lock:
+            return self._index(item_id, path, path.stat())
+
+    def append(self, item_id: str, path: Path, *, previous: Optional[os.stat_result] = None) -> DocumentEntry:
+        """Index text appended to an already indexed plain-text document.
+
+        Only the previous last line (which the append may have extended) and
+        the new lines are re-read. ``previous`` is the file's stat from just
+        before the write; when the indexed entry does not match it, the file
+        was changed some other way too. Falls back to a full index in that
+        case, when the document is unknown, is not plain text, or shrank.
+        """
+        path = Path(path)
+        stat = path.stat()
+        with self._lock:
+            entry = self._get_entry(item_id)
+            if (
+                entry is None
+                or entry.source_path != str(path)
+                or entry.text_path != path
+                or stat.st_size < entry.size
+                or (
+                    previous is not None
+                    and (entry.size != previous.st_size or entry.mtime_ns != previous.st_mtime_ns)
+                )
+            ):
+                return self._index(item_id, path, stat)
+            tail_line = entry.line_count - 1
+            tail_start = entry.offsets[tail_line]
+            with open(path, "rb") as handle:
+                # 既知の行境界がずれていないこと（直前の行が改行で終わっていること）を確かめる
+                if tail_start > 0:
+                    handle.seek(tail_start - 1)
+                    if handle.read(1) != b"\n":
+                        return self._index(item_id, path, stat)
+                handle.seek(tail_start)
+                tail = handle.read()
+            offsets = entry.offsets[:tail_line]
+            offsets.extend(_line_offsets(tail, tail_start))
+            if len(offsets) > _LINE_MASK:
+                return self._index(item_id, path, stat)
+            with self._conn:
+                if self.fts_tokenizer:
+                    self._delete_lines(entry.doc_key, tail_line)
+                    self._insert_lines(entry.doc_key, _split_lines(tail), tail_line)
+                self._conn.execute(
+                    "UPDATE documents SET mtime_ns = ?, size = ?, offsets = ? WHERE doc_key = ?",
+                    (stat.st_mtime_ns, stat.st_size, offsets.tobytes(), entry.doc_key),
+                )
+            entry.offsets = offsets
+            entry.mtime_ns = stat.st_mtime_ns
+            entry.size = stat.st_size
+            return entry
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT doc_key FROM documents WHERE item_id = ?", (item_id,)).fetchone()
+            self._entries.pop(item_id, None)
+            if row is None:
+                return
+            with self._conn:
+                if self.fts_tokenizer:
+                    self._delete_lines(row[0], 0)
+                self._conn.execute("DELETE FROM documents WHERE doc_key = ?", (row[0],))
+            (self.text_cache_dir / f"{row[0]}.txt").unlink(missing_ok=True)
+
+    def _index(self, item_id: str, path: Path, stat) -> DocumentEntry:
+        existing = self._conn.execute("SELECT doc_key FROM documents WHERE item_id = ?", (item_id,)).fetchone()
+        with self._conn:
+            if existing is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO documents (item_id, source_path, text_path, mtime_ns, size, offsets) "
+                    "VALUES (?, ?, '', 0, 0, x'')",
+                    (item_id, str(path)),
+                )
+                doc_key = cursor.lastrowid
+            else:
+                doc_key = existing[0]
+                if self.fts_tokenizer:
+                    self._delete_lines(doc_key, 0)
+
+            text_path = self._text_source(doc_key, path)
+            data = text_path.read_bytes()
+            offsets = _line_offsets(data)
+            if len(offsets) > _LINE_MASK:
+                raise RuntimeError(f"Document has too many lines to index: {path}")
+            if self.fts_tokenizer:
+                self._insert_lines(doc_key, _split_lines(data), 0)
+            self._conn.execute(
+                "UPDATE documents SET source_path = ?, text_path = ?, mtime_ns = ?, size = ?, offsets = ? "
+                "WHERE doc_key = ?",
+                (str(path), str(text_path), stat.st_mtime_ns, stat.st_size, offsets.tobytes(), doc_key),
+            )
+        entry = DocumentEntry(doc_key, str(path), text_path, stat.st_mtime_ns, stat.st_size, offsets)
+        self._remember(item_id, entry)
+        LOGGER.debug("Indexed document %s (%d lines)", item_id, entry.line_count)
+        return entry
+
+    def _text_source(self, doc_key: int, path: Path) -> Path:
+        """Plain-text file backing the line offsets (PDFs are extracted once)."""
+        if path.suffix.lower() != ".pdf":
+            return path
+        try:
+            from pypdf import PdfReader
+        except ImportError as exc:
+            raise RuntimeError("pypdf is not installed; PDF documents cannot be indexed") from exc
+        pages = [(page.extract_text() or "") for page in PdfReader(str(path)).pages]
+        self.text_cache_dir.mkdir(parents=True, exist_ok=True)
+        text_path = self.text_cache_dir / f"{doc_key}.txt"
+        text_path.write_text("\n".join(pages), encoding="utf-8")
+        return text_path
+
+    def _insert_lines(self, doc_key: int, lines: Iterable[str], first_line: int) -> None:
+        base = doc_key << _LINE_BITS
+        self._conn.executemany(
+            "INSERT INTO document_lines (rowid, content) VALUES (?, ?)",
+            ((base + first_line + i, line) for i, line in enumerate(lines)),
+        )
+
+    def _delete_lines(self, doc_key: int, first_line: int) -> None:
+        base = doc_key << _LINE_BITS
+        self._conn.execute(
+            "DELETE FROM document_lines WHERE rowid BETWEEN ? AND ?",
+            (base + first_line, base + _LINE_MASK),
+        )
+
+    def _get_entry(self, item_id: str) -> Optional[DocumentEntry]:
+        entry = self._entries.get(item_id)
+        if entry is not None:
+            self._entries.move_to_end(item_id)
+            return entry
+        row = self._conn.execute(
+            "SELECT doc_key, source_path, text_path, mtime_ns, size, offsets FROM documents WHERE item_id = ?",
+            (item_id,),
+        ).fetchone()
+        if row is None or not row[2]:
+            return None
+        offsets = array("q")
+        offsets.frombytes(row[5])
+        entry = DocumentEntry(row[0], row[1], Path(row[2]), row[3], row[4], offsets)
+        self._remember(item_id, entry)
+        return entry
+
+    def _remember(self, item_id: str, entry: DocumentEntry) -> None:
+        self._entries[item_id] = entry
+        self._entries.move_to_end(item_id)
+        while len(self._entries) > _ENTRY_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_lines(self, item_id: str, path: Path, start: int, end: int) -> Tuple[List[str], int]:
+        """Return lines ``[start, end)`` (0-based) and the document's total line count."""
+        entry = self.ensure(item_id, path)
+        total = entry.line_count
+        start = max(0, start)
+        end = min(total, end)
+        if start >= end:
+            return [], total
+        begin = entry.offsets[start]
+        with open(entry.text_path, "rb") as handle:
+            handle.seek(begin)
+            if end < total:
+                data = handle.read(entry.offsets[end] - 1 - begin)  # 末尾の改行は含めない
+            else:
+                data = handle.read()
+        return _split_lines(data), total
+
+    def search(
+        self,
+        pattern: str,
+        documents: Dict[str, Path],
+        *,
+        case_sensitive: bool = False,
+        limit: int = 10,
+    ) -> List[DocumentMatch]:
+        """Find lines matching ``pattern`` (regex) in ``documents`` (item_id -> path).
+
+        Literal patterns of three or more characters are answered from the
+        FTS table; anything else is scanned line by line from the indexed text.
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        regex = re.compile(pattern, flags)
+        entries: Dict[int, Tuple[str, DocumentEntry]] = {}
+        for item_id, path in documents.items():
+            try:
+                entry = self.ensure(item_id, path)
+                entries[entry.doc_key] = (item_id, entry)
+            except (OSError, RuntimeError) as exc:
+                LOGGER.warning("Skipping document %s in search: %s", item_id, exc)
+        if not entries or limit <= 0:
+            return []
+
+        if self.fts_tokenizer == "trigram" and is_literal_pattern(pattern) and len(pattern) >= 3:
+            candidates = self._fts_candidates(pattern, {key: item_id for key, (item_id, _) in entries.items()})
+        else:
+            candidates = self._scan_candidates(entries.values())
+
+        matches: List[DocumentMatch] = []
+        for item_id, line_index, text in candidates:
+            if regex.search(text):
+                matches.append(DocumentMatch(item_id, line_index, text))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def _fts_candidates(self, pattern: str, keys: Dict[int, str]) -> Iterator[Tuple[str, int, str]]:
+        placeholders = ", ".join("?" for _ in keys)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT rowid, content FROM document_lines WHERE document_lines MATCH ? "
+                f"AND (rowid >> {_LINE_BITS}) IN ({placeholders}) ORDER BY rowid",
+                (_fts_phrase(pattern), *keys),
+            ).fetchall()
+        for rowid, content in rows:
+            yield keys[rowid >> _LINE_BITS], rowid & _LINE_MASK, content
+
+    def _scan_candidates(self, entries: Iterable[Tuple[str, DocumentEntry]]) -> Iterator[Tuple[str, int, str]]:
+        for item_id, entry in entries:
+            for line_index, line in enumerate(_split_lines(entry.text_path.read_bytes())):
+                yield item_id, line_index, line
+
+
+__all__ = ["DocumentEntry", "DocumentIndex", "DocumentMatch", "is_literal_pattern"]
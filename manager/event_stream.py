@@ -0,0 +1,193 @@
+"""Asyncio-native NDJSON event stream fed from SEA worker threads.
+
+SEA pulses run on worker threads and report progress through an
+``event_callback``. ``AsyncEventStream`` hands those events to the event
+loop with ``loop.call_soon_threadsafe`` so the HTTP response wakes up as soon
+as an event exists (no queue polling), coalesces adjacent token deltas into
+a single frame (delta frames are written at most once per coalesce window),
+and emits ``ping`` frames from a loop timer only while the stream is idle.
+Producers block once ``max_pending`` events are waiting, so a slow client
+throttles the SEA thread instead of growing an unbounded queue.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Events whose ``content`` is an append-only delta and can be concatenated
+DELTA_EVENT_TYPES = frozenset({"streaming_chunk", "streaming_thinking"})
+# Events after which nothing more is sent to the client
+TERMINAL_EVENT_TYPES = frozenset({"cancelled"})
+
+_SENTINEL = object()
+_PING = {"type": "ping"}
+
+
+def _delta_key(event: Any) -> Optional[tuple]:
+    """Return a merge key for delta events, or None if the event is not mergeable."""
+    if not isinstance(event, dict) or event.get("type") not in DELTA_EVENT_TYPES:
+        return None
+    content = event.get("content")
+    if not isinstance(content, str):
+        return None
+    return tuple(sorted((k, v) for k, v in event.items() if k != "content" and isinstance(v, (str, int, type(None)))))
+
+
+def coalesce_events(events: List[Any]) -> List[Any]:
+    """Merge runs of adjacent delta events that only differ in ``content``."""
+    merged: List[Any] = []
+    last_key: Optional[tuple] = None
+    for event in events:
+        key = _delta_key(event)
+        if key is not None and key == last_key:
+            previous = merged[-1]
+            merged[-1] = {**previous, "content": previous["content"] + event["content"]}
+            continue
+        merged.append(event)
+        last_key = key
+    return merged
+
+
+def encode_event(event: Any) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+class AsyncEventStream:
+    """Thread-safe producer / async consumer bridge for streamed events.
+
+    Producers (any thread) call :meth:`push` and finally :meth:`close`.
+    The consumer iterates the stream inside the event loop and receives
+    already-encoded NDJSON text, one write per micro-batch.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        heartbeat_interval: float = 2.0,
+        coalesce_window: float = 0.0,
+        max_batch: int = 256,
+        max_pending: int = 1024,
+        backpressure_timeout: float = 30.0,
+    ) -> None:
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._heartbeat_interval = heartbeat_interval
+        self._coalesce_window = coalesce_window
+        self._max_batch = max_batch
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._last_emit = loop.time()
+        self._closed = False
+        # Set when the consumer stalled for a whole timeout; only affects push()
+        self._unthrottled = False
+        self._max_pending = max_pending
+        self._backpressure_timeout = backpressure_timeout
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+
+    # -- producer side (any thread) -----------------------------------
+
+    def push(self, event: Dict[str, Any]) -> None:
+        """Enqueue an event from any thread.
+
+        Blocks (up to ``backpressure_timeout``) while ``max_pending`` events
+        are still waiting to be written. Never blocks once the consumer is
+        gone or has stalled for a whole timeout.
+        """
+        with self._pending_cond:
+            if self._max_pending > 0 and not (self._closed or self._unthrottled):
+                drained = self._pending_cond.wait_for(
+                    lambda: self._pending < self._max_pending or self._closed,
+                    timeout=self._backpressure_timeout,
+                )
+                if not drained:
+                    # Consumer is not reading at all; stop throttling the producer.
+                    # Heartbeats keep running: the stream itself is still open.
+                    self._unthrottled = True
+            self._pending += 1
+        self._enqueue(event)
+
+    def close(self) -> None:
+        """Signal the end of the stream from any thread."""
+        self._enqueue(_SENTINEL)
+
+    def _enqueue(self, item: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        except RuntimeError:
+            # Loop already closed (client went away and server shut down)
+            pass
+
+    def _release(self, count: int) -> None:
+        if count <= 0:
+            return
+        with self._pending_cond:
+            self._pending = max(0, self._pending - count)
+            self._pending_cond.notify_all()
+
+    # -- consumer side (event loop) ------------------------------------
+
+    def _arm_heartbeat(self, delay: float) -> None:
+        if self._heartbeat_interval > 0 and not self._closed:
+            self._heartbeat_handle = self._loop.call_later(delay, self._on_heartbeat)
+
+    def _on_heartbeat(self) -> None:
+        idle = self._loop.time() - self._last_emit
+        if idle >= self._heartbeat_interval:
+            # Keep proxies from timing out the idle connection
+            self._queue.put_nowait(_PING)
+            self._arm_heartbeat(self._heartbeat_interval)
+        else:
+            self._arm_heartbeat(self._heartbeat_interval - idle)
+
+    def _drain_nowait(self, batch: List[Any]) -> bool:
+        """Move already-queued events into ``batch``. Returns True on sentinel."""
+        while len(batch) < self._max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if item is _SENTINEL:
+                return True
+            batch.append(item)
+        return False
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        self._arm_heartbeat(self._heartbeat_interval)
+        try:
+            finished = False
+            delta_sent = False
+            while not finished:
+                item = await self._queue.get()
+                if item is _SENTINEL:
+                    break
+                batch = [item]
+                is_delta = _delta_key(item) is not None
+                if self._coalesce_window > 0 and is_delta and delta_sent:
+                    # Writes are at least one window apart, so deltas already
+                    # coalesced upstream (SEA) are not held a second time.
+                    # The first delta goes out at once.
+                    wait = self._coalesce_window - (self._loop.time() - self._last_emit)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                delta_sent = delta_sent or is_delta
+                finished = self._drain_nowait(batch)
+                self._release(sum(1 for event in batch if event is not _PING))
+                for index, event in enumerate(batch):
+                    if isinstance(event, dict) and event.get("type") in TERMINAL_EVENT_TYPES:
+                        batch = batch[: index + 1]
+                        finished = True
+                        break
+                if len(batch) > 1:
+                    # Pings queued behind real events are redundant
+                    batch = [event for event in batch if event is not _PING] or [_PING]
+                self._last_emit = self._loop.time()
+                yield "".join(encode_event(event) for event in coalesce_events(batch))
+        finally:
+            with self._pending_cond:
+                self._closed = True
+                self._pending_cond.notify_all()
+            if self._heartbeat_handle is not None:
+                self._heartbeat_handle.cancel()
@@ -1,14 +1,23 @@
 import base64
 import hashlib
-import json
 import logging
-import os
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List, Sequence
 
 from discord_gateway.integration import ensure_gateway_runtime
 from discord_gateway.mapping import ChannelContext
+from discord_gateway.memory_transfer import (
+    ENCODING_IDENTITY,
+    PROTOCOL_VERSION,
+    MemorySpool,
+    MemoryTransferError,
+    OutgoingMemoryTransfer,
+    available_encodings,
+    default_encoding,
+    iter_json_document,
+)
 from discord_gateway.orchestrator import (
     MemorySyncCompletionResult,
     MemorySyncHandshakeResult,
@@ -16,12 +25,28 @@ from discord_gateway.orchestrator import (
 from discord_gateway.saiverse_adapter import DiscordMessage
 from discord_gateway.translator import GatewayCommand
 from discord_gateway.visitors import VisitorProfile
+from persona.building_history import ensure_building_history
+from persona.utils import env_int
+
+# v2 の initiate をこの理由で断るのは v1 しか知らない受信側（total_size 等が無いため）
+_V1_REJECTIONS = frozenset({"invalid_metadata", "missing_checksum"})
+
+
+def _memory_sync_max_bytes() -> int:
+    return env_int("SAIVERSE_GATEWAY_MEMORY_MAX_BYTES", 512 * 1024 * 1024)
 
 
 class GatewayMixin:
     """Discord gateway integration helpers."""
 
     def _initialize_gateway_integration(self) -> None:
+        # 中断されたまま再開されなかった受信スプールを片付ける
+        removed = MemorySpool.sweep(
+            self._gateway_memory_spool_root(),
+            env_int("SAIVERSE_GATEWAY_MEMORY_SPOOL_TTL_SEC", 24 * 60 * 60),
+        )
+        if removed:
+            logging.info("Removed %d abandoned gateway memory spool(s)", removed)
         bridge = ensure_gateway_runtime(self)
         if bridge:
             self.gateway_runtime = bridge.runtime
@@ -107,6 +132,14 @@ class GatewayMixin:
 
     def gateway_handle_memory_sync_initiate(
         self, visitor: VisitorProfile, payload: dict
+    ) -> MemorySyncHandshakeResult:
+        result = self._gateway_accept_memory_sync(visitor, payload)
+        # 送信側のバージョン交渉用に、受理・拒否に関わらず対応バージョンを返す
+        result.version = PROTOCOL_VERSION
+        return result
+
+    def _gateway_accept_memory_sync(
+        self, visitor: VisitorProfile, payload: dict
     ) -> MemorySyncHandshakeResult:
         transfer_id = payload.get("transfer_id", "").strip()
         if not transfer_id:
@@ -114,11 +147,17 @@ class GatewayMixin:
                 accepted=False, reason="missing_transfer_id"
             )
 
-        if transfer_id in self._gateway_memory_transfers:
+        try:
+            version = int(payload.get("version") or 1)
+        except (TypeError, ValueError):
+            return MemorySyncHandshakeResult(accepted=False, reason="invalid_metadata")
+        existing = self._gateway_memory_transfers.get(transfer_id)
+        if existing is not None and not (version >= 2 and payload.get("resume")):
             logging.warning("Duplicate memory transfer id: %s", transfer_id)
             return MemorySyncHandshakeResult(accepted=False, reason="duplicate_transfer")
 
-        if visitor.persona_id in self._gateway_memory_active_persona:
+        active = self._gateway_memory_active_persona.get(visitor.persona_id)
+        if active is not None and active != transfer_id:
             logging.warning(
                 "Persona %s already has an active memory transfer.", visitor.persona_id
             )
@@ -126,35 +165,63 @@ class GatewayMixin:
                 accepted=False, reason="transfer_in_progress"
             )
 
-        try:
-            total_size = int(payload.get("total_size"))
-            total_chunks = int(payload.get("total_chunks"))
-        except (TypeError, ValueError):
-            logging.warning("Invalid memory transfer metadata received: %s", payload)
-            return MemorySyncHandshakeResult(accepted=False, reason="invalid_metadata")
-
-        checksum = str(payload.get("checksum") or "").strip()
-        if not checksum:
-            return MemorySyncHandshakeResult(accepted=False, reason="missing_checksum")
-
-        if total_size < 0 or total_chunks <= 0:
-            return MemorySyncHandshakeResult(accepted=False, reason="invalid_metadata")
-
+        if version >= 2:
+            # v2: サイズ・チャンク数・チェックサムはストリーム終了時（complete）に届く
+            encoding = str(payload.get("encoding") or ENCODING_IDENTITY)
+            if encoding not in available_encodings():
+                return MemorySyncHandshakeResult(accepted=False, reason="unsupported_encoding")
+            total_size = None
+            total_chunks = None
+            checksum = ""
+        else:
+            encoding = ENCODING_IDENTITY
+            try:
+                total_size = int(payload.get("total_size"))
+                total_chunks = int(payload.get("total_chunks"))
+            except (TypeError, ValueError):
+                logging.warning("Invalid memory transfer metadata received: %s", payload)
+                return MemorySyncHandshakeResult(accepted=False, reason="invalid_metadata")
+
+            checksum = str(payload.get("checksum") or "").strip()
+            if not checksum:
+                return MemorySyncHandshakeResult(accepted=False, reason="missing_checksum")
+
+            if total_size < 0 or total_chunks <= 0:
+                return MemorySyncHandshakeResult(accepted=False, reason="invalid_metadata")
+
+        meta = {
+            "persona_id": visitor.persona_id,
+            "version": version,
+            "encoding": encoding,
+            "total_size": total_size,
+            "total_chunks": total_chunks,
+            "checksum": checksum,
+        }
+        spool, resumed = MemorySpool.open(self._gateway_memory_spool_root(), transfer_id, meta)
         state = {
             "persona_id": visitor.persona_id,
             "owner_user_id": visitor.owner_user_id,
+            "version": version,
+            "encoding": encoding,
             "expected_size": total_size,
             "expected_chunks": total_chunks,
             "checksum": checksum,
-            "bytes_received": 0,
-            "chunks_received": 0,
-            "buffer": bytearray(),
+            "spool": spool,
             "building_id": payload.get("building_id"),
             "city_id": payload.get("city_id"),
         }
         self._gateway_memory_transfers[transfer_id] = state
         self._gateway_memory_active_persona[visitor.persona_id] = transfer_id
-        return MemorySyncHandshakeResult(accepted=True)
+        if resumed:
+            logging.info(
+                "Resuming memory transfer %s from chunk %d (%d bytes spooled)",
+                transfer_id,
+                spool.next_index,
+                spool.size,
+            )
+        return MemorySyncHandshakeResult(
+            accepted=True, resume_from=spool.next_index if version >= 2 else None
+        )
 
     def gateway_handle_memory_sync_chunk(
         self, visitor: VisitorProfile, payload: dict
@@ -173,16 +240,7 @@ class GatewayMixin:
                 transfer_id,
                 visitor.persona_id,
             )
-            return [
-                GatewayCommand(
-                    type="memory_sync_complete",
-                    payload={
-                        "transfer_id": transfer_id,
-                        "status": "error",
-                        "reason": "unknown_transfer",
-                    },
-                )
-            ]
+            return [self._memory_sync_error(transfer_id, "unknown_transfer")]
 
         data = payload.get("data")
         if not data:
@@ -195,47 +253,59 @@ class GatewayMixin:
             logging.warning(
                 "Failed to decode memory chunk for %s: %s", visitor.persona_id, exc
             )
-            self._pop_memory_transfer(transfer_id)
-            return [
-                GatewayCommand(
-                    type="memory_sync_complete",
-                    payload={
-                        "transfer_id": transfer_id,
-                        "status": "error",
-                        "reason": "decode_error",
-                    },
+            self._pop_memory_transfer(transfer_id, discard=True)
+            return [self._memory_sync_error(transfer_id, "decode_error")]
+
+        spool: MemorySpool = state["spool"]
+        if state["version"] < 2:
+            # v1: 順番通りに届く前提で追記し、宣言されたサイズ・チャンク数を上限にする
+            try:
+                spool.append(chunk, max_size=state["expected_size"])
+                overflow = spool.next_index > state["expected_chunks"]
+            except MemoryTransferError:
+                overflow = True
+            if overflow:
+                logging.warning(
+                    "Memory transfer %s exceeded expected bounds (bytes=%s/%s, chunks=%s/%s)",
+                    transfer_id,
+                    spool.size,
+                    state["expected_size"],
+                    spool.next_index,
+                    state["expected_chunks"],
                 )
-            ]
-
-        state["buffer"].extend(chunk)
-        state["bytes_received"] += len(chunk)
-        state["chunks_received"] += 1
+                self._pop_memory_transfer(transfer_id, discard=True)
+                return [self._memory_sync_error(transfer_id, "overflow")]
+            return []
 
-        if (
-            state["bytes_received"] > state["expected_size"]
-            or state["chunks_received"] > state["expected_chunks"]
-        ):
+        chunk_index = payload.get("chunk_index")
+        if not isinstance(chunk_index, int) or isinstance(chunk_index, bool):
             logging.warning(
-                "Memory transfer %s exceeded expected bounds (bytes=%s/%s, chunks=%s/%s)",
-                transfer_id,
-                state["bytes_received"],
-                state["expected_size"],
-                state["chunks_received"],
-                state["expected_chunks"],
+                "Memory transfer %s: invalid chunk_index %r", transfer_id, chunk_index
             )
-            self._pop_memory_transfer(transfer_id)
-            return [
-                GatewayCommand(
-                    type="memory_sync_complete",
-                    payload={
-                        "transfer_id": transfer_id,
-                        "status": "error",
-                        "reason": "overflow",
-                    },
+            self._pop_memory_transfer(transfer_id, discard=True)
+            return [self._memory_sync_error(transfer_id, "invalid_metadata")]
+        try:
+            spool.append(
+                chunk,
+                index=chunk_index,
+                chunk_sha256=payload.get("chunk_sha256"),
+                max_size=_memory_sync_max_bytes(),
+            )
+        except MemoryTransferError as exc:
+            if exc.reason in {"out_of_order", "chunk_checksum_mismatch"}:
+                # 再送してもらえば回復できる: 受信済みの位置を返す
+                logging.info(
+                    "Memory transfer %s: %s at chunk %s, requesting resend from %d",
+                    transfer_id,
+                    exc.reason,
+                    payload.get("chunk_index"),
+                    spool.next_index,
                 )
-            ]
-
-        return []
+                return [self._memory_sync_chunk_ack(transfer_id, spool.next_index, resend=True)]
+            logging.warning("Memory transfer %s failed: %s", transfer_id, exc.reason)
+            self._pop_memory_transfer(transfer_id, discard=True)
+            return [self._memory_sync_error(transfer_id, exc.reason)]
+        return [self._memory_sync_chunk_ack(transfer_id, spool.next_index)]
 
     def gateway_handle_memory_sync_complete(
         self, visitor: VisitorProfile, payload: dict
@@ -248,28 +318,41 @@ class GatewayMixin:
         if not state:
             return MemorySyncCompletionResult(success=False, reason="unknown_transfer")
 
-        expected_size = state["expected_size"]
-        expected_chunks = state["expected_chunks"]
-        buffer = state["buffer"]
-
-        if state["bytes_received"] != expected_size:
-            self._pop_memory_transfer(transfer_id)
+        spool: MemorySpool = state["spool"]
+        if state["version"] >= 2:
+            try:
+                expected_size = int(payload.get("total_size"))
+                expected_chunks = int(payload.get("total_chunks"))
+            except (TypeError, ValueError):
+                self._pop_memory_transfer(transfer_id, discard=True)
+                return MemorySyncCompletionResult(success=False, reason="invalid_metadata")
+            checksum = str(payload.get("checksum") or "")
+        else:
+            expected_size = state["expected_size"]
+            expected_chunks = state["expected_chunks"]
+            checksum = state["checksum"]
+
+        if spool.size != expected_size:
+            self._pop_memory_transfer(transfer_id, discard=True)
             return MemorySyncCompletionResult(success=False, reason="size_mismatch")
 
-        if state["chunks_received"] != expected_chunks:
-            self._pop_memory_transfer(transfer_id)
+        if spool.next_index != expected_chunks:
+            self._pop_memory_transfer(transfer_id, discard=True)
             return MemorySyncCompletionResult(success=False, reason="chunk_mismatch")
 
-        checksum = hashlib.sha256(buffer).hexdigest()
-        if checksum != state["checksum"]:
-            self._pop_memory_transfer(transfer_id)
-            return MemorySyncCompletionResult(success=False, reason="checksum_mismatch")
-
         target_dir = self.saiverse_home / "gateway_memory"
-        target_dir.mkdir(parents=True, exist_ok=True)
         filename = f"{state['persona_id']}-{transfer_id}"
         target_path = target_dir / f"{filename}.bin"
-        target_path.write_bytes(buffer)
+        try:
+            spool.finalize(
+                target_path,
+                encoding=state["encoding"],
+                checksum=checksum,
+                max_output=_memory_sync_max_bytes(),
+            )
+        except MemoryTransferError as exc:
+            self._pop_memory_transfer(transfer_id, discard=True)
+            return MemorySyncCompletionResult(success=False, reason=exc.reason)
         logging.info(
             "Stored gateway memory for %s at %s (transfer=%s)",
             state["persona_id"],
@@ -279,15 +362,42 @@ class GatewayMixin:
         self._pop_memory_transfer(transfer_id)
         return MemorySyncCompletionResult(success=True)
 
-    def _pop_memory_transfer(self, transfer_id: str) -> Dict[str, Any] | None:
+    def _pop_memory_transfer(
+        self, transfer_id: str, *, discard: bool = False
+    ) -> Dict[str, Any] | None:
         state = self._gateway_memory_transfers.pop(transfer_id, None)
         if not state:
             return None
         persona_id = state.get("persona_id")
         if persona_id:
             self._gateway_memory_active_persona.pop(persona_id, None)
+        if discard and state.get("spool") is not None:
+            state["spool"].discard()
         return state
 
+    def _gateway_memory_spool_root(self) -> Path:
+        return self.saiverse_home / "gateway_memory_incoming"
+
+    @staticmethod
+    def _memory_sync_error(transfer_id: str, reason: str) -> GatewayCommand:
+        return GatewayCommand(
+            type="memory_sync_complete",
+            payload={
+                "transfer_id": transfer_id,
+                "status": "error",
+                "reason": reason,
+            },
+        )
+
+    @staticmethod
+    def _memory_sync_chunk_ack(
+        transfer_id: str, next_index: int, *, resend: bool = False
+    ) -> GatewayCommand:
+        payload: Dict[str, Any] = {"transfer_id": transfer_id, "next_index": next_index}
+        if resend:
+            payload["resend"] = True
+        return GatewayCommand(type="memory_sync_chunk_ack", payload=payload)
+
     def gateway_handle_ai_replies(
         self, building_id: str, persona, replies: Sequence[str]
     ) -> None:
@@ -304,59 +414,173 @@ class GatewayMixin:
         mapping = getattr(self, "gateway_mapping", None)
         if not runtime or not mapping:
             return
-        history = self.building_histories.get(building_id, [])
+        # 送信中も building_histories は伸び続けるので、開始時点の分を固定する
         persona_history = [
-            entry for entry in history if entry.get("persona_id") == visitor.persona_id
+            entry
+            for entry in list(self.building_histories.get(building_id, []))
+            if entry.get("persona_id") == visitor.persona_id
         ]
-        payload = {
+        header = {
             "persona_id": visitor.persona_id,
             "city_id": self.city_name,
             "building_id": building_id,
-            "history": persona_history,
         }
-        data_bytes = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-        if not data_bytes:
-            return
-        chunk_size = int(os.getenv("SAIVERSE_GATEWAY_MEMORY_CHUNK_SIZE", "65536"))
-        chunk_size = max(chunk_size, 1024)
+
+        def document():
+            return iter_json_document(header, "history", persona_history)
+
+        chunk_size = env_int("SAIVERSE_GATEWAY_MEMORY_CHUNK_SIZE", 65536)
+        window = env_int("SAIVERSE_GATEWAY_MEMORY_WINDOW", 8)
         transfer_id = f"{visitor.persona_id}-{int(time.time())}"
+        transfer = OutgoingMemoryTransfer(
+            transfer_id,
+            document(),
+            encoding=default_encoding(),
+            chunk_size=chunk_size,
+            window=window,
+        )
+        initiate_payload = {
+            "target_discord_user_id": visitor.owner_user_id,
+            "transfer_id": transfer_id,
+            "persona_id": visitor.persona_id,
+            "city_id": self.city_name,
+            "building_id": building_id,
+            "version": PROTOCOL_VERSION,
+            "encoding": transfer.encoding,
+        }
+        # 受信側が memory_sync_ack で v2 対応を示すまでチャンクは送らない
+        self._gateway_memory_outgoing[transfer_id] = {
+            "transfer": transfer,
+            "target_discord_user_id": visitor.owner_user_id,
+            "initiate": initiate_payload,
+            "document": document,
+            "negotiating": True,
+        }
+        self._gateway_send_command(
+            GatewayCommand(type="memory_sync_initiate", payload=initiate_payload)
+        )
+
+    def gateway_handle_memory_sync_progress(self, payload: dict) -> Sequence[GatewayCommand]:
+        """Sender side: react to the receiver's memory_sync_ack / memory_sync_chunk_ack."""
+
+        transfer_id = payload.get("transfer_id")
+        outgoing = self._gateway_memory_outgoing.get(transfer_id)
+        if not outgoing:
+            logging.debug("Memory sync ack for unknown outgoing transfer %s", transfer_id)
+            return []
+        if outgoing.pop("negotiating", False):
+            peer_version = payload.get("version")
+            if (
+                payload.get("status") == "error"
+                and not (isinstance(peer_version, int) and peer_version >= 2)
+                and payload.get("reason") in _V1_REJECTIONS
+            ):
+                logging.info(
+                    "Receiver of memory transfer %s does not support v2; falling back to v1",
+                    transfer_id,
+                )
+                self._gateway_memory_outgoing.pop(transfer_id, None)
+                return self._gateway_memory_sync_v1_commands(outgoing)
+        if payload.get("status") == "error":
+            logging.warning(
+                "Memory transfer %s rejected by receiver: %s", transfer_id, payload.get("reason")
+            )
+            self._gateway_memory_outgoing.pop(transfer_id, None)
+            return []
+        transfer: OutgoingMemoryTransfer = outgoing["transfer"]
+        try:
+            next_index = int(payload.get("next_index", transfer.acked))
+        except (TypeError, ValueError):
+            return []
+        if payload.get("resend") or ("status" in payload and outgoing.pop("resuming", False)):
+            # 受信側の位置から再送（再開・チャンク欠落・チェックサム不一致）
+            transfer.rewind(next_index)
+        else:
+            transfer.acknowledge(next_index)
+        return self._gateway_memory_sync_next_commands(transfer_id)
+
+    def gateway_handle_resync_required(self, payload: dict) -> None:
+        """Re-announce outgoing transfers so receivers report where to resume."""
+
+        for outgoing in list(self._gateway_memory_outgoing.values()):
+            outgoing["resuming"] = True
+            resume_payload = dict(outgoing["initiate"], resume=True)
+            self._gateway_send_command(
+                GatewayCommand(type="memory_sync_initiate", payload=resume_payload)
+            )
+
+    def _gateway_memory_sync_v1_commands(self, outgoing: Dict[str, Any]) -> List[GatewayCommand]:
+        """Protocol v1: the whole uncompressed document with size and checksum up front."""
+
+        initiate = outgoing["initiate"]
+        transfer: OutgoingMemoryTransfer = outgoing["transfer"]
+        target = outgoing["target_discord_user_id"]
+        transfer_id = initiate["transfer_id"]
+        data_bytes = b"".join(outgoing["document"]())
+        chunk_size = transfer.chunk_size
         checksum = hashlib.sha256(data_bytes).hexdigest()
         total_chunks = (len(data_bytes) + chunk_size - 1) // chunk_size
-        initiate = GatewayCommand(
-            type="memory_sync_initiate",
-            payload={
-                "target_discord_user_id": visitor.owner_user_id,
-                "transfer_id": transfer_id,
-                "persona_id": visitor.persona_id,
-                "city_id": self.city_name,
-                "building_id": building_id,
-                "total_size": len(data_bytes),
-                "total_chunks": total_chunks,
-                "checksum": checksum,
-            },
-        )
-        self._gateway_send_command(initiate)
+        v1_initiate = {
+            key: value for key, value in initiate.items() if key not in {"version", "encoding"}
+        }
+        commands = [
+            GatewayCommand(
+                type="memory_sync_initiate",
+                payload={
+                    **v1_initiate,
+                    "total_size": len(data_bytes),
+                    "total_chunks": total_chunks,
+                    "checksum": checksum,
+                },
+            )
+        ]
         for index in range(total_chunks):
             chunk = data_bytes[index * chunk_size : (index + 1) * chunk_size]
-            command = GatewayCommand(
-                type="memory_sync_chunk",
+            commands.append(
+                GatewayCommand(
+                    type="memory_sync_chunk",
+                    payload={
+                        "target_discord_user_id": target,
+                        "transfer_id": transfer_id,
+                        "chunk_index": index,
+                        "data": base64.b64encode(chunk).decode("ascii"),
+                    },
+                )
+            )
+        commands.append(
+            GatewayCommand(
+                type="memory_sync_complete",
                 payload={
-                    "target_discord_user_id": visitor.owner_user_id,
+                    "target_discord_user_id": target,
                     "transfer_id": transfer_id,
-                    "chunk_index": index,
-                    "data": base64.b64encode(chunk).decode("ascii"),
+                    "checksum": checksum,
                 },
             )
-            self._gateway_send_command(command)
-        complete = GatewayCommand(
-            type="memory_sync_complete",
-            payload={
-                "target_discord_user_id": visitor.owner_user_id,
-                "transfer_id": transfer_id,
-                "checksum": checksum,
-            },
         )
-        self._gateway_send_command(complete)
+        return commands
+
+    def _gateway_memory_sync_next_commands(self, transfer_id: str) -> List[GatewayCommand]:
+        outgoing = self._gateway_memory_outgoing.get(transfer_id)
+        if not outgoing:
+            return []
+        transfer: OutgoingMemoryTransfer = outgoing["transfer"]
+        target = outgoing["target_discord_user_id"]
+        commands = [
+            GatewayCommand(
+                type="memory_sync_chunk",
+                payload={"target_discord_user_id": target, **transfer.chunk_payload(index, chunk)},
+            )
+            for index, chunk in transfer.sendable()
+        ]
+        if transfer.finished:
+            self._gateway_memory_outgoing.pop(transfer_id, None)
+            commands.append(
+                GatewayCommand(
+                    type="memory_sync_complete",
+                    payload={"target_discord_user_id": target, **transfer.summary()},
+                )
+            )
+        return commands
 
     def _gateway_send_message(
         self, building_id: str, content: str, persona_id: str | None
@@ -390,6 +614,6 @@ class GatewayMixin:
         runtime.submit(enqueue())
 
     def _append_gateway_history(self, building_id: str, entry: Dict[str, Any]) -> None:
-        history = self.building_histories.setdefault(building_id, [])
+        history = ensure_building_history(self.building_histories, building_id)
         history.append(entry)
         self._save_building_histories()
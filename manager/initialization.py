@@ -11,7 +11,9 @@ from zoneinfo import ZoneInfo
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from persona.building_history import BuildingHistory
 from saiverse.buildings import Building
+from saiverse.sql_profiler import instrument_engine, sql_profiling_enabled
 from database.models import City as CityModel
 
 if TYPE_CHECKING:
@@ -39,6 +41,8 @@ class InitializationMixin:
         DATABASE_URL = f"sqlite:///{db_path}"
         engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
         event.listen(engine, "connect", self._set_sqlite_pragmas)
+        if sql_profiling_enabled():
+            instrument_engine(engine, "main")
         self._ensure_city_timezone_column(engine)
         self._ensure_user_avatar_column(engine)
         self._ensure_city_host_avatar_column(engine)
@@ -158,12 +162,12 @@ class InitializationMixin:
         for b_id, path in self.building_memory_paths.items():
             if path.exists():
                 try:
-                    self.building_histories[b_id] = json.loads(path.read_text(encoding="utf-8"))
+                    self.building_histories[b_id] = BuildingHistory(json.loads(path.read_text(encoding="utf-8")))
                 except json.JSONDecodeError:
                     LOGGER.warning("Failed to load building history %s", b_id)
-                    self.building_histories[b_id] = []
+                    self.building_histories[b_id] = BuildingHistory()
             else:
-                self.building_histories[b_id] = []
+                self.building_histories[b_id] = BuildingHistory()
 
     def _init_model_config(self, model: Optional[str]) -> None:
         """Step 4a: Initialize model configuration."""
@@ -183,6 +187,8 @@ class InitializationMixin:
         self.metabolism_enabled: bool = True
         self.metabolism_keep_messages_override: Optional[int] = None
         self.startup_warnings: List[Dict[str, str]] = []
+        # 起動フェーズごとの所要時間など（ユーザー向け警告ではない診断情報）
+        self.startup_diagnostics: List[Dict[str, Any]] = []
 
     def _update_timezone_cache(self, tz_name: Optional[str]) -> None:
         """Update cached timezone information for this manager.
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
 import uuid
 from collections import defaultdict
 from datetime import datetime
@@ -15,6 +17,7 @@ from database.models import (
 )
 
 if TYPE_CHECKING:
+    from manager.document_index import DocumentIndex
     from manager.state import CoreState
 
 LOGGER = logging.getLogger(__name__)
@@ -33,6 +36,8 @@ class ItemService:
         self.items_by_building: Dict[str, List[str]] = defaultdict(list)
         self.items_by_persona: Dict[str, List[str]] = defaultdict(list)
         self.world_items: List[str] = []
+        self._document_index: Optional["DocumentIndex"] = None
+        self._document_index_lock = threading.Lock()
 
     def _resolve_file_path(self, file_path_str: str) -> Path:
         """Resolve file path, handling legacy WSL paths and relative paths.
@@ -86,6 +91,65 @@ class ItemService:
         # Return original path if no recovery worked
         return path
 
+    @property
+    def document_index(self) -> "DocumentIndex":
+        """Lazily opened line-offset / full-text index for document items."""
+        if self._document_index is None:
+            with self._document_index_lock:
+                if self._document_index is None:
+                    from manager.document_index import DocumentIndex
+                    self._document_index = DocumentIndex(
+                        Path(self.manager.saiverse_home) / "cache" / "document_index.sqlite3"
+                    )
+        return self._document_index
+
+    def resolve_document(self, item_id: str) -> tuple[Dict, Path]:
+        """Return ``(item, file_path)`` for a document item or raise RuntimeError."""
+        item = self.items.get(item_id)
+        if not item:
+            raise RuntimeError(f"Item '{item_id}' not found.")
+        if (item.get("type") or "").lower() != "document":
+            raise RuntimeError(f"Item '{item_id}' is not a document type.")
+        file_path_str = item.get("file_path")
+        if not file_path_str:
+            raise RuntimeError("This document has no file_path set.")
+        file_path = self._resolve_file_path(file_path_str)
+        if not file_path.exists():
+            raise RuntimeError(f"File not found: {file_path}")
+        return item, file_path
+
+    def accessible_document_ids(self, persona_id: str) -> List[str]:
+        """Document items in the persona's inventory and current building."""
+        item_ids = list(self.items_by_persona.get(persona_id, []))
+        persona = self.manager.personas.get(persona_id)
+        building_id = getattr(persona, "current_building_id", None) if persona else None
+        if building_id:
+            item_ids.extend(self.items_by_building.get(building_id, []))
+        seen = set()
+        documents = []
+        for item_id in item_ids:
+            item = self.items.get(item_id)
+            if item_id in seen or not item or (item.get("type") or "").lower() != "document":
+                continue
+            seen.add(item_id)
+            documents.append(item_id)
+        return documents
+
+    def _update_document_index(
+        self, item_id: str, file_path: Path, *, previous: Optional[os.stat_result] = None
+    ) -> None:
+        """Best effort: a failure only means the tools index lazily on next access.
+
+        ``previous`` (the stat before an append) selects the incremental path.
+        """
+        try:
+            if previous is not None:
+                self.document_index.append(item_id, file_path, previous=previous)
+            else:
+                self.document_index.index(item_id, file_path)
+        except Exception as exc:
+            LOGGER.warning("Failed to index document %s: %s", item_id, exc)
+
     def load_items_from_db(self) -> None:
         """Load items and their locations from the database into memory."""
         db = self.manager.SessionLocal()
@@ -477,12 +541,15 @@ class ItemService:
 
         patch = action_data.get("patch", "")
         try:
-            current_content = file_path.read_text(encoding="utf-8")
-            new_content = current_content + "\n" + patch
-            file_path.write_text(new_content, encoding="utf-8")
+            previous = file_path.stat()
+            # 追記のみ: 既存部分の改行コードは変えない（索引の行オフセットがそのまま使える）
+            with open(file_path, "a", encoding="utf-8", newline="") as handle:
+                handle.write("\n" + patch)
         except OSError as exc:
             raise RuntimeError(f"ファイルの更新に失敗しました: {exc}") from exc
 
+        self._update_document_index(item_id, file_path, previous=previous)
+
         from saiverse.media_summary import ensure_document_summary
         new_summary = ensure_document_summary(file_path)
 
@@ -706,6 +773,7 @@ class ItemService:
         }
         self.items_by_building[building_id].append(item_id)
         self.refresh_building_system_instruction(building_id)
+        self._update_document_index(item_id, file_path)
 
         building_name = self.manager.building_map.get(building_id).name if building_id in self.manager.building_map else building_id
         actor_msg = f"「{name}」という文書を作成し、{building_name}に配置した。"
@@ -960,6 +1028,7 @@ class ItemService:
         }
         self.items_by_building[building_id].append(item_id)
         self.refresh_building_system_instruction(building_id)
+        self._update_document_index(item_id, self._resolve_file_path(relative_path))
 
         building_name = self.manager.building_map.get(building_id).name if building_id in self.manager.building_map else building_id
         note = (
@@ -1,7 +1,10 @@
 import base64
 import logging
 import mimetypes
+import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -12,13 +15,21 @@ from saiverse.buildings import Building
 from database.models import (
     AI as AIModel,
     Building as BuildingModel,
+    BuildingOccupancyCurrent,
     BuildingOccupancyLog,
     BuildingToolLink,
     User,
     UserAiLink,
 )
+from persona.building_history import ensure_building_history
 from persona.core import PersonaCore
+from persona.utils import env_int
 from saiverse.model_configs import get_context_length, get_model_provider
+from saiverse.startup_profiler import get_startup_profiler
+
+
+# 1ターン終了時のフラッシュと定期フラッシュが同時に走らないようにする
+_session_flush_lock = threading.Lock()
 
 
 class PersonaMixin:
@@ -45,6 +56,8 @@ class PersonaMixin:
     avatar_map: Dict[str, str]
     persona_map: Dict[str, str]
     id_to_name_map: Dict[str, str]
+    startup_warnings: List[Dict[str, str]]
+    startup_diagnostics: List[Dict[str, object]]
 
     def _set_persona_avatar(self, ai_id: str, avatar_value: Optional[str]) -> None:
         """Update in-memory avatar cache and persona reference."""
@@ -89,18 +102,82 @@ class PersonaMixin:
         )
         return str(dest_path)
 
+    def _persona_load_mode(self) -> str:
+        """SAIVERSE_PERSONA_LOAD_MODE: serial / parallel (default) / lazy."""
+        mode = os.getenv("SAIVERSE_PERSONA_LOAD_MODE", "parallel").strip().lower()
+        if mode not in {"serial", "parallel", "lazy"}:
+            logging.warning("Unknown SAIVERSE_PERSONA_LOAD_MODE '%s'; using 'parallel'.", mode)
+            mode = "parallel"
+        return mode
+
+    def _record_startup_timing(self, phase: str, seconds: float, **extra) -> None:
+        entry = {
+            "source": "startup_timing",
+            "phase": phase,
+            "seconds": round(seconds, 3),
+            "message": f"{phase}: {seconds:.3f}s",
+            **extra,
+        }
+        self.startup_diagnostics.append(entry)
+        logging.info("[startup] %s took %.3fs %s", phase, seconds, extra or "")
+        profiler = get_startup_profiler()
+        if profiler is not None:
+            profiler.record_phase(phase, seconds, **extra)
+
+    def _fetch_linked_user_names(self, db, persona_ids: List[str]) -> Dict[str, str]:
+        """Return {AIID: USERNAME} of the first linked user for each persona (one query)."""
+        if not persona_ids:
+            return {}
+        rows = (
+            db.query(UserAiLink.AIID, User.USERNAME)
+            .join(User, User.USERID == UserAiLink.USERID)
+            .filter(UserAiLink.AIID.in_(persona_ids))
+            .all()
+        )
+        names: Dict[str, str] = {}
+        for ai_id, username in rows:
+            names.setdefault(ai_id, username)
+        return names
+
     def _load_personas_from_db(self) -> None:
-        """DBからペルソナ情報を読み込み、PersonaCoreインスタンスを生成する"""
+        """DBからペルソナ情報を読み込み、PersonaCoreインスタンスを生成する
+
+        serial 以外のモードではペルソナの外殻（履歴・セッション情報）だけを先に
+        生成し、SAIMemory アダプタはスレッドプール（parallel）または初回アクセス時
+        （lazy）に初期化する。各フェーズの所要時間は startup_diagnostics に残す。
+        """
+        mode = self._persona_load_mode()
         db = self.SessionLocal()
+        executor: Optional[ThreadPoolExecutor] = None
         try:
+            started = time.perf_counter()
             db_personas = (
                 db.query(AIModel).filter(AIModel.HOME_CITYID == self.city_id).all()
             )
+            linked_users = self._fetch_linked_user_names(db, [ai.AIID for ai in db_personas])
+            self._record_startup_timing(
+                "persona_query", time.perf_counter() - started, count=len(db_personas)
+            )
+
+            if mode == "parallel" and db_personas:
+                workers = env_int("SAIVERSE_PERSONA_LOAD_WORKERS", 4)
+                executor = ThreadPoolExecutor(
+                    max_workers=max(1, min(workers, len(db_personas))),
+                    thread_name_prefix="persona-memory",
+                )
+
+            shells_started = time.perf_counter()
             failed_count = 0
             for db_ai in db_personas:
                 pid = db_ai.AIID
                 try:
-                    self._load_single_persona(db, db_ai)
+                    self._load_single_persona(
+                        db,
+                        db_ai,
+                        linked_user_name=linked_users.get(pid, "the user"),
+                        defer_memory=mode != "serial",
+                        memory_executor=executor,
+                    )
                 except Exception as exc:
                     failed_count += 1
                     msg = f"Failed to load persona '{pid}': {exc}"
@@ -109,26 +186,31 @@ class PersonaMixin:
                         "source": "persona_load",
                         "message": msg,
                     })
+            self._record_startup_timing(
+                "persona_shells" if mode != "serial" else "personas",
+                time.perf_counter() - shells_started,
+                mode=mode,
+                count=len(self.personas),
+            )
             logging.info(
-                "Loaded %d personas from database (%d failed).",
-                len(self.personas), failed_count,
+                "Loaded %d personas from database (%d failed, mode=%s).",
+                len(self.personas), failed_count, mode,
             )
-            # Check for embedding model changes across all loaded personas
-            changed_personas = [
-                pid
-                for pid, p in self.personas.items()
-                if getattr(getattr(p, "memory", None), "embed_model_changed", False)
-            ]
-            if changed_personas:
-                names = ", ".join(changed_personas)
-                self.startup_warnings.append({
-                    "source": "embed_model_mismatch",
-                    "message": (
-                        f"Embeddingモデルが変更されました。記憶想起を正常に動作させるため、"
-                        f"再計算を推奨します。（対象: {names}）"
-                    ),
-                    "persona_ids": changed_personas,
-                })
+            if mode == "serial":
+                self._check_embed_model_changes(list(self.personas.values()))
+            elif executor is not None:
+                futures = {
+                    pid: p.sai_memory_future
+                    for pid, p in self.personas.items()
+                    if p.sai_memory_future is not None
+                }
+                executor.shutdown(wait=False)
+                threading.Thread(
+                    target=self._await_memory_adapters,
+                    args=(futures, time.perf_counter()),
+                    name="persona-memory-wait",
+                    daemon=True,
+                ).start()
         except Exception as exc:
             msg = f"Failed to query personas from DB: {exc}"
             logging.error(msg, exc_info=True)
@@ -136,10 +218,52 @@ class PersonaMixin:
                 "source": "persona_load",
                 "message": msg,
             })
+            if executor is not None:
+                executor.shutdown(wait=False)
         finally:
             db.close()
 
-    def _load_single_persona(self, db, db_ai) -> None:
+    def _await_memory_adapters(self, futures: Dict[str, "Future"], started: float) -> None:
+        """Wait for background SAIMemory initialisation, then report timing and model changes."""
+        for pid, future in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                logging.warning("SAIMemory initialisation failed for %s: %s", pid, exc)
+        self._record_startup_timing(
+            "memory_adapters", time.perf_counter() - started, mode="parallel", count=len(futures)
+        )
+        self._check_embed_model_changes(
+            [p for pid, p in self.personas.items() if pid in futures]
+        )
+
+    def _check_embed_model_changes(self, personas: List[PersonaCore]) -> None:
+        """Check for embedding model changes across loaded personas."""
+        changed_personas = [
+            p.persona_id
+            for p in personas
+            if getattr(p.sai_memory, "embed_model_changed", False)
+        ]
+        if changed_personas:
+            names = ", ".join(changed_personas)
+            self.startup_warnings.append({
+                "source": "embed_model_mismatch",
+                "message": (
+                    f"Embeddingモデルが変更されました。記憶想起を正常に動作させるため、"
+                    f"再計算を推奨します。（対象: {names}）"
+                ),
+                "persona_ids": changed_personas,
+            })
+
+    def _load_single_persona(
+        self,
+        db,
+        db_ai,
+        *,
+        linked_user_name: Optional[str] = None,
+        defer_memory: bool = False,
+        memory_executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
         """単一のペルソナをDBレコードからロードする"""
         pid = db_ai.AIID
         default_room_id = f"{pid}_room"
@@ -157,15 +281,8 @@ class PersonaMixin:
         common_prompt_file = find_file(PROMPTS_DIR, "common.txt") or Path("system_prompts/common.txt")
 
         # Get linked user name (first linked user, or "the user" as fallback)
-        linked_user_name = "the user"
-        linked_user = (
-            db.query(User)
-            .join(UserAiLink, User.USERID == UserAiLink.USERID)
-            .filter(UserAiLink.AIID == pid)
-            .first()
-        )
-        if linked_user:
-            linked_user_name = linked_user.USERNAME
+        if linked_user_name is None:
+            linked_user_name = self._fetch_linked_user_names(db, [pid]).get(pid, "the user")
 
         persona = PersonaCore(
             city_name=self.city_name,
@@ -200,6 +317,9 @@ class PersonaMixin:
             persona_event_ack=self.archive_persona_events,
             manager_ref=self,
             linked_user_name=linked_user_name,
+            ai_record=db_ai,
+            defer_memory=defer_memory,
+            memory_executor=memory_executor,
         )
 
         persona.private_room_id = private_room_id
@@ -212,14 +332,63 @@ class PersonaMixin:
 
         self.personas[pid] = persona
 
+    def _flush_session_metadata(
+        self, personas: Optional[List[PersonaCore]] = None, *, force: bool = False
+    ) -> int:
+        """Persist session state of personas that changed, in one DB transaction.
+
+        Personas whose emotion / auto_count / auto-prompt times are unchanged
+        are skipped entirely; log files are rewritten only when dirty.
+        Returns the number of personas whose AI row was updated.
+        """
+        if personas is None:
+            personas = list(self.personas.values())
+        with _session_flush_lock:
+            updates = []
+            for persona in personas:
+                if persona.is_visitor:
+                    continue
+                data = persona._session_db_snapshot() if force else persona._pending_session_db_update()
+                if data:
+                    updates.append((persona, data))
+
+            if updates:
+                db = self.SessionLocal()
+                try:
+                    for persona, data in updates:
+                        db.query(AIModel).filter(AIModel.AIID == persona.persona_id).update(data)
+                    db.commit()
+                    for persona, data in updates:
+                        persona._mark_session_db_saved(data)
+                    logging.debug(
+                        "Flushed session metadata for %s",
+                        [persona.persona_id for persona, _ in updates],
+                    )
+                except Exception as exc:
+                    db.rollback()
+                    updates = []
+                    logging.error("Failed to flush session metadata: %s", exc, exc_info=True)
+                finally:
+                    db.close()
+
+            for persona in personas:
+                try:
+                    persona._save_session_files(force=force)
+                except Exception as exc:
+                    logging.error(
+                        "Failed to save session files for %s: %s", persona.persona_id, exc, exc_info=True
+                    )
+        return len(updates)
+
     def _load_occupancy_from_db(self) -> None:
         """DBから現在の入室状況を読み込み、PersonaCoreとManagerの状態を更新する"""
+        started = time.perf_counter()
         db = self.SessionLocal()
         try:
+            # スナップショットテーブルは在室中の行だけを持つため、履歴量に依存しない
             current_occupancy = (
-                db.query(BuildingOccupancyLog)
-                .filter(BuildingOccupancyLog.CITYID == self.city_id)
-                .filter(BuildingOccupancyLog.EXIT_TIMESTAMP.is_(None))
+                db.query(BuildingOccupancyCurrent)
+                .filter(BuildingOccupancyCurrent.CITYID == self.city_id)
                 .all()
             )
 
@@ -243,6 +412,7 @@ class PersonaMixin:
             if hasattr(self, "state"):
                 self.state.occupants = self.occupants
             logging.info("Loaded current occupancy from database.")
+            self._record_startup_timing("occupancy", time.perf_counter() - started)
         except Exception as exc:
             msg = f"Failed to load occupancy from DB: {exc}"
             logging.error(msg, exc_info=True)
@@ -360,7 +530,7 @@ class PersonaMixin:
                 / new_building_id
                 / "log.json"
             )
-            self.building_histories[new_building_id] = []
+            ensure_building_history(self.building_histories, new_building_id)
 
             # Auto-link user if there is exactly one user
             user_count = db.query(User).count()
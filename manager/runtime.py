@@ -1,9 +1,11 @@
+import asyncio
 import importlib
 import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import requests
 import threading
@@ -19,6 +21,8 @@ from manager.gateway import GatewayMixin
 from manager.sds import SDSMixin
 from manager.background import DatabasePollingMixin
 from manager.state import CoreState
+from manager.event_stream import AsyncEventStream
+from persona.utils import env_float
 from database.models import (
     BuildingOccupancyLog,
     BuildingToolLink,
@@ -36,6 +40,12 @@ try:
 except ImportError:
     TRIGGERS_AVAILABLE = False
 
+# Worker threads for streamed user turns (replaces one daemon thread per request)
+_USER_TURN_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sea-user-turn")
+# Post-turn persistence gets its own worker so it never queues behind running turns
+_USER_TURN_FINISH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sea-user-turn-finish")
+
+
 class RuntimeService(
     VisitorMixin, GatewayMixin, SDSMixin, DatabasePollingMixin, PersonaMixin
 ):
@@ -85,6 +95,7 @@ class RuntimeService(
         self.occupancy_manager = manager.occupancy_manager
         self._gateway_memory_transfers = manager._gateway_memory_transfers
         self._gateway_memory_active_persona = manager._gateway_memory_active_persona
+        self._gateway_memory_outgoing = manager._gateway_memory_outgoing
         self.gateway_runtime = manager.gateway_runtime
         self.gateway_mapping = manager.gateway_mapping
 
@@ -408,30 +419,24 @@ class RuntimeService(
         logging.debug("[runtime] handle_user_input collected %d replies", len(replies))
 
         self._save_building_histories()
-        for persona in self.personas.values():
-            persona._save_session_metadata()
+        self.manager._flush_session_metadata()
         return replies
 
-    def handle_user_input_stream(
-        self, message: str, metadata: Optional[Dict[str, Any]] = None, meta_playbook: Optional[str] = None,
-        args: Optional[Dict[str, Any]] = None, building_id: Optional[str] = None,
-    ) -> Iterator[str]:
-        logging.debug(
-            "[runtime] handle_user_input_stream called (metadata_present=%s, meta_playbook=%s, args=%s, building_id=%s)",
-            bool(metadata),
-            meta_playbook,
-            bool(args),
-            building_id,
-        )
+    def _resolve_user_turn(
+        self, message: str, building_id: Optional[str]
+    ) -> Tuple[Optional[str], List[Any], Optional[str]]:
+        """Validate a user turn and pick responding personas.
+
+        Returns ``(building_id, personas, error_html)``; ``error_html`` is set
+        when the turn must be aborted.
+        """
         if not message or not str(message).strip():
             logging.error("[runtime] handle_user_input_stream got empty message; aborting to avoid corrupt routing")
-            yield '<div class="note-box">入力が空でした。再送してください。</div>'
-            return
+            return None, [], '<div class="note-box">入力が空でした。再送してください。</div>'
 
         building_id = building_id or self.state.user_current_building_id
         if not building_id:
-            yield '<div class="note-box">エラー: ユーザーの現在地が不明です。</div>'
-            return
+            return None, [], '<div class="note-box">エラー: ユーザーの現在地が不明です。</div>'
         logging.debug("[runtime] handle_user_input_stream building_id=%s", building_id)
         responding_personas = [
             self.personas[pid]
@@ -443,10 +448,120 @@ class RuntimeService(
             [p.persona_id for p in responding_personas],
             self.occupants.get(building_id, []),
         )
+        return building_id, responding_personas, None
 
-        user_entry = {"role": "user", "content": message}
-        if metadata:
-            user_entry["metadata"] = metadata
+    def _enrich_stream_event(
+        self, event: Any, profile_cache: Optional[Dict[str, Optional[Tuple[str, str]]]] = None,
+    ) -> Any:
+        """Enrich streaming events with resolved persona name and avatar URL.
+
+        ``profile_cache`` keeps the resolved (name, avatar URL) per persona for
+        the lifetime of one stream so token events do not repeat the lookups.
+        """
+        if isinstance(event, dict) and event.get("persona_id"):
+            pid = event["persona_id"]
+            if profile_cache is not None and pid in profile_cache:
+                profile = profile_cache[pid]
+            else:
+                p = self.personas.get(pid)
+                profile = (
+                    p.persona_name,
+                    avatar_path_to_url(p.avatar_image) or "/api/static/builtin_icons/host.png",
+                ) if p else None
+                if profile_cache is not None:
+                    profile_cache[pid] = profile
+            if profile:
+                if not event.get("persona_name"):
+                    event["persona_name"] = profile[0]
+                if not event.get("persona_avatar"):
+                    event["persona_avatar"] = profile[1]
+        return event
+
+    def _run_user_turn(
+        self,
+        responding_personas: List[Any],
+        building_id: str,
+        message: str,
+        metadata: Optional[Dict[str, Any]],
+        meta_playbook: Optional[str],
+        args: Optional[Dict[str, Any]],
+        stop_event: threading.Event,
+        emit: Callable[[Any], None],
+    ) -> None:
+        """Run SEA for each responding persona, reporting events through ``emit``.
+
+        ``emit(None)`` is always called last as the end-of-stream sentinel.
+        """
+        profile_cache: Dict[str, Optional[Tuple[str, str]]] = {}
+
+        def _event_callback(event):
+            emit(self._enrich_stream_event(event, profile_cache))
+
+        try:
+            for persona in responding_personas:
+                if stop_event.is_set():
+                    logging.info("[runtime] Stop event detected; breaking persona loop for building %s", building_id)
+                    emit({"type": "cancelled", "content": "生成を中止しました。"})
+                    break
+                # SEA実行。イベントはコールバック経由で送る
+                self.manager.run_sea_user(
+                    persona, building_id, message,
+                    metadata=metadata,
+                    meta_playbook=meta_playbook,
+                    args=args,
+                    event_callback=_event_callback
+                )
+                # Check stop event after each persona completes
+                if stop_event.is_set():
+                    logging.info("[runtime] Stop event detected after persona %s; breaking loop", persona.persona_id)
+                    emit({"type": "cancelled", "content": "生成を中止しました。"})
+                    break
+        except LLMError as e:
+            logging.error("SEA worker LLM error: %s", e, exc_info=True)
+            if stop_event.is_set():
+                emit({"type": "cancelled", "content": "生成を中止しました。"})
+            else:
+                emit(e.to_dict())
+        except Exception as e:
+            logging.error("SEA worker error", exc_info=True)
+            if stop_event.is_set():
+                emit({"type": "cancelled", "content": "生成を中止しました。"})
+            else:
+                emit({
+                    "type": "error",
+                    "error_code": "unknown",
+                    "content": "予期せぬエラーが発生しました。",
+                    "technical_detail": str(e),
+                })
+        finally:
+            emit(None)  # 番兵
+
+    def _finish_user_turn(self, building_id: str, stop_event: threading.Event) -> None:
+        """Release the stop event and persist histories after a user turn."""
+        # Only drop the stop event if a newer turn has not replaced it
+        if self.manager._active_stop_events.get(building_id) is stop_event:
+            self.manager._active_stop_events.pop(building_id, None)
+
+        bh_sizes = {bid: len(h) for bid, h in self.building_histories.items() if h}
+        logging.debug("[runtime] pre-save building_histories sizes: %s", bh_sizes)
+        self._save_building_histories()
+        self.manager._flush_session_metadata()
+
+    def handle_user_input_stream(
+        self, message: str, metadata: Optional[Dict[str, Any]] = None, meta_playbook: Optional[str] = None,
+        args: Optional[Dict[str, Any]] = None, building_id: Optional[str] = None,
+    ) -> Iterator[str]:
+        logging.debug(
+            "[runtime] handle_user_input_stream called (metadata_present=%s, meta_playbook=%s, args=%s, building_id=%s)",
+            bool(metadata),
+            meta_playbook,
+            bool(args),
+            building_id,
+        )
+        building_id, responding_personas, error_html = self._resolve_user_turn(message, building_id)
+        if error_html:
+            yield error_html
+            return
 
         # SEA runtime handles history recording internally
         # SEAモード: タイムアウト回避のためのスレッド実行とKeep-Alive
@@ -456,62 +571,12 @@ class RuntimeService(
         stop_event = threading.Event()
         self.manager._active_stop_events[building_id] = stop_event
 
-        def _enrich_event(event):
-            """Enrich streaming events with resolved persona name and avatar URL."""
-            if isinstance(event, dict) and event.get("persona_id"):
-                pid = event["persona_id"]
-                p = self.personas.get(pid)
-                if p:
-                    if not event.get("persona_name"):
-                        event["persona_name"] = p.persona_name
-                    if not event.get("persona_avatar"):
-                        event["persona_avatar"] = (
-                            avatar_path_to_url(p.avatar_image)
-                            or "/api/static/builtin_icons/host.png"
-                        )
-            response_queue.put(event)
-
-        def backend_worker():
-            try:
-                for persona in responding_personas:
-                    if stop_event.is_set():
-                        logging.info("[runtime] Stop event detected; breaking persona loop for building %s", building_id)
-                        response_queue.put({"type": "cancelled", "content": "生成を中止しました。"})
-                        break
-                    # SEA実行。イベントはコールバック経由でキューに送る
-                    self.manager.run_sea_user(
-                        persona, building_id, message,
-                        metadata=metadata,
-                        meta_playbook=meta_playbook,
-                        args=args,
-                        event_callback=_enrich_event
-                    )
-                    # Check stop event after each persona completes
-                    if stop_event.is_set():
-                        logging.info("[runtime] Stop event detected after persona %s; breaking loop", persona.persona_id)
-                        response_queue.put({"type": "cancelled", "content": "生成を中止しました。"})
-                        break
-            except LLMError as e:
-                logging.error("SEA worker LLM error: %s", e, exc_info=True)
-                if stop_event.is_set():
-                    response_queue.put({"type": "cancelled", "content": "生成を中止しました。"})
-                else:
-                    response_queue.put(e.to_dict())
-            except Exception as e:
-                logging.error("SEA worker error", exc_info=True)
-                if stop_event.is_set():
-                    response_queue.put({"type": "cancelled", "content": "生成を中止しました。"})
-                else:
-                    response_queue.put({
-                        "type": "error",
-                        "error_code": "unknown",
-                        "content": "予期せぬエラーが発生しました。",
-                        "technical_detail": str(e),
-                    })
-            finally:
-                response_queue.put(None)  # 番兵
-
-        threading.Thread(target=backend_worker, daemon=True).start()
+        threading.Thread(
+            target=self._run_user_turn,
+            args=(responding_personas, building_id, message, metadata, meta_playbook, args,
+                  stop_event, response_queue.put),
+            daemon=True,
+        ).start()
 
         # メインスレッド: キューを監視してクライアントに送信
         try:
@@ -534,18 +599,58 @@ class RuntimeService(
                     # プロキシ等のタイムアウトを防ぐためのPing
                     yield json.dumps({"type": "ping"}, ensure_ascii=False) + "\n"
         finally:
-            # Clean up stop event
-            self.manager._active_stop_events.pop(building_id, None)
-
             # Persist building histories and session metadata.
             # MUST be inside finally: this generator can be closed via
             # GeneratorExit (e.g. HTTP disconnect after streaming completes),
             # and code after try/finally would never execute in that case.
-            bh_sizes = {bid: len(h) for bid, h in self.building_histories.items() if h}
-            logging.debug("[runtime] pre-save building_histories sizes: %s", bh_sizes)
-            self._save_building_histories()
-            for persona in self.personas.values():
-                persona._save_session_metadata()
+            self._finish_user_turn(building_id, stop_event)
+
+    async def handle_user_input_stream_async(
+        self, message: str, metadata: Optional[Dict[str, Any]] = None, meta_playbook: Optional[str] = None,
+        args: Optional[Dict[str, Any]] = None, building_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Asyncio-native variant of :meth:`handle_user_input_stream`.
+
+        SEA events are pushed onto the event loop with ``call_soon_threadsafe``
+        as they happen, token deltas are coalesced per write, and keep-alive
+        pings come from a loop timer instead of a queue poll.
+        """
+        building_id, responding_personas, error_html = self._resolve_user_turn(message, building_id)
+        if error_html:
+            yield error_html
+            return
+
+        loop = asyncio.get_running_loop()
+        stream = AsyncEventStream(
+            loop,
+            heartbeat_interval=env_float("SAIVERSE_STREAM_HEARTBEAT_SEC", 2.0),
+            coalesce_window=env_float("SAIVERSE_STREAM_COALESCE_MS", 15.0) / 1000.0,
+        )
+
+        def _emit(event):
+            if event is None:
+                stream.close()
+            else:
+                stream.push(event)
+
+        stop_event = threading.Event()
+        self.manager._active_stop_events[building_id] = stop_event
+
+        worker = loop.run_in_executor(
+            _USER_TURN_EXECUTOR,
+            self._run_user_turn,
+            responding_personas, building_id, message, metadata, meta_playbook, args,
+            stop_event, _emit,
+        )
+
+        def _on_worker_done(_future):
+            # Persist after SEA has finished, even if the client disconnected early
+            _USER_TURN_FINISH_EXECUTOR.submit(self._finish_user_turn, building_id, stop_event)
+
+        worker.add_done_callback(_on_worker_done)
+
+        async for chunk in stream:
+            yield chunk
 
     def preview_context(
         self, message: str, building_id: Optional[str] = None,
@@ -588,8 +693,7 @@ class RuntimeService(
                 replies.extend(persona.run_scheduled_prompt())
         if replies:
             self._save_building_histories()
-            for persona in self.personas.values():
-                persona._save_session_metadata()
+            self.manager._flush_session_metadata()
         return replies
 
     def start_autonomous_conversations(self) -> None:
@@ -6,6 +6,7 @@ from typing import Tuple
 import requests
 
 from database.models import AI as AIModel, BuildingOccupancyLog, VisitingAI
+from persona.building_history import ensure_building_history
 from saiverse.remote_persona_proxy import RemotePersonaProxy
 
 
@@ -246,7 +247,7 @@ class VisitorMixin:
                     "<div class=\"note-box\">🏢 City Transfer:<br>"
                     f"<b>{pname}が故郷に帰ってきました</b></div>"
                 )
-                self.building_histories.setdefault(target_bid, []).append(
+                ensure_building_history(self.building_histories, target_bid).append(
                     {"role": "host", "content": arrival_message}
                 )
                 self._save_building_histories()
@@ -307,7 +308,7 @@ class VisitorMixin:
                 "<div class=\"note-box\">🏢 City Transfer:<br>"
                 f"<b>{pname}が別のCityからやってきました</b></div>"
             )
-            self.building_histories.setdefault(target_bid, []).append(
+            ensure_building_history(self.building_histories, target_bid).append(
                 {"role": "host", "content": arrival_message}
             )
             self._save_building_histories()
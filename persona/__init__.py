@@ -1,7 +1,22 @@
 """
 Persona package exposes the PersonaCore interface and supporting utilities.
+
+``PersonaCore`` is imported on first access so lightweight helpers such as
+``persona.utils`` can be used from low-level packages without loading the
+whole persona runtime.
 """
 
-from .core import PersonaCore
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .core import PersonaCore
 
 __all__ = ["PersonaCore"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "PersonaCore":
+        from .core import PersonaCore
+
+        return PersonaCore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
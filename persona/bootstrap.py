@@ -7,6 +7,7 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from persona.building_history import SeqRangeSet
 from saiverse_memory import SAIMemoryAdapter
 from database.models import AI as AIModel
 from sqlalchemy.orm import Session
@@ -22,20 +23,27 @@ def load_action_priority(path: Path) -> Dict[str, int]:
     return {"think": 1, "emotion_shift": 2, "move": 3}
 
 
-def load_session_data(persona) -> None:
-    """Populate persona fields from persisted session data."""
+def load_session_data(persona, db_ai: Optional[AIModel] = None) -> None:
+    """Populate persona fields from persisted session data.
+
+    ``db_ai`` may be passed when the caller already fetched the AI row
+    (bulk startup loading) to avoid one query per persona.
+    """
     if persona.is_visitor:
         persona.messages = []
         persona.conscious_log = []
         persona.pulse_cursors = {}
         persona.entry_markers = {}
+        persona.ingested_seqs = {}
         persona._raw_pulse_cursor_data = {}
         persona._raw_pulse_cursor_format = "count"
         return
 
-    session: Session = persona.SessionLocal()
+    session: Optional[Session] = None
     try:
-        db_ai: Optional[AIModel] = session.query(AIModel).filter(AIModel.AIID == persona.persona_id).first()
+        if db_ai is None:
+            session = persona.SessionLocal()
+            db_ai = session.query(AIModel).filter(AIModel.AIID == persona.persona_id).first()
         if db_ai:
             persona.auto_count = db_ai.AUTO_COUNT or 0
 
@@ -55,7 +63,8 @@ def load_session_data(persona) -> None:
     except Exception as exc:
         logging.error("Failed to load session data from DB for %s: %s", persona.persona_name, exc, exc_info=True)
     finally:
-        session.close()
+        if session is not None:
+            session.close()
 
     if persona.persona_log_path.exists():
         try:
@@ -76,6 +85,13 @@ def load_session_data(persona) -> None:
             persona._raw_pulse_cursor_data = raw_cursors if isinstance(raw_cursors, dict) else {}
             fmt = data.get("pulse_cursor_format")
             persona._raw_pulse_cursor_format = fmt if isinstance(fmt, str) else "count"
+            raw_ingested = data.get("ingested_seqs")
+            if isinstance(raw_ingested, dict):
+                persona.ingested_seqs = {
+                    str(b_id): SeqRangeSet(ranges)
+                    for b_id, ranges in raw_ingested.items()
+                    if isinstance(ranges, list)
+                }
         except json.JSONDecodeError:
             logging.warning("Failed to load conscious log, starting empty")
             persona.conscious_log = []
@@ -0,0 +1,184 @@
+"""Seq-indexed building history and compact per-persona seq sets.
+
+Building logs are shared by every persona in a city. ``BuildingHistory`` is a
+``list`` subclass (so JSON serialisation and existing list code keep working)
+that owns the building's ``next_seq`` and tracks whether ``seq`` is still
+non-decreasing, which lets :meth:`BuildingHistory.since` find unseen messages
+with a bisect instead of walking the whole log.
+
+``SeqRangeSet`` replaces the per-message ``ingested_by`` lists: each persona
+keeps the seqs it ingested ahead of its pulse cursor as a handful of ranges.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence
+
+
+def seq_of(msg: Any) -> int:
+    """``msg["seq"]`` as int (0 when missing or invalid)."""
+    try:
+        seq = msg.get("seq")
+    except AttributeError:
+        return 0
+    if isinstance(seq, int):
+        return seq
+    try:
+        return int(seq)
+    except (TypeError, ValueError):
+        return 0
+
+
+class BuildingHistory(list):
+    """Building log whose entries can be looked up by ``seq``.
+
+    ``append`` assigns ``seq`` to entries that lack one (host notes appended
+    directly by the manager), so every writer shares one counter per building.
+    Mutations that may break the ordering (insert, item assignment, sort)
+    trigger :meth:`reindex`; :meth:`since` falls back to a scan while the log
+    is out of order.
+    """
+
+    def __init__(self, iterable: Iterable[Dict[str, Any]] = ()) -> None:
+        super().__init__(iterable)
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Recompute ``next_seq`` and the ordering flag with one pass."""
+        last = 0
+        monotonic = True
+        highest = 0
+        for msg in self:
+            seq = seq_of(msg)
+            if seq < last:
+                monotonic = False
+            last = seq
+            highest = max(highest, seq)
+        self.next_seq = max(getattr(self, "next_seq", 1), highest + 1)
+        self.monotonic = monotonic
+
+    @property
+    def last_seq(self) -> int:
+        return self.next_seq - 1
+
+    def append(self, msg: Dict[str, Any]) -> None:  # type: ignore[override]
+        seq = seq_of(msg)
+        if seq < 1 and isinstance(msg, dict):
+            seq = msg["seq"] = self.next_seq
+        if self and seq < seq_of(self[-1]):
+            self.monotonic = False
+        self.next_seq = max(self.next_seq, seq + 1)
+        super().append(msg)
+
+    def extend(self, msgs: Iterable[Dict[str, Any]]) -> None:  # type: ignore[override]
+        for msg in msgs:
+            self.append(msg)
+
+    def __iadd__(self, msgs: Iterable[Dict[str, Any]]) -> "BuildingHistory":  # type: ignore[override]
+        self.extend(msgs)
+        return self
+
+    def insert(self, index, msg) -> None:  # type: ignore[override]
+        super().insert(index, msg)
+        self.reindex()
+
+    def __setitem__(self, index, value) -> None:  # type: ignore[override]
+        super().__setitem__(index, value)
+        self.reindex()
+
+    def sort(self, *args, **kwargs) -> None:  # type: ignore[override]
+        super().sort(*args, **kwargs)
+        self.reindex()
+
+    def reverse(self) -> None:  # type: ignore[override]
+        super().reverse()
+        self.reindex()
+
+    def since(self, seq: int) -> List[Dict[str, Any]]:
+        """Entries with ``seq`` greater than ``seq``, in log order."""
+        if self.monotonic:
+            return self[bisect_right(self, seq, key=seq_of):]
+        return [msg for msg in self if seq_of(msg) > seq]
+
+
+def ensure_building_history(
+    histories: MutableMapping[str, List[Dict[str, Any]]], building_id: str
+) -> BuildingHistory:
+    """Return ``histories[building_id]`` as a BuildingHistory, converting it in place."""
+    hist = histories.get(building_id)
+    if isinstance(hist, BuildingHistory):
+        return hist
+    converted = BuildingHistory(hist or [])
+    histories[building_id] = converted
+    return converted
+
+
+def messages_after(hist: Sequence[Dict[str, Any]], seq: int) -> List[Dict[str, Any]]:
+    """Entries of any building log with ``seq`` greater than ``seq``."""
+    if isinstance(hist, BuildingHistory):
+        return hist.since(seq)
+    return [msg for msg in hist if seq_of(msg) > seq]
+
+
+class SeqRangeSet:
+    """Set of ints stored as sorted, disjoint, inclusive ``[start, end]`` ranges."""
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, ranges: Optional[Iterable[Sequence[int]]] = None) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for item in ranges or ():
+            try:
+                start, end = int(item[0]), int(item[1])
+            except (TypeError, ValueError, IndexError):
+                continue
+            self._add_range(start, end)
+
+    def __contains__(self, seq: int) -> bool:
+        idx = bisect_right(self._starts, seq) - 1
+        return idx >= 0 and seq <= self._ends[idx]
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SeqRangeSet) and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f"SeqRangeSet({self.to_list()!r})"
+
+    def add(self, seq: int) -> None:
+        self._add_range(seq, seq)
+
+    def _add_range(self, start: int, end: int) -> None:
+        if start > end:
+            return
+        # 隣接・重なる範囲をまとめて一つにする
+        lo = bisect_left(self._ends, start - 1)
+        hi = bisect_right(self._starts, end + 1)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def discard_through(self, seq: int) -> None:
+        """Forget every value ``<= seq`` (everything behind the pulse cursor)."""
+        idx = bisect_right(self._ends, seq)
+        del self._starts[:idx]
+        del self._ends[:idx]
+        if self._starts and self._starts[0] <= seq:
+            self._starts[0] = seq + 1
+
+    def to_list(self) -> List[List[int]]:
+        return [[start, end] for start, end in zip(self._starts, self._ends)]
+
+
+__all__ = [
+    "BuildingHistory",
+    "SeqRangeSet",
+    "ensure_building_history",
+    "messages_after",
+    "seq_of",
+]
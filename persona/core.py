@@ -1,5 +1,7 @@
 import logging
+import threading
 import time
+from concurrent.futures import Executor, Future
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timezone as dt_timezone, tzinfo, timedelta
@@ -12,6 +14,7 @@ from saiverse_memory import SAIMemoryAdapter
 from llm_clients import get_llm_client
 from saiverse.model_configs import model_supports_images
 from saiverse.action_handler import ActionHandler
+from persona.building_history import SeqRangeSet
 from persona.history_manager import HistoryManager
 from persona.emotion_module import EmotionControlModule
 from database.models import AI as AIModel
@@ -78,6 +81,9 @@ class PersonaCore(
         persona_event_ack: Optional[Callable[[str, List[int]], None]] = None,
         manager_ref: Optional[Any] = None,
         linked_user_name: str = "the user",
+        ai_record: Optional[AIModel] = None,
+        defer_memory: bool = False,
+        memory_executor: Optional[Executor] = None,
     ):
         self.city_name = city_name
         self.linked_user_name = linked_user_name
@@ -123,14 +129,23 @@ class PersonaCore(
         self.emotion = {"stability": {"mean": 0, "variance": 1}, "affect": {"mean": 0, "variance": 1}, "resonance": {"mean": 0, "variance": 1}, "attitude": {"mean": 0, "variance": 1}}
         self.pulse_cursors: Dict[str, int] = {}
         self.entry_markers: Dict[str, int] = {}
+        self.ingested_seqs: Dict[str, SeqRangeSet] = {}
         self._raw_pulse_cursor_data: Dict[str, Any] = {}
         self._raw_pulse_cursor_format: str = "count"
 
         # Load session data, which may overwrite the defaults
-        load_session_data(self)
+        load_session_data(self, ai_record)
 
-        # Initialise SAIMemory bridge for long-term recall/summary
-        self.sai_memory: Optional[SAIMemoryAdapter] = initialise_memory_adapter(self)
+        # Initialise SAIMemory bridge for long-term recall/summary.
+        # defer_memory=True: executor があればバックグラウンドで、なければ初回アクセス時に初期化する
+        self._sai_memory: Optional[SAIMemoryAdapter] = None
+        self._sai_memory_lock = threading.RLock()
+        self._sai_memory_future: Optional[Future] = None
+        self._sai_memory_pending = defer_memory
+        if not defer_memory:
+            self._sai_memory = initialise_memory_adapter(self)
+        elif memory_executor is not None:
+            self._sai_memory_future = memory_executor.submit(initialise_memory_adapter, self)
 
         # Initialize managers that depend on loaded data
         self.history_manager = HistoryManager(
@@ -139,11 +154,14 @@ class PersonaCore(
             building_memory_paths=self.building_memory_paths,
             initial_persona_history=self.messages,
             initial_building_histories=building_histories,
-            memory_adapter=self.sai_memory,
+            memory_adapter=self._sai_memory,
+            memory_resolver=(lambda: self.sai_memory) if defer_memory else None,
         )
 
         # Configure pulse tracking based on loaded histories
         initialise_pulse_state(self)
+        # 読み込んだ状態を保存済みとして記録し、変更が無ければ保存を省く
+        self._mark_session_clean()
 
         # Initialize remaining attributes
         self.move_callback = move_callback
@@ -193,6 +211,42 @@ class PersonaCore(
             "status": "idle"  # idle, running, waiting, completed
         }
 
+    @property
+    def sai_memory(self) -> Optional[SAIMemoryAdapter]:
+        if self._sai_memory_pending:
+            self._resolve_sai_memory()
+        return self._sai_memory
+
+    @sai_memory.setter
+    def sai_memory(self, adapter: Optional[SAIMemoryAdapter]) -> None:
+        with self._sai_memory_lock:
+            self._sai_memory = adapter
+            self._sai_memory_pending = False
+            self._sai_memory_future = None
+        if getattr(self, "history_manager", None) is not None:
+            self.history_manager.set_memory_adapter(adapter)
+
+    @property
+    def sai_memory_future(self) -> Optional[Future]:
+        """Future of a background SAIMemory initialisation, if one is still attached."""
+        return self._sai_memory_future
+
+    def _resolve_sai_memory(self) -> None:
+        with self._sai_memory_lock:
+            if not self._sai_memory_pending:
+                return
+            try:
+                if self._sai_memory_future is not None:
+                    adapter = self._sai_memory_future.result()
+                else:
+                    adapter = initialise_memory_adapter(self)
+            except Exception as exc:
+                logging.warning("Deferred SAIMemory initialisation failed for %s: %s", self.persona_id, exc)
+                adapter = None
+            self._sai_memory = adapter
+            self._sai_memory_future = None
+            self._sai_memory_pending = False
+
     def set_inventory(self, item_ids: List[str]) -> None:
         self.inventory_item_ids = list(item_ids)
     def set_item_registry(self, registry: Dict[str, Dict[str, Any]]) -> None:
@@ -283,16 +337,16 @@ class PersonaCore(
     def common_prompt(self) -> str:
         """
         共通プロンプトを実行時に読み込む。
-        ファイル更新が即座に反映されるように、毎回読み込む。
+        stat検証付きキャッシュ経由なので、ファイル更新は数秒以内に反映され、
+        更新が無ければパルスごとのディスク読み込みは発生しない。
         """
+        from saiverse.data_paths import read_text_cached
+
         try:
-            path = self.common_prompt_path
-            abs_path = path.resolve()
-            logging.debug(f"[common_prompt] path={path}, abs_path={abs_path}, exists={abs_path.exists()}")
-            if not abs_path.exists():
-                logging.error(f"[common_prompt] File not found: {abs_path}")
-                return ""
-            return abs_path.read_text(encoding="utf-8")
+            return read_text_cached(self.common_prompt_path)
+        except FileNotFoundError:
+            logging.error(f"[common_prompt] File not found: {self.common_prompt_path.resolve()}")
+            return ""
         except Exception as exc:
             logging.error(f"Failed to read common_prompt from {self.common_prompt_path}: {exc}")
             return ""
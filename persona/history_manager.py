@@ -2,10 +2,12 @@ import copy
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, TYPE_CHECKING, Any
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING, Any
 import re
 from datetime import datetime
 
+from persona.building_history import ensure_building_history
+
 if TYPE_CHECKING:
     from saiverse_memory import SAIMemoryAdapter
 
@@ -20,18 +22,38 @@ class HistoryManager:
         initial_persona_history: Optional[List[Dict[str, str]]] = None,
         initial_building_histories: Optional[Dict[str, List[Dict[str, str]]]] = None,
         memory_adapter: Optional["SAIMemoryAdapter"] = None,
+        memory_resolver: Optional[Callable[[], Optional["SAIMemoryAdapter"]]] = None,
     ):
         self.persona_id = persona_id
         self.persona_log_path = persona_log_path
         self.building_memory_paths = building_memory_paths
         self.messages = initial_persona_history if initial_persona_history is not None else []
         self.building_histories = initial_building_histories if initial_building_histories is not None else {}
-        self.memory_adapter = memory_adapter
+        self._memory_adapter = memory_adapter
+        # 遅延初期化時: 最初にアダプタが必要になった時点で解決する
+        self._memory_resolver = memory_resolver if memory_adapter is None else None
         self._building_seq_counter: Dict[str, int] = {}
         self.metabolism_anchor_message_id: Optional[str] = None
+        # add_* のたびに増える。save_all 済みの値と比べて未保存の変更を判定する
+        self.revision = 0
+        self._saved_revision = 0
 
         self._normalise_building_histories()
 
+    @property
+    def memory_adapter(self) -> Optional["SAIMemoryAdapter"]:
+        resolver = self._memory_resolver
+        if resolver is not None:
+            # resolver 側でロック・冪等化されているので並行呼び出しでも同じアダプタになる
+            self._memory_adapter = resolver()
+            self._memory_resolver = None
+        return self._memory_adapter
+
+    @memory_adapter.setter
+    def memory_adapter(self, adapter: Optional["SAIMemoryAdapter"]) -> None:
+        self._memory_resolver = None
+        self._memory_adapter = adapter
+
     def set_memory_adapter(self, adapter: Optional["SAIMemoryAdapter"]) -> None:
         self.memory_adapter = adapter
 
@@ -83,7 +105,7 @@ class HistoryManager:
 
     def _normalise_building_histories(self) -> None:
         for b_id, path in self.building_memory_paths.items():
-            hist = self.building_histories.setdefault(b_id, [])
+            hist = ensure_building_history(self.building_histories, b_id)
             max_seq = 0
             for idx, msg in enumerate(hist):
                 seq_value = msg.get("seq")
@@ -111,16 +133,18 @@ class HistoryManager:
                     if pid not in deduped:
                         deduped.append(pid)
                 msg["heard_by"] = sorted(deduped)
+                # 取り込み済み情報はペルソナ側の SeqRangeSet に移った。旧ログの値は読むだけ
                 ingested_raw = msg.get("ingested_by")
-                if isinstance(ingested_raw, list):
+                if isinstance(ingested_raw, list) and ingested_raw:
                     msg["ingested_by"] = sorted({str(pid) for pid in ingested_raw if pid})
                 else:
-                    msg["ingested_by"] = []
+                    msg.pop("ingested_by", None)
                 max_seq = max(max_seq, seq)
-            self._building_seq_counter[b_id] = max_seq + 1
+            hist.reindex()
+            self._building_seq_counter[b_id] = max(max_seq + 1, hist.next_seq)
         for b_id in self.building_memory_paths.keys():
             self._building_seq_counter.setdefault(b_id, 1)
-            self.building_histories.setdefault(b_id, [])
+            ensure_building_history(self.building_histories, b_id)
 
     def _decorate_building_message(
         self,
@@ -130,7 +154,11 @@ class HistoryManager:
     ) -> Dict[str, str]:
         enriched = msg.copy()
         seq_value = enriched.get("seq")
-        next_candidate = self._building_seq_counter.get(building_id, 1)
+        # 建物ログは全ペルソナで共有なので、ログ側のカウンタとも突き合わせる
+        next_candidate = max(
+            self._building_seq_counter.get(building_id, 1),
+            ensure_building_history(self.building_histories, building_id).next_seq,
+        )
         if isinstance(seq_value, int):
             seq = seq_value
         else:
@@ -149,12 +177,7 @@ class HistoryManager:
             enriched["message_id"] = msg.get("id") or f"{building_id}:{seq}"
         heard_set = {str(pid) for pid in (heard_by or []) if pid}
         enriched["heard_by"] = sorted(heard_set)
-        ingested_raw = enriched.get("ingested_by")
-        if isinstance(ingested_raw, list):
-            ingested_set = {str(pid) for pid in ingested_raw if pid}
-            enriched["ingested_by"] = sorted(ingested_set)
-        else:
-            enriched["ingested_by"] = []
+        enriched.pop("ingested_by", None)
         return enriched
 
     def _sync_to_memory(self, *, channel: str, building_id: Optional[str], message: Dict[str, str]) -> None:
@@ -193,10 +216,11 @@ class HistoryManager:
         self._sync_to_memory(channel="persona", building_id=None, message=prepared_msg)
 
         # Add to building history and trim
-        hist = self.building_histories.setdefault(building_id, [])
+        hist = ensure_building_history(self.building_histories, building_id)
         building_msg = self._decorate_building_message(building_id, prepared_msg, heard_by)
         hist.append(building_msg)
         self._ensure_size_limit(hist, self._get_building_memory_path(building_id))
+        self.revision += 1
 
     def _get_building_memory_path(self, building_id: str) -> Path:
         path = self.building_memory_paths.get(building_id)
@@ -218,10 +242,11 @@ class HistoryManager:
         building_id must be the canonical building ID present in building_memory_paths.
         """
         prepared_msg = self._prepare_message(msg)
-        hist = self.building_histories.setdefault(building_id, [])
+        hist = ensure_building_history(self.building_histories, building_id)
         building_msg = self._decorate_building_message(building_id, prepared_msg, heard_by)
         hist.append(building_msg)
         self._ensure_size_limit(hist, self._get_building_memory_path(building_id))
+        self.revision += 1
 
     def add_to_persona_only(self, msg: Dict[str, str]) -> None:
         """Adds a message only to the persona's main history."""
@@ -229,6 +254,7 @@ class HistoryManager:
         self.messages.append(prepared_msg)
         self._ensure_size_limit(self.messages, self.persona_log_path)
         self._sync_to_memory(channel="persona", building_id=None, message=prepared_msg)
+        self.revision += 1
 
     def get_recent_history(
         self,
@@ -432,8 +458,14 @@ class HistoryManager:
             selected.append(msg)
         return list(reversed(selected))
 
+    @property
+    def is_dirty(self) -> bool:
+        """True when messages were added since the last :meth:`save_all`."""
+        return self.revision != self._saved_revision
+
     def save_all(self) -> None:
         """Saves all persona and building histories to their respective files."""
+        revision = self.revision
         self.persona_log_path.parent.mkdir(parents=True, exist_ok=True)
         self.persona_log_path.write_text(
             json.dumps(self.messages, ensure_ascii=False), encoding="utf-8"
@@ -442,3 +474,4 @@ class HistoryManager:
             hist = self.building_histories.get(b_id, [])
             path.parent.mkdir(parents=True, exist_ok=True)
             path.write_text(json.dumps(hist, ensure_ascii=False), encoding="utf-8")
+        self._saved_revision = revision
@@ -137,12 +137,12 @@ class PersonaGenerationMixin:
         # Load extra prompt files from Building configuration
         extra_prompt_files = getattr(building, "extra_prompt_files", []) or []
         if extra_prompt_files:
-            from saiverse.data_paths import find_file, PROMPTS_DIR
+            from saiverse.data_paths import find_file, read_text_cached, PROMPTS_DIR
             for filename in extra_prompt_files:
                 prompt_path = find_file(PROMPTS_DIR, filename)
                 if prompt_path:
                     try:
-                        extra_content = prompt_path.read_text(encoding="utf-8")
+                        extra_content = read_text_cached(prompt_path)
                         system_text += "\n\n" + extra_content
                     except Exception as exc:
                         logging.warning("Failed to load extra prompt '%s': %s", filename, exc)
@@ -590,9 +590,7 @@ class PersonaGenerationMixin:
                     continue
                 if (msg.get("content") or "") != content:
                     continue
-                bucket = msg.setdefault("ingested_by", [])
-                if isinstance(bucket, list) and self.persona_id not in bucket:
-                    bucket.append(self.persona_id)
+                self.mark_building_ingested(self.current_building_id, msg)
                 break
         except Exception:
             logging.debug(
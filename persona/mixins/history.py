@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import Any, Dict, List, Optional
 
 from database.models import AI as AIModel
+from persona.building_history import SeqRangeSet, seq_of
 
 
 class PersonaHistoryMixin:
@@ -21,6 +22,7 @@ class PersonaHistoryMixin:
     emotion: Dict[str, Dict[str, float]]
     history_manager: Any
     id_to_name_map: Dict[str, str]
+    ingested_seqs: Dict[str, SeqRangeSet]
     is_visitor: bool
     last_auto_prompt_times: Dict[str, float]
     occupants: Dict[str, List[str]]
@@ -133,40 +135,110 @@ class PersonaHistoryMixin:
             snapshot.append(self.persona_id)
         return snapshot
 
-    def _save_session_metadata(self) -> None:
+    def _session_db_snapshot(self) -> Dict[str, Any]:
+        return {
+            "EMOTION": json.dumps(self.emotion, ensure_ascii=False),
+            "AUTO_COUNT": self.auto_count,
+            "LAST_AUTO_PROMPT_TIMES": json.dumps(
+                self.last_auto_prompt_times, ensure_ascii=False
+            ),
+        }
+
+    def _conscious_log_signature(self) -> tuple:
+        # conscious_log は追記のみ、pulse_cursors / ingested_seqs は小さいので比較は安価
+        return (
+            len(self.conscious_log),
+            tuple(sorted(self.pulse_cursors.items())),
+            self._ingested_seqs_payload(),
+        )
+
+    def _ingested_seqs_payload(self) -> Dict[str, List[List[int]]]:
+        ingested = getattr(self, "ingested_seqs", None) or {}
+        return {b_id: seqs.to_list() for b_id, seqs in sorted(ingested.items()) if seqs}
+
+    def mark_building_ingested(self, building_id: str, msg: Dict[str, Any]) -> None:
+        """Record that a building message already reached this persona's own history."""
+        seq = seq_of(msg)
+        if seq <= self.pulse_cursors.get(building_id, 0):
+            return
+        self.ingested_seqs.setdefault(building_id, SeqRangeSet()).add(seq)
+
+    def _mark_session_clean(self) -> None:
+        """Record the current session state as persisted (called after load)."""
+        self._saved_session_db = None if self.is_visitor else self._session_db_snapshot()
+        self._saved_conscious_signature = self._conscious_log_signature()
+
+    def _pending_session_db_update(self) -> Optional[Dict[str, Any]]:
+        """Columns of the AI row that changed since the last save, or None."""
         if self.is_visitor:
+            return None
+        snapshot = self._session_db_snapshot()
+        saved = getattr(self, "_saved_session_db", None)
+        if saved is None:
+            return snapshot
+        changed = {key: value for key, value in snapshot.items() if saved.get(key) != value}
+        return changed or None
+
+    def _mark_session_db_saved(self, update_data: Dict[str, Any]) -> None:
+        saved = dict(getattr(self, "_saved_session_db", None) or {})
+        saved.update(update_data)
+        self._saved_session_db = saved
+
+    @property
+    def session_dirty(self) -> bool:
+        """True when any persisted session state changed since it was last saved."""
+        return bool(self._pending_session_db_update() or self._session_files_dirty())
+
+    def _session_files_dirty(self) -> bool:
+        if getattr(self, "_saved_conscious_signature", None) != self._conscious_log_signature():
+            return True
+        if self.is_visitor or getattr(self, "messages", None):
+            return self.history_manager.is_dirty
+        return False
+
+    def _save_session_files(self, *, force: bool = False) -> None:
+        """Write the persona log / conscious log only when they changed."""
+        if (self.is_visitor or getattr(self, "messages", None)) and (
+            force or self.history_manager.is_dirty
+        ):
             self.history_manager.save_all()
+        signature = self._conscious_log_signature()
+        if force or getattr(self, "_saved_conscious_signature", None) != signature:
             self._save_conscious_log()
-            return
+            self._saved_conscious_signature = signature
 
-        db = self.SessionLocal()
-        try:
-            update_data = {
-                "EMOTION": json.dumps(self.emotion, ensure_ascii=False),
-                "AUTO_COUNT": self.auto_count,
-                "LAST_AUTO_PROMPT_TIMES": json.dumps(
-                    self.last_auto_prompt_times, ensure_ascii=False
-                ),
-            }
-            db.query(AIModel).filter(AIModel.AIID == self.persona_id).update(
-                update_data
-            )
-            db.commit()
-            logging.info("Saved dynamic state to DB for %s.", self.persona_name)
-        except Exception as exc:
-            db.rollback()
-            logging.error(
-                "Failed to save session data to DB for %s: %s",
-                self.persona_name,
-                exc,
-                exc_info=True,
-            )
-        finally:
-            db.close()
+    def _save_session_metadata(self, *, force: bool = False) -> None:
+        """Persist dynamic state that changed since the last save.
 
-        if getattr(self, "messages", None):
-            self.history_manager.save_all()
-        self._save_conscious_log()
+        Unchanged personas cost a JSON comparison instead of a DB write.
+        The manager batches several personas into one transaction via
+        ``_flush_session_metadata``; this is the single-persona path.
+        """
+        update_data = (
+            None if self.is_visitor
+            else (self._session_db_snapshot() if force else self._pending_session_db_update())
+        )
+        if update_data:
+            db = self.SessionLocal()
+            try:
+                db.query(AIModel).filter(AIModel.AIID == self.persona_id).update(
+                    update_data
+                )
+                db.commit()
+                self._mark_session_db_saved(update_data)
+                logging.info("Saved dynamic state to DB for %s.", self.persona_name)
+            except Exception as exc:
+                db.rollback()
+                logging.error(
+                    "Failed to save session data to DB for %s: %s",
+                    self.persona_name,
+                    exc,
+                    exc_info=True,
+                )
+            finally:
+                db.close()
+
+        self._save_session_files(force=force)
 
     def get_building_history(
         self, building_id: str, raw: bool = False
@@ -180,6 +252,7 @@ class PersonaHistoryMixin:
             "pulse_cursors": self.pulse_cursors,
             "pulse_cursor_format": "seq",
             "pulse_indices": self.pulse_cursors,
+            "ingested_seqs": self._ingested_seqs_payload(),
         }
         self.conscious_log_path.write_text(
             json.dumps(data_to_save, ensure_ascii=False), encoding="utf-8"
@@ -2,8 +2,11 @@
 Utility helpers for persona modules.
 """
 
+import logging
 import os
 
+LOGGER = logging.getLogger(__name__)
+
 
 def env_int(name: str, default: int) -> int:
     """Read a positive integer from the environment with a safe fallback."""
@@ -12,6 +15,20 @@ def env_int(name: str, default: int) -> int:
         return default
     try:
         parsed = int(value)
-        return parsed if parsed >= 0 else default
     except ValueError:
+        LOGGER.warning("Ignoring invalid %s=%r; using %d", name, value, default)
+        return default
+    return parsed if parsed >= 0 else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a non-negative float from the environment with a safe fallback."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        parsed = float(value)
+    except ValueError:
+        LOGGER.warning("Ignoring invalid %s=%r; using %s", name, value, default)
         return default
+    return parsed if parsed >= 0 else default
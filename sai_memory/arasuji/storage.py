@@ -9,6 +9,8 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+from sai_memory.change_tracking import init_change_tracking
+
 
 @dataclass
 class ArasujiEntry:
@@ -88,6 +90,9 @@ def init_arasuji_tables(conn: sqlite3.Connection) -> None:
         """
     )
 
+    # Change counter (used by the Memory Weave context cache)
+    init_change_tracking(conn, "arasuji")
+
     conn.commit()
 
 
@@ -411,8 +411,13 @@ def run_backup_auto(
     force_full: bool = False,
     prefer_simple: bool = False,
     skip_if_unchanged: bool = True,
+    local_format: str | None = None,
 ) -> Path | None:
-    """Run backup with automatic fallback to simple backup if rdiff-backup unavailable.
+    """Run backup with automatic fallback to a local backup if rdiff-backup unavailable.
+
+    The local backup is the deduplicating chunk store (``chunk``, default) or
+    the legacy whole-file copy (``simple``), chosen by ``local_format`` or
+    ``SAIMEMORY_BACKUP_FORMAT``.
 
     Args:
         persona_id: Persona identifier
@@ -420,21 +425,37 @@ def run_backup_auto(
         output_root: Custom backup directory
         rdiff_path: Path to rdiff-backup executable
         force_full: Force full backup (rdiff-backup only)
-        prefer_simple: Always use simple backup even if rdiff-backup is available
-        skip_if_unchanged: Skip backup if DB hasn't changed (simple backup only)
+        prefer_simple: Always use the local backup even if rdiff-backup is available
+        skip_if_unchanged: Skip backup if DB hasn't changed (local backups only)
+        local_format: ``chunk`` or ``simple``
 
     Returns:
-        Path to backup (directory for rdiff, file for simple), or None if skipped
+        Path to backup (directory for rdiff, manifest for chunk, file for simple),
+        or None if skipped
 
     Raises:
         BackupError: If backup fails
     """
     if prefer_simple or not is_rdiff_backup_available(rdiff_path):
+        fmt = (local_format or os.getenv("SAIMEMORY_BACKUP_FORMAT", "chunk")).strip().lower()
         if not prefer_simple:
             LOGGER.info(
-                "rdiff-backup not available for %s, using simple backup",
+                "rdiff-backup not available for %s, using %s backup",
                 persona_id,
+                fmt,
             )
+        if fmt != "simple":
+            from sai_memory.chunk_backup import ChunkBackupError, run_chunk_backup
+
+            try:
+                return run_chunk_backup(
+                    persona_id=persona_id,
+                    db_path=db_path,
+                    output_root=output_root,
+                    skip_if_unchanged=skip_if_unchanged,
+                )
+            except (ChunkBackupError, sqlite3.Error, OSError) as exc:
+                raise BackupError(f"Chunk backup failed: {exc}") from exc
         return run_simple_backup(
             persona_id=persona_id,
             db_path=db_path,
@@ -0,0 +1,65 @@
+"""Per-table change counters for memory.db.
+
+SQLite triggers bump a row in ``data_versions`` whenever a tracked table is
+written, so readers can tell "nothing changed since last time" with a single
+primary-key lookup instead of re-reading the table. Because the counter lives
+in the database itself, every write path (Memopedia API, arasuji generator,
+importers, manual SQL) is covered without having to remember to call a hook.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, Iterable
+
+# 論理名 -> 監視対象テーブル
+TRACKED_TABLES = {
+    "arasuji": "arasuji_entries",
+    "memopedia": "memopedia_pages",
+}
+
+
+def init_change_tracking(conn: sqlite3.Connection, name: str) -> None:
+    """Create ``data_versions`` and the write triggers for one tracked table.
+
+    Safe to call repeatedly; the table named by ``TRACKED_TABLES[name]`` must
+    already exist. Does not commit (callers run this inside their own init).
+    """
+    table = TRACKED_TABLES[name]
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)", (name,))
+    for op in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_version
+            AFTER {op} ON {table}
+            BEGIN
+                UPDATE data_versions SET version = version + 1 WHERE name = '{name}';
+            END
+            """
+        )
+
+
+def get_data_versions(conn: sqlite3.Connection, names: Iterable[str] = TRACKED_TABLES) -> Dict[str, int]:
+    """Return the current counter for each name (0 when not tracked yet)."""
+    names = list(names)
+    versions = {name: 0 for name in names}
+    try:
+        rows = conn.execute(
+            f"SELECT name, version FROM data_versions WHERE name IN ({', '.join('?' for _ in names)})",
+            names,
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return versions
+    versions.update({name: int(version) for name, version in rows})
+    return versions
+
+
+__all__ = ["TRACKED_TABLES", "get_data_versions", "init_change_tracking"]
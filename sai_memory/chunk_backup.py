@@ -0,0 +1,402 @@
+"""Incremental, deduplicating SAIMemory backups.
+
+Layout under ``<root>/<persona_id>/``::
+
+    chunks/ab/abcdef...      zlib-compressed chunk, named by SHA-256 of its raw bytes
+    manifests/<id>.json      one per snapshot: ordered chunk list + whole-file SHA-256
+
+Change detection adds nothing to the live database's writes. A passive WAL
+checkpoint moves committed pages into ``memory.db``, and the fingerprint is
+the size and mtime of that file plus ``schema_version``. The ``-wal`` file is
+left out because SQLite recreates it on every open, so restarts alone would
+look like changes. Only when the checkpoint cannot finish (a reader holds old
+pages) are the WAL's state and frame counts added. A backup is skipped when
+the fingerprint equals the one in the latest manifest.
+
+A changed database is snapshotted with the SQLite backup API and cut into
+page-aligned chunks. SQLite rewrites pages in place and never shifts bytes
+between them, so page-aligned boundaries dedup like content-defined chunking
+without the rolling hash. Only chunks missing from the store are written.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import zlib
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from persona.utils import env_int
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_BACKUP_ROOT = Path.home() / ".saiverse" / "backups" / "saimemory_chunks"
+CHUNK_KEEP = env_int("SAIMEMORY_CHUNK_BACKUP_KEEP", env_int("SAIMEMORY_SIMPLE_BACKUP_KEEP", 10))
+CHUNK_SIZE_KB = max(1, env_int("SAIMEMORY_BACKUP_CHUNK_KB", 256))
+BACKUP_CONCURRENCY = max(1, env_int("SAIMEMORY_BACKUP_CONCURRENCY", 1))
+
+# Startup backups of all personas share this so they don't saturate the disk together
+_backup_slots = threading.BoundedSemaphore(BACKUP_CONCURRENCY)
+
+
+class ChunkBackupError(RuntimeError):
+    pass
+
+
+@dataclass
+class Manifest:
+    snapshot_id: str
+    created_at: str
+    size: int
+    page_size: int
+    chunk_size: int
+    sha256: str
+    chunks: List[str]
+    fingerprint: Dict[str, Any] = field(default_factory=dict)
+    high_water: Dict[str, int] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(self.__dict__, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(**data)
+
+
+# ---------------------------------------------------------------------------
+# Change tracking
+# ---------------------------------------------------------------------------
+
+
+def _file_state(path: Path) -> List[int]:
+    try:
+        st = path.stat()
+    except OSError:
+        return [0, 0]
+    return [int(st.st_size), int(st.st_mtime_ns)]
+
+
+def read_fingerprint(conn: sqlite3.Connection, db_path: Path) -> Dict[str, Any]:
+    """Change fingerprint of ``db_path`` (see the module docstring).
+
+    A passive checkpoint runs first so committed content lives in the main
+    file. The file state is read after it, so a write that lands in between
+    shows up as a difference next time rather than being missed.
+    """
+    db_path = Path(db_path)
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    fingerprint: Dict[str, Any] = {"db": _file_state(db_path), "schema_version": int(schema_version)}
+    if busy or log_frames > checkpointed:
+        # 読み取り中の接続がいてWALを畳みきれなかった: WAL側の状態も比較に含める
+        fingerprint["wal"] = _file_state(db_path.with_name(db_path.name + "-wal"))
+        fingerprint["wal_frames"] = [int(log_frames), int(checkpointed)]
+    return fingerprint
+
+
+def _high_water(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Informational: message rowid high-water mark and count at snapshot time."""
+    try:
+        max_rowid, count = conn.execute("SELECT COALESCE(MAX(rowid), 0), COUNT(*) FROM messages").fetchone()
+    except sqlite3.OperationalError:
+        return {}
+    return {"messages_max_rowid": int(max_rowid), "messages_count": int(count)}
+
+
+# ---------------------------------------------------------------------------
+# Store helpers
+# ---------------------------------------------------------------------------
+
+
+def _persona_root(persona_id: str, root: Path | None) -> Path:
+    return (Path(root) if root else CHUNK_BACKUP_ROOT) / persona_id
+
+
+def _chunk_path(store: Path, digest: str) -> Path:
+    return store / "chunks" / digest[:2] / digest
+
+
+def list_manifests(persona_id: str, output_root: Path | None = None) -> List[Path]:
+    """Manifests of a persona, newest first."""
+    manifest_dir = _persona_root(persona_id, output_root) / "manifests"
+    if not manifest_dir.exists():
+        return []
+    return sorted(manifest_dir.glob("*.json"), reverse=True)
+
+
+def latest_manifest(persona_id: str, output_root: Path | None = None) -> Optional[Manifest]:
+    manifests = list_manifests(persona_id, output_root)
+    return Manifest.load(manifests[0]) if manifests else None
+
+
+def _iter_chunks(path: Path, chunk_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        while True:
+            block = fh.read(chunk_size)
+            if not block:
+                return
+            yield block
+
+
+def _write_chunk(store: Path, digest: str, data: bytes) -> bool:
+    target = _chunk_path(store, digest)
+    if target.exists():
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    tmp.write_bytes(zlib.compress(data, 1))
+    os.replace(tmp, target)
+    return True
+
+
+def _read_chunk(store: Path, digest: str) -> bytes:
+    try:
+        return zlib.decompress(_chunk_path(store, digest).read_bytes())
+    except FileNotFoundError as exc:
+        raise ChunkBackupError(f"missing chunk {digest}") from exc
+    except zlib.error as exc:
+        raise ChunkBackupError(f"corrupt chunk {digest}: {exc}") from exc
+
+
+# ---------------------------------------------------------------------------
+# Backup / restore / verify
+# ---------------------------------------------------------------------------
+
+
+def run_chunk_backup(
+    *,
+    persona_id: str,
+    db_path: Path,
+    output_root: Path | None = None,
+    keep_count: int | None = None,
+    skip_if_unchanged: bool = True,
+    chunk_kb: int | None = None,
+) -> Path | None:
+    """Back up ``db_path`` into the chunk store.
+
+    Returns the new manifest path, or None when nothing changed since the
+    latest snapshot.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise ChunkBackupError(f"memory.db not found: {db_path}")
+    store = _persona_root(persona_id, output_root)
+    keep_count = CHUNK_KEEP if keep_count is None else keep_count
+
+    with _backup_slots:
+        with closing(sqlite3.connect(db_path, timeout=30.0)) as src:
+            fingerprint = read_fingerprint(src, db_path)
+            previous = latest_manifest(persona_id, output_root)
+            if skip_if_unchanged and previous is not None and previous.fingerprint == fingerprint:
+                LOGGER.info(
+                    "Chunk backup skipped for %s: unchanged since %s", persona_id, previous.snapshot_id
+                )
+                return None
+
+            tmpdir = Path(tempfile.mkdtemp(prefix="saimemory_chunk_"))
+            try:
+                snapshot_path = tmpdir / "memory.db"
+                with closing(sqlite3.connect(snapshot_path)) as dst:
+                    src.backup(dst)
+                    dst.execute("PRAGMA journal_mode=DELETE")
+                    page_size = int(dst.execute("PRAGMA page_size").fetchone()[0])
+                    high_water = _high_water(dst)
+                manifest = _store_snapshot(
+                    store, snapshot_path, page_size, chunk_kb or CHUNK_SIZE_KB, fingerprint, high_water
+                )
+            finally:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+
+    manifest_dir = store / "manifests"
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = manifest_dir / f"{manifest.snapshot_id}.json"
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(manifest.to_json(), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+    prune_chunk_backups(persona_id, output_root, keep_count)
+    return manifest_path
+
+
+def _store_snapshot(
+    store: Path,
+    snapshot_path: Path,
+    page_size: int,
+    chunk_kb: int,
+    fingerprint: Dict[str, Any],
+    high_water: Dict[str, int],
+) -> Manifest:
+    chunk_size = max(page_size, (chunk_kb * 1024) // page_size * page_size)
+    whole = hashlib.sha256()
+    chunks: List[str] = []
+    written = 0
+    size = 0
+    for block in _iter_chunks(snapshot_path, chunk_size):
+        whole.update(block)
+        size += len(block)
+        digest = hashlib.sha256(block).hexdigest()
+        chunks.append(digest)
+        if _write_chunk(store, digest, block):
+            written += 1
+    snapshot_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    LOGGER.info(
+        "Chunk backup %s: %d chunks, %d new (%.1f KB written of %.1f KB)",
+        snapshot_id,
+        len(chunks),
+        written,
+        written * chunk_size / 1024,
+        size / 1024,
+    )
+    return Manifest(
+        snapshot_id=snapshot_id,
+        created_at=datetime.now(timezone.utc).isoformat(),
+        size=size,
+        page_size=page_size,
+        chunk_size=chunk_size,
+        sha256=whole.hexdigest(),
+        chunks=chunks,
+        fingerprint=fingerprint,
+        high_water=high_water,
+    )
+
+
+def _resolve_manifest(persona_id: str, output_root: Path | None, snapshot_id: str | None) -> Manifest:
+    store = _persona_root(persona_id, output_root)
+    if snapshot_id:
+        path = store / "manifests" / f"{snapshot_id}.json"
+        if not path.exists():
+            raise ChunkBackupError(f"snapshot not found: {snapshot_id}")
+        return Manifest.load(path)
+    manifest = latest_manifest(persona_id, output_root)
+    if manifest is None:
+        raise ChunkBackupError(f"no chunk backups for persona {persona_id}")
+    return manifest
+
+
+def verify_chunk_backup(
+    persona_id: str,
+    snapshot_id: str | None = None,
+    output_root: Path | None = None,
+) -> Manifest:
+    """Check that every chunk of a snapshot exists, is intact and adds up to the recorded hash.
+
+    Raises ChunkBackupError on the first problem; returns the verified manifest.
+    """
+    manifest = _resolve_manifest(persona_id, output_root, snapshot_id)
+    store = _persona_root(persona_id, output_root)
+    whole = hashlib.sha256()
+    size = 0
+    for digest in manifest.chunks:
+        data = _read_chunk(store, digest)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ChunkBackupError(f"chunk {digest} does not match its hash")
+        whole.update(data)
+        size += len(data)
+    if size != manifest.size or whole.hexdigest() != manifest.sha256:
+        raise ChunkBackupError(f"snapshot {manifest.snapshot_id} does not reassemble to the recorded file")
+    return manifest
+
+
+def restore_chunk_backup(
+    persona_id: str,
+    dest_path: Path,
+    snapshot_id: str | None = None,
+    output_root: Path | None = None,
+    overwrite: bool = False,
+) -> Path:
+    """Reassemble a snapshot into ``dest_path`` after verifying it.
+
+    The file is rebuilt next to the destination, checked (SHA-256 and
+    ``PRAGMA quick_check``) and only then moved into place. An existing
+    destination is kept as ``<name>.pre-restore`` when ``overwrite`` is set.
+    """
+    dest_path = Path(dest_path)
+    if dest_path.exists() and not overwrite:
+        raise ChunkBackupError(f"{dest_path} exists; pass overwrite=True to replace it")
+    manifest = _resolve_manifest(persona_id, output_root, snapshot_id)
+    store = _persona_root(persona_id, output_root)
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(dest_path.name + ".restoring")
+    whole = hashlib.sha256()
+    try:
+        with open(tmp_path, "wb") as out:
+            for digest in manifest.chunks:
+                data = _read_chunk(store, digest)
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ChunkBackupError(f"chunk {digest} does not match its hash")
+                whole.update(data)
+                out.write(data)
+        if whole.hexdigest() != manifest.sha256:
+            raise ChunkBackupError(f"restored file hash mismatch for snapshot {manifest.snapshot_id}")
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            result = conn.execute("PRAGMA quick_check").fetchone()[0]
+        if result != "ok":
+            raise ChunkBackupError(f"restored database failed quick_check: {result}")
+        if dest_path.exists():
+            backup_of_current = dest_path.with_name(dest_path.name + ".pre-restore")
+            os.replace(dest_path, backup_of_current)
+            for suffix in ("-wal", "-shm"):
+                stale = dest_path.with_name(dest_path.name + suffix)
+                if stale.exists():
+                    os.replace(stale, backup_of_current.with_name(backup_of_current.name + suffix))
+        os.replace(tmp_path, dest_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    LOGGER.info("Restored %s snapshot %s to %s", persona_id, manifest.snapshot_id, dest_path)
+    return dest_path
+
+
+def prune_chunk_backups(persona_id: str, output_root: Path | None = None, keep_count: int = CHUNK_KEEP) -> Tuple[int, int]:
+    """Drop manifests beyond ``keep_count`` and chunks no manifest references.
+
+    Returns (manifests removed, chunks removed).
+    """
+    manifests = list_manifests(persona_id, output_root)
+    removed_manifests = 0
+    for extra in manifests[max(1, keep_count):]:
+        extra.unlink(missing_ok=True)
+        removed_manifests += 1
+    if not removed_manifests:
+        return 0, 0
+
+    store = _persona_root(persona_id, output_root)
+    referenced = set()
+    for path in list_manifests(persona_id, output_root):
+        referenced.update(Manifest.load(path).chunks)
+    removed_chunks = 0
+    for chunk in (store / "chunks").glob("*/*"):
+        if chunk.name not in referenced:
+            chunk.unlink(missing_ok=True)
+            removed_chunks += 1
+    LOGGER.info(
+        "Pruned %d chunk-backup manifests and %d unreferenced chunks for %s",
+        removed_manifests,
+        removed_chunks,
+        persona_id,
+    )
+    return removed_manifests, removed_chunks
+
+
+__all__ = [
+    "CHUNK_BACKUP_ROOT",
+    "ChunkBackupError",
+    "Manifest",
+    "latest_manifest",
+    "list_manifests",
+    "prune_chunk_backups",
+    "read_fingerprint",
+    "restore_chunk_backup",
+    "run_chunk_backup",
+    "verify_chunk_backup",
+]
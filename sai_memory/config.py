@@ -84,6 +84,8 @@ class Settings:
 
     debug: bool
 
+    reader_pool_size: int = 4
+
 
 def load_settings() -> Settings:
     provider = os.getenv("LLM_PROVIDER", "openai").strip().lower()
@@ -163,6 +165,7 @@ def load_settings() -> Settings:
     summary_max_chars = _get_int("SAIMEMORY_SUMMARY_MAX_CHARS", 1200)
 
     debug = _get_bool("SAIMEMORY_DEBUG", False)
+    reader_pool_size = max(0, _get_int("SAIMEMORY_READER_POOL_SIZE", 4))
 
     return Settings(
         provider=provider,
@@ -189,4 +192,5 @@ def load_settings() -> Settings:
         summary_prerun=summary_prerun,
         summary_max_chars=summary_max_chars,
         debug=debug,
+        reader_pool_size=reader_pool_size,
     )
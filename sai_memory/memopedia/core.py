@@ -39,6 +39,8 @@ from sai_memory.memopedia.storage import (
     get_unorganized_pages as storage_get_unorganized_pages,
     # Important flag
     set_important_flag,
+    soft_delete_page,
+    touch_page as storage_touch_page,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -47,20 +49,28 @@ LOGGER = logging.getLogger(__name__)
 class Memopedia:
     """High-level interface for Memopedia operations."""
 
-    def __init__(self, conn: sqlite3.Connection, *, db_lock: Optional[threading.RLock] = None):
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        db_lock: Optional[threading.RLock] = None,
+        init_tables: bool = True,
+    ):
         """
         Initialize Memopedia with a database connection.
 
         Args:
             conn: SQLite connection (should be the same as SAIMemory's connection)
             db_lock: Optional lock for thread-safe operations (share with SAIMemoryAdapter)
+            init_tables: Run the table DDL/migrations (skip when the caller already did)
         """
         self.conn = conn
         self._lock = db_lock or threading.RLock()
 
         # Initialize tables
-        with self._lock:
-            init_memopedia_tables(conn)
+        if init_tables:
+            with self._lock:
+                init_memopedia_tables(conn)
 
         LOGGER.info("Memopedia initialized")
 
@@ -80,8 +90,11 @@ class Memopedia:
                 "plans": [...]
             }
         """
+        return self._annotated_tree(thread_id)
+
+    def _annotated_tree(self, thread_id: Optional[str], max_depth: Optional[int] = None) -> Dict[str, Any]:
         with self._lock:
-            tree = build_tree(self.conn)
+            tree = build_tree(self.conn, max_depth)
             states = get_all_states_for_thread(self.conn, thread_id) if thread_id else {}
 
         def _annotate(page: MemopediaPage) -> Dict[str, Any]:
@@ -126,7 +139,8 @@ class Memopedia:
         Returns:
             Formatted Markdown string of the page tree
         """
-        tree = self.get_tree(thread_id)
+        # root_* ページは深さに数えないので、ツリーは max_depth + 1 段まであれば足りる
+        tree = self._annotated_tree(thread_id, None if max_depth is None else max_depth + 1)
         lines: List[str] = []
 
         category_names = {
@@ -387,11 +401,7 @@ class Memopedia:
             )
 
             # Soft delete: mark as deleted instead of removing
-            self.conn.execute(
-                "UPDATE memopedia_pages SET is_deleted = 1 WHERE id = ?",
-                (page_id,),
-            )
-            self.conn.commit()
+            soft_delete_page(self.conn, page_id)
             return True
 
     def find_by_title(self, title: str, category: Optional[str] = None) -> Optional[MemopediaPage]:
@@ -487,14 +497,8 @@ class Memopedia:
         Called automatically when a page is opened or updated,
         used by apply_vividness_decay() to determine decay timing.
         """
-        import time
-        now = int(time.time())
         with self._lock:
-            self.conn.execute(
-                "UPDATE memopedia_pages SET last_referenced_at = ? WHERE id = ?",
-                (now, page_id),
-            )
-            self.conn.commit()
+            storage_touch_page(self.conn, page_id)
 
     def apply_vividness_decay(self) -> int:
         """Apply time-based vividness decay to all non-root pages.
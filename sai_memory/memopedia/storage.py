@@ -8,7 +8,10 @@ import sqlite3
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from sai_memory.change_tracking import init_change_tracking
+from sai_memory.memopedia.tree_cache import MemopediaTreeCache, cache_for, current_version
 
 # Category constants
 CATEGORY_PEOPLE = "people"
@@ -208,6 +211,9 @@ def init_memopedia_tables(conn: sqlite3.Connection) -> None:
         "CREATE INDEX IF NOT EXISTS idx_memopedia_edit_history_page ON memopedia_page_edit_history(page_id)"
     )
 
+    # Change counter (used by the Memory Weave context cache)
+    init_change_tracking(conn, "memopedia")
+
     conn.commit()
 
     # Seed root pages if they don't exist
@@ -268,6 +274,51 @@ def _row_to_page(row: tuple) -> MemopediaPage:
     )
 
 
+# ----- Tree cache helpers -----
+
+
+def _fresh_tree_cache(conn: sqlite3.Connection) -> Optional[MemopediaTreeCache]:
+    """Return the tree cache for ``conn``, reloading it if the pages changed.
+
+    None for in-memory databases, when change tracking is missing, or while
+    ``conn`` has uncommitted writes (the cache must only ever hold committed
+    rows); callers then fall back to querying directly.
+    """
+    if conn.in_transaction:
+        return None
+    cache = cache_for(conn)
+    if cache is None:
+        return None
+    version = current_version(conn)
+    if version is None:
+        return None
+    with cache.lock:
+        if cache.version != version:
+            cur = conn.execute(
+                "SELECT id, parent_id, title, summary, content, category, created_at, updated_at, keywords, vividness, is_trunk, is_important, last_referenced_at, is_deleted FROM memopedia_pages"
+            )
+            cache.rebuild(((_row_to_page(row), bool(row[13])) for row in cur.fetchall()), version)
+    return cache
+
+
+def _commit_tree_change(
+    conn: sqlite3.Connection,
+    bumps: int,
+    update: Callable[[MemopediaTreeCache], None],
+) -> None:
+    """Commit a write to memopedia_pages and patch the tree cache with ``update``.
+
+    ``bumps`` is the number of rows the write touched (one counter bump each).
+    The counter is read before the commit, while the write transaction still
+    keeps other writers out.
+    """
+    cache = cache_for(conn)
+    version = current_version(conn) if cache is not None else None
+    conn.commit()
+    if cache is not None:
+        cache.apply(version, bumps, update)
+
+
 # ----- Page CRUD operations -----
 
 
@@ -288,15 +339,14 @@ def create_page(
     pid = page_id or str(uuid.uuid4())
     now = int(time.time())
     kw_list = keywords or []
-    conn.execute(
+    cur = conn.execute(
         """
         INSERT INTO memopedia_pages (id, parent_id, title, summary, content, category, created_at, updated_at, keywords, vividness, is_trunk, is_important, last_referenced_at)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (pid, parent_id, title, summary, content, category, now, now, json.dumps(kw_list), vividness, int(is_trunk), 0, now),
     )
-    conn.commit()
-    return MemopediaPage(
+    page = MemopediaPage(
         id=pid,
         parent_id=parent_id,
         title=title,
@@ -310,6 +360,8 @@ def create_page(
         is_trunk=is_trunk,
         last_referenced_at=now,
     )
+    _commit_tree_change(conn, cur.rowcount, lambda cache: cache.put(page))
+    return page
 
 
 def get_page(conn: sqlite3.Connection, page_id: str) -> Optional[MemopediaPage]:
@@ -362,7 +414,7 @@ def update_page(
     new_parent_id = parent_id if parent_id is not ... else page.parent_id
     now = int(time.time())
 
-    conn.execute(
+    cur = conn.execute(
         """
         UPDATE memopedia_pages
         SET title = ?, summary = ?, content = ?, keywords = ?, vividness = ?, is_trunk = ?, is_important = ?, parent_id = ?, updated_at = ?
@@ -370,8 +422,14 @@ def update_page(
         """,
         (new_title, new_summary, new_content, json.dumps(new_keywords), new_vividness, int(new_is_trunk), int(new_is_important), new_parent_id, now, page_id),
     )
-    conn.commit()
-    return get_page(conn, page_id)
+    return _commit_page_update(conn, page_id, cur.rowcount)
+
+
+def _commit_page_update(conn: sqlite3.Connection, page_id: str, bumps: int) -> Optional[MemopediaPage]:
+    """Commit a single-page UPDATE and return the page as stored."""
+    updated = get_page(conn, page_id)
+    _commit_tree_change(conn, bumps, lambda cache: cache.put(updated) if updated else None)
+    return updated
 
 
 def delete_page(conn: sqlite3.Connection, page_id: str) -> bool:
@@ -384,13 +442,33 @@ def delete_page(conn: sqlite3.Connection, page_id: str) -> bool:
     # Delete page states
     conn.execute("DELETE FROM memopedia_page_states WHERE page_id = ?", (page_id,))
     # Delete the page itself
-    conn.execute("DELETE FROM memopedia_pages WHERE id = ?", (page_id,))
-    conn.commit()
+    cur = conn.execute("DELETE FROM memopedia_pages WHERE id = ?", (page_id,))
+    _commit_tree_change(conn, cur.rowcount, lambda cache: cache.remove(page_id, hard=True))
     return True
 
 
+def soft_delete_page(conn: sqlite3.Connection, page_id: str) -> bool:
+    """Mark a page as deleted, keeping the row (and its edit history) in the DB."""
+    cur = conn.execute("UPDATE memopedia_pages SET is_deleted = 1 WHERE id = ?", (page_id,))
+    _commit_tree_change(conn, cur.rowcount, lambda cache: cache.remove(page_id))
+    return cur.rowcount > 0
+
+
+def touch_page(conn: sqlite3.Connection, page_id: str) -> None:
+    """Update a page's last_referenced_at (used for vividness decay)."""
+    now = int(time.time())
+    cur = conn.execute(
+        "UPDATE memopedia_pages SET last_referenced_at = ? WHERE id = ?",
+        (now, page_id),
+    )
+    _commit_tree_change(conn, cur.rowcount, lambda cache: cache.touch(page_id, now))
+
+
 def get_children(conn: sqlite3.Connection, parent_id: Optional[str]) -> List[MemopediaPage]:
     """Get all non-deleted direct children of a page."""
+    cache = _fresh_tree_cache(conn)
+    if cache is not None:
+        return cache.get_children(parent_id)
     if parent_id is None:
         cur = conn.execute(
             """SELECT id, parent_id, title, summary, content, category, created_at, updated_at,
@@ -432,28 +510,39 @@ def get_pages_by_category(conn: sqlite3.Connection, category: str) -> List[Memop
     return [_row_to_page(row) for row in cur.fetchall()]
 
 
-def build_tree(conn: sqlite3.Connection) -> Dict[str, List[MemopediaPage]]:
-    """Build the full tree structure organized by category."""
-    all_pages = get_all_pages(conn)
-
-    # Build a lookup for children
-    children_map: Dict[Optional[str], List[MemopediaPage]] = {}
-    for page in all_pages:
-        parent = page.parent_id
-        if parent not in children_map:
-            children_map[parent] = []
-        children_map[parent].append(page)
-
-    def _attach_children(page: MemopediaPage) -> MemopediaPage:
-        page.children = children_map.get(page.id, [])
-        for child in page.children:
-            _attach_children(child)
-        return page
+def build_tree(conn: sqlite3.Connection, max_depth: Optional[int] = None) -> Dict[str, List[MemopediaPage]]:
+    """Build the tree structure organized by category.
 
-    # Get root pages and attach children recursively
-    roots = children_map.get(None, [])
-    for root in roots:
-        _attach_children(root)
+    ``max_depth`` limits how many levels below the root pages get their
+    ``children`` attached (None = the whole tree). Served from the tree cache
+    when available, so only the returned pages are materialised.
+    """
+    cache = _fresh_tree_cache(conn)
+    if cache is not None:
+        roots = cache.build_tree(max_depth)
+    else:
+        all_pages = get_all_pages(conn)
+
+        # Build a lookup for children
+        children_map: Dict[Optional[str], List[MemopediaPage]] = {}
+        for page in all_pages:
+            parent = page.parent_id
+            if parent not in children_map:
+                children_map[parent] = []
+            children_map[parent].append(page)
+
+        def _attach_children(page: MemopediaPage, depth: int) -> MemopediaPage:
+            if max_depth is not None and depth >= max_depth:
+                return page
+            page.children = children_map.get(page.id, [])
+            for child in page.children:
+                _attach_children(child, depth + 1)
+            return page
+
+        # Get root pages and attach children recursively
+        roots = children_map.get(None, [])
+        for root in roots:
+            _attach_children(root, 0)
 
     # Organize by category
     result: Dict[str, List[MemopediaPage]] = {
@@ -777,12 +866,11 @@ def set_trunk_flag(conn: sqlite3.Connection, page_id: str, is_trunk: bool) -> Op
         return None
 
     now = int(time.time())
-    conn.execute(
+    cur = conn.execute(
         "UPDATE memopedia_pages SET is_trunk = ?, updated_at = ? WHERE id = ?",
         (int(is_trunk), now, page_id),
     )
-    conn.commit()
-    return get_page(conn, page_id)
+    return _commit_page_update(conn, page_id, cur.rowcount)
 
 
 def set_important_flag(conn: sqlite3.Connection, page_id: str, is_important: bool) -> Optional[MemopediaPage]:
@@ -792,12 +880,11 @@ def set_important_flag(conn: sqlite3.Connection, page_id: str, is_important: boo
         return None
 
     now = int(time.time())
-    conn.execute(
+    cur = conn.execute(
         "UPDATE memopedia_pages SET is_important = ?, updated_at = ? WHERE id = ?",
         (int(is_important), now, page_id),
     )
-    conn.commit()
-    return get_page(conn, page_id)
+    return _commit_page_update(conn, page_id, cur.rowcount)
 
 
 def get_trunks(conn: sqlite3.Connection, category: Optional[str] = None) -> List[MemopediaPage]:
@@ -839,8 +926,10 @@ def move_pages_to_parent(
         raise ValueError(f"Parent page not found: {new_parent_id}")
 
     now = int(time.time())
-    moved_count = 0
+    moved: List[str] = []
 
+    # 書き込み前にまとめて判定する。移動できたページの下に new_parent_id は無いので、
+    # 先に移動したページがあっても後続の循環チェックの結果は変わらない
     for page_id in page_ids:
         # Skip if trying to move a page to itself or to its own descendant
         if page_id == new_parent_id:
@@ -853,20 +942,27 @@ def move_pages_to_parent(
         # Check for circular reference (don't allow moving a page under its own descendant)
         if _is_descendant_of(conn, new_parent_id, page_id):
             continue
+        moved.append(page_id)
 
+    bumps = 0
+    for page_id in moved:
         # Update the parent_id
-        conn.execute(
+        cur = conn.execute(
             "UPDATE memopedia_pages SET parent_id = ?, updated_at = ? WHERE id = ?",
             (new_parent_id, now, page_id),
         )
-        moved_count += 1
+        bumps += cur.rowcount
 
-    conn.commit()
-    return moved_count
+    _commit_tree_change(conn, bumps, lambda cache: cache.move(moved, new_parent_id, now))
+    return len(moved)
 
 
 def _is_descendant_of(conn: sqlite3.Connection, potential_descendant_id: str, ancestor_id: str) -> bool:
     """Check if potential_descendant_id is a descendant of ancestor_id."""
+    cache = _fresh_tree_cache(conn)
+    if cache is not None:
+        return cache.is_descendant_of(potential_descendant_id, ancestor_id)
+
     current_id = potential_descendant_id
     visited = set()
 
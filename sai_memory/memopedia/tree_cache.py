@@ -0,0 +1,262 @@
+"""In-process adjacency cache for the Memopedia page tree.
+
+``build_tree`` used to re-read every page and rebuild the parent→children map
+on each call, and the cycle check in ``move_pages_to_parent`` walked parents
+with one query per level. ``MemopediaTreeCache`` keeps, per memory.db file:
+
+- the non-deleted pages by id and each parent's child ids ordered by title
+- the ``parent_id`` of every row (soft-deleted ones included, so ancestry
+  matches what the old per-level walk saw)
+- a path index: each page's ancestor ids as a frozenset, built lazily from
+  the parent's entry and dropped whenever a parent link changes
+
+The cache remembers the ``data_versions`` counter of ``memopedia_pages`` it
+reflects. Writers in ``storage`` patch it in place when the counter moved by
+exactly their own rows; any other write (decay, imports, another process,
+manual SQL) leaves a gap and the next read rebuilds from one query.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from bisect import insort
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from sai_memory.memopedia.storage import MemopediaPage
+
+_NAME = "memopedia"
+
+
+class MemopediaTreeCache:
+    """Adjacency lists and ancestor paths for one memory.db.
+
+    All methods take ``lock``; pages handed out are copies, so callers may
+    attach children or edit fields freely.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.version: Optional[int] = None
+        self.pages: Dict[str, "MemopediaPage"] = {}
+        self.parents: Dict[str, Optional[str]] = {}
+        self.children: Dict[Optional[str], List[str]] = {}
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+
+    # ----- Build / validation -----
+
+    def rebuild(self, rows: Iterable[Tuple["MemopediaPage", bool]], version: int) -> None:
+        """Replace the contents with ``(page, is_deleted)`` rows at ``version``."""
+        with self.lock:
+            self.pages.clear()
+            self.parents.clear()
+            self.children.clear()
+            self._ancestors.clear()
+            live: List["MemopediaPage"] = []
+            for page, is_deleted in rows:
+                self.parents[page.id] = page.parent_id
+                if not is_deleted:
+                    self.pages[page.id] = page
+                    live.append(page)
+            live.sort(key=self._title_key)
+            for page in live:
+                self.children.setdefault(page.parent_id, []).append(page.id)
+            self.version = version
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.version = None
+
+    def apply(self, version: Optional[int], bumps: int, update: Callable[["MemopediaTreeCache"], None]) -> None:
+        """Patch the cache after a write that moved the counter by ``bumps``.
+
+        ``version`` is the counter read inside the writer's transaction. If the
+        cache was not exactly ``bumps`` behind it, something else wrote in
+        between and the cache is dropped instead.
+        """
+        with self.lock:
+            if self.version is None or version is None or self.version != version - bumps:
+                self.version = None
+                return
+            if bumps:
+                update(self)
+            self.version = version
+
+    # ----- Reads -----
+
+    @staticmethod
+    def _title_key(page: "MemopediaPage") -> str:
+        # get_children の SQL と同じ並び (ORDER BY title)
+        return page.title
+
+    @staticmethod
+    def _tree_key(page: "MemopediaPage") -> Tuple[str, str]:
+        # build_tree は get_all_pages の並び (category, title) を引き継いでいた
+        return (page.category, page.title)
+
+    def _copy(self, page_id: str) -> "MemopediaPage":
+        page = self.pages[page_id]
+        return replace(page, keywords=list(page.keywords), children=[])
+
+    def get_children(self, parent_id: Optional[str]) -> List["MemopediaPage"]:
+        with self.lock:
+            return [self._copy(pid) for pid in self.children.get(parent_id, ())]
+
+    def build_tree(self, max_depth: Optional[int] = None) -> List["MemopediaPage"]:
+        """Root pages (copies) with ``children`` attached down to ``max_depth`` levels."""
+        with self.lock:
+
+            def _ordered(parent_id: Optional[str]) -> List[str]:
+                # 子は通常親と同じカテゴリなので、タイトル順の一覧はほぼ整列済み
+                return sorted(
+                    self.children.get(parent_id, ()), key=lambda pid: self._tree_key(self.pages[pid])
+                )
+
+            def _attach(page_id: str, depth: int) -> "MemopediaPage":
+                page = self._copy(page_id)
+                if max_depth is None or depth < max_depth:
+                    page.children = [_attach(cid, depth + 1) for cid in _ordered(page_id)]
+                return page
+
+            return [_attach(pid, 0) for pid in _ordered(None)]
+
+    def ancestors(self, page_id: str) -> FrozenSet[str]:
+        """Ids reached by following ``parent_id`` upwards from ``page_id``."""
+        with self.lock:
+            known = self._ancestors.get(page_id)
+            if known is not None:
+                return known
+            chain: List[str] = []
+            seen: set[str] = set()
+            current: Optional[str] = page_id
+            while True:
+                if current in self._ancestors:
+                    acc = self._ancestors[current]
+                    prev = current
+                    break
+                if current in seen:
+                    # 親リンクが循環している: 到達できた範囲だけ返し、索引には載せない
+                    return frozenset(seen)
+                seen.add(current)
+                chain.append(current)
+                parent = self.parents.get(current)
+                if parent is None:
+                    acc = frozenset()
+                    prev = chain.pop()
+                    self._ancestors[prev] = acc
+                    break
+                current = parent
+            for node in reversed(chain):
+                acc = acc | {prev}
+                self._ancestors[node] = acc
+                prev = node
+            return self._ancestors[page_id]
+
+    def is_descendant_of(self, page_id: str, ancestor_id: str) -> bool:
+        return page_id == ancestor_id or ancestor_id in self.ancestors(page_id)
+
+    # ----- Incremental updates (called through ``apply``) -----
+
+    def _unlink(self, page_id: str) -> None:
+        old = self.pages.get(page_id)
+        if old is None:
+            return
+        siblings = self.children.get(old.parent_id)
+        if siblings and page_id in siblings:
+            siblings.remove(page_id)
+
+    def put(self, page: "MemopediaPage") -> None:
+        """Insert a new row or replace an existing one (soft-deleted rows stay hidden)."""
+        known = page.id in self.parents
+        if known and page.id not in self.pages:
+            self._set_parent(page.id, page.parent_id)
+            return
+        self._unlink(page.id)
+        if self.parents.get(page.id) != page.parent_id or not known:
+            self._ancestors.clear()
+        self.parents[page.id] = page.parent_id
+        self.pages[page.id] = replace(page, keywords=list(page.keywords), children=[])
+        insort(
+            self.children.setdefault(page.parent_id, []),
+            page.id,
+            key=lambda pid: self._title_key(self.pages[pid]),
+        )
+
+    def _set_parent(self, page_id: str, parent_id: Optional[str]) -> None:
+        if self.parents.get(page_id) != parent_id:
+            self.parents[page_id] = parent_id
+            self._ancestors.clear()
+
+    def move(self, page_ids: Iterable[str], parent_id: Optional[str], updated_at: int) -> None:
+        for page_id in page_ids:
+            page = self.pages.get(page_id)
+            if page is None:
+                self._set_parent(page_id, parent_id)
+                continue
+            self.put(replace(page, parent_id=parent_id, updated_at=updated_at))
+
+    def remove(self, page_id: str, *, hard: bool = False) -> None:
+        """Drop a page from the tree; ``hard`` also forgets the row itself."""
+        self._unlink(page_id)
+        self.pages.pop(page_id, None)
+        if hard:
+            self.parents.pop(page_id, None)
+            self._ancestors.clear()
+
+    def touch(self, page_id: str, referenced_at: int) -> None:
+        page = self.pages.get(page_id)
+        if page is not None:
+            page.last_referenced_at = referenced_at
+
+
+_CACHES: Dict[Tuple[str, int, int], MemopediaTreeCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def _database_key(conn: sqlite3.Connection) -> Optional[Tuple[str, int, int]]:
+    try:
+        rows = conn.execute("PRAGMA database_list").fetchall()
+    except sqlite3.Error:
+        return None
+    path = next((row[2] for row in rows if row[1] == "main"), "")
+    if not path:
+        return None  # :memory: / 一時DBは接続ごとに別物なので共有しない
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    # inode も鍵に含め、置き換えられたファイル (バックアップ復元など) と区別する
+    return (os.path.realpath(path), st.st_dev, st.st_ino)
+
+
+def cache_for(conn: sqlite3.Connection) -> Optional[MemopediaTreeCache]:
+    """The shared cache for ``conn``'s database file (None for in-memory DBs)."""
+    key = _database_key(conn)
+    if key is None:
+        return None
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = MemopediaTreeCache()
+        return cache
+
+
+def current_version(conn: sqlite3.Connection) -> Optional[int]:
+    """``data_versions`` counter for memopedia_pages, or None when not tracked."""
+    try:
+        row = conn.execute("SELECT version FROM data_versions WHERE name = ?", (_NAME,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else None
+
+
+def clear_caches() -> None:
+    """Forget every cached tree (tests, or after swapping database files)."""
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
+
+__all__ = ["MemopediaTreeCache", "cache_for", "clear_caches", "current_version"]
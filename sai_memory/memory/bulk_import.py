@@ -0,0 +1,329 @@
+"""Batched message import for SAIMemory databases.
+
+The per-message helpers (``add_message``, ``replace_message_embeddings``)
+commit after every row, update both message indexes row by row and embed
+inline. That is fine for
+live chat but turns a multi-year export into hours of fsyncs.
+
+``BulkImporter`` buffers rows and writes them with ``executemany``, one
+transaction per ``batch_size`` rows. Optionally it drops the secondary
+message indexes while it is open and rebuilds them once at the end; they
+are also recreated by ``init_db``, so an import that dies half-way leaves
+nothing permanently missing.
+
+Embedding is deferred: the importer only records the ids of messages that
+need vectors, and :func:`embed_pending` re-reads their content and embeds
+them afterwards in large batches.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from persona.utils import env_int
+from sai_memory.memory.chunking import chunk_text
+
+LOGGER = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+# 1トランザクションあたりの行数 / 1回の embed 呼び出しに渡すチャンク数
+IMPORT_BATCH_SIZE = max(1, env_int("SAIMEMORY_IMPORT_BATCH_SIZE", 5000))
+IMPORT_EMBED_BATCH = max(1, env_int("SAIMEMORY_IMPORT_EMBED_BATCH", 64))
+
+_DEFERRED_INDEXES = ("idx_messages_thread_created", "idx_messages_resource_created")
+
+
+def _lock_or_null(lock: Optional[threading.RLock]) -> ContextManager[Any]:
+    return lock if lock is not None else nullcontext()
+
+
+class BulkImporter:
+    """Write many messages into one memory.db with batched transactions.
+
+    Use as a context manager::
+
+        with BulkImporter(conn, total=len(rows), progress_callback=cb) as bulk:
+            for row in rows:
+                bulk.add_message(thread_id, row["role"], row["content"], embed=True)
+        embed_pending(conn, embedder, bulk.pending_embeddings,
+                      min_chars=settings.chunk_min_chars, max_chars=settings.chunk_max_chars)
+
+    ``lock`` is the writer lock of a shared connection (the adapter's
+    ``_db_lock``); it is held per batch, not for the whole import, so live
+    writes can interleave. Set ``defer_indexes=False`` when other readers
+    query the database during the import.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        lock: Optional[threading.RLock] = None,
+        batch_size: Optional[int] = None,
+        total: int = 0,
+        defer_indexes: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> None:
+        self.conn = conn
+        self.lock = lock
+        self.batch_size = max(1, batch_size or IMPORT_BATCH_SIZE)
+        self.total = total
+        self.defer_indexes = defer_indexes
+        self.progress_callback = progress_callback
+        self.written = 0
+        self.pending_embeddings: List[str] = []
+        self._threads: Dict[str, Optional[str]] = {}
+        self._known_threads: set[str] = set()
+        self._rows: List[Tuple[Any, ...]] = []
+        self._dropped: List[Tuple[str, str]] = []  # (index name, sql)
+        self._synchronous: Optional[int] = None
+        self._active = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def __enter__(self) -> "BulkImporter":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.finish()
+        else:
+            self.abort()
+
+    def begin(self) -> None:
+        if self._active:
+            return
+        with _lock_or_null(self.lock):
+            self.conn.commit()
+            self._synchronous = int(self.conn.execute("PRAGMA synchronous").fetchone()[0])
+            # WAL + NORMAL は電源断でも壊れない。コミット毎の fsync だけを省く
+            if self._synchronous > 1:
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+            if self.defer_indexes:
+                rows = self.conn.execute(
+                    f"SELECT name, sql FROM sqlite_master "
+                    f"WHERE type='index' AND name IN ({', '.join('?' for _ in _DEFERRED_INDEXES)})",
+                    _DEFERRED_INDEXES,
+                ).fetchall()
+                for name, sql in rows:
+                    if not sql:
+                        continue
+                    self.conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+                    self._dropped.append((name, sql))
+            self.conn.commit()
+        self._active = True
+        LOGGER.debug(
+            "Bulk import started: batch_size=%d, deferred=%s",
+            self.batch_size,
+            [name for name, _ in self._dropped],
+        )
+
+    def finish(self) -> None:
+        """Flush the last batch and rebuild what :meth:`begin` dropped."""
+        if not self._active:
+            return
+        try:
+            self.flush()
+        finally:
+            self._restore()
+
+    def abort(self) -> None:
+        """Discard the unflushed batch and restore the dropped indexes."""
+        if not self._active:
+            return
+        with _lock_or_null(self.lock):
+            self.conn.rollback()
+        self._rows.clear()
+        self._threads.clear()
+        self._restore()
+
+    def _restore(self) -> None:
+        with _lock_or_null(self.lock):
+            if self._dropped:
+                self._report(f"Rebuilding indexes ({self.written} messages)...")
+            for name, sql in self._dropped:
+                try:
+                    self.conn.execute(sql)
+                except sqlite3.OperationalError as exc:
+                    LOGGER.warning("Failed to recreate %s after bulk import: %s", name, exc)
+            self.conn.commit()
+            if self._synchronous is not None and self._synchronous > 1:
+                self.conn.execute(f"PRAGMA synchronous={self._synchronous}")
+        self._dropped.clear()
+        self._active = False
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+    def add_thread(self, thread_id: str, resource_id: Optional[str] = None) -> None:
+        if thread_id in self._known_threads:
+            return
+        self._known_threads.add(thread_id)
+        self._threads[thread_id] = resource_id
+
+    def add_message(
+        self,
+        thread_id: str,
+        role: str,
+        content: str,
+        *,
+        resource_id: Optional[str] = None,
+        created_at: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        message_id: Optional[str] = None,
+        embed: bool = False,
+    ) -> str:
+        """Queue one message (creating its thread if needed). Returns the message id.
+
+        ``message_id`` keeps an original id; an existing row with that id is
+        replaced. ``embed=True`` records the message for :func:`embed_pending`.
+        """
+        if not self._active:
+            self.begin()
+        mid = message_id or str(uuid.uuid4())
+        ts = int(time.time()) if created_at is None else int(created_at)
+        meta_json = json.dumps(metadata, ensure_ascii=False) if metadata else None
+        self.add_thread(thread_id, resource_id)
+        self._rows.append((mid, thread_id, role, content, resource_id, ts, meta_json))
+        if embed and content and content.strip():
+            self.pending_embeddings.append(mid)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+        return mid
+
+    def flush(self) -> None:
+        """Write the buffered rows in one transaction."""
+        if not self._rows and not self._threads:
+            return
+        with _lock_or_null(self.lock):
+            try:
+                if self._threads:
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO threads(id, resource_id, overview, overview_updated_at)"
+                        " VALUES (?, ?, NULL, NULL)",
+                        list(self._threads.items()),
+                    )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO messages(id, thread_id, role, content, resource_id, created_at, metadata)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._rows,
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        self.written += len(self._rows)
+        self._rows.clear()
+        self._threads.clear()
+        self._report(f"Imported {self.written}/{max(self.total, self.written)} messages")
+
+    def _report(self, message: str) -> None:
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(self.written, max(self.total, self.written), message)
+        except Exception:
+            LOGGER.debug("Bulk import progress callback failed", exc_info=True)
+
+
+def _iter_contents(
+    conn: sqlite3.Connection, message_ids: Sequence[str], lock: Optional[threading.RLock]
+) -> Iterator[Tuple[str, str]]:
+    page = 500
+    for start in range(0, len(message_ids), page):
+        ids = message_ids[start : start + page]
+        with _lock_or_null(lock):
+            rows = conn.execute(
+                f"SELECT id, content FROM messages WHERE id IN ({', '.join('?' for _ in ids)})",
+                ids,
+            ).fetchall()
+        contents = dict(rows)
+        for mid in ids:
+            yield mid, contents.get(mid) or ""
+
+
+def embed_pending(
+    conn: sqlite3.Connection,
+    embedder: Any,
+    message_ids: Sequence[str],
+    *,
+    min_chars: int,
+    max_chars: int,
+    lock: Optional[threading.RLock] = None,
+    batch_chunks: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> int:
+    """Embed the given messages in batches. Returns messages embedded.
+
+    Content is read back from ``messages`` a page at a time. Chunks of several messages share one ``embedder.embed`` call of about
+    ``batch_chunks`` texts, and each batch's vectors are written with
+    ``executemany`` in one transaction. Inference runs without ``lock``.
+    """
+    batch_chunks = max(1, batch_chunks or IMPORT_EMBED_BATCH)
+    total = len(message_ids)
+    done = 0
+    embedded = 0
+    owners: List[Tuple[str, int]] = []  # (message_id, chunk count)
+    texts: List[str] = []
+
+    def _write_batch() -> None:
+        nonlocal embedded
+        vectors = embedder.embed(texts, is_query=False)
+        rows: List[Tuple[str, int, str]] = []
+        offset = 0
+        for mid, count in owners:
+            for idx in range(count):
+                rows.append((mid, idx, json.dumps([float(v) for v in vectors[offset + idx]])))
+            offset += count
+        with _lock_or_null(lock):
+            try:
+                conn.executemany(
+                    "DELETE FROM message_embeddings WHERE message_id=?",
+                    [(mid,) for mid, _ in owners],
+                )
+                conn.executemany(
+                    "INSERT INTO message_embeddings(message_id, chunk_index, vector) VALUES(?, ?, ?)",
+                    rows,
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        embedded += len(owners)
+        owners.clear()
+        texts.clear()
+
+    for mid, content in _iter_contents(conn, message_ids, lock):
+        chunks = chunk_text(content.strip(), min_chars=min_chars, max_chars=max_chars)
+        payload = [c.strip() for c in chunks if c and c.strip()]
+        done += 1
+        if payload:
+            owners.append((mid, len(payload)))
+            texts.extend(payload)
+        if len(texts) >= batch_chunks:
+            _write_batch()
+            if progress_callback:
+                progress_callback(done, total, f"Embedding {done}/{total} messages...")
+    if texts:
+        _write_batch()
+    if progress_callback and total:
+        progress_callback(total, total, f"Embedded {embedded} messages")
+    return embedded
+
+
+__all__ = [
+    "BulkImporter",
+    "IMPORT_BATCH_SIZE",
+    "IMPORT_EMBED_BATCH",
+    "embed_pending",
+]
@@ -0,0 +1,73 @@
+"""Small pool of read-only SQLite connections for one memory database.
+
+In WAL mode readers do not block the writer (and vice versa), so recall,
+history fetches and context building can run on pooled reader connections
+while the single writer connection stays behind the adapter's lock.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sai_memory.memory.storage import open_reader
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ReaderPool:
+    """Bounded pool of reader connections, opened lazily on demand."""
+
+    def __init__(self, db_path: str, size: int = 4) -> None:
+        self.db_path = db_path
+        self.size = max(1, int(size))
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("reader pool is closed")
+            if len(self._all) < self.size:
+                conn = open_reader(self.db_path)
+                self._all.append(conn)
+                return conn
+        # Pool exhausted: wait for another reader to finish
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close idle readers now; readers in use are closed when released."""
+        with self._lock:
+            self._closed = True
+            self._all = []
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception:
+                LOGGER.debug("Failed to close reader connection", exc_info=True)
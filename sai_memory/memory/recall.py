@@ -5,11 +5,14 @@ import logging
 import os
 from pathlib import Path
 from threading import RLock
-from typing import Any, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 import numpy as np
-from fastembed import TextEmbedding
-from fastembed.common.model_description import ModelSource, PoolingType
+
+if TYPE_CHECKING:
+    # fastembed (onnxruntime/tokenizers) is imported when an Embedder is first built
+    from fastembed import TextEmbedding
+    from fastembed.common.model_description import PoolingType
 
 from sai_memory.logging_utils import debug
 from sai_memory.memory.storage import (
@@ -44,6 +47,8 @@ class Embedder:
         model_dim: int | None = None,
         cuda: bool | None = None,
     ):
+        from fastembed import TextEmbedding
+
         self.model_name = model
         logger = logging.getLogger(__name__)
         resolved_local_path: str | None = None
@@ -202,6 +207,9 @@ def _build_local_model_kwargs(
     local_model_path: str,
     explicit_dim: int | None,
 ) -> Dict[str, Any]:
+    from fastembed import TextEmbedding
+    from fastembed.common.model_description import ModelSource
+
     model_dir = Path(local_model_path).expanduser().resolve()
     if not model_dir.exists():
         raise FileNotFoundError(f"SAIMemory embedding model path does not exist: {model_dir}")
@@ -285,6 +293,8 @@ def _infer_embedding_dimension(model_dir: Path) -> int:
 
 
 def _infer_pooling(model_dir: Path) -> PoolingType:
+    from fastembed.common.model_description import PoolingType
+
     pooling_cfg = model_dir / "1_Pooling" / "config.json"
     if pooling_cfg.exists():
         try:
@@ -411,6 +421,12 @@ def semantic_recall(
     return expanded
 
 
+def embed_query(embedder: Embedder, query_text: str) -> np.ndarray:
+    """Embed a recall query. Pure inference: needs no DB connection or lock."""
+    vectors: List[List[float]] = embedder.embed([query_text], is_query=True)
+    return np.array(vectors[0], dtype=np.float32)
+
+
 def semantic_recall_groups(
     conn,
     embedder: Embedder,
@@ -424,15 +440,18 @@ def semantic_recall_groups(
     scope: str,
     exclude_message_ids: set[str] | None = None,
     required_tags: list[str] | None = None,
+    query_vector: Any = None,
 ) -> List[Tuple[Message, List[Message], float]]:
     """Return top-k recall groups as (seed, group_messages_sorted, score).
 
     - seed: the message that matched semantically
     - group_messages_sorted: [before..., seed, after...] ordered by created_at
     - score: cosine similarity for the seed
+
+    Pass ``query_vector`` (see :func:`embed_query`) to skip embedding here, so
+    callers can run inference before taking any DB lock.
     """
-    vectors: List[List[float]] = embedder.embed([query_text], is_query=True)
-    q = np.array(vectors[0], dtype=np.float32)
+    q = query_vector if query_vector is not None else embed_query(embedder, query_text)
     vector_dim = q.shape[0]
 
     if scope == "resource" and resource_id:
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from sai_memory.logging_utils import debug
+from saiverse.sql_profiler import connect_kwargs
 
 
 def _ensure_dir(path: str) -> None:
@@ -39,9 +40,20 @@ def _configure_sqlite(conn: sqlite3.Connection) -> None:
         conn.execute(f"PRAGMA wal_autocheckpoint={wal_autocheckpoint_int}")
 
 
+def open_reader(db_path: str) -> sqlite3.Connection:
+    """Open a read-only connection to an existing (WAL) database.
+
+    Readers never write, so only ``query_only`` and a busy timeout are set;
+    journal mode is a property of the database file and set by the writer.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0, **connect_kwargs("saimemory"))
+    conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
 def init_db(db_path: str, *, check_same_thread: bool = True) -> sqlite3.Connection:
     _ensure_dir(db_path)
-    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread, **connect_kwargs("saimemory"))
     _configure_sqlite(conn)
     conn.execute(
         """
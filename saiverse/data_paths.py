@@ -5,16 +5,28 @@ Provides centralized access to three data sources with priority:
     2. expansion_data (<repo>/expansion_data/) — middle priority
     3. builtin_data (<repo>/builtin_data/)  — lowest priority
 
+Static files (prompts, model configs) and directory lookups are served from
+a stat-validated cache: within ``SAIVERSE_FILE_CACHE_TTL_SEC`` of the last
+check no filesystem call is made at all, afterwards a changed mtime/size (or
+directory mtime for listings) triggers a re-read. Edits are therefore picked
+up within the TTL without restarting.
+
 Environment variables:
     SAIVERSE_USER_DATA_DIR: Override user_data directory (for testing)
     SAIVERSE_HOME: Override ~/.saiverse directory (for testing)
+    SAIVERSE_FILE_CACHE_TTL_SEC: Revalidation interval of the file cache (default 2.0)
 """
 from __future__ import annotations
 
+import copy
+import json
 import logging
 import os
+import time
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from persona.utils import env_float
 
 LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +67,118 @@ PROMPTS_DIR = "prompts"
 ICONS_DIR = "icons"
 
 
+# ---------------------------------------------------------------------------
+# Stat-validated content cache
+# ---------------------------------------------------------------------------
+
+_cache_ttl: Optional[float] = None
+
+
+def _get_cache_ttl() -> float:
+    # 初回利用時に読む（.env の読み込み前に import されても反映される。不正値は既定値）
+    global _cache_ttl
+    if _cache_ttl is None:
+        _cache_ttl = env_float("SAIVERSE_FILE_CACHE_TTL_SEC", 2.0)
+    return _cache_ttl
+
+
+class _CacheEntry:
+    __slots__ = ("signature", "checked_at", "value")
+
+    def __init__(self, signature: Hashable, checked_at: float, value: Any) -> None:
+        self.signature = signature
+        self.checked_at = checked_at
+        self.value = value
+
+
+# 競合しても同じ内容を二度読むだけなのでロックは取らない（dict 操作自体はアトミック）
+_content_cache: Dict[Hashable, _CacheEntry] = {}
+
+
+def _cached(key: Hashable, signature_fn: Callable[[], Hashable], load_fn: Callable[[], Any]) -> Any:
+    now = time.monotonic()
+    entry = _content_cache.get(key)
+    if entry is not None and now - entry.checked_at < _get_cache_ttl():
+        return entry.value
+    signature = signature_fn()
+    if entry is not None and entry.signature == signature:
+        entry.checked_at = now
+        return entry.value
+    value = load_fn()
+    _content_cache[key] = _CacheEntry(signature, now, value)
+    return value
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _dir_mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _listing_signature(subdir: str) -> tuple:
+    """mtimes of every directory a lookup in ``subdir`` can see.
+
+    Adding, removing or renaming a file changes its directory's mtime, so an
+    unchanged signature means the lookup result is still valid.
+    """
+    parts: list = [str(USER_DATA_DIR), _dir_mtime(USER_DATA_DIR / subdir)]
+    expansion_mtime = _dir_mtime(EXPANSION_DATA_DIR)
+    parts.append(expansion_mtime)
+    if expansion_mtime is not None:
+        for project_dir in sorted(EXPANSION_DATA_DIR.iterdir()):
+            parts.append((project_dir.name, _dir_mtime(project_dir), _dir_mtime(project_dir / subdir)))
+    parts.append(_dir_mtime(BUILTIN_DATA_DIR / subdir))
+    return tuple(parts)
+
+
+def read_text_cached(path: Path | str, encoding: str = "utf-8") -> str:
+    """``Path.read_text`` served from the content cache.
+
+    Raises FileNotFoundError (and drops the cached entry) when the file is gone.
+    """
+    path = Path(path)
+    key = ("text", str(path), encoding)
+    try:
+        return _cached(key, lambda: _file_signature(path), lambda: path.read_text(encoding=encoding))
+    except FileNotFoundError:
+        _content_cache.pop(key, None)
+        raise
+
+
+def load_json_cached(path: Path | str) -> Any:
+    """Parse a JSON file through the content cache.
+
+    Returns a fresh copy on every call so callers may mutate the result.
+    """
+    path = Path(path)
+    key = ("json", str(path))
+    try:
+        value = _cached(
+            key,
+            lambda: _file_signature(path),
+            lambda: json.loads(path.read_text(encoding="utf-8")),
+        )
+    except FileNotFoundError:
+        _content_cache.pop(key, None)
+        raise
+    return copy.deepcopy(value)
+
+
+def expire_file_cache() -> None:
+    """Force the next access of every cached entry to revalidate against the disk.
+
+    Unchanged files are still served from memory; only the TTL is skipped.
+    """
+    for entry in list(_content_cache.values()):
+        entry.checked_at = float("-inf")
+
+
 def get_data_paths(subdir: str) -> list[Path]:
     """Get user_data, expansion_data, and builtin_data paths for a subdirectory.
 
@@ -96,6 +220,17 @@ def find_file(subdir: str, filename: str) -> Path | None:
     Returns:
         Path to the file if found, None otherwise
     """
+    if "/" in filename or os.sep in filename:
+        # Nested lookups are not covered by the listing signature
+        return _find_file_uncached(subdir, filename)
+    return _cached(
+        ("find", str(USER_DATA_DIR), subdir, filename),
+        lambda: _listing_signature(subdir),
+        lambda: _find_file_uncached(subdir, filename),
+    )
+
+
+def _find_file_uncached(subdir: str, filename: str) -> Path | None:
     # Check user_data first (highest priority)
     user_file = USER_DATA_DIR / subdir / filename
     if user_file.exists():
@@ -132,6 +267,15 @@ def iter_files(subdir: str, pattern: str = "*") -> Iterator[Path]:
     Yields:
         Path objects for matching files
     """
+    files = _cached(
+        ("iter", str(USER_DATA_DIR), subdir, pattern),
+        lambda: _listing_signature(subdir),
+        lambda: tuple(_iter_files_uncached(subdir, pattern)),
+    )
+    return iter(files)
+
+
+def _iter_files_uncached(subdir: str, pattern: str) -> Iterator[Path]:
     seen_names: set[str] = set()
 
     # 1. User data (highest priority)
@@ -301,7 +445,7 @@ def load_prompt(name: str) -> str:
     if path is None:
         raise FileNotFoundError(f"Prompt file not found: {name}")
     
-    return path.read_text(encoding="utf-8")
+    return read_text_cached(path)
 
 
 def get_user_icons_dir() -> Path:
@@ -451,6 +595,9 @@ __all__ = [
     "iter_project_subdirs",
     "get_project_data_paths",
     "load_prompt",
+    "read_text_cached",
+    "load_json_cached",
+    "expire_file_cache",
     "get_user_icons_dir",
     "get_user_database_dir",
     "ensure_user_data_dirs",
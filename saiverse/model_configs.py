@@ -18,7 +18,7 @@ def load_configs() -> Dict[str, Dict]:
     2. builtin_data/models/
     3. models/ (legacy, for backwards compatibility)
     """
-    from .data_paths import iter_files, MODELS_DIR
+    from .data_paths import iter_files, load_json_cached, MODELS_DIR
     
     configs: Dict[str, Dict] = {}
     seen_keys: set[str] = set()
@@ -26,7 +26,8 @@ def load_configs() -> Dict[str, Dict]:
     # Load from user_data and builtin_data (iter_files handles priority)
     for config_file in iter_files(MODELS_DIR, "*.json"):
         try:
-            config_data = json.loads(config_file.read_text(encoding="utf-8"))
+            # Unchanged files are served from the stat-validated cache
+            config_data = load_json_cached(config_file)
             
             # Extract model ID from config (required field for API calls)
             model_id = config_data.get("model")
@@ -71,7 +72,11 @@ def reload_configs() -> Dict[str, Dict]:
     Call this after adding, editing, or removing model JSON files
     to pick up changes without restarting the server.
     """
+    from .data_paths import expire_file_cache
+
     global MODEL_CONFIGS
+    # Skip the cache TTL so edits made just now are seen; unchanged files are not re-parsed
+    expire_file_cache()
     MODEL_CONFIGS = load_configs()
     LOGGER.info("Model configurations reloaded: %d models", len(MODEL_CONFIGS))
     return MODEL_CONFIGS
@@ -212,13 +217,13 @@ def find_model_config(query: str) -> tuple[str, Dict]:
             return config_key, config
 
     # 3. Check exact filename match - load config directly from file
-    from .data_paths import get_data_paths, MODELS_DIR
+    from .data_paths import get_data_paths, load_json_cached, MODELS_DIR
 
     for models_path in get_data_paths(MODELS_DIR):
         config_file = models_path / f"{query}.json"
         if config_file.exists():
             try:
-                config_data = json.loads(config_file.read_text(encoding="utf-8"))
+                config_data = load_json_cached(config_file)
                 model_id = config_data.get("model", query)
                 # Return the query (filename) as the resolved ID so caller knows which file was used
                 # But include the actual model ID in the config for API calls
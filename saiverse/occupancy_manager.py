@@ -1,10 +1,15 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Callable, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 
-from database.models import BuildingOccupancyLog, User as UserModel
+from database.models import (
+    BuildingOccupancyDaily,
+    BuildingOccupancyLog,
+    User as UserModel,
+)
+from persona.building_history import ensure_building_history
 
 if TYPE_CHECKING:
     from .buildings import Building
@@ -101,9 +106,9 @@ class OccupancyManager:
             to_building_name = self.building_map[to_id].name
             action_type = "AI Action" if entity_type == 'ai' else "User Action"
             left_message = f'<div class="note-box">🚶 {action_type}:<br><b>{entity_name}が{to_building_name}へ移動しました</b></div>'
-            self.building_histories.setdefault(from_id, []).append({"role": "host", "content": left_message})
+            ensure_building_history(self.building_histories, from_id).append({"role": "host", "content": left_message})
             entered_message = f'<div class="note-box">🚶 {action_type}:<br><b>{entity_name}が{from_building_name}から入室しました</b></div>'
-            self.building_histories.setdefault(to_id, []).append({"role": "host", "content": entered_message})
+            ensure_building_history(self.building_histories, to_id).append({"role": "host", "content": entered_message})
 
             logging.info(f"Moved {entity_type} '{entity_id}' from {from_id} to {to_id}.")
             return True, None
@@ -114,5 +119,88 @@ class OccupancyManager:
         finally:
             if manage_session_locally: db.close()
 
+    def compact_history(
+        self,
+        retention_days: int = 30,
+        now: Optional[datetime] = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """
+        retention_days より前に退室済みの在室ログを日別集計
+        (building_occupancy_daily) に畳み込み、元のログ行を削除する。
+        在室中の行 (EXIT_TIMESTAMP IS NULL) は対象外。削除した行数を返す。
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+        total = 0
+        while True:
+            db = self.SessionLocal()
+            try:
+                rows = (
+                    db.query(BuildingOccupancyLog)
+                    .filter(
+                        BuildingOccupancyLog.CITYID == self.city_id,
+                        BuildingOccupancyLog.EXIT_TIMESTAMP.isnot(None),
+                        BuildingOccupancyLog.EXIT_TIMESTAMP < cutoff,
+                    )
+                    .order_by(BuildingOccupancyLog.ID)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    return total
+
+                buckets: Dict[Tuple[str, str, str], List[float]] = {}
+                for row in rows:
+                    for day, seconds in _split_interval_by_day(row.ENTRY_TIMESTAMP, row.EXIT_TIMESTAMP):
+                        bucket = buckets.setdefault((row.BUILDINGID, row.AIID, day), [0, 0.0])
+                        bucket[1] += seconds
+                    first_day = row.ENTRY_TIMESTAMP.strftime("%Y-%m-%d")
+                    buckets.setdefault((row.BUILDINGID, row.AIID, first_day), [0, 0.0])[0] += 1
+
+                for (building_id, ai_id, day), (visits, seconds) in buckets.items():
+                    daily = (
+                        db.query(BuildingOccupancyDaily)
+                        .filter_by(BUILDINGID=building_id, AIID=ai_id, DAY=day)
+                        .first()
+                    )
+                    if daily is None:
+                        daily = BuildingOccupancyDaily(
+                            CITYID=self.city_id,
+                            BUILDINGID=building_id,
+                            AIID=ai_id,
+                            DAY=day,
+                            VISIT_COUNT=0,
+                            TOTAL_SECONDS=0.0,
+                        )
+                        db.add(daily)
+                    daily.VISIT_COUNT += visits
+                    daily.TOTAL_SECONDS += seconds
+
+                db.query(BuildingOccupancyLog).filter(
+                    BuildingOccupancyLog.ID.in_([row.ID for row in rows])
+                ).delete(synchronize_session=False)
+                db.commit()
+                total += len(rows)
+                logging.info("Compacted %d occupancy log row(s) older than %s.", len(rows), cutoff)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
     def _is_user(self, entity_id: str) -> bool:
         return entity_id == self.user_entity_id
+
+
+def _split_interval_by_day(start: datetime, end: datetime) -> List[Tuple[str, float]]:
+    """[start, end) を日付境界で分割し、(YYYY-MM-DD, 秒数) のリストを返す。"""
+    if end <= start:
+        return [(start.strftime("%Y-%m-%d"), 0.0)]
+    parts: List[Tuple[str, float]] = []
+    cursor = start
+    while cursor < end:
+        next_midnight = datetime.combine(cursor.date() + timedelta(days=1), datetime.min.time())
+        segment_end = min(end, next_midnight)
+        parts.append((cursor.strftime("%Y-%m-%d"), (segment_end - cursor).total_seconds()))
+        cursor = segment_end
+    return parts
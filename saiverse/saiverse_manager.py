@@ -7,7 +7,7 @@ import requests
 import logging
 from pathlib import Path
 import mimetypes
-from typing import Dict, List, Optional, Tuple, Iterator, Union, Any, Callable
+from typing import Dict, List, Optional, Tuple, Iterator, AsyncIterator, Union, Any, Callable
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import importlib
@@ -21,8 +21,10 @@ from .buildings import Building
 from sea import SEARuntime
 from sea.pulse_controller import PulseController
 from persona.core import PersonaCore
+from persona.building_history import ensure_building_history
 from .model_configs import get_model_provider, get_context_length
 from .occupancy_manager import OccupancyManager
+from .startup_profiler import PhaseClock
 from .conversation_manager import ConversationManager
 from .schedule_manager import ScheduleManager
 from .integration_manager import IntegrationManager
@@ -92,14 +94,24 @@ class SAIVerseManager(
         model: Optional[str] = None,
         sds_url: str = os.getenv("SDS_URL", "http://127.0.0.1:8080"),
     ):
+        # 各フェーズの所要時間を計測（startup_diagnostics が出来るまでは手元に溜める）
+        pending_laps: List[Tuple[str, float]] = []
+        clock = PhaseClock("manager", sink=lambda phase, seconds: pending_laps.append((phase, seconds)))
+
         # --- Phase 1: Data Loading ---
         self._init_database(db_path)
+        clock.lap("database")
         self._init_city_config(city_name)
         self._init_buildings()
+        clock.lap("city_and_buildings")
         self._init_file_paths()
         self._init_avatars()
         self._init_building_histories()
+        clock.lap("building_histories")
         self._init_model_config(model)
+        for phase, seconds in pending_laps:
+            self._record_startup_timing(phase, seconds)
+        clock.sink = self._record_startup_timing
 
         self.state = CoreState(
             session_factory=self.SessionLocal,
@@ -199,6 +211,7 @@ class SAIVerseManager(
         self.persona_map = self.state.persona_map
         self.id_to_name_map.update({pid: p.persona_name for pid, p in self.personas.items()})
         self._load_occupancy_from_db()
+        clock.lap("personas_and_occupancy")
 
         # --- Step 6: Prepare Background Task Managers ---
         # 自律会話を管理するConversationManagerを準備します（この時点ではまだ起動しません）。
@@ -228,12 +241,14 @@ class SAIVerseManager(
         )
         self.phenomenon_manager.start()
         logging.info("Initialized and started PhenomenonManager.")
+        clock.lap("background_managers")
 
         # --- Initialize IntegrationManager ---
         self.integration_manager = IntegrationManager(self, tick_interval=30)
         self._register_integrations()
         self.integration_manager.start()
         logging.info("Initialized and started IntegrationManager.")
+        clock.lap("integrations")
 
         # --- Step 7: Register with SDS and start background tasks ---
         self.sds_url = sds_url
@@ -255,10 +270,12 @@ class SAIVerseManager(
             logging.info("Starting in Offline Mode as per DB setting.")
             self.sds_status = "Offline (Startup Setting)"
             self._load_cities_from_db()
+        clock.lap("sds")
         self.gateway_runtime = None
         self.gateway_mapping = ChannelMapping([])
         self._gateway_memory_transfers: Dict[str, Dict[str, Any]] = {}
         self._gateway_memory_active_persona: Dict[str, str] = {}
+        self._gateway_memory_outgoing: Dict[str, Dict[str, Any]] = {}
         gateway_enabled = os.getenv("SAIVERSE_GATEWAY_ENABLED", "0").lower() in {
             "1",
             "true",
@@ -271,6 +288,7 @@ class SAIVerseManager(
                 logging.exception(
                     "Failed to initialize Discord gateway integration: %s", exc
                 )
+        clock.lap("gateways")
 
         # SEA runtime (always enabled)
         self.sea_runtime: SEARuntime = SEARuntime(self)
@@ -293,6 +311,7 @@ class SAIVerseManager(
         self.items_by_persona = self.item_service.items_by_persona
         self.world_items = self.item_service.world_items
         self.item_registry = self.items  # Alias for UI compatibility
+        clock.lap("runtime_and_items")
 
         # Start background thread for DB polling (after runtime is ready)
         self.db_polling_stop_event = threading.Event()
@@ -310,6 +329,7 @@ class SAIVerseManager(
             TriggerType.SERVER_START,
             {"city_id": self.city_id, "city_name": self.city_name},
         )
+        clock.lap("background_start")
 
     @staticmethod
     def _load_avatar_data(path: Path) -> Optional[str]:
@@ -540,7 +560,7 @@ class SAIVerseManager(
     def _append_building_history_note(self, building_id: str, content: str) -> None:
         if not building_id:
             return
-        history = self.building_histories.setdefault(building_id, [])
+        history = ensure_building_history(self.building_histories, building_id)
         history.append({
             "role": "host", 
             "content": content,
@@ -578,7 +598,7 @@ class SAIVerseManager(
                 if last_building_id and last_building_id in self.building_map:
                     username = user.USERNAME or "ユーザー"
                     logout_message = f'<div class="note-box">🚶 User Action:<br><b>{username}がオフラインになりました</b></div>'
-                    self.building_histories.setdefault(last_building_id, []).append({"role": "host", "content": logout_message})
+                    ensure_building_history(self.building_histories, last_building_id).append({"role": "host", "content": logout_message})
                     self._save_building_histories()
                     logging.info(f"Logged user logout in building {last_building_id}")
 
@@ -660,8 +680,7 @@ class SAIVerseManager(
             logging.info("PhenomenonManager stopped.")
 
         # Save all persona and building states
-        for persona in self.personas.values():
-            persona._save_session_metadata()
+        self._flush_session_metadata()
         self._save_building_histories()
         logging.info("SAIVerseManager shutdown complete.")
 
@@ -678,6 +697,16 @@ class SAIVerseManager(
             args=args, building_id=building_id,
         )
 
+    async def handle_user_input_stream_async(
+        self, message: str, metadata: Optional[Dict[str, Any]] = None, meta_playbook: Optional[str] = None,
+        args: Optional[Dict[str, Any]] = None, building_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        async for chunk in self.runtime.handle_user_input_stream_async(
+            message, metadata=metadata, meta_playbook=meta_playbook,
+            args=args, building_id=building_id,
+        ):
+            yield chunk
+
     def cancel_active_generation(self) -> bool:
         """Cancel the active LLM generation for personas in the user's current building.
 
@@ -901,8 +930,7 @@ class SAIVerseManager(
                 replies.extend(persona.run_scheduled_prompt())
         if replies:
             self._save_building_histories()
-            for persona in self.personas.values():
-                persona._save_session_metadata()
+            self._flush_session_metadata()
         return replies
 
     def execute_tool(self, tool_id: int, persona_id: str, arguments: Dict[str, Any]) -> str:
@@ -1098,8 +1126,7 @@ class SAIVerseManager(
         for building_id in self.building_map:
             if building_id not in self.occupants:
                 self.occupants[building_id] = []
-            if building_id not in self.building_histories:
-                self.building_histories[building_id] = []
+            ensure_building_history(self.building_histories, building_id)
 
     def delete_building(self, building_id: str) -> str:
         """Deletes a building after checking for occupants."""
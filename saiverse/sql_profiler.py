@@ -0,0 +1,396 @@
+"""Opt-in SQLite statement timing and slow-query log.
+
+Enabled with ``SAIVERSE_SQL_PROFILE=1``. Two entry points feed one
+process-wide :class:`SQLProfiler`:
+
+- :func:`instrument_engine` hooks SQLAlchemy's ``before/after_cursor_execute``
+  events (the main ``saiverse.db`` engines in ``manager/initialization.py``
+  and ``database/session.py``).
+- :func:`connection_factory` returns an ``sqlite3.Connection`` subclass whose
+  cursors time ``execute`` *and* the row fetching that follows, so a plain
+  ``SELECT`` that only gets expensive while iterating (``_fetch_all_messages``)
+  is measured as one statement. SAIMemory's ``init_db`` / ``open_reader``
+  pass it as ``factory=`` when profiling is on.
+
+Statements are aggregated by normalised SQL (literals → ``?``, ``IN (?, ?, …)``
+collapsed) with a latency histogram per shape. Statements slower than
+``SAIVERSE_SLOW_QUERY_MS`` (default 100) are logged with their
+``EXPLAIN QUERY PLAN`` and kept in a bounded slow log. The report is served
+by ``GET /api/config/sql-stats``.
+
+When profiling is off nothing is hooked and connections are plain
+``sqlite3.Connection`` objects.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+MAX_STATEMENT_SHAPES = 2000
+SLOW_LOG_SIZE = 100
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete", "replace")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sql_profiling_enabled() -> bool:
+    return os.getenv("SAIVERSE_SQL_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _slow_threshold_ms() -> float:
+    try:
+        return float(os.getenv("SAIVERSE_SLOW_QUERY_MS", "100"))
+    except ValueError:
+        return 100.0
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """Statement shape used as the aggregation key."""
+    text = _STRING_LITERAL.sub("?", sql)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _IN_LIST.sub("IN (?, …)", text)
+
+
+class _StatementStats:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets", "slow_count", "plan")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.slow_count = 0
+        self.plan: Optional[List[str]] = None
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        for index, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile_ms(self, pct: float) -> float:
+        """Upper bound of the bucket holding the ``pct`` percentile."""
+        target = self.count * pct / 100.0
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if hits and seen >= target:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else round(self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Any = None) -> Optional[List[str]]:
+    """``EXPLAIN QUERY PLAN`` detail lines, or None when the statement can't be explained."""
+    head = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else ""
+    if head not in _EXPLAINABLE:
+        return None
+    try:
+        # Base-class execute: never recurse into a profiled connection
+        cursor = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", params if params is not None else ())
+        return [str(row[-1]) for row in cursor.fetchall()]
+    except Exception as exc:
+        LOGGER.debug("[sql] EXPLAIN QUERY PLAN failed: %s", exc)
+        return None
+
+
+class SQLProfiler:
+    """Per-statement-shape latency histograms plus a slow-query ring."""
+
+    def __init__(self, slow_ms: Optional[float] = None) -> None:
+        self.slow_ms = _slow_threshold_ms() if slow_ms is None else slow_ms
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], _StatementStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=SLOW_LOG_SIZE)
+        self.started_at = time.time()
+
+    def record(
+        self,
+        db: str,
+        sql: str,
+        elapsed_ms: float,
+        *,
+        conn: Optional[sqlite3.Connection] = None,
+        params: Any = None,
+    ) -> None:
+        shape = normalize_sql(sql)
+        key = (db, shape)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= MAX_STATEMENT_SHAPES:
+                    key = (db, "<other>")
+                    stats = self._stats.setdefault(key, _StatementStats())
+                else:
+                    stats = self._stats[key] = _StatementStats()
+            stats.add(elapsed_ms)
+            if elapsed_ms < self.slow_ms:
+                return
+            stats.slow_count += 1
+            first_slow = stats.slow_count == 1
+            need_plan = stats.plan is None and conn is not None
+
+        # EXPLAIN once per statement shape, outside the lock
+        plan = explain_query_plan(conn, sql, params) if need_plan else None
+        with self._lock:
+            if plan is not None and stats.plan is None:
+                stats.plan = plan
+            plan = stats.plan
+            entry = {
+                "db": db,
+                "sql": shape,
+                "duration_ms": round(elapsed_ms, 3),
+                "plan": plan,
+                "full_scan": _has_full_scan(plan),
+                "at": time.time(),
+            }
+            self._slow.append(entry)
+        # Full plan warning once per statement shape; repeats go to INFO
+        LOGGER.log(
+            logging.WARNING if first_slow else logging.INFO,
+            "[sql] slow query %.1fms (%s): %s | plan: %s",
+            elapsed_ms, db, shape[:300], "; ".join(plan) if plan else "-",
+        )
+
+    def report(self, *, limit: int = 50, order_by: str = "total_ms") -> Dict[str, Any]:
+        with self._lock:
+            items = list(self._stats.items())
+            slow = list(self._slow)
+        rows = []
+        for (db, shape), stats in items:
+            rows.append({
+                "db": db,
+                "sql": shape,
+                "count": stats.count,
+                "total_ms": round(stats.total_ms, 3),
+                "mean_ms": round(stats.total_ms / stats.count, 3) if stats.count else 0.0,
+                "p50_ms": stats.percentile_ms(50),
+                "p95_ms": stats.percentile_ms(95),
+                "max_ms": round(stats.max_ms, 3),
+                "slow_count": stats.slow_count,
+                "histogram": dict(zip([f"<={b:g}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}ms"], stats.buckets)),
+                "plan": stats.plan,
+            })
+        if order_by not in ("total_ms", "max_ms", "count", "mean_ms", "slow_count"):
+            order_by = "total_ms"
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return {
+            "enabled": True,
+            "slow_threshold_ms": self.slow_ms,
+            "since": round(self.started_at, 3),
+            "statement_shapes": len(rows),
+            "statements": rows[:max(0, limit)],
+            "slow_queries": list(reversed(slow)),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self.started_at = time.time()
+
+
+def _has_full_scan(plan: Optional[Sequence[str]]) -> bool:
+    if not plan:
+        return False
+    return any(
+        line.startswith("SCAN ") and " USING " not in line and "CONSTANT ROW" not in line
+        for line in plan
+    )
+
+
+_profiler: Optional[SQLProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_sql_profiler() -> SQLProfiler:
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SQLProfiler()
+        return _profiler
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+
+def instrument_engine(engine: Any, db: str) -> None:
+    """Time every cursor execution of a SQLAlchemy engine under label ``db``."""
+    from sqlalchemy import event
+
+    profiler = get_sql_profiler()
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_sql_profile_start", []).append(time.perf_counter())
+
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_sql_profile_start")
+        if not stack:
+            return
+        elapsed_ms = (time.perf_counter() - stack.pop()) * 1000.0
+        params = parameters[0] if executemany and parameters else parameters
+        profiler.record(db, statement, elapsed_ms, conn=getattr(cursor, "connection", None), params=params)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    event.listen(engine, "after_cursor_execute", _after)
+    LOGGER.info("[sql] Profiling SQLAlchemy engine '%s' (slow >= %.0fms)", db, profiler.slow_ms)
+
+
+# ---------------------------------------------------------------------------
+# sqlite3
+# ---------------------------------------------------------------------------
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that times a statement from ``execute`` until its rows are consumed.
+
+    The sample is recorded when the result is exhausted, the cursor executes
+    the next statement, is closed, or is garbage collected.
+    """
+
+    db_label = "sqlite"
+
+    def _begin(self, sql: str, params: Any, elapsed: float) -> None:
+        self._finish()
+        self._sql = sql
+        self._params = params
+        self._elapsed = elapsed
+
+    def _finish(self) -> None:
+        sql = getattr(self, "_sql", None)
+        if sql is None:
+            return
+        self._sql = None
+        get_sql_profiler().record(
+            self.db_label, sql, self._elapsed * 1000.0, conn=self.connection, params=self._params,
+        )
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            if getattr(self, "_sql", None) is not None:
+                self._elapsed += time.perf_counter() - started
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        result = sqlite3.Cursor.execute(self, sql, parameters)
+        self._begin(sql, parameters, time.perf_counter() - started)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        rows = list(seq_of_parameters)
+        started = time.perf_counter()
+        result = sqlite3.Cursor.executemany(self, sql, rows)
+        self._begin(sql, rows[0] if rows else (), time.perf_counter() - started)
+        return result
+
+    def fetchone(self):
+        row = self._timed(sqlite3.Cursor.fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(sqlite3.Cursor.fetchmany, size)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(sqlite3.Cursor.fetchall)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._timed(sqlite3.Cursor.__next__)
+        except StopIteration:
+            self._finish()
+            raise
+
+    def close(self):
+        self._finish()
+        return sqlite3.Cursor.close(self)
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class ProfiledConnection(sqlite3.Connection):
+    cursor_class = ProfiledCursor
+
+    def cursor(self, factory=None):
+        return sqlite3.Connection.cursor(self, factory or self.cursor_class)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+_factories: Dict[str, type] = {}
+
+
+def connection_factory(db: str) -> Optional[type]:
+    """``sqlite3.connect(..., factory=...)`` class for label ``db``, or None when profiling is off."""
+    if not sql_profiling_enabled():
+        return None
+    with _profiler_lock:
+        factory = _factories.get(db)
+        if factory is None:
+            cursor_cls = type(f"ProfiledCursor_{db}", (ProfiledCursor,), {"db_label": db})
+            factory = type(f"ProfiledConnection_{db}", (ProfiledConnection,), {"cursor_class": cursor_cls})
+            _factories[db] = factory
+    return factory
+
+
+def connect_kwargs(db: str) -> Dict[str, Any]:
+    """Extra ``sqlite3.connect`` keyword arguments (``{}`` when profiling is off)."""
+    factory = connection_factory(db)
+    return {"factory": factory} if factory is not None else {}
+
+
+def profile_report(**kwargs: Any) -> Dict[str, Any]:
+    if _profiler is None and not sql_profiling_enabled():
+        return {"enabled": False, "statements": [], "slow_queries": []}
+    return get_sql_profiler().report(**kwargs)
+
+
+__all__ = [
+    "SQLProfiler",
+    "connect_kwargs",
+    "connection_factory",
+    "explain_query_plan",
+    "get_sql_profiler",
+    "instrument_engine",
+    "normalize_sql",
+    "profile_report",
+    "sql_profiling_enabled",
+]
@@ -0,0 +1,284 @@
+"""Startup profiler: per-module import time and per-phase wall time.
+
+Enabled by ``python main.py --profile-startup`` (or ``SAIVERSE_PROFILE_STARTUP=1``).
+While active, an import hook times every module executed (cumulative and
+self time, per thread) and :class:`PhaseClock` laps record initialisation
+phases. The report is written as JSON next to the session log and its
+phase timings are exposed through ``GET /api/config/startup-diagnostics``.
+
+When profiling is off, the only cost is ``PhaseClock`` taking a
+``perf_counter`` per phase.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _ImportTimingFinder:
+    """Meta path finder that wraps ``exec_module`` of every located spec with a timer.
+
+    It never loads anything itself: the spec comes from the remaining finders and
+    only the loader instance gets a timed ``exec_module``, so ``isinstance``
+    checks against the loader classes keep working.
+    """
+
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname: str, path: Any = None, target: Any = None):
+        if getattr(self._local, "searching", False):
+            return None
+        self._local.searching = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find = getattr(finder, "find_spec", None)
+                if find is None:
+                    continue
+                spec = find(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.searching = False
+        if spec is None or spec.loader is None:
+            return spec
+        original = getattr(spec.loader, "exec_module", None)
+        if original is None or getattr(original, "_saiverse_timed", False):
+            return spec
+
+        profiler = self._profiler
+
+        def timed_exec_module(module: Any) -> None:
+            stack = profiler._child_stack()
+            stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                original(module)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                profiler._record_import(fullname, elapsed, elapsed - children)
+
+        timed_exec_module._saiverse_timed = True  # type: ignore[attr-defined]
+        try:
+            spec.loader.exec_module = timed_exec_module
+        except (AttributeError, TypeError):
+            # Builtin / frozen importers are classes with static methods; leave them untimed
+            pass
+        return spec
+
+
+class StartupProfiler:
+    """Collects import and phase timings for one process start."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.phases: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._finder: Optional[_ImportTimingFinder] = None
+
+    # -- import hook ------------------------------------------------------
+
+    def install_import_hook(self) -> None:
+        if self._finder is None:
+            self._finder = _ImportTimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall_import_hook(self) -> None:
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    def _child_stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record_import(self, name: str, cumulative: float, self_time: float) -> None:
+        with self._lock:
+            self.imports[name] = {"cumulative": cumulative, "self": max(0.0, self_time)}
+
+    # -- phases -------------------------------------------------------------
+
+    def record_phase(self, name: str, seconds: float, **extra: Any) -> None:
+        with self._lock:
+            self.phases.append({
+                "phase": name,
+                "seconds": round(seconds, 4),
+                "at": round(time.perf_counter() - self.started_at, 4),
+                **extra,
+            })
+
+    @contextmanager
+    def phase(self, name: str, **extra: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - started, **extra)
+
+    # -- reporting ----------------------------------------------------------
+
+    def report(self, top: int = 40) -> Dict[str, Any]:
+        total = time.perf_counter() - self.started_at
+        with self._lock:
+            imports = dict(self.imports)
+            phases = list(self.phases)
+        packages: Dict[str, float] = {}
+        for name, timing in imports.items():
+            root = name.split(".", 1)[0]
+            packages[root] = packages.get(root, 0.0) + timing["self"]
+        top_imports = sorted(imports.items(), key=lambda item: item[1]["cumulative"], reverse=True)[:top]
+        top_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        target = _env_float("SAIVERSE_STARTUP_TARGET_SEC")
+        return {
+            "total_sec": round(total, 3),
+            "target_sec": target,
+            "within_target": None if target is None else total <= target,
+            "import_count": len(imports),
+            "import_self_total_sec": round(sum(t["self"] for t in imports.values()), 3),
+            "phases": phases,
+            "top_imports": [
+                {"module": name, "cumulative_sec": round(t["cumulative"], 4), "self_sec": round(t["self"], 4)}
+                for name, t in top_imports
+            ],
+            "top_packages": [
+                {"package": name, "self_sec": round(seconds, 4)} for name, seconds in top_packages
+            ],
+        }
+
+    def write(self, path: Path, top: int = 40) -> Dict[str, Any]:
+        report = self.report(top=top)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        return report
+
+    def log_summary(self, report: Dict[str, Any], top: int = 15) -> None:
+        LOGGER.info(
+            "[startup-profile] total %.2fs, %d modules imported (%.2fs self time)",
+            report["total_sec"],
+            report["import_count"],
+            report["import_self_total_sec"],
+        )
+        for entry in report["phases"]:
+            LOGGER.info("[startup-profile] phase %-28s %.3fs", entry["phase"], entry["seconds"])
+        for entry in report["top_packages"][:top]:
+            LOGGER.info("[startup-profile] package %-26s %.3fs", entry["package"], entry["self_sec"])
+        if report["within_target"] is False:
+            LOGGER.warning(
+                "[startup-profile] cold start %.2fs exceeds SAIVERSE_STARTUP_TARGET_SEC=%.2fs",
+                report["total_sec"],
+                report["target_sec"],
+            )
+
+
+class PhaseClock:
+    """Lap timer for consecutive initialisation steps.
+
+    ``clock.lap("buildings")`` records the time since the previous lap (or
+    since construction) and passes it to ``sink(phase, seconds, **extra)``.
+    Without a sink, laps go to the active profiler (if any).
+    """
+
+    def __init__(self, prefix: str = "", sink: Optional[Callable[..., None]] = None) -> None:
+        self.prefix = prefix
+        self.sink = sink
+        self._last = time.perf_counter()
+
+    def lap(self, name: str, **extra: Any) -> float:
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+        phase = f"{self.prefix}.{name}" if self.prefix else name
+        if self.sink is not None:
+            self.sink(phase, seconds, **extra)
+        elif _active is not None:
+            _active.record_phase(phase, seconds, **extra)
+        return seconds
+
+
+def _env_float(name: str) -> Optional[float]:
+    raw = os.getenv(name)
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+_active: Optional[StartupProfiler] = None
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> bool:
+    argv = sys.argv if argv is None else argv
+    if "--profile-startup" in argv:
+        return True
+    return os.getenv("SAIVERSE_PROFILE_STARTUP", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def enable_startup_profiling() -> StartupProfiler:
+    """Start profiling (idempotent). Call before the heavy imports."""
+    global _active
+    if _active is None:
+        _active = StartupProfiler()
+        _active.install_import_hook()
+    return _active
+
+
+def get_startup_profiler() -> Optional[StartupProfiler]:
+    return _active
+
+
+def finish_startup_profiling(output_path: Path) -> Optional[Dict[str, Any]]:
+    """Stop the import hook, write the report and log a summary. No-op when inactive."""
+    if _active is None:
+        return None
+    _active.uninstall_import_hook()
+    report = _active.write(output_path)
+    _active.log_summary(report)
+    LOGGER.info("[startup-profile] report written to %s", output_path)
+    return report
+
+
+@contextmanager
+def startup_phase(name: str, **extra: Any) -> Iterator[None]:
+    """Time a block as a startup phase when profiling is active."""
+    if _active is None:
+        yield
+        return
+    with _active.phase(name, **extra):
+        yield
+
+
+__all__ = [
+    "PhaseClock",
+    "StartupProfiler",
+    "enable_startup_profiling",
+    "finish_startup_profiling",
+    "get_startup_profiler",
+    "profiling_requested",
+    "startup_phase",
+]
@@ -5,15 +5,19 @@ import logging
 import os
 import threading
 import time
+from contextlib import contextmanager
 from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from sai_memory.config import Settings, load_settings
+from sai_memory.memory.bulk_import import BulkImporter, ProgressCallback, embed_pending
 from sai_memory.memory.chunking import chunk_text
+from sai_memory.memory.pool import ReaderPool
 from sai_memory.memory.recall import (
     Embedder,
+    embed_query,
     semantic_recall_groups,
 )
 from sai_memory.memory.storage import (
@@ -75,7 +79,9 @@ class SAIMemoryAdapter:
 
         resolved_resource = resource_id or (base_settings.resource_id or persona_id)
         self.settings = replace(base_settings, db_path=str(db_path), resource_id=resolved_resource)
+        # Single writer connection guarded by _db_lock; reads go through _reader_pool
         self._db_lock = threading.RLock()
+        self._reader_pool: Optional[ReaderPool] = None
 
         if not self.settings.memory_enabled:
             LOGGER.warning("SAIMemory disabled via settings; adapter will no-op")
@@ -94,6 +100,9 @@ class SAIMemoryAdapter:
                 )
             """)
             self.conn.commit()
+            journal_mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            if self.settings.reader_pool_size > 0 and str(journal_mode).lower() == "wal":
+                self._reader_pool = ReaderPool(self.settings.db_path, size=self.settings.reader_pool_size)
         except Exception as exc:
             LOGGER.exception("Failed to initialise SAIMemory DB at %s", self.settings.db_path)
             self.conn = None
@@ -178,8 +187,8 @@ class SAIMemoryAdapter:
         if not self._ready:
             return {}
         try:
-            with self._db_lock:
-                cur = self.conn.execute(
+            with self.read_connection() as conn:
+                cur = conn.execute(
                     "SELECT data FROM working_memory WHERE persona_id = ?",
                     (self.persona_id,)
                 )
@@ -238,9 +247,9 @@ class SAIMemoryAdapter:
             return []
         thread_id = self._thread_id(building_id)
         try:
-            with self._db_lock:
-                rows = get_messages_last(self.conn, thread_id, self.settings.last_messages)  # type: ignore[arg-type]
-                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id) for msg in rows]
+            with self.read_connection() as conn:
+                rows = get_messages_last(conn, thread_id, self.settings.last_messages)  # type: ignore[arg-type]
+                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id, conn=conn) for msg in rows]
         except Exception as exc:
             LOGGER.warning("Failed to fetch recent messages for %s: %s", thread_id, exc)
             return []
@@ -290,9 +299,9 @@ class SAIMemoryAdapter:
             return []
         thread_id = self._thread_id(None)
         try:
-            with self._db_lock:
-                all_rows = _fetch_all_messages(self.conn, thread_id)
-                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id) for msg in all_rows]
+            with self.read_connection() as conn:
+                all_rows = _fetch_all_messages(conn, thread_id)
+                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id, conn=conn) for msg in all_rows]
         except Exception as exc:
             LOGGER.warning("Failed to fetch persona messages for %s: %s", thread_id, exc)
             return []
@@ -339,9 +348,9 @@ class SAIMemoryAdapter:
             return []
         thread_id = self._thread_id(None)
         try:
-            with self._db_lock:
-                all_rows = _fetch_all_messages(self.conn, thread_id)
-                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id) for msg in all_rows]
+            with self.read_connection() as conn:
+                all_rows = _fetch_all_messages(conn, thread_id)
+                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id, conn=conn) for msg in all_rows]
         except Exception as exc:
             LOGGER.warning("Failed to fetch persona messages for %s: %s", thread_id, exc)
             return []
@@ -389,10 +398,10 @@ class SAIMemoryAdapter:
             return []
         thread_id = self._thread_id(None)
         try:
-            with self._db_lock:
+            with self.read_connection() as conn:
                 from sai_memory.memory.storage import get_messages_from_id
-                rows = get_messages_from_id(self.conn, thread_id, anchor_message_id)
-                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id) for msg in rows]
+                rows = get_messages_from_id(conn, thread_id, anchor_message_id)
+                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id, conn=conn) for msg in rows]
         except Exception as exc:
             LOGGER.warning("Failed to fetch persona messages from anchor %s: %s", anchor_message_id, exc)
             return []
@@ -450,9 +459,9 @@ class SAIMemoryAdapter:
 
         thread_id = self._thread_id(None)
         try:
-            with self._db_lock:
-                all_rows = _fetch_all_messages(self.conn, thread_id)
-                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id) for msg in all_rows]
+            with self.read_connection() as conn:
+                all_rows = _fetch_all_messages(conn, thread_id)
+                payloads = [self._payload_from_message_locked(msg, viewing_thread_id=thread_id, conn=conn) for msg in all_rows]
         except Exception as exc:
             LOGGER.warning("Failed to fetch persona messages for balancing: %s", exc)
             return []
@@ -524,25 +533,25 @@ class SAIMemoryAdapter:
         if not self._ready:
             return []
         try:
-            with self._db_lock:
-                cur = self.conn.execute("SELECT id FROM threads ORDER BY id ASC")
+            with self.read_connection() as conn:
+                cur = conn.execute("SELECT id FROM threads ORDER BY id ASC")
                 rows = cur.fetchall()
                 active_suffix = self._active_persona_suffix()
                 summaries: List[Dict[str, Any]] = []
                 for (thread_id,) in rows:
-                    first_messages = get_messages_paginated(self.conn, thread_id, page=0, page_size=1)
+                    first_messages = get_messages_paginated(conn, thread_id, page=0, page_size=1)
                     preview = ""
                     first_id: Optional[str] = None
                     if first_messages:
                         first_msg = first_messages[0]
                         first_id = first_msg.id
-                        preview = compose_message_content(self.conn, first_msg)
+                        preview = compose_message_content(conn, first_msg)
                         if max_preview_chars > 0 and len(preview) > max_preview_chars:
                             preview = preview[: max_preview_chars - 1] + "…"
                     suffix = thread_id.split(":", 1)[1] if ":" in thread_id else thread_id
 
                     # Get Stelis thread info
-                    stelis_info = get_stelis_thread(self.conn, thread_id)
+                    stelis_info = get_stelis_thread(conn, thread_id)
                     is_stelis = stelis_info is not None
 
                     summary: Dict[str, Any] = {
@@ -570,9 +579,9 @@ class SAIMemoryAdapter:
         if not self._ready:
             return []
         try:
-            with self._db_lock:
-                msgs = get_messages_paginated(self.conn, thread_id, page=page, page_size=page_size)  # type: ignore[arg-type]
-                return [self._payload_from_message_locked(msg, viewing_thread_id=thread_id) for msg in msgs]
+            with self.read_connection() as conn:
+                msgs = get_messages_paginated(conn, thread_id, page=page, page_size=page_size)  # type: ignore[arg-type]
+                return [self._payload_from_message_locked(msg, viewing_thread_id=thread_id, conn=conn) for msg in msgs]
         except Exception as exc:
             LOGGER.warning("Failed to get messages for thread %s: %s", thread_id, exc)
             return []
@@ -581,8 +590,8 @@ class SAIMemoryAdapter:
         if not self._ready:
             return 0
         try:
-            with self._db_lock:
-                cur = self.conn.execute("SELECT COUNT(*) FROM messages WHERE thread_id=?", (thread_id,))  # type: ignore[attr-defined]
+            with self.read_connection() as conn:
+                cur = conn.execute("SELECT COUNT(*) FROM messages WHERE thread_id=?", (thread_id,))  # type: ignore[attr-defined]
                 row = cur.fetchone()
                 return int(row[0]) if row else 0
         except Exception as exc:
@@ -614,6 +623,8 @@ class SAIMemoryAdapter:
         if new_content is None and new_created_at is None:
             return True  # Nothing to update
         try:
+            # Embed outside the DB lock so inference never blocks other readers/writers
+            vectors = self._embed_document(new_content) if new_content is not None else None
             with self._db_lock:
                 # Check message exists
                 cur = self.conn.execute("SELECT 1 FROM messages WHERE id=?", (message_id,))  # type: ignore[attr-defined]
@@ -640,17 +651,8 @@ class SAIMemoryAdapter:
                 # Update embeddings only if content changed
                 if new_content is not None:
                     self.conn.execute("DELETE FROM message_embeddings WHERE message_id=?", (message_id,))  # type: ignore[attr-defined]
-                    content_strip = new_content.strip()
-                    if content_strip and self.embedder is not None:
-                        chunks = chunk_text(
-                            content_strip,
-                            min_chars=self.settings.chunk_min_chars,
-                            max_chars=self.settings.chunk_max_chars,
-                        )
-                        payload = [chunk.strip() for chunk in chunks if chunk and chunk.strip()]
-                        if payload:
-                            vectors = self.embedder.embed(payload, is_query=False)
-                            replace_message_embeddings(self.conn, message_id, vectors)   # type: ignore[attr-defined]
+                    if vectors:
+                        replace_message_embeddings(self.conn, message_id, vectors)   # type: ignore[attr-defined]
                 
                 self.conn.commit()  # type: ignore[attr-defined]
                 return True
@@ -705,17 +707,18 @@ class SAIMemoryAdapter:
 
         guard_ids: set[str] = set()
         try:
-            with self._db_lock:
+            query_vector = embed_query(self.embedder, query_text)
+            with self.read_connection() as conn:
                 recall_topk = self.settings.topk if topk is None else max(1, int(topk))
                 before = self.settings.range_before if range_before is None else max(0, int(range_before))
                 after = self.settings.range_after if range_after is None else max(0, int(range_after))
                 guard_count = max(0, self.settings.last_messages)
                 if guard_count > 0:
-                    recent_msgs = get_messages_last(self.conn, thread_id, guard_count)
+                    recent_msgs = get_messages_last(conn, thread_id, guard_count)
                     guard_ids = {m.id for m in recent_msgs}
                 effective_topk = recall_topk + len(guard_ids)
                 groups_raw = semantic_recall_groups(
-                    self.conn,
+                    conn,
                     self.embedder,
                     query_text,
                     thread_id=search_thread_id,
@@ -726,11 +729,12 @@ class SAIMemoryAdapter:
                     scope=self.settings.scope,
                     exclude_message_ids=guard_ids,
                     required_tags=["conversation"],
+                    query_vector=query_vector,
                 )
                 groups = []
                 for seed, bundle, score in groups_raw:
                     formatted = [
-                        (msg, compose_message_content(self.conn, msg))
+                        (msg, compose_message_content(conn, msg))
                         for msg in bundle
                     ]
                     groups.append((seed, formatted, score))
@@ -804,13 +808,18 @@ class SAIMemoryAdapter:
         after = self.settings.range_after if range_after is None else max(0, int(range_after))
         rrf_k = 60
 
+        # Query embedding first, with no connection or lock held
+        query_vector = None
+        if query_text and query_text.strip():
+            query_vector = embed_query(self.embedder, query_text)
+
         # Guard: exclude recent messages
         thread_id = self._thread_id(None)
         guard_ids: set[str] = set()
         guard_count = max(0, self.settings.last_messages)
         if guard_count > 0:
-            with self._db_lock:
-                recent_msgs = get_messages_last(self.conn, thread_id, guard_count)
+            with self.read_connection() as conn:
+                recent_msgs = get_messages_last(conn, thread_id, guard_count)
                 guard_ids = {m.id for m in recent_msgs}
 
         message_scores: dict[str, float] = defaultdict(float)
@@ -818,9 +827,9 @@ class SAIMemoryAdapter:
 
         # 1. Keyword search
         if keywords:
-            with self._db_lock:
+            with self.read_connection() as conn:
                 all_msgs = get_all_messages_for_search(
-                    self.conn,
+                    conn,
                     required_tags=["conversation"],
                 )
             keyword_scored = []
@@ -843,11 +852,11 @@ class SAIMemoryAdapter:
                 message_scores[msg.id] += 1.0 / (rrf_k + rank)
 
         # 2. Semantic search
-        if query_text and query_text.strip():
+        if query_vector is not None:
             search_topk = recall_topk * 2 + len(guard_ids)
-            with self._db_lock:
+            with self.read_connection() as conn:
                 groups_raw = semantic_recall_groups(
-                    self.conn,
+                    conn,
                     self.embedder,
                     query_text,
                     thread_id=None,
@@ -858,6 +867,7 @@ class SAIMemoryAdapter:
                     scope=self.settings.scope,
                     exclude_message_ids=guard_ids,
                     required_tags=["conversation"],
+                    query_vector=query_vector,
                 )
             rank_counter = 0
             for seed, _bundle, _score in groups_raw:
@@ -880,18 +890,18 @@ class SAIMemoryAdapter:
         # Expand context around each seed
         groups = []
         try:
-            with self._db_lock:
+            with self.read_connection() as conn:
                 for msg_id in top_ids:
                     msg = message_data[msg_id]
                     score = message_scores[msg_id]
                     if before > 0 or after > 0:
-                        around = get_messages_around(self.conn, msg.thread_id, msg.id, before, after)
+                        around = get_messages_around(conn, msg.thread_id, msg.id, before, after)
                         bundle = [*around[:before], msg, *around[before:]]
                         bundle.sort(key=lambda m: m.created_at)
                     else:
                         bundle = [msg]
                     formatted = [
-                        (m, compose_message_content(self.conn, m))
+                        (m, compose_message_content(conn, m))
                         for m in bundle
                     ]
                     groups.append((msg, formatted, score))
@@ -944,7 +954,26 @@ class SAIMemoryAdapter:
             LOGGER.warning("Failed to update overview for %s: %s", thread_id, exc)
             return None
 
+    @contextmanager
+    def read_connection(self) -> Iterator[Any]:
+        """Yield a connection for read-only queries.
+
+        Uses a pooled WAL reader when available so reads don't wait for the
+        writer lock; falls back to the writer connection under ``_db_lock``.
+        Never write through the yielded connection.
+        """
+        pool = self._reader_pool
+        if pool is None:
+            with self._db_lock:
+                yield self.conn
+            return
+        with pool.connection() as conn:
+            yield conn
+
     def close(self) -> None:
+        if self._reader_pool is not None:
+            self._reader_pool.close()
+            self._reader_pool = None
         if self.conn is not None:
             try:
                 self.conn.close()
@@ -981,12 +1010,13 @@ class SAIMemoryAdapter:
                 suffix = self._active_persona_suffix() or self._PERSONA_THREAD_SUFFIX
         return f"{self.persona_id}:{suffix}"
 
-    def _payload_from_message_locked(self, msg, viewing_thread_id: Optional[str] = None) -> dict:
-        if self.conn is None:
+    def _payload_from_message_locked(self, msg, viewing_thread_id: Optional[str] = None, conn=None) -> dict:
+        conn = conn if conn is not None else self.conn
+        if conn is None:
             content = msg.content or ""
         else:
             content = compose_message_content(
-                self.conn, msg, viewing_thread_id=viewing_thread_id
+                conn, msg, viewing_thread_id=viewing_thread_id
             ) or ""
         original_role = msg.role
         role = "assistant" if original_role == "model" else original_role
@@ -1217,8 +1247,8 @@ class SAIMemoryAdapter:
             thread_id = self._thread_id(None, thread_suffix=suffix)
 
         try:
-            with self._db_lock:
-                return get_stelis_thread(self.conn, thread_id)
+            with self.read_connection() as conn:
+                return get_stelis_thread(conn, thread_id)
         except Exception as exc:
             LOGGER.warning("Failed to get Stelis info for %s: %s", thread_id, exc)
             return None
@@ -1241,8 +1271,8 @@ class SAIMemoryAdapter:
             parent_thread_id = self._thread_id(None, thread_suffix=suffix)
 
         try:
-            with self._db_lock:
-                depth = get_stelis_thread_depth(self.conn, parent_thread_id)
+            with self.read_connection() as conn:
+                depth = get_stelis_thread_depth(conn, parent_thread_id)
                 # -1 means not a Stelis thread, so next would be depth 0
                 effective_next_depth = max(0, depth + 1) if depth >= 0 else 0
                 return effective_next_depth < max_depth
@@ -1272,9 +1302,9 @@ class SAIMemoryAdapter:
             thread_id = self._thread_id(None, thread_suffix=suffix)
 
         try:
-            with self._db_lock:
+            with self.read_connection() as conn:
                 return calculate_stelis_window_tokens(
-                    self.conn, thread_id, model_context_length
+                    conn, thread_id, model_context_length
                 )
         except Exception as exc:
             LOGGER.warning("Failed to calculate Stelis window: %s", exc)
@@ -1307,12 +1337,40 @@ class SAIMemoryAdapter:
             return []
 
         try:
-            with self._db_lock:
-                return get_active_stelis_threads(self.conn, parent_thread_id)
+            with self.read_connection() as conn:
+                return get_active_stelis_threads(conn, parent_thread_id)
         except Exception as exc:
             LOGGER.warning("Failed to list active Stelis threads: %s", exc)
             return []
 
+    def _message_fields(
+        self,
+        *,
+        building_id: Optional[str],
+        message: dict,
+        thread_suffix: Optional[str] = None,
+    ) -> tuple[Dict[str, Any], bool]:
+        """Storage fields for an append payload, plus whether to skip embedding."""
+        metadata = message.get("metadata")
+        if not isinstance(metadata, dict):
+            metadata = None
+        embedding_chunks = message.get("embedding_chunks")
+        skip_embedding = False
+        if embedding_chunks is not None:
+            try:
+                skip_embedding = int(embedding_chunks) == 0
+            except (TypeError, ValueError):
+                skip_embedding = False
+        fields = {
+            "thread_id": self._thread_id(building_id, thread_suffix=thread_suffix),
+            "role": message.get("role", "system"),
+            "content": message.get("content", ""),
+            "resource_id": building_id or self.settings.resource_id,
+            "created_at": self._timestamp_to_epoch(message.get("timestamp")),
+            "metadata": metadata,
+        }
+        return fields, skip_embedding
+
     def _append_message(
         self,
         *,
@@ -1323,55 +1381,82 @@ class SAIMemoryAdapter:
         if not self._ready:
             return
         try:
-            role = message.get("role", "system")
-            content = message.get("content", "")
-            timestamp = message.get("timestamp")
-            created_at = self._timestamp_to_epoch(timestamp)
-            thread_id = self._thread_id(building_id, thread_suffix=thread_suffix)
-            resource_id = building_id or self.settings.resource_id
-            metadata = message.get("metadata")
-            if not isinstance(metadata, dict):
-                metadata = None
-            embedding_chunks = message.get("embedding_chunks")
-            skip_embedding = False
-            if embedding_chunks is not None:
-                try:
-                    skip_embedding = int(embedding_chunks) == 0
-                except (TypeError, ValueError):
-                    skip_embedding = False
+            fields, skip_embedding = self._message_fields(
+                building_id=building_id, message=message, thread_suffix=thread_suffix
+            )
+            thread_id = fields["thread_id"]
 
             LOGGER.debug(
                 "[_append_message] thread_suffix=%s, building_id=%s, thread_id=%s",
                 thread_suffix, building_id, thread_id
             )
 
+            # Embed before taking the writer lock: inference is the slow part
+            vectors = None if skip_embedding else self._embed_document(fields["content"])
             with self._db_lock:
-                get_or_create_thread(self.conn, thread_id, resource_id)  # type: ignore[arg-type]
-                mid = add_message(
-                    self.conn,
-                    thread_id=thread_id,
-                    role=role,
-                    content=content,
-                    resource_id=resource_id,
-                    created_at=created_at,
-                    metadata=metadata,
-                )
-                if (not skip_embedding) and content and content.strip() and self.embedder is not None:
-                    chunks = chunk_text(
-                        content,
-                        min_chars=self.settings.chunk_min_chars,
-                        max_chars=self.settings.chunk_max_chars,
-                    )
-                    payload = [c.strip() for c in chunks if c and c.strip()]
-                    if payload:
-                        vectors = self.embedder.embed(payload, is_query=False)
-                        replace_message_embeddings(self.conn, mid, vectors)
+                get_or_create_thread(self.conn, thread_id, fields["resource_id"])  # type: ignore[arg-type]
+                mid = add_message(self.conn, **fields)
+                if vectors:
+                    replace_message_embeddings(self.conn, mid, vectors)
             LOGGER.debug(
-                "SAIMemory upserted message=%s thread=%s role=%s", mid, thread_id, role
+                "SAIMemory upserted message=%s thread=%s role=%s", mid, thread_id, fields["role"]
             )
         except Exception as exc:
             LOGGER.warning("Failed to append message to SAIMemory (building=%s): %s", building_id, exc)
 
+    @contextmanager
+    def bulk_import(
+        self,
+        *,
+        total: int = 0,
+        defer_indexes: bool = False,
+        embed: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Iterator["PersonaBulkImport"]:
+        """Batched counterpart of ``append_persona_message`` for importers.
+
+        Rows are written in transactions of ``SAIMEMORY_IMPORT_BATCH_SIZE``;
+        embeddings are generated after the last row, in batches, and reported
+        through ``progress_callback`` as well. ``defer_indexes`` drops the
+        message indexes for the duration; only use it when nothing else reads
+        this persona's memory meanwhile (CLI imports).
+        """
+        if not self._ready:
+            raise RuntimeError(f"SAIMemory is not available for persona {self.persona_id}")
+        importer = BulkImporter(
+            self.conn,  # type: ignore[arg-type]
+            lock=self._db_lock,
+            total=total,
+            defer_indexes=defer_indexes,
+            progress_callback=progress_callback,
+        )
+        with importer:
+            yield PersonaBulkImport(self, importer, embed=embed and self.can_embed())
+        if importer.pending_embeddings:
+            embed_pending(
+                self.conn,  # type: ignore[arg-type]
+                self.embedder,
+                importer.pending_embeddings,
+                min_chars=self.settings.chunk_min_chars,
+                max_chars=self.settings.chunk_max_chars,
+                lock=self._db_lock,
+                progress_callback=progress_callback,
+            )
+
+    def _embed_document(self, content: Optional[str]) -> Optional[List[List[float]]]:
+        """Chunk and embed message content. Runs without any DB lock held."""
+        if not content or not content.strip() or self.embedder is None:
+            return None
+        chunks = chunk_text(
+            content,
+            min_chars=self.settings.chunk_min_chars,
+            max_chars=self.settings.chunk_max_chars,
+        )
+        payload = [c.strip() for c in chunks if c and c.strip()]
+        if not payload:
+            return None
+        return self.embedder.embed(payload, is_query=False)
+
     @staticmethod
     def _timestamp_to_epoch(value: Optional[str]) -> int:
         if not value:
@@ -1383,6 +1468,34 @@ class SAIMemoryAdapter:
             return int(time.time())
 
 
+class PersonaBulkImport:
+    """Handle yielded by :meth:`SAIMemoryAdapter.bulk_import`."""
+
+    def __init__(self, adapter: SAIMemoryAdapter, importer: BulkImporter, *, embed: bool) -> None:
+        self._adapter = adapter
+        self.importer = importer
+        self.embed = embed
+
+    def append_persona_message(self, message: dict, *, thread_suffix: Optional[str] = None) -> str:
+        return self.append_message(None, message, thread_suffix=thread_suffix)
+
+    def append_message(
+        self,
+        building_id: Optional[str],
+        message: dict,
+        *,
+        thread_suffix: Optional[str] = None,
+    ) -> str:
+        fields, skip_embedding = self._adapter._message_fields(
+            building_id=building_id, message=message, thread_suffix=thread_suffix
+        )
+        return self.importer.add_message(embed=self.embed and not skip_embedding, **fields)
+
+    @property
+    def written(self) -> int:
+        return self.importer.written
+
+
 def _fetch_all_messages(conn, thread_id: str, page_size: int = 200):
     page = 0
     rows = []
@@ -2,28 +2,60 @@
 
 Exports and imports threads with all metadata preserved,
 enabling external editing (e.g., find-replace) and re-import.
+
+Besides the dict-based API, :func:`iter_export_native` streams an export
+straight from a SQLite cursor (as the v1 JSON document or as NDJSON, one
+record per line, optionally gzip-compressed) and
+:func:`import_threads_native_stream` reads either back without holding the
+whole file in memory.
 """
 from __future__ import annotations
 
+import gzip
+import io
 import json
 import logging
 import sqlite3
+import threading
+import zlib
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from sai_memory.memory.bulk_import import BulkImporter, embed_pending
 from sai_memory.memory.storage import (
-    add_message,
     delete_thread,
     get_or_create_thread,
     get_stelis_thread,
     init_db,
+    open_reader,
     set_thread_overview,
 )
 
 LOGGER = logging.getLogger(__name__)
 
 FORMAT_VERSION = "saiverse_saimemory_v1"
+NDJSON_FORMAT_VERSION = "saiverse_saimemory_ndjson_v1"
+
+# ストリーミング出力はこの程度まとめてから yield する（HTTP チャンク数を抑える）
+_STREAM_FLUSH_BYTES = 64 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _memory_db_path(persona_id: str) -> Path:
+    return Path.home() / ".saiverse" / "personas" / persona_id / "memory.db"
+
+
+def _open_import_target(
+    persona_id: str, conn: Optional[sqlite3.Connection]
+) -> Tuple[sqlite3.Connection, bool]:
+    """Use the caller's connection, or open memory.db; returns (conn, owned)."""
+    if conn is not None:
+        return conn, False
+    db_path = _memory_db_path(persona_id)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return init_db(str(db_path), check_same_thread=True), True
 
 
 # ---------------------------------------------------------------------------
@@ -55,14 +87,8 @@ def _resolve_thread_ids(
     return [row[0] for row in cur.fetchall()]
 
 
-def _export_thread(
-    conn: sqlite3.Connection,
-    thread_id: str,
-    start_epoch: Optional[int] = None,
-    end_epoch: Optional[int] = None,
-) -> Dict[str, Any]:
-    """Export a single thread with all metadata."""
-    # Thread-level info
+def _thread_header(conn: sqlite3.Connection, thread_id: str) -> Dict[str, Any]:
+    """Thread-level fields of the native format (everything except messages)."""
     cur = conn.execute(
         "SELECT resource_id, overview, overview_updated_at FROM threads WHERE id=?",
         (thread_id,),
@@ -88,6 +114,22 @@ def _export_thread(
             "label": stelis.label,
         }
 
+    return {
+        "thread_id": thread_id,
+        "resource_id": resource_id,
+        "overview": overview,
+        "overview_updated_at": overview_updated_at,
+        "stelis": stelis_data,
+    }
+
+
+def _iter_thread_messages(
+    conn: sqlite3.Connection,
+    thread_id: str,
+    start_epoch: Optional[int] = None,
+    end_epoch: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield a thread's messages row by row from the cursor."""
     # Messages (raw, no role conversion or content expansion)
     query_parts = [
         "SELECT id, role, content, resource_id, created_at, metadata",
@@ -102,32 +144,33 @@ def _export_thread(
         params.append(end_epoch)
     query_parts.append("ORDER BY created_at ASC")
 
-    rows = conn.execute(" ".join(query_parts), params).fetchall()
-    messages: List[Dict[str, Any]] = []
-    for mid, role, content, res_id, created_at, meta_raw in rows:
+    for mid, role, content, res_id, created_at, meta_raw in conn.execute(" ".join(query_parts), params):
         meta = None
         if meta_raw:
             try:
                 meta = json.loads(meta_raw) if isinstance(meta_raw, str) else meta_raw
             except (json.JSONDecodeError, TypeError):
                 meta = None
-        messages.append({
+        yield {
             "id": mid,
             "role": role,
             "content": content,
             "resource_id": res_id,
             "created_at": int(created_at) if created_at is not None else None,
             "metadata": meta,
-        })
+        }
 
-    return {
-        "thread_id": thread_id,
-        "resource_id": resource_id,
-        "overview": overview,
-        "overview_updated_at": overview_updated_at,
-        "stelis": stelis_data,
-        "messages": messages,
-    }
+
+def _export_thread(
+    conn: sqlite3.Connection,
+    thread_id: str,
+    start_epoch: Optional[int] = None,
+    end_epoch: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Export a single thread with all metadata."""
+    thread = _thread_header(conn, thread_id)
+    thread["messages"] = list(_iter_thread_messages(conn, thread_id, start_epoch, end_epoch))
+    return thread
 
 
 def export_threads_native(
@@ -147,7 +190,7 @@ def export_threads_native(
     Returns:
         Dict in saiverse_saimemory_v1 format.
     """
-    db_path = Path.home() / ".saiverse" / "personas" / persona_id / "memory.db"
+    db_path = _memory_db_path(persona_id)
     if not db_path.exists():
         raise FileNotFoundError(f"memory.db not found for persona {persona_id}: {db_path}")
 
@@ -176,7 +219,7 @@ def export_thread_by_id(
     thread_id: str,
 ) -> Dict[str, Any]:
     """Export a single thread by its full thread_id. Used by API."""
-    db_path = Path.home() / ".saiverse" / "personas" / persona_id / "memory.db"
+    db_path = _memory_db_path(persona_id)
     if not db_path.exists():
         raise FileNotFoundError(f"memory.db not found for persona {persona_id}: {db_path}")
 
@@ -193,6 +236,102 @@ def export_thread_by_id(
         conn.close()
 
 
+def _iter_json_records(
+    conn: sqlite3.Connection,
+    persona_id: str,
+    thread_ids: List[str],
+    start_epoch: Optional[int],
+    end_epoch: Optional[int],
+    fmt: str,
+) -> Iterator[str]:
+    def dump(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    exported_at = datetime.now(timezone.utc).isoformat()
+    if fmt == "ndjson":
+        yield dump({"format": NDJSON_FORMAT_VERSION, "exported_at": exported_at, "persona_id": persona_id}) + "\n"
+        for tid in thread_ids:
+            yield dump({"type": "thread", **_thread_header(conn, tid)}) + "\n"
+            for msg in _iter_thread_messages(conn, tid, start_epoch, end_epoch):
+                yield dump({"type": "message", **msg}) + "\n"
+        return
+
+    # v1 JSON: 1メッセージ1行で書き出す（既存のインポーターでそのまま読める）
+    head = {"format": FORMAT_VERSION, "exported_at": exported_at, "persona_id": persona_id}
+    yield dump(head)[:-1] + ', "threads": [\n'
+    for t_index, tid in enumerate(thread_ids):
+        header = _thread_header(conn, tid)
+        yield ("" if t_index == 0 else ",\n") + dump(header)[:-1] + ', "messages": [\n'
+        for m_index, msg in enumerate(_iter_thread_messages(conn, tid, start_epoch, end_epoch)):
+            yield ("" if m_index == 0 else ",\n") + "  " + dump(msg)
+        yield "\n]}"
+    yield "\n]}\n"
+
+
+def iter_export_native(
+    persona_id: str,
+    thread_suffixes: Optional[Iterable[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    *,
+    fmt: str = "json",
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """Stream an export as encoded bytes without building it in memory.
+
+    Args:
+        persona_id: Persona identifier.
+        thread_suffixes: Thread suffixes or full IDs to export. None = all.
+        start: Start ISO timestamp filter (inclusive).
+        end: End ISO timestamp filter (inclusive).
+        fmt: ``"json"`` (saiverse_saimemory_v1 document) or ``"ndjson"``.
+        compress: Gzip the stream.
+
+    Raises ``FileNotFoundError`` / ``ValueError`` immediately (before the
+    first chunk) so API callers can still answer with an error status.
+    """
+    if fmt not in ("json", "ndjson"):
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+    db_path = _memory_db_path(persona_id)
+    if not db_path.exists():
+        raise FileNotFoundError(f"memory.db not found for persona {persona_id}: {db_path}")
+
+    start_epoch = int(datetime.fromisoformat(start).timestamp()) if start else None
+    end_epoch = int(datetime.fromisoformat(end).timestamp()) if end else None
+    thread_list = list(thread_suffixes) if thread_suffixes is not None else None
+
+    def generate() -> Iterator[bytes]:
+        # StreamingResponse は next() を別スレッドから呼ぶので読み取り専用接続を使う
+        conn = open_reader(str(db_path))
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        buffer: List[bytes] = []
+        size = 0
+        try:
+            thread_ids = _resolve_thread_ids(conn, persona_id, thread_list)
+            for piece in _iter_json_records(conn, persona_id, thread_ids, start_epoch, end_epoch, fmt):
+                data = piece.encode("utf-8")
+                buffer.append(data)
+                size += len(data)
+                if size < _STREAM_FLUSH_BYTES:
+                    continue
+                block = b"".join(buffer)
+                buffer.clear()
+                size = 0
+                if compressor is not None:
+                    block = compressor.compress(block)
+                if block:
+                    yield block
+            block = b"".join(buffer)
+            if compressor is not None:
+                block = compressor.compress(block) + compressor.flush()
+            if block:
+                yield block
+        finally:
+            conn.close()
+
+    return generate()
+
+
 # ---------------------------------------------------------------------------
 # Import
 # ---------------------------------------------------------------------------
@@ -245,6 +384,86 @@ def _import_stelis(conn: sqlite3.Connection, thread_id: str, stelis_data: Dict[s
     conn.commit()
 
 
+def _begin_thread(
+    conn: sqlite3.Connection,
+    importer: BulkImporter,
+    thread_data: Dict[str, Any],
+    replace: bool,
+) -> Tuple[str, Optional[str]]:
+    """Create (or replace) one thread and restore its overview/Stelis info."""
+    thread_id = thread_data["thread_id"]
+    resource_id = thread_data.get("resource_id")
+
+    # Replace mode: write queued rows first, then delete the existing thread
+    if replace:
+        importer.flush()
+
+    with importer.lock if importer.lock is not None else nullcontext():
+        if replace:
+            delete_thread(conn, thread_id)
+
+        # Create thread
+        get_or_create_thread(conn, thread_id, resource_id)
+
+        # Restore overview
+        overview = thread_data.get("overview")
+        if overview:
+            set_thread_overview(conn, thread_id, overview)
+
+        # Restore Stelis info
+        stelis = thread_data.get("stelis")
+        if stelis and isinstance(stelis, dict):
+            _import_stelis(conn, thread_id, stelis)
+    return thread_id, resource_id
+
+
+def _queue_message(
+    importer: BulkImporter,
+    thread_id: str,
+    resource_id: Optional[str],
+    msg: Dict[str, Any],
+    embed: bool,
+) -> None:
+    # Insert messages preserving original IDs (batched; one commit per batch)
+    importer.add_message(
+        thread_id,
+        msg.get("role", "user"),
+        msg.get("content", ""),
+        resource_id=msg.get("resource_id", resource_id),
+        created_at=msg.get("created_at"),
+        metadata=msg.get("metadata"),
+        message_id=msg.get("id"),
+        embed=embed,
+    )
+
+
+def _finish_import(
+    conn: sqlite3.Connection,
+    persona_id: str,
+    importer: BulkImporter,
+    threads_imported: int,
+    progress_callback: Optional[Callable[[int, int, str], None]],
+) -> Dict[str, Any]:
+    imported = importer.written
+    total = max(importer.total, imported)
+
+    # Generate embeddings if requested
+    if importer.pending_embeddings:
+        if progress_callback:
+            progress_callback(imported, total, "Generating embeddings...")
+        _regenerate_embeddings(
+            conn, persona_id, importer.pending_embeddings, progress_callback, lock=importer.lock
+        )
+
+    if progress_callback:
+        progress_callback(total, total, "Import complete")
+
+    return {
+        "threads_imported": threads_imported,
+        "messages_imported": imported,
+    }
+
+
 def import_threads_native(
     persona_id: str,
     data: Dict[str, Any],
@@ -252,6 +471,9 @@ def import_threads_native(
     replace: bool = True,
     skip_embed: bool = False,
     progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    lock: Optional[threading.RLock] = None,
+    defer_indexes: bool = True,
 ) -> Dict[str, Any]:
     """Import threads from native format dict.
 
@@ -261,152 +483,158 @@ def import_threads_native(
         replace: If True, delete existing thread before import.
         skip_embed: If True, skip embedding generation.
         progress_callback: Called with (current, total, message).
+        conn: Live connection to write through (e.g. the persona adapter's);
+            by default memory.db is opened and closed here.
+        lock: Writer lock guarding ``conn`` (the adapter's ``_db_lock``).
+        defer_indexes: Drop the message indexes during the import. Pass
+            False when the persona is loaded and may read meanwhile.
 
     Returns:
         Dict with import summary: {"threads_imported", "messages_imported"}.
     """
     _validate_native_format(data)
 
-    db_path = Path.home() / ".saiverse" / "personas" / persona_id / "memory.db"
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = init_db(str(db_path), check_same_thread=True)
+    conn, owned = _open_import_target(persona_id, conn)
 
     # Count total messages for progress
     total_messages = sum(len(t.get("messages", [])) for t in data["threads"])
-    imported = 0
     threads_imported = 0
+    importer = BulkImporter(
+        conn,
+        lock=lock,
+        total=total_messages,
+        defer_indexes=defer_indexes,
+        progress_callback=progress_callback,
+    )
 
     try:
-        for thread_data in data["threads"]:
-            thread_id = thread_data["thread_id"]
-            messages = thread_data.get("messages", [])
-
-            if progress_callback:
-                progress_callback(imported, total_messages, f"Processing thread: {thread_id}")
-
-            # Replace mode: delete existing thread
-            if replace:
-                delete_thread(conn, thread_id)
-
-            # Create thread
-            resource_id = thread_data.get("resource_id")
-            get_or_create_thread(conn, thread_id, resource_id)
-
-            # Restore overview
-            overview = thread_data.get("overview")
-            if overview:
-                set_thread_overview(conn, thread_id, overview)
-
-            # Restore Stelis info
-            stelis = thread_data.get("stelis")
-            if stelis and isinstance(stelis, dict):
-                _import_stelis(conn, thread_id, stelis)
-
-            # Insert messages preserving original IDs
-            for msg in messages:
-                msg_id = msg.get("id")
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                res_id = msg.get("resource_id", resource_id)
-                created_at = msg.get("created_at")
-                metadata = msg.get("metadata")
-
-                meta_json = json.dumps(metadata, ensure_ascii=False) if metadata else None
-
-                if msg_id:
-                    # Use original message ID
-                    conn.execute(
-                        "INSERT OR REPLACE INTO messages"
-                        "(id, thread_id, role, content, resource_id, created_at, metadata)"
-                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
-                        (msg_id, thread_id, role, content, res_id, created_at, meta_json),
-                    )
-                    conn.commit()
-                else:
-                    add_message(
-                        conn,
-                        thread_id=thread_id,
-                        role=role,
-                        content=content,
-                        resource_id=res_id,
-                        created_at=created_at,
-                        metadata=metadata,
+        with importer:
+            for thread_data in data["threads"]:
+                if progress_callback:
+                    progress_callback(
+                        importer.written, total_messages, f"Processing thread: {thread_data['thread_id']}"
                     )
+                thread_id, resource_id = _begin_thread(conn, importer, thread_data, replace)
+                for msg in thread_data.get("messages", []):
+                    _queue_message(importer, thread_id, resource_id, msg, not skip_embed)
+                threads_imported += 1
+
+        return _finish_import(conn, persona_id, importer, threads_imported, progress_callback)
+    finally:
+        if owned:
+            conn.close()
 
-                imported += 1
-                if progress_callback and imported % 50 == 0:
-                    progress_callback(imported, total_messages, f"Imported {imported}/{total_messages} messages")
 
-            threads_imported += 1
+def _open_text_stream(source: BinaryIO) -> io.TextIOWrapper:
+    """Wrap a seekable binary file as UTF-8 text, transparently un-gzipping it."""
+    magic = source.read(2)
+    source.seek(0)
+    raw: BinaryIO = gzip.GzipFile(fileobj=source, mode="rb") if magic == _GZIP_MAGIC else source  # type: ignore[assignment]
+    return io.TextIOWrapper(raw, encoding="utf-8-sig")
 
-        # Generate embeddings if requested
-        if not skip_embed and total_messages > 0:
-            if progress_callback:
-                progress_callback(imported, total_messages, "Generating embeddings...")
-            _regenerate_embeddings(conn, data["threads"], progress_callback, imported, total_messages)
 
-        if progress_callback:
-            progress_callback(total_messages, total_messages, "Import complete")
+def import_threads_native_stream(
+    persona_id: str,
+    source: BinaryIO,
+    *,
+    replace: bool = True,
+    skip_embed: bool = False,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    lock: Optional[threading.RLock] = None,
+    defer_indexes: bool = True,
+) -> Dict[str, Any]:
+    """Import a native export from a seekable binary file (gzip is detected).
 
-        return {
-            "threads_imported": threads_imported,
-            "messages_imported": imported,
-        }
+    NDJSON exports are imported record by record, so memory use does not
+    grow with the file. A v1 JSON document has no line structure to stream
+    and is parsed as a whole, then handed to :func:`import_threads_native`.
+    ``conn``, ``lock`` and ``defer_indexes`` are as for that function.
+    """
+    text = _open_text_stream(source)
+    first_line = text.readline()
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != NDJSON_FORMAT_VERSION:
+        data = json.loads(first_line + text.read())
+        if not isinstance(data, dict):
+            raise ValueError("JSON root must be an object")
+        return import_threads_native(
+            persona_id,
+            data,
+            replace=replace,
+            skip_embed=skip_embed,
+            progress_callback=progress_callback,
+            conn=conn,
+            lock=lock,
+            defer_indexes=defer_indexes,
+        )
+
+    conn, owned = _open_import_target(persona_id, conn)
+    importer = BulkImporter(
+        conn, lock=lock, defer_indexes=defer_indexes, progress_callback=progress_callback
+    )
+    threads_imported = 0
+    thread_id: Optional[str] = None
+    resource_id: Optional[str] = None
+
+    try:
+        with importer:
+            for line_no, line in enumerate(text, start=2):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                kind = record.pop("type", None) if isinstance(record, dict) else None
+                if kind == "thread":
+                    if "thread_id" not in record:
+                        raise ValueError(f"line {line_no}: thread record missing 'thread_id'")
+                    if progress_callback:
+                        progress_callback(importer.written, importer.written, f"Processing thread: {record['thread_id']}")
+                    thread_id, resource_id = _begin_thread(conn, importer, record, replace)
+                    threads_imported += 1
+                elif kind == "message":
+                    if thread_id is None:
+                        raise ValueError(f"line {line_no}: message before any thread record")
+                    _queue_message(importer, thread_id, resource_id, record, not skip_embed)
+                else:
+                    raise ValueError(f"line {line_no}: unknown record type {kind!r}")
+
+        return _finish_import(conn, persona_id, importer, threads_imported, progress_callback)
     finally:
-        conn.close()
+        if owned:
+            conn.close()
 
 
 def _regenerate_embeddings(
     conn: sqlite3.Connection,
-    threads_data: List[Dict[str, Any]],
+    persona_id: str,
+    message_ids: List[str],
     progress_callback: Optional[Callable[[int, int, str], None]],
-    base_progress: int,
-    total: int,
+    *,
+    lock: Optional[threading.RLock] = None,
 ) -> None:
-    """Regenerate embeddings for imported messages."""
+    """Embed the imported messages in batches."""
     try:
-        from sai_memory.memory.chunking import chunk_text
-        from sai_memory.memory.storage import replace_message_embeddings
         from saiverse_memory.adapter import SAIMemoryAdapter
 
         # Create a temporary adapter just for embedder
-        # We need persona_id from the first thread
-        if not threads_data:
-            return
-        first_thread = threads_data[0]["thread_id"]
-        persona_id = first_thread.split(":")[0] if ":" in first_thread else first_thread
-
         adapter = SAIMemoryAdapter(persona_id)
-        if not adapter.can_embed():
-            LOGGER.warning("Embedder not available, skipping embedding generation")
-            return
-
-        count = 0
-        for thread_data in threads_data:
-            for msg in thread_data.get("messages", []):
-                msg_id = msg.get("id")
-                content = msg.get("content", "")
-                if not msg_id or not content or not content.strip():
-                    count += 1
-                    continue
-
-                chunks = chunk_text(
-                    content.strip(),
-                    min_chars=adapter.settings.chunk_min_chars,
-                    max_chars=adapter.settings.chunk_max_chars,
-                )
-                payload = [c.strip() for c in chunks if c and c.strip()]
-                if payload:
-                    vectors = adapter.embedder.embed(payload, is_query=False)
-                    replace_message_embeddings(conn, msg_id, vectors)
-
-                count += 1
-                if progress_callback and count % 20 == 0:
-                    progress_callback(
-                        base_progress + count, total + base_progress,
-                        f"Embedding {count} messages...",
-                    )
-
-        adapter.close()
+        try:
+            if not adapter.can_embed():
+                LOGGER.warning("Embedder not available, skipping embedding generation")
+                return
+            embed_pending(
+                conn,
+                adapter.embedder,
+                message_ids,
+                min_chars=adapter.settings.chunk_min_chars,
+                max_chars=adapter.settings.chunk_max_chars,
+                lock=lock,
+                progress_callback=progress_callback,
+            )
+        finally:
+            adapter.close()
     except Exception as exc:
         LOGGER.warning("Failed to regenerate embeddings: %s", exc)
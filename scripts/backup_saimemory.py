@@ -13,6 +13,15 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from sai_memory.backup import BackupError, run_backup
+from sai_memory.chunk_backup import (
+    CHUNK_BACKUP_ROOT,
+    ChunkBackupError,
+    Manifest,
+    list_manifests,
+    restore_chunk_backup,
+    run_chunk_backup,
+    verify_chunk_backup,
+)
 
 load_dotenv()
 
@@ -21,17 +30,30 @@ DEFAULT_PERSONA_ROOT = Path.home() / ".saiverse" / "personas"
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Create full or incremental SAIMemory backups using rdiff-backup.")
+    parser = argparse.ArgumentParser(
+        description="Create full or incremental SAIMemory backups using rdiff-backup or the chunk store."
+    )
     parser.add_argument("personas", nargs="+", help="Persona IDs (maps to ~/.saiverse/personas/<persona>/memory.db)")
     parser.add_argument(
         "--output-dir",
-        default=str(DEFAULT_BACKUP_ROOT),
-        help=f"Backup repository root (default: {DEFAULT_BACKUP_ROOT})",
+        help=f"Backup repository root (default: {DEFAULT_BACKUP_ROOT} for rdiff, {CHUNK_BACKUP_ROOT} for chunk)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("rdiff", "chunk"),
+        default="rdiff",
+        help="Backup format (default: rdiff).",
     )
+    chunk_ops = parser.add_mutually_exclusive_group()
+    chunk_ops.add_argument("--list", action="store_true", help="List chunk-store snapshots.")
+    chunk_ops.add_argument("--verify", action="store_true", help="Verify a chunk-store snapshot.")
+    chunk_ops.add_argument("--restore", metavar="DEST", help="Restore a chunk-store snapshot to DEST.")
+    parser.add_argument("--snapshot", help="Snapshot ID for --verify/--restore (default: latest).")
+    parser.add_argument("--overwrite", action="store_true", help="Allow --restore to replace an existing file.")
     parser.add_argument(
         "--full",
         action="store_true",
-        help="Rotate the existing repository and create a fresh full backup.",
+        help="rdiff: rotate the repository and create a fresh full backup. chunk: snapshot even if unchanged.",
     )
     parser.add_argument(
         "--rdiff-path",
@@ -56,7 +78,10 @@ def main() -> None:
         format="%(levelname)s: %(message)s",
     )
 
-    output_root = Path(args.output_dir).expanduser()
+    if args.format == "chunk" or args.list or args.verify or args.restore:
+        sys.exit(_run_chunk(args))
+
+    output_root = Path(args.output_dir or DEFAULT_BACKUP_ROOT).expanduser()
     output_root.mkdir(parents=True, exist_ok=True)
 
     status = 0
@@ -77,5 +102,40 @@ def main() -> None:
     sys.exit(status)
 
 
+def _run_chunk(args: argparse.Namespace) -> int:
+    output_root = Path(args.output_dir).expanduser() if args.output_dir else None
+    status = 0
+    for persona in args.personas:
+        try:
+            if args.list:
+                for path in list_manifests(persona, output_root):
+                    manifest = Manifest.load(path)
+                    print(
+                        f"{persona}\t{manifest.snapshot_id}\t{manifest.size / 1024:.1f} KB"
+                        f"\t{len(manifest.chunks)} chunks\t{manifest.high_water}"
+                    )
+            elif args.verify:
+                manifest = verify_chunk_backup(persona, args.snapshot, output_root)
+                logging.info("Verified: persona=%s snapshot=%s", persona, manifest.snapshot_id)
+            elif args.restore:
+                dest = Path(args.restore).expanduser()
+                if len(args.personas) > 1:
+                    dest = dest / persona / "memory.db"
+                restore_chunk_backup(persona, dest, args.snapshot, output_root, overwrite=args.overwrite)
+                logging.info("Restored: persona=%s dest=%s", persona, dest)
+            else:
+                manifest_path = run_chunk_backup(
+                    persona_id=persona,
+                    db_path=_persona_db_path(persona),
+                    output_root=output_root,
+                    skip_if_unchanged=not args.full,
+                )
+                logging.info("Backup completed: persona=%s manifest=%s", persona, manifest_path or "(unchanged)")
+        except (ChunkBackupError, OSError) as exc:
+            logging.error("Chunk backup operation failed for %s: %s", persona, exc)
+            status = 1
+    return status
+
+
 if __name__ == "__main__":
     main()
@@ -16,11 +16,13 @@ Examples:
 
     # Export with time range
     python scripts/export_saimemory_native.py air_city_a --start 2026-01-01T00:00:00 --end 2026-02-01T00:00:00
+
+    # Large persona: NDJSON, gzip-compressed (streamed; memory use stays flat)
+    python scripts/export_saimemory_native.py air_city_a --format ndjson --gzip --output export.ndjson.gz
 """
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -47,41 +49,52 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--start", help="Start ISO timestamp (inclusive)")
     parser.add_argument("--end", help="End ISO timestamp (inclusive)")
+    parser.add_argument(
+        "--format", choices=("json", "ndjson"), default="json",
+        help="json: saiverse_saimemory_v1 document (default); ndjson: one record per line",
+    )
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
 
-    from saiverse_memory.native_export import export_threads_native
+    from saiverse_memory.native_export import iter_export_native
 
     try:
-        data = export_threads_native(
-            persona_id=args.persona,
-            thread_suffixes=args.threads,
-            start=args.start,
-            end=args.end,
+        chunks = iter_export_native(
+            args.persona,
+            args.threads,
+            args.start,
+            args.end,
+            fmt=args.format,
+            compress=args.gzip,
         )
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
+
+    written = 0
+    try:
+        if args.output == "-":
+            for block in chunks:
+                sys.stdout.buffer.write(block)
+                written += len(block)
+            sys.stdout.flush()
+        else:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.output, "wb") as f:
+                for block in chunks:
+                    f.write(block)
+                    written += len(block)
     except Exception as e:
         print(f"Export failed: {e}", file=sys.stderr)
         return 1
 
     # Summary
-    total_threads = len(data.get("threads", []))
-    total_msgs = sum(len(t.get("messages", [])) for t in data.get("threads", []))
-    print(f"Exported {total_threads} thread(s), {total_msgs} message(s)", file=sys.stderr)
-
-    # Output
-    if args.output == "-":
-        json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
-        sys.stdout.write("\n")
-    else:
-        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"Exported {written} byte(s)", file=sys.stderr)
+    if args.output != "-":
         print(f"Written to {args.output}", file=sys.stderr)
 
     return 0
@@ -5,6 +5,7 @@ import argparse
 import json
 import sys
 import textwrap
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional, Sequence
@@ -132,6 +133,11 @@ def _truncate(value: str, width: int) -> str:
     return textwrap.shorten(value, width=width, placeholder="…")
 
 
+def print_progress(current: int, total: int, message: str) -> None:
+    sys.stderr.write(f"\r{message}\033[K")
+    sys.stderr.flush()
+
+
 def handle_import(export: ChatGPTExport, args: argparse.Namespace) -> None:
     records = export.conversations
     if not records:
@@ -164,54 +170,63 @@ def handle_import(export: ChatGPTExport, args: argparse.Namespace) -> None:
             return
 
     try:
-        for record in selected:
-            payloads = list(record.iter_memory_payloads(include_roles=include_roles))
-            thread_suffix = resolve_thread_suffix(record, args.thread_suffix)
-            if header_enabled:
-                header_ts = record.create_time or record.update_time or datetime.now(tz=UTC)
-                origin_id = record.conversation_id or record.identifier
-                header_text = (
-                    f"[Imported ChatGPT conversation \"{record.title}\" "
-                    f"({origin_id}) created {format_datetime(header_ts)}]"
-                )
-                payloads.insert(
-                    0,
-                    {
-                        "role": "system",
-                        "content": header_text,
-                        "timestamp": format_datetime(header_ts),
-                    },
-                )
-
-            import_result = {
-                "id": record.identifier,
-                "title": record.title,
-                "thread_suffix": thread_suffix,
-                "messages_imported": len(payloads),
-            }
-
-            if args.dry_run:
-                import_result["status"] = "skipped (dry-run)"
-            else:
-                for payload in payloads:
-                    metadata = payload.get("metadata")
-                    if not isinstance(metadata, dict):
-                        metadata = {}
-                        payload["metadata"] = metadata
-                    tags = metadata.get("tags")
-                    if isinstance(tags, list):
-                        tag_list = [str(tag) for tag in tags if tag]
-                    elif tags is None:
-                        tag_list = []
-                    else:
-                        tag_list = [str(tags)]
-                    if "conversation" not in tag_list:
-                        tag_list.append("conversation")
-                    metadata["tags"] = tag_list
-                    adapter.append_persona_message(payload, thread_suffix=thread_suffix)  # type: ignore[arg-type]
-                import_result["status"] = "imported"
-
-            results.append(import_result)
+        # 1会話ずつではなく全体を一括インポートし、埋め込みは最後にまとめて生成する
+        bulk_ctx = (
+            adapter.bulk_import(defer_indexes=True, progress_callback=print_progress)
+            if adapter is not None
+            else nullcontext()
+        )
+        with bulk_ctx as bulk:
+            for record in selected:
+                payloads = list(record.iter_memory_payloads(include_roles=include_roles))
+                thread_suffix = resolve_thread_suffix(record, args.thread_suffix)
+                if header_enabled:
+                    header_ts = record.create_time or record.update_time or datetime.now(tz=UTC)
+                    origin_id = record.conversation_id or record.identifier
+                    header_text = (
+                        f"[Imported ChatGPT conversation \"{record.title}\" "
+                        f"({origin_id}) created {format_datetime(header_ts)}]"
+                    )
+                    payloads.insert(
+                        0,
+                        {
+                            "role": "system",
+                            "content": header_text,
+                            "timestamp": format_datetime(header_ts),
+                        },
+                    )
+
+                import_result = {
+                    "id": record.identifier,
+                    "title": record.title,
+                    "thread_suffix": thread_suffix,
+                    "messages_imported": len(payloads),
+                }
+
+                if args.dry_run:
+                    import_result["status"] = "skipped (dry-run)"
+                else:
+                    for payload in payloads:
+                        metadata = payload.get("metadata")
+                        if not isinstance(metadata, dict):
+                            metadata = {}
+                            payload["metadata"] = metadata
+                        tags = metadata.get("tags")
+                        if isinstance(tags, list):
+                            tag_list = [str(tag) for tag in tags if tag]
+                        elif tags is None:
+                            tag_list = []
+                        else:
+                            tag_list = [str(tags)]
+                        if "conversation" not in tag_list:
+                            tag_list.append("conversation")
+                        metadata["tags"] = tag_list
+                        bulk.append_persona_message(payload, thread_suffix=thread_suffix)
+                    import_result["status"] = "imported"
+
+                results.append(import_result)
+        if adapter is not None:
+            sys.stderr.write("\n")
 
     finally:
         if adapter is not None:
@@ -26,6 +26,7 @@ import argparse
 import json
 import logging
 import sys
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -33,7 +34,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from saiverse_memory import SAIMemoryAdapter
-from sai_memory.memory.storage import add_message, get_or_create_thread, init_db
+from sai_memory.memory.bulk_import import BulkImporter
+from sai_memory.memory.storage import init_db
 from pathlib import Path as PathLib
 
 LOGGER = logging.getLogger("import_chatlog_json")
@@ -103,6 +105,10 @@ def load_chatlog(path: Path) -> list[dict]:
     return messages
 
 
+def _log_progress(current: int, total: int, message: str) -> None:
+    LOGGER.info("%s", message)
+
+
 def import_messages(
     adapter: SAIMemoryAdapter,
     messages: list[dict],
@@ -119,43 +125,47 @@ def import_messages(
     """
     count = 0
     current_time = start_time
+    bulk_ctx = (
+        nullcontext()
+        if dry_run
+        else adapter.bulk_import(
+            total=len(messages), defer_indexes=True, progress_callback=_log_progress
+        )
+    )
     
-    for msg in messages:
-        role = msg["role"]
-        content = msg["content"]
+    with bulk_ctx as bulk:
+        for msg in messages:
+            role = msg["role"]
+            content = msg["content"]
         
-        # Build metadata
-        metadata: dict = {"tags": ["conversation", "imported"]}
-        if "token_count" in msg:
-            metadata["token_count"] = msg["token_count"]
+            # Build metadata
+            metadata: dict = {"tags": ["conversation", "imported"]}
+            if "token_count" in msg:
+                metadata["token_count"] = msg["token_count"]
         
-        timestamp = current_time.isoformat()
+            timestamp = current_time.isoformat()
         
-        if dry_run:
-            LOGGER.info(
-                "[DRY-RUN] Would import: role=%s, time=%s, content=%s...",
-                role,
-                timestamp,
-                content[:50] if len(content) > 50 else content,
-            )
-        else:
-            message_data = {
-                "role": role,
-                "content": content,
-                "timestamp": timestamp,
-                "metadata": metadata,
-            }
-            if skip_embed:
-                message_data["embedding_chunks"] = 0
-            adapter._append_message(
-                building_id=None,
-                message=message_data,
-                thread_suffix=thread_suffix,
-            )
-            LOGGER.debug("Imported message: role=%s, time=%s", role, timestamp)
+            if dry_run:
+                LOGGER.info(
+                    "[DRY-RUN] Would import: role=%s, time=%s, content=%s...",
+                    role,
+                    timestamp,
+                    content[:50] if len(content) > 50 else content,
+                )
+            else:
+                message_data = {
+                    "role": role,
+                    "content": content,
+                    "timestamp": timestamp,
+                    "metadata": metadata,
+                }
+                if skip_embed:
+                    message_data["embedding_chunks"] = 0
+                bulk.append_persona_message(message_data, thread_suffix=thread_suffix)
+                LOGGER.debug("Imported message: role=%s, time=%s", role, timestamp)
         
-        count += 1
-        current_time += timedelta(seconds=interval_seconds)
+            count += 1
+            current_time += timedelta(seconds=interval_seconds)
     
     return count
 
@@ -180,42 +190,44 @@ def import_messages_direct(
     current_time = start_time
     thread_id = f"{persona_id}:{thread_suffix}"
     
-    # Create thread first
-    if not dry_run:
-        get_or_create_thread(conn, thread_id, resource_id=persona_id)
+    bulk_ctx = (
+        nullcontext()
+        if dry_run
+        else BulkImporter(conn, total=len(messages), progress_callback=_log_progress)
+    )
     
-    for msg in messages:
-        role = msg["role"]
-        content = msg["content"]
-        
-        # Build metadata
-        metadata: dict = {"tags": ["conversation", "imported"]}
-        if "token_count" in msg:
-            metadata["token_count"] = msg["token_count"]
-        
-        ts_epoch = int(current_time.timestamp())
-        
-        if dry_run:
-            LOGGER.info(
-                "[DRY-RUN] Would import: role=%s, time=%s, content=%s...",
-                role,
-                current_time.isoformat(),
-                content[:50] if len(content) > 50 else content,
-            )
-        else:
-            add_message(
-                conn,
-                thread_id=thread_id,
-                role=role,
-                content=content,
-                resource_id=persona_id,
-                created_at=ts_epoch,
-                metadata=metadata,
-            )
-            LOGGER.debug("Imported message: role=%s, time=%s", role, current_time.isoformat())
-        
-        count += 1
-        current_time += timedelta(seconds=interval_seconds)
+    with bulk_ctx as bulk:
+        for msg in messages:
+            role = msg["role"]
+            content = msg["content"]
+            
+            # Build metadata
+            metadata: dict = {"tags": ["conversation", "imported"]}
+            if "token_count" in msg:
+                metadata["token_count"] = msg["token_count"]
+            
+            ts_epoch = int(current_time.timestamp())
+            
+            if dry_run:
+                LOGGER.info(
+                    "[DRY-RUN] Would import: role=%s, time=%s, content=%s...",
+                    role,
+                    current_time.isoformat(),
+                    content[:50] if len(content) > 50 else content,
+                )
+            else:
+                bulk.add_message(
+                    thread_id,
+                    role,
+                    content,
+                    resource_id=persona_id,
+                    created_at=ts_epoch,
+                    metadata=metadata,
+                )
+                LOGGER.debug("Imported message: role=%s, time=%s", role, current_time.isoformat())
+            
+            count += 1
+            current_time += timedelta(seconds=interval_seconds)
     
     return count
 
@@ -19,6 +19,9 @@ Examples:
 
     # Import as new thread
     python scripts/import_saimemory_native.py air_city_a export.json --new-thread edited_v2
+
+    # Streamed NDJSON / gzip export (read record by record; no --dry-run / --new-thread)
+    python scripts/import_saimemory_native.py air_city_a export.ndjson.gz
 """
 from __future__ import annotations
 
@@ -67,6 +70,55 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def is_streamed_export(path: Path) -> bool:
+    """True for gzip-compressed or NDJSON exports (imported without loading them whole)."""
+    from saiverse_memory.native_export import NDJSON_FORMAT_VERSION
+
+    with path.open("rb") as f:
+        head = f.read(4096)
+    if head.startswith(b"\x1f\x8b"):
+        return True
+    first_line = head.split(b"\n", 1)[0].decode("utf-8-sig", errors="ignore")
+    return NDJSON_FORMAT_VERSION in first_line
+
+
+def import_streamed(args: argparse.Namespace) -> int:
+    from saiverse_memory.native_export import import_threads_native_stream
+
+    if args.dry_run or args.new_thread_suffix:
+        LOGGER.error("--dry-run and --new-thread are not supported for NDJSON/gzip exports.")
+        return 1
+    if not args.force:
+        LOGGER.info("This will REPLACE existing threads with the same thread_id.")
+        answer = input("Proceed? [y/N] ").strip().lower()
+        if answer != "y":
+            LOGGER.info("Aborted.")
+            return 0
+
+    def progress(current: int, total: int, message: str) -> None:
+        LOGGER.info("[%d] %s", current, message)
+
+    try:
+        with args.json_file.open("rb") as source:
+            result = import_threads_native_stream(
+                args.persona_id,
+                source,
+                replace=True,
+                skip_embed=args.no_embed,
+                progress_callback=progress,
+            )
+    except Exception as e:
+        LOGGER.exception("Import failed: %s", e)
+        return 1
+
+    LOGGER.info(
+        "Import complete: %d thread(s), %d message(s)",
+        result["threads_imported"],
+        result["messages_imported"],
+    )
+    return 0
+
+
 def load_native_json(path: Path) -> dict:
     """Load and validate native JSON file."""
     if not path.exists():
@@ -95,6 +147,9 @@ def main() -> int:
         datefmt="%H:%M:%S",
     )
 
+    if args.json_file.exists() and is_streamed_export(args.json_file):
+        return import_streamed(args)
+
     # Load file
     try:
         data = load_native_json(args.json_file)
@@ -8,11 +8,24 @@ from __future__ import annotations
 
 from typing import Any, Callable, Optional
 
-try:  # pragma: no cover - optional dependency
-    from langgraph.graph import StateGraph, END, START
-except Exception:  # langgraph missing or import error
-    StateGraph = None  # type: ignore
-    END = START = None  # type: ignore
+# langgraph (and langchain_core behind it) is imported on the first compile,
+# not when the SEA package is imported
+StateGraph = None  # type: ignore
+END = START = None  # type: ignore
+_langgraph_checked = False
+
+
+def _load_langgraph() -> bool:
+    global StateGraph, END, START, _langgraph_checked
+    if not _langgraph_checked:
+        try:  # pragma: no cover - optional dependency
+            from langgraph.graph import StateGraph as _StateGraph, END as _END, START as _START
+        except Exception:  # langgraph missing or import error
+            pass
+        else:
+            StateGraph, END, START = _StateGraph, _END, _START
+        _langgraph_checked = True
+    return StateGraph is not None
 
 
 def compile_playbook(
@@ -35,7 +48,7 @@ def compile_playbook(
     Returns None if langgraph is unavailable.
     """
 
-    if StateGraph is None:
+    if not _load_langgraph():
         return None
 
     from sea.playbook_models import NodeType
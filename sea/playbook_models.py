@@ -3,7 +3,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union, Set
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing_extensions import Literal
 
 
@@ -97,6 +97,8 @@ class LLMNodeDef(BaseModel):
         description="State key containing metadata dict to attach to the speak message "
                     "(e.g., media attachments from tool execution). Only used when speak=true."
     )
+    # Prepared output_key / output_mapping, built on first use (see sea.runtime_state)
+    _compiled_output: Any = PrivateAttr(default=None)
 
 
 class ToolNodeDef(BaseModel):
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import logging
 import threading
+import time
 import uuid
 from dataclasses import dataclass, field
 from enum import IntEnum
@@ -15,6 +16,7 @@ from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional
 
 from llm_clients.exceptions import LLMError
 from sea.cancellation import CancellationToken, ExecutionCancelledException
+from sea.pulse_trace import PulseTrace, begin_pulse_trace, finish_pulse_trace
 
 if TYPE_CHECKING:
     from sea.runtime import SEARuntime
@@ -77,6 +79,7 @@ class ExecutionRequest:
     event_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     pulse_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     cancellation_token: CancellationToken = field(default_factory=CancellationToken)
+    submitted_ns: int = field(default_factory=time.perf_counter_ns)  # For queue wait in the pulse trace
     
     # For schedule resumption
     is_resumption: bool = False
@@ -247,11 +250,25 @@ class PulseController:
         """
         persona_id = request.persona_id
         lock = self._get_lock(persona_id)
+        trace = begin_pulse_trace(
+            request.pulse_id,
+            persona_id=persona_id,
+            pulse_type=request.type,
+            created_ns=request.submitted_ns,
+        )
+        if trace is not None:
+            trace.add_span(
+                "queue_wait", "queue", request.submitted_ns, time.perf_counter_ns(),
+                resumption=request.is_resumption or None,
+            )
+        status = "error"
         
         try:
-            result = self._do_execute(request)
+            result = self._do_execute(request, trace)
+            status = "completed"
             return result
         except ExecutionCancelledException as e:
+            status = "cancelled"
             LOGGER.info(
                 "[PulseController] Execution cancelled for persona %s, interrupted_by=%s",
                 persona_id, e.interrupted_by
@@ -269,6 +286,7 @@ class PulseController:
             )
             return []
         finally:
+            finish_pulse_trace(trace, status)
             with lock:
                 if self._current.get(persona_id) is request:
                     del self._current[persona_id]
@@ -276,7 +294,7 @@ class PulseController:
                 # Process next queued request
                 self._process_queue(persona_id)
     
-    def _do_execute(self, request: ExecutionRequest) -> List[str]:
+    def _do_execute(self, request: ExecutionRequest, trace: Optional[PulseTrace] = None) -> List[str]:
         """Actually execute the request via SEARuntime."""
         persona = self._get_persona(request.persona_id)
         if persona is None:
@@ -297,6 +315,8 @@ class PulseController:
                 occupants=self._get_occupants(request.building_id),
                 cancellation_token=request.cancellation_token,
                 pulse_type=request.type,
+                pulse_trace=trace,
+                pulse_id=request.pulse_id,
             )
             return []
         else:
@@ -311,6 +331,8 @@ class PulseController:
                 event_callback=request.event_callback,
                 cancellation_token=request.cancellation_token,
                 pulse_type=request.type,
+                pulse_trace=trace,
+                pulse_id=request.pulse_id,
             )
     
     def _build_resumption_prompt(self, request: ExecutionRequest) -> str:
@@ -0,0 +1,409 @@
+"""Per-pulse latency breakdown (span recorder).
+
+A pulse runs ``PulseController.submit`` → ``run_playbook`` →
+``prepare_context`` → LangGraph nodes → emitters. :class:`PulseTrace`
+collects timed spans for each of those steps (queue wait, context build,
+every node, LLM time-to-first-token / generation, tool execution, memory
+writes, emits) so a slow pulse can be explained after the fact.
+
+The trace travels in the pulse state as ``_pulse_trace`` (next to
+``_activity_trace``); code that only has a ``pulse_id`` (emitters,
+``_store_memory``, ``_prepare_context``) finds it through
+:func:`get_active_trace`. Finished traces are kept in a bounded in-memory
+ring and served by ``GET /api/config/pulse-traces``, either as a summary or
+as Chrome trace JSON (load in ``chrome://tracing`` / Perfetto).
+
+``SAIVERSE_PULSE_TRACE=0`` disables recording; ``SAIVERSE_PULSE_TRACE_LIMIT``
+sets how many finished pulses are kept (default 50).
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+# Category used for spans of each LangGraph node type
+NODE_CATEGORIES = {
+    "llm": "llm_node",
+    "tool": "tool",
+    "tool_call": "tool",
+    "memorize": "memory",
+    "exec": "playbook",
+    "subplay": "playbook",
+    "speak": "emit",
+    "say": "emit",
+    "think": "emit",
+}
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("SAIVERSE_PULSE_TRACE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _history_limit() -> int:
+    try:
+        return max(1, int(os.getenv("SAIVERSE_PULSE_TRACE_LIMIT", "50")))
+    except ValueError:
+        return 50
+
+
+class PulseTrace:
+    """Spans recorded for one pulse. Thread-safe; times are ``perf_counter_ns``."""
+
+    def __init__(
+        self,
+        pulse_id: str,
+        *,
+        persona_id: Optional[str] = None,
+        pulse_type: Optional[str] = None,
+        created_ns: Optional[int] = None,
+    ) -> None:
+        self.pulse_id = pulse_id
+        self.persona_id = persona_id
+        self.pulse_type = pulse_type
+        self.created_ns = created_ns if created_ns is not None else time.perf_counter_ns()
+        self.created_at = time.time() - (time.perf_counter_ns() - self.created_ns) / 1e9
+        self.finished_ns: Optional[int] = None
+        self.status = "running"
+        self.playbook: Optional[str] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    # -- recording ---------------------------------------------------
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int,
+        **args: Any,
+    ) -> None:
+        span = {
+            "name": name,
+            "cat": category,
+            "start_ns": start_ns,
+            "end_ns": end_ns,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            span["args"] = {k: v for k, v in args.items() if v is not None}
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time the block; keys added to the yielded dict end up in the span args."""
+        extra: Dict[str, Any] = dict(args)
+        started = time.perf_counter_ns()
+        try:
+            yield extra
+        except BaseException as exc:
+            extra["error"] = type(exc).__name__
+            raise
+        finally:
+            self.add_span(name, category, started, time.perf_counter_ns(), **extra)
+
+    def finish(self, status: str = "completed") -> None:
+        if self.finished_ns is None:
+            self.finished_ns = time.perf_counter_ns()
+            self.status = status
+
+    # -- reporting ---------------------------------------------------
+    @property
+    def duration_ms(self) -> float:
+        end = self.finished_ns if self.finished_ns is not None else time.perf_counter_ns()
+        return round((end - self.created_ns) / 1e6, 3)
+
+    def breakdown(self) -> Dict[str, float]:
+        """Milliseconds per category. Spans nested in a span of the same category count once."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: (s["start_ns"], -s["end_ns"]))
+        totals: Dict[str, float] = {}
+        open_until: Dict[tuple, int] = {}
+        for span in spans:
+            key = (span["cat"], span["tid"])
+            if span["start_ns"] < open_until.get(key, 0):
+                continue  # nested in an already counted span of the same category
+            open_until[key] = span["end_ns"]
+            totals[span["cat"]] = totals.get(span["cat"], 0.0) + (span["end_ns"] - span["start_ns"]) / 1e6
+        return {cat: round(ms, 3) for cat, ms in sorted(totals.items())}
+
+    def llm_calls(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            spans = [s for s in self.spans if s["cat"] == "llm"]
+        calls = []
+        for span in sorted(spans, key=lambda s: s["start_ns"]):
+            args = span.get("args", {})
+            calls.append({
+                "node": args.get("node"),
+                "model": args.get("model"),
+                "streaming": span["name"] == "llm.stream",
+                "ttft_ms": args.get("ttft_ms"),
+                "total_ms": round((span["end_ns"] - span["start_ns"]) / 1e6, 3),
+            })
+        return calls
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "pulse_id": self.pulse_id,
+            "persona_id": self.persona_id,
+            "pulse_type": self.pulse_type,
+            "playbook": self.playbook,
+            "status": self.status,
+            "started_at": round(self.created_at, 3),
+            "duration_ms": self.duration_ms,
+            "span_count": len(self.spans),
+            "breakdown_ms": self.breakdown(),
+            "llm_calls": self.llm_calls(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = self.summary()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ns"])
+        payload["spans"] = [
+            {
+                "name": s["name"],
+                "cat": s["cat"],
+                "offset_ms": round((s["start_ns"] - self.created_ns) / 1e6, 3),
+                "duration_ms": round((s["end_ns"] - s["start_ns"]) / 1e6, 3),
+                **({"args": s["args"]} if s.get("args") else {}),
+            }
+            for s in spans
+        ]
+        return payload
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome Trace Event Format ("X" complete events, microseconds)."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ns"])
+        tids: Dict[int, int] = {}
+        events: List[Dict[str, Any]] = [{
+            "name": "process_name",
+            "ph": "M",
+            "pid": 1,
+            "args": {"name": f"pulse {self.pulse_id} ({self.persona_id or '-'})"},
+        }]
+        for span in spans:
+            tid = tids.setdefault(span["tid"], len(tids) + 1)
+            events.append({
+                "name": span["name"],
+                "cat": span["cat"],
+                "ph": "X",
+                "ts": round((span["start_ns"] - self.created_ns) / 1e3, 3),
+                "dur": round((span["end_ns"] - span["start_ns"]) / 1e3, 3),
+                "pid": 1,
+                "tid": tid,
+                "args": span.get("args", {}),
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "pulse_id": self.pulse_id,
+                "persona_id": self.persona_id,
+                "pulse_type": self.pulse_type,
+                "playbook": self.playbook,
+                "status": self.status,
+            },
+        }
+
+
+class PulseTraceStore:
+    """Running traces by pulse_id plus a bounded ring of finished ones."""
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        self._lock = threading.Lock()
+        self._active: Dict[str, PulseTrace] = {}
+        self._finished: "OrderedDict[str, PulseTrace]" = OrderedDict()
+        self._limit = limit or _history_limit()
+
+    def start(self, trace: PulseTrace) -> PulseTrace:
+        with self._lock:
+            self._active[trace.pulse_id] = trace
+        return trace
+
+    def active(self, pulse_id: Optional[str]) -> Optional[PulseTrace]:
+        if not pulse_id:
+            return None
+        with self._lock:
+            return self._active.get(pulse_id)
+
+    def finish(self, trace: PulseTrace, status: str = "completed") -> None:
+        trace.finish(status)
+        with self._lock:
+            if self._active.get(trace.pulse_id) is trace:
+                del self._active[trace.pulse_id]
+            self._finished[trace.pulse_id] = trace
+            self._finished.move_to_end(trace.pulse_id)
+            while len(self._finished) > self._limit:
+                self._finished.popitem(last=False)
+        LOGGER.info(
+            "[pulse-trace] %s persona=%s type=%s %.0fms %s",
+            trace.pulse_id, trace.persona_id, trace.pulse_type, trace.duration_ms,
+            " ".join(f"{cat}={ms:.0f}" for cat, ms in trace.breakdown().items()),
+        )
+
+    def get(self, pulse_id: str) -> Optional[PulseTrace]:
+        with self._lock:
+            return self._finished.get(pulse_id) or self._active.get(pulse_id)
+
+    def recent(self, persona_id: Optional[str] = None, limit: int = 20) -> List[PulseTrace]:
+        """Newest first; running pulses are included."""
+        with self._lock:
+            traces = list(self._finished.values()) + list(self._active.values())
+        if persona_id:
+            traces = [t for t in traces if t.persona_id == persona_id]
+        traces.sort(key=lambda t: t.created_ns, reverse=True)
+        return traces[:max(0, limit)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._active.clear()
+            self._finished.clear()
+
+
+_store = PulseTraceStore()
+
+
+def get_pulse_trace_store() -> PulseTraceStore:
+    return _store
+
+
+def begin_pulse_trace(
+    pulse_id: str,
+    *,
+    persona_id: Optional[str] = None,
+    pulse_type: Optional[str] = None,
+    created_ns: Optional[int] = None,
+) -> Optional[PulseTrace]:
+    """Create and register a trace, or None when tracing is disabled."""
+    if not tracing_enabled():
+        return None
+    trace = PulseTrace(pulse_id, persona_id=persona_id, pulse_type=pulse_type, created_ns=created_ns)
+    return _store.start(trace)
+
+
+def finish_pulse_trace(trace: Optional[PulseTrace], status: str = "completed") -> None:
+    if trace is not None:
+        _store.finish(trace, status)
+
+
+def get_active_trace(pulse_id: Optional[str]) -> Optional[PulseTrace]:
+    return _store.active(pulse_id)
+
+
+def span(trace: Optional[PulseTrace], name: str, category: str, **args: Any) -> ContextManager[Dict[str, Any]]:
+    """``trace.span(...)`` or a no-op context when there is no trace."""
+    if trace is None:
+        return nullcontext({})
+    return trace.span(name, category, **args)
+
+
+def traced_stream(
+    trace: Optional[PulseTrace],
+    stream: Iterator[Any],
+    *,
+    node: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Iterator[Any]:
+    """Wrap an LLM stream; records ``llm.stream`` with time-to-first-token.
+
+    Thinking chunks count as the first token: they are what the user sees first.
+    """
+    if trace is None:
+        return stream
+    return _TracedStream(trace, stream, node, model)
+
+
+class _TracedStream:
+    def __init__(self, trace: PulseTrace, stream: Iterator[Any], node: Optional[str], model: Optional[str]) -> None:
+        self._trace = trace
+        self._stream = iter(stream)
+        self._source = stream
+        self._node = node
+        self._model = model
+        self._started = time.perf_counter_ns()
+        self._first: Optional[int] = None
+        self._chunks = 0
+        self._done = False
+
+    def __iter__(self) -> "_TracedStream":
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            chunk = next(self._stream)
+        except StopIteration:
+            self._record()
+            raise
+        except BaseException as exc:
+            self._record(error=type(exc).__name__)
+            raise
+        if self._first is None:
+            self._first = time.perf_counter_ns()
+        self._chunks += 1
+        return chunk
+
+    def close(self) -> None:
+        self._record()
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            close()
+
+    def _record(self, error: Optional[str] = None) -> None:
+        if self._done:
+            return
+        self._done = True
+        ttft_ms = round((self._first - self._started) / 1e6, 3) if self._first is not None else None
+        self._trace.add_span(
+            "llm.stream", "llm", self._started, time.perf_counter_ns(),
+            node=self._node, model=self._model, ttft_ms=ttft_ms, chunks=self._chunks, error=error,
+        )
+
+
+def traced_node(fn: Callable[[dict], Any], node_id: str, node_type: str, playbook_name: str) -> Callable[[dict], Any]:
+    """Wrap a LangGraph node function with a span taken from ``state["_pulse_trace"]``."""
+    category = NODE_CATEGORIES.get(node_type, "node")
+    name = f"{node_type}:{node_id}"
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_node(state: dict):
+            trace = state.get("_pulse_trace") if isinstance(state, dict) else None
+            if trace is None:
+                return await fn(state)
+            with trace.span(name, category, playbook=playbook_name):
+                return await fn(state)
+        return async_node
+
+    @functools.wraps(fn)
+    def sync_node(state: dict):
+        trace = state.get("_pulse_trace") if isinstance(state, dict) else None
+        if trace is None:
+            return fn(state)
+        with trace.span(name, category, playbook=playbook_name):
+            return fn(state)
+    return sync_node
+
+
+__all__ = [
+    "PulseTrace",
+    "PulseTraceStore",
+    "begin_pulse_trace",
+    "finish_pulse_trace",
+    "get_active_trace",
+    "get_pulse_trace_store",
+    "span",
+    "traced_node",
+    "traced_stream",
+    "tracing_enabled",
+]
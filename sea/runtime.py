@@ -18,6 +18,7 @@ from saiverse.usage_tracker import get_usage_tracker
 from sea.cancellation import CancellationToken, ExecutionCancelledException
 from sea.langgraph_runner import compile_playbook
 from sea.playbook_models import NodeType, PlaybookSchema, PlaybookValidationError, validate_playbook_graph
+from sea.pulse_trace import PulseTrace, get_active_trace, span
 from sea.runtime_context import prepare_context as prepare_context_impl
 from sea.runtime_engine import RuntimeEngine
 from sea.runtime_context import preview_context as preview_context_impl
@@ -83,6 +84,8 @@ class SEARuntime:
         event_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
         cancellation_token: Optional[CancellationToken] = None,
         pulse_type: str = "user",
+        pulse_trace: Optional[PulseTrace] = None,
+        pulse_id: Optional[str] = None,
     ) -> List[str]:
         """Router -> subgraph -> speak. Returns spoken strings for gateway/UI."""
         # Check for cancellation before starting
@@ -101,7 +104,8 @@ class SEARuntime:
                 if metadata:
                     msg_metadata.update(metadata)
                 user_msg["metadata"] = msg_metadata
-                persona.history_manager.add_message(user_msg, building_id, heard_by=None)
+                with span(pulse_trace, "history.user_input", "memory"):
+                    persona.history_manager.add_message(user_msg, building_id, heard_by=None)
             except Exception:
                 LOGGER.exception("Failed to record user input to history")
 
@@ -128,12 +132,14 @@ class SEARuntime:
             auto_mode=False, record_history=True, event_callback=event_callback,
             cancellation_token=cancellation_token, pulse_type=pulse_type,
             initial_params=effective_args if effective_args else None,
+            pulse_trace=pulse_trace, pulse_id=pulse_id,
         )
 
         # Post-response metabolism check
         bh_before = len(self.manager.building_histories.get(building_id, []))
         try:
-            self._maybe_run_metabolism(persona, building_id, event_callback)
+            with span(pulse_trace, "metabolism", "memory"):
+                self._maybe_run_metabolism(persona, building_id, event_callback)
         except Exception:
             LOGGER.exception("[metabolism] Post-response metabolism failed")
         bh_after = len(self.manager.building_histories.get(building_id, []))
@@ -152,6 +158,8 @@ class SEARuntime:
         occupants: List[str],
         cancellation_token: Optional[CancellationToken] = None,
         pulse_type: str = "auto",
+        pulse_trace: Optional[PulseTrace] = None,
+        pulse_id: Optional[str] = None,
     ) -> None:
         """Router -> subgraph -> think. For autonomous loop, no direct user output."""
         # Check for cancellation before starting
@@ -168,11 +176,13 @@ class SEARuntime:
             playbook, persona, building_id, user_input=None,
             auto_mode=True, record_history=True,
             cancellation_token=cancellation_token, pulse_type=pulse_type,
+            pulse_trace=pulse_trace, pulse_id=pulse_id,
         )
 
         # Post-auto metabolism check (no event_callback for auto pulses)
         try:
-            self._maybe_run_metabolism(persona, building_id)
+            with span(pulse_trace, "metabolism", "memory"):
+                self._maybe_run_metabolism(persona, building_id)
         except Exception:
             LOGGER.exception("[metabolism] Post-auto metabolism failed")
 
@@ -190,6 +200,8 @@ class SEARuntime:
         cancellation_token: Optional[CancellationToken] = None,
         pulse_type: Optional[str] = None,
         initial_params: Optional[Dict[str, Any]] = None,
+        pulse_trace: Optional[PulseTrace] = None,
+        pulse_id: Optional[str] = None,
     ) -> List[str]:
         return run_playbook(
             self,
@@ -204,6 +216,8 @@ class SEARuntime:
             cancellation_token=cancellation_token,
             pulse_type=pulse_type,
             initial_params=initial_params,
+            pulse_trace=pulse_trace,
+            pulse_id=pulse_id,
         )
 
     # LangGraph compile wrapper -----------------------------------------
@@ -388,52 +402,30 @@ class SEARuntime:
         return base_client
 
     def _build_tools_spec(self, tool_names: List[str], llm_client: Any) -> List[Any]:
-        """Build tools spec for LLM based on available tool names and llm_client type."""
-        from tools import GEMINI_TOOLS_SPEC, OPENAI_TOOLS_SPEC
+        """Build tools spec for LLM based on available tool names and llm_client type.
 
-        LOGGER.info("[sea] _build_tools_spec called with tool_names: %s", tool_names)
+        The provider payload for a given tool set is cached in ``tools``,
+        so repeated steps of an agentic loop reuse the same spec objects.
+        """
+        from tools import build_provider_tools_spec
 
         # Determine provider from llm_client class name
         client_class_name = type(llm_client).__name__
-        LOGGER.info("[sea] LLM client class: %s", client_class_name)
-
         if client_class_name in ("OpenAIClient", "AnthropicClient", "OllamaClient", "NvidiaNIMClient", "LlamaCppClient"):
-            # Filter OpenAI tools spec (OpenAI-compatible)
-            LOGGER.info("[sea] Using OpenAI-compatible tools format (client: %s)", client_class_name)
-            LOGGER.info("[sea] Filtering from OPENAI_TOOLS_SPEC (total: %d)", len(OPENAI_TOOLS_SPEC))
-            filtered = [
-                tool for tool in OPENAI_TOOLS_SPEC
-                if tool.get("function", {}).get("name") in tool_names
-            ]
-            LOGGER.info("[sea] Built OpenAI tools spec: %d tools", len(filtered))
-            for tool in filtered:
-                LOGGER.info("[sea] - OpenAI tool: %s", tool.get("function", {}).get("name"))
-                LOGGER.info("[sea]   Full spec: %s", tool)
-            return filtered
+            provider = "openai"  # OpenAI-compatible
         else:
-            # Filter Gemini tools spec - combine all matching declarations into a single Tool
-            LOGGER.info("[sea] Using Gemini tools format (client: %s)", client_class_name)
-            from google.genai import types
-            all_matching_decls = []
-            for tool in GEMINI_TOOLS_SPEC:
-                if hasattr(tool, "function_declarations"):
-                    matching_decls = [
-                        decl for decl in tool.function_declarations
-                        if decl.name in tool_names
-                    ]
-                    all_matching_decls.extend(matching_decls)
-
-            if all_matching_decls:
-                # Gemini requires all function_declarations in a single Tool object
-                filtered = [types.Tool(function_declarations=all_matching_decls)]
-                LOGGER.info("[sea] Built Gemini tools spec: 1 Tool with %d function_declarations", len(all_matching_decls))
-                for decl in all_matching_decls:
-                    LOGGER.info("[sea] - Gemini function_declaration: name=%s, description=%s", decl.name, decl.description)
-                    LOGGER.info("[sea]   parameters: %s", decl.parameters)
-            else:
-                filtered = []
-                LOGGER.info("[sea] Built Gemini tools spec: 0 tools")
-            return filtered
+            # Gemini: all matching declarations combined into a single Tool
+            provider = "gemini"
+
+        filtered = build_provider_tools_spec(tool_names, provider)
+        LOGGER.info(
+            "[sea] Built %s tools spec for %s: %d entries (requested: %s)",
+            provider, client_class_name, len(filtered), tool_names,
+        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            for tool in filtered:
+                LOGGER.debug("[sea]   tool spec: %s", tool)
+        return filtered
 
     def _dump_llm_io(
         self,
@@ -1084,7 +1076,8 @@ class SEARuntime:
                     message["metadata"] = msg_metadata
                 # Pass thread_suffix to ensure message is saved to correct thread
                 thread_suffix = current_thread.split(":", 1)[1] if ":" in current_thread else current_thread
-                adapter.append_persona_message(message, thread_suffix=thread_suffix)
+                with span(get_active_trace(pulse_id), "memory.append", "memory", role=message["role"]):
+                    adapter.append_persona_message(message, thread_suffix=thread_suffix)
             return True
         except Exception:
             LOGGER.warning("memorize node not stored", exc_info=True)
@@ -1604,18 +1597,22 @@ class SEARuntime:
     # ---------------- context preparation -----------------
 
     def _prepare_context(self, persona: Any, building_id: str, user_input: Optional[str], requirements: Optional[Any] = None, pulse_id: Optional[str] = None, warnings: Optional[List[Dict[str, Any]]] = None, preview_only: bool = False, event_callback: Optional[Callable[[Dict[str, Any]], None]] = None, cancellation_token: Optional[Any] = None) -> List[Dict[str, Any]]:
-        return prepare_context_impl(
-            self,
-            persona,
-            building_id,
-            user_input,
-            requirements=requirements,
-            pulse_id=pulse_id,
-            warnings=warnings,
-            preview_only=preview_only,
-            event_callback=event_callback,
-            cancellation_token=cancellation_token,
-        )
+        trace = None if preview_only else get_active_trace(pulse_id)
+        with span(trace, "prepare_context", "context") as span_args:
+            messages = prepare_context_impl(
+                self,
+                persona,
+                building_id,
+                user_input,
+                requirements=requirements,
+                pulse_id=pulse_id,
+                warnings=warnings,
+                preview_only=preview_only,
+                event_callback=event_callback,
+                cancellation_token=cancellation_token,
+            )
+            span_args["messages"] = len(messages)
+        return messages
 
     # ---- Context Preview (read-only, no side effects) ----
 
@@ -4,6 +4,8 @@ import asyncio
 import logging
 from typing import Any, Dict, Optional
 
+from sea.pulse_trace import get_active_trace, span
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -51,8 +53,9 @@ class RuntimeEmitters:
         msg["metadata"] = metadata
         if record_history:
             try:
-                persona.history_manager.add_message(msg, building_id, heard_by=None)
-                self.runtime.manager.gateway_handle_ai_replies(building_id, persona, [text])
+                with span(get_active_trace(pulse_id), "emit.speak", "emit"):
+                    persona.history_manager.add_message(msg, building_id, heard_by=None)
+                    self.runtime.manager.gateway_handle_ai_replies(building_id, persona, [text])
             except Exception:
                 LOGGER.exception("Failed to emit speak message")
         self.notify_unity_speak(persona, text)
@@ -91,8 +94,9 @@ class RuntimeEmitters:
         if msg_metadata:
             msg["metadata"] = msg_metadata
         try:
-            persona.history_manager.add_to_building_only(building_id, msg)
-            self.runtime.manager.gateway_handle_ai_replies(building_id, persona, [text])
+            with span(get_active_trace(pulse_id), "emit.say", "emit"):
+                persona.history_manager.add_to_building_only(building_id, msg)
+                self.runtime.manager.gateway_handle_ai_replies(building_id, persona, [text])
         except Exception:
             LOGGER.exception("Failed to emit say message")
         self.notify_unity_speak(persona, text)
@@ -103,14 +107,15 @@ class RuntimeEmitters:
         adapter = getattr(persona, "sai_memory", None)
         try:
             if adapter and adapter.is_ready():
-                adapter.append_persona_message(
-                    {
-                        "role": "assistant",
-                        "content": text,
-                        "metadata": {"tags": ["internal", f"pulse:{pulse_id}"]},
-                        "persona_id": persona.persona_id,
-                    }
-                )
+                with span(get_active_trace(pulse_id), "memory.append", "memory", role="assistant"):
+                    adapter.append_persona_message(
+                        {
+                            "role": "assistant",
+                            "content": text,
+                            "metadata": {"tags": ["internal", f"pulse:{pulse_id}"]},
+                            "persona_id": persona.persona_id,
+                        }
+                    )
         except Exception:
             LOGGER.warning("think message not stored", exc_info=True)
 
@@ -7,6 +7,7 @@ from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from saiverse.logging_config import log_sea_trace
 from sea.playbook_models import PlaybookSchema
+from sea.pulse_trace import span
 from sea.runtime_utils import _format
 
 LOGGER = logging.getLogger(__name__)
@@ -71,11 +72,12 @@ class RuntimeEngine:
                     LOGGER.info("[sea][tool] Tool function found: %s", tool_func)
 
                 # Execute tool with persona context
-                if persona_id and persona_dir:
-                    with persona_context(persona_id, persona_dir, manager_ref, playbook_name=playbook.name, auto_mode=auto_mode, event_callback=event_callback):
+                with span(state.get("_pulse_trace"), f"tool.exec:{tool_name}", "tool"):
+                    if persona_id and persona_dir:
+                        with persona_context(persona_id, persona_dir, manager_ref, playbook_name=playbook.name, auto_mode=auto_mode, event_callback=event_callback):
+                            result = tool_func(**kwargs) if callable(tool_func) else None
+                    else:
                         result = tool_func(**kwargs) if callable(tool_func) else None
-                else:
-                    result = tool_func(**kwargs) if callable(tool_func) else None
 
                 # Log tool result
                 result_str = str(result)
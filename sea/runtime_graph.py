@@ -8,6 +8,7 @@ from llm_clients.exceptions import LLMError
 from sea.cancellation import CancellationToken, ExecutionCancelledException
 from sea.langgraph_runner import compile_playbook
 from sea.playbook_models import PlaybookSchema
+from sea.pulse_trace import traced_node
 
 LOGGER = logging.getLogger(__name__)
 
@@ -35,20 +36,24 @@ def compile_with_langgraph(
         persona.execution_state["node"] = playbook.start_node
         persona.execution_state["status"] = "running"
 
+    def _traced(node_type: str, factory: Callable[[Any], Callable[[dict], Any]]) -> Callable[[Any], Callable[[dict], Any]]:
+        # Every node gets a span in the pulse trace (state["_pulse_trace"])
+        return lambda node_def: traced_node(factory(node_def), node_def.id, node_type, playbook.name)
+
     compiled = compile_playbook(
         playbook,
-        llm_node_factory=lambda node_def: runtime._lg_llm_node(node_def, persona, building_id, playbook, event_callback),
-        tool_node_factory=lambda node_def: runtime._lg_tool_node(node_def, persona, playbook, event_callback, auto_mode=auto_mode),
-        tool_call_node_factory=lambda node_def: runtime._lg_tool_call_node(node_def, persona, playbook, event_callback, auto_mode=auto_mode),
-        speak_node=lambda state: runtime._lg_speak_node(state, persona, building_id, playbook, _lg_outputs, event_callback),
-        think_node=lambda state: runtime._lg_think_node(state, persona, playbook, _lg_outputs, event_callback),
-        say_node_factory=lambda node_def: runtime._lg_say_node(node_def, persona, building_id, playbook, _lg_outputs, event_callback),
-        memorize_node_factory=lambda node_def: runtime._lg_memorize_node(node_def, persona, playbook, _lg_outputs, event_callback),
-        exec_node_factory=lambda node_def: runtime._lg_exec_node(node_def, playbook, persona, building_id, auto_mode, _lg_outputs, event_callback),
-        subplay_node_factory=lambda node_def: runtime._lg_subplay_node(node_def, persona, building_id, playbook, auto_mode, _lg_outputs, event_callback),
-        set_node_factory=lambda node_def: runtime._lg_set_node(node_def, playbook, event_callback),
-        stelis_start_node_factory=lambda node_def: runtime._lg_stelis_start_node(node_def, persona, playbook, event_callback),
-        stelis_end_node_factory=lambda node_def: runtime._lg_stelis_end_node(node_def, persona, playbook, event_callback),
+        llm_node_factory=_traced("llm", lambda node_def: runtime._lg_llm_node(node_def, persona, building_id, playbook, event_callback)),
+        tool_node_factory=_traced("tool", lambda node_def: runtime._lg_tool_node(node_def, persona, playbook, event_callback, auto_mode=auto_mode)),
+        tool_call_node_factory=_traced("tool_call", lambda node_def: runtime._lg_tool_call_node(node_def, persona, playbook, event_callback, auto_mode=auto_mode)),
+        speak_node=traced_node(lambda state: runtime._lg_speak_node(state, persona, building_id, playbook, _lg_outputs, event_callback), "speak", "speak", playbook.name),
+        think_node=traced_node(lambda state: runtime._lg_think_node(state, persona, playbook, _lg_outputs, event_callback), "think", "think", playbook.name),
+        say_node_factory=_traced("say", lambda node_def: runtime._lg_say_node(node_def, persona, building_id, playbook, _lg_outputs, event_callback)),
+        memorize_node_factory=_traced("memorize", lambda node_def: runtime._lg_memorize_node(node_def, persona, playbook, _lg_outputs, event_callback)),
+        exec_node_factory=_traced("exec", lambda node_def: runtime._lg_exec_node(node_def, playbook, persona, building_id, auto_mode, _lg_outputs, event_callback)),
+        subplay_node_factory=_traced("subplay", lambda node_def: runtime._lg_subplay_node(node_def, persona, building_id, playbook, auto_mode, _lg_outputs, event_callback)),
+        set_node_factory=_traced("set", lambda node_def: runtime._lg_set_node(node_def, playbook, event_callback)),
+        stelis_start_node_factory=_traced("stelis_start", lambda node_def: runtime._lg_stelis_start_node(node_def, persona, playbook, event_callback)),
+        stelis_end_node_factory=_traced("stelis_end", lambda node_def: runtime._lg_stelis_end_node(node_def, persona, playbook, event_callback)),
     )
     if not compiled:
         # Update execution state: compilation failed, reset to idle
@@ -115,6 +120,7 @@ def compile_with_langgraph(
         "_cancellation_token": effective_cancellation_token,  # For node-level cancellation checks
         "_pulse_usage_accumulator": usage_accumulator,  # Inherit from parent or create new
         "_activity_trace": activity_trace,  # Shared trace of exec/tool activities
+        "_pulse_trace": parent.get("_pulse_trace"),  # Span recorder shared across the pulse (sea/pulse_trace.py)
         "_intermediate_msgs": [],  # Track intermediate node outputs for profile-based context
         # Playbook variables (no prefix)
         "last": user_input or "",
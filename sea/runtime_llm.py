@@ -9,8 +9,10 @@ from typing import Any, Callable, Dict, Optional
 
 from llm_clients.exceptions import LLMError
 from sea.runtime_utils import _format, _is_llm_streaming_enabled
+from sea.runtime_streaming import StreamDeltaCoalescer
 from saiverse.logging_config import log_sea_trace
 from sea.playbook_models import PlaybookSchema
+from sea.pulse_trace import span, traced_stream
 from saiverse.usage_tracker import get_usage_tracker
 
 LOGGER = logging.getLogger(__name__)
@@ -149,11 +151,17 @@ def lg_llm_node(runtime, node_def: Any, persona: Any, building_id: str, playbook
                     cancelled_during_stream = False
                     for stream_attempt in range(max_stream_retries):
                         text_chunks: list[str] = []
-                        stream_iter = llm_client.generate_stream(
-                            messages,
-                            tools=tools_spec,
-                            temperature=runtime._default_temperature(persona),
-                            **runtime._get_cache_kwargs(),
+                        coalescer = StreamDeltaCoalescer(event_callback, persona, getattr(node_def, "id", "llm"))
+                        stream_iter = traced_stream(
+                            state.get("_pulse_trace"),
+                            llm_client.generate_stream(
+                                messages,
+                                tools=tools_spec,
+                                temperature=runtime._default_temperature(persona),
+                                **runtime._get_cache_kwargs(),
+                            ),
+                            node=getattr(node_def, "id", "llm"),
+                            model=getattr(llm_client, "model", None),
                         )
                         try:
                             for chunk in stream_iter:
@@ -162,21 +170,12 @@ def lg_llm_node(runtime, node_def: Any, persona: Any, building_id: str, playbook
                                     cancelled_during_stream = True
                                     break
                                 if isinstance(chunk, dict) and chunk.get("type") == "thinking":
-                                    event_callback({
-                                        "type": "streaming_thinking",
-                                        "content": chunk["content"],
-                                        "persona_id": getattr(persona, "persona_id", None),
-                                        "node_id": getattr(node_def, "id", "llm"),
-                                    })
+                                    coalescer.add_thinking(chunk["content"])
                                     continue
                                 text_chunks.append(chunk)
-                                event_callback({
-                                    "type": "streaming_chunk",
-                                    "content": chunk,
-                                    "persona_id": getattr(persona, "persona_id", None),
-                                    "node_id": getattr(node_def, "id", "llm"),
-                                })
+                                coalescer.add_text(chunk)
                         finally:
+                            coalescer.flush()
                             if hasattr(stream_iter, 'close'):
                                 stream_iter.close()
                         text = "".join(text_chunks)
@@ -338,12 +337,14 @@ def lg_llm_node(runtime, node_def: Any, persona: Any, building_id: str, playbook
 
                 else:
                     # ── Synchronous tool mode (original) ──
-                    result = llm_client.generate(
-                        messages,
-                        tools=tools_spec,
-                        temperature=runtime._default_temperature(persona),
-                        **runtime._get_cache_kwargs(),
-                    )
+                    with span(state.get("_pulse_trace"), "llm.generate", "llm",
+                              node=getattr(node_def, "id", "llm"), model=getattr(llm_client, "model", None)):
+                        result = llm_client.generate(
+                            messages,
+                            tools=tools_spec,
+                            temperature=runtime._default_temperature(persona),
+                            **runtime._get_cache_kwargs(),
+                        )
 
                     # Consume reasoning (thinking) from tool-mode LLM call
                     _tool_reasoning = llm_client.consume_reasoning()
@@ -534,11 +535,17 @@ def lg_llm_node(runtime, node_def: Any, persona: Any, building_id: str, playbook
                     cancelled_during_stream = False
                     for stream_attempt in range(max_stream_retries):
                         text_chunks = []
-                        stream_iter = llm_client.generate_stream(
-                            messages,
-                            tools=[],
-                            temperature=runtime._default_temperature(persona),
-                            **runtime._get_cache_kwargs(),
+                        coalescer = StreamDeltaCoalescer(event_callback, persona, getattr(node_def, "id", "llm"))
+                        stream_iter = traced_stream(
+                            state.get("_pulse_trace"),
+                            llm_client.generate_stream(
+                                messages,
+                                tools=[],
+                                temperature=runtime._default_temperature(persona),
+                                **runtime._get_cache_kwargs(),
+                            ),
+                            node=getattr(node_def, "id", "llm"),
+                            model=getattr(llm_client, "model", None),
                         )
                         try:
                             for chunk in stream_iter:
@@ -550,22 +557,13 @@ def lg_llm_node(runtime, node_def: Any, persona: Any, building_id: str, playbook
 
                                 # Thinking chunks are dicts, text chunks are strings
                                 if isinstance(chunk, dict) and chunk.get("type") == "thinking":
-                                    event_callback({
-                                        "type": "streaming_thinking",
-                                        "content": chunk["content"],
-                                        "persona_id": getattr(persona, "persona_id", None),
-                                        "node_id": getattr(node_def, "id", "llm"),
-                                    })
+                                    coalescer.add_thinking(chunk["content"])
                                     continue
                                 text_chunks.append(chunk)
-                                # Send each text chunk to UI
-                                event_callback({
-                                    "type": "streaming_chunk",
-                                    "content": chunk,
-                                    "persona_id": getattr(persona, "persona_id", None),
-                                    "node_id": getattr(node_def, "id", "llm"),
-                                })
+                                # Send text to UI (coalesced into size/time-bounded batches)
+                                coalescer.add_text(chunk)
                         finally:
+                            coalescer.flush()
                             # Explicitly close to disconnect HTTP streaming from LLM API
                             # This stops API-side token generation and billing
                             if hasattr(stream_iter, 'close'):
@@ -683,13 +681,15 @@ def lg_llm_node(runtime, node_def: Any, persona: Any, building_id: str, playbook
                         state["_reasoning_details"] = reasoning_details
                 else:
                     # Non-streaming mode
-                    text = llm_client.generate(
-                        messages,
-                        tools=[],
-                        temperature=runtime._default_temperature(persona),
-                        response_schema=response_schema,
-                        **runtime._get_cache_kwargs(),
-                    )
+                    with span(state.get("_pulse_trace"), "llm.generate", "llm",
+                              node=getattr(node_def, "id", "llm"), model=getattr(llm_client, "model", None)):
+                        text = llm_client.generate(
+                            messages,
+                            tools=[],
+                            temperature=runtime._default_temperature(persona),
+                            response_schema=response_schema,
+                            **runtime._get_cache_kwargs(),
+                        )
 
                     # Record usage
                     usage = llm_client.consume_usage()
@@ -6,6 +6,7 @@ from typing import Any, Callable, Dict, List, Optional
 
 from llm_clients.exceptions import LLMError
 from saiverse.logging_config import log_sea_trace
+from sea.pulse_trace import span
 
 LOGGER = logging.getLogger(__name__)
 
@@ -56,11 +57,12 @@ def lg_tool_call_node(runtime: Any, node_def: Any, persona: Any, playbook: Any,
             persona_dir = persona_dir.parent if persona_dir else Path.cwd()
             manager_ref = getattr(persona_obj, "manager_ref", None)
             LOGGER.info("[sea][tool_call] CALL %s (persona=%s) args=%s", tool_name, persona_id, tool_args)
-            if persona_id and persona_dir:
-                with persona_context(persona_id, persona_dir, manager_ref, playbook_name=playbook.name, auto_mode=auto_mode, event_callback=event_callback):
+            with span(state.get("_pulse_trace"), f"tool.exec:{tool_name}", "tool"):
+                if persona_id and persona_dir:
+                    with persona_context(persona_id, persona_dir, manager_ref, playbook_name=playbook.name, auto_mode=auto_mode, event_callback=event_callback):
+                        result = tool_func(**tool_args)
+                else:
                     result = tool_func(**tool_args)
-            else:
-                result = tool_func(**tool_args)
             result_str = str(result)
             result_preview = result_str[:500] + "..." if len(result_str) > 500 else result_str
             LOGGER.info("[sea][tool_call] RESULT %s -> %s", tool_name, result_preview)
@@ -4,7 +4,9 @@ import logging
 import uuid
 from typing import Any, Callable, Dict, List, Optional
 
+from sea.cancellation import ExecutionCancelledException
 from sea.playbook_models import PlaybookSchema
+from sea.pulse_trace import PulseTrace, begin_pulse_trace, finish_pulse_trace, span
 
 LOGGER = logging.getLogger(__name__)
 
@@ -22,22 +24,74 @@ def run_playbook(
     cancellation_token: Optional[Any] = None,
     pulse_type: Optional[str] = None,
     initial_params: Optional[Dict[str, Any]] = None,
+    pulse_trace: Optional[PulseTrace] = None,
+    pulse_id: Optional[str] = None,
 ) -> List[str]:
     if cancellation_token:
         cancellation_token.raise_if_cancelled()
 
     parent = parent_state or {}
+    trace = parent.get("_pulse_trace") or pulse_trace
 
     if initial_params:
         LOGGER.debug("[sea] _run_playbook received args: %s", list(initial_params.keys()))
         # Store args for compile_with_langgraph to resolve via input_schema
         parent["_args"] = dict(initial_params)
     LOGGER.debug("[sea] _run_playbook called for %s, parent_state keys: %s", playbook.name, list(parent.keys()) if parent else "(none)")
+    # トレースの有無（SAIVERSE_PULSE_TRACE=0）に関係なく、呼び出し元の pulse_id を使う
     if "_pulse_id" in parent:
         pulse_id = str(parent["_pulse_id"])
+    elif pulse_id:
+        pulse_id = str(pulse_id)
+    elif trace is not None:
+        pulse_id = trace.pulse_id
     else:
         pulse_id = str(uuid.uuid4())
 
+    # Pulses started outside PulseController (tools, API helpers) get their own trace
+    owns_trace = False
+    if trace is None and "_pulse_id" not in parent:
+        trace = begin_pulse_trace(
+            pulse_id,
+            persona_id=getattr(persona, "persona_id", None),
+            pulse_type=pulse_type,
+        )
+        owns_trace = trace is not None
+    if trace is not None:
+        parent["_pulse_trace"] = trace
+        if trace.playbook is None:
+            trace.playbook = playbook.name
+
+    status = "error"
+    try:
+        with span(trace, f"playbook:{playbook.name}", "playbook"):
+            result = _run_playbook_body(
+                runtime, playbook, persona, building_id, user_input, auto_mode, parent,
+                pulse_id, event_callback, cancellation_token, pulse_type,
+            )
+        status = "completed"
+        return result
+    except ExecutionCancelledException:
+        status = "cancelled"
+        raise
+    finally:
+        if owns_trace:
+            finish_pulse_trace(trace, status)
+
+
+def _run_playbook_body(
+    runtime: Any,
+    playbook: PlaybookSchema,
+    persona: Any,
+    building_id: str,
+    user_input: Optional[str],
+    auto_mode: bool,
+    parent: Dict[str, Any],
+    pulse_id: str,
+    event_callback: Optional[Callable[[Dict[str, Any]], None]],
+    cancellation_token: Optional[Any],
+    pulse_type: Optional[str],
+) -> List[str]:
     parent_chain = parent.get("_playbook_chain", "")
     if parent_chain:
         current_chain = f"{parent_chain} > {playbook.name}"
@@ -4,7 +4,9 @@ import ast
 import json
 import logging
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from llm_clients.structured_output import extract_json_object
 
 from .runtime_utils import _format
 
@@ -12,6 +14,66 @@ from .runtime_utils import _format
 LOGGER = logging.getLogger(__name__)
 
 
+class CompiledNodeOutput:
+    """Output key and ``output_mapping`` of one LLM node, prepared once.
+
+    The mapping's source paths are pre-split so router nodes don't re-derive
+    them every pulse. The instance remembers the ``output_mapping`` object and
+    key it was built from; :func:`compiled_node_output` rebuilds it when the
+    node is given a different mapping or key.
+    """
+
+    __slots__ = ("key", "mapping", "_source")
+
+    def __init__(self, node_def: Any) -> None:
+        output_mapping = getattr(node_def, "output_mapping", None)
+        self.key: str = getattr(node_def, "output_key", None) or getattr(node_def, "id", "") or "node"
+        self.mapping: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = tuple(
+            (source, target, _split_path(self.key, source))
+            for source, target in (output_mapping or {}).items()
+        )
+        self._source = (self.key, output_mapping)
+
+    def matches(self, node_def: Any) -> bool:
+        key = getattr(node_def, "output_key", None) or getattr(node_def, "id", "") or "node"
+        return self._source[0] == key and self._source[1] is getattr(node_def, "output_mapping", None)
+
+    def apply_mapping(self, state: Dict[str, Any]) -> None:
+        output_data = state.get(self.key)
+        if output_data is None:
+            LOGGER.warning(
+                "[sea] output_mapping: output_key %s not found in state (available keys: %s)",
+                self.key,
+                list(state.keys())[:20],
+            )
+            return
+        for source_path, target_key, parts in self.mapping:
+            value = _resolve_parts(output_data, parts)
+            if value is not None:
+                state[target_key] = value
+                LOGGER.debug("[sea] output_mapping: %s -> %s = %s", source_path, target_key, str(value))
+            else:
+                LOGGER.warning(
+                    "[sea] output_mapping: failed to resolve %s from %s (keys: %s)",
+                    source_path,
+                    self.key,
+                    list(output_data.keys()) if isinstance(output_data, dict) else "(not a dict)",
+                )
+
+
+def compiled_node_output(node_def: Any) -> CompiledNodeOutput:
+    """Return the node's :class:`CompiledNodeOutput`, caching it on the node."""
+    compiled = getattr(node_def, "_compiled_output", None)
+    if isinstance(compiled, CompiledNodeOutput) and compiled.matches(node_def):
+        return compiled
+    compiled = CompiledNodeOutput(node_def)
+    try:
+        node_def._compiled_output = compiled
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return compiled
+
+
 def process_structured_output(node_def: Any, text: Any, state: Dict[str, Any]) -> bool:
     schema = getattr(node_def, "response_schema", None)
     if not schema:
@@ -19,6 +81,7 @@ def process_structured_output(node_def: Any, text: Any, state: Dict[str, Any]) -
 
     node_id = getattr(node_def, "id", "?")
     LOGGER.debug("[sea] _process_structured_output: node=%s, text type=%s", node_id, type(text).__name__)
+    compiled = compiled_node_output(node_def)
 
     parsed: Optional[Dict[str, Any]]
     if isinstance(text, dict):
@@ -34,19 +97,40 @@ def process_structured_output(node_def: Any, text: Any, state: Dict[str, Any]) -
     if parsed is None:
         LOGGER.warning("[sea] structured output parse failed for node %s", node_id)
         return False
+    LOGGER.debug("[sea] _process_structured_output: storing to state['%s']", compiled.key)
+    store_structured_result(state, compiled.key, parsed)
 
-    key = getattr(node_def, "output_key", None) or getattr(node_def, "id", "") or "node"
-    LOGGER.debug("[sea] _process_structured_output: storing to state['%s']", key)
-    store_structured_result(state, key, parsed)
-
-    output_mapping = getattr(node_def, "output_mapping", None)
-    if output_mapping:
-        LOGGER.debug("[sea] _process_structured_output: applying output_mapping: %s", output_mapping)
-        apply_output_mapping(state, key, output_mapping)
+    if compiled.mapping:
+        LOGGER.debug("[sea] _process_structured_output: applying output_mapping: %s", getattr(node_def, "output_mapping", None))
+        compiled.apply_mapping(state)
 
     return True
 
 
+def _split_path(output_key: str, source_path: str) -> Tuple[str, ...]:
+    if source_path.startswith(f"{output_key}."):
+        source_path = source_path[len(output_key) + 1 :]
+    return tuple(source_path.split(".")) if source_path else ()
+
+
+def _resolve_parts(data: Any, parts: Tuple[str, ...]) -> Any:
+    current = data
+    for key in parts:
+        if isinstance(current, dict):
+            current = current.get(key)
+        elif isinstance(current, list) and key.isdigit():
+            idx = int(key)
+            if idx < len(current):
+                current = current[idx]
+            else:
+                return None
+        else:
+            return None
+        if current is None:
+            return None
+    return current
+
+
 def apply_output_mapping(state: Dict[str, Any], output_key: str, mapping: Dict[str, str]) -> None:
     output_data = state.get(output_key)
     if output_data is None:
@@ -64,11 +148,7 @@ def apply_output_mapping(state: Dict[str, Any], output_key: str, mapping: Dict[s
     )
 
     for source_path, target_key in mapping.items():
-        if source_path.startswith(f"{output_key}."):
-            relative_path = source_path[len(output_key) + 1 :]
-            value = resolve_nested_value(output_data, relative_path)
-        else:
-            value = resolve_nested_value(output_data, source_path)
+        value = _resolve_parts(output_data, _split_path(output_key, source_path))
 
         if value is not None:
             state[target_key] = value
@@ -85,45 +165,37 @@ def apply_output_mapping(state: Dict[str, Any], output_key: str, mapping: Dict[s
 def resolve_nested_value(data: Any, path: str) -> Any:
     if path == "":
         return data
-    keys = path.split(".")
-    current = data
-    for key in keys:
-        if isinstance(current, dict):
-            current = current.get(key)
-        elif isinstance(current, list) and key.isdigit():
-            idx = int(key)
-            if idx < len(current):
-                current = current[idx]
-            else:
-                return None
-        else:
-            return None
-        if current is None:
-            return None
-    return current
+    return _resolve_parts(data, tuple(path.split(".")))
 
 
 def store_structured_result(state: Dict[str, Any], key: str, data: Any) -> None:
     state[key] = data
-    for path, value in flatten_dict(data).items():
-        state[f"{key}.{path}"] = value
+    # Write flattened keys straight into state (no intermediate dicts)
+    _flatten_into(state, data, key, "")
 
 
 def flatten_dict(value: Any, prefix: str = "") -> Dict[str, Any]:
     result: Dict[str, Any] = {}
+    _flatten_into(result, value, "", prefix)
+    return result
+
+
+def _flatten_into(out: Dict[str, Any], value: Any, base: str, prefix: str) -> None:
+    """Flatten ``value`` into ``out`` under ``base.`` + dotted path (single recursive pass)."""
     if isinstance(value, dict):
         for k, v in value.items():
-            new_prefix = f"{prefix}.{k}" if prefix else str(k)
-            result.update(flatten_dict(v, new_prefix))
+            _flatten_into(out, v, base, f"{prefix}.{k}" if prefix else str(k))
     elif isinstance(value, list):
         if prefix:
-            result[prefix] = json.dumps(value, ensure_ascii=False)
+            out[_join(base, prefix)] = json.dumps(value, ensure_ascii=False)
         for idx, item in enumerate(value):
-            new_prefix = f"{prefix}.{idx}" if prefix else str(idx)
-            result.update(flatten_dict(item, new_prefix))
+            _flatten_into(out, item, base, f"{prefix}.{idx}" if prefix else str(idx))
     else:
-        result[prefix or "value"] = value
-    return result
+        out[_join(base, prefix or "value")] = value
+
+
+def _join(base: str, path: str) -> str:
+    return f"{base}.{path}" if base else path
 
 
 def resolve_state_value(state: Dict[str, Any], key: str) -> Any:
@@ -158,24 +230,9 @@ def resolve_state_value(state: Dict[str, Any], key: str) -> Any:
 
 
 def extract_structured_json(text: str) -> Optional[Dict[str, Any]]:
-    candidate = text.strip()
-    if not candidate:
-        return None
-    if candidate.startswith("```"):
-        for seg in candidate.split("```"):
-            seg = seg.strip()
-            if seg.startswith("{") and seg.endswith("}"):
-                candidate = seg
-                break
-    if not candidate.startswith("{"):
-        match = re.search(r"\{.*\}", candidate, re.DOTALL)
-        if match:
-            candidate = match.group(0)
-    try:
-        parsed = json.loads(candidate)
-    except Exception:
+    if not isinstance(text, str):
         return None
-    return parsed if isinstance(parsed, dict) else None
+    return extract_json_object(text)
 
 
 def update_router_selection(state: Dict[str, Any], text: str, parsed: Optional[Dict[str, Any]] = None) -> None:
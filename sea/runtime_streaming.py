@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from persona.utils import env_int
+
+
+def _start_timer(delay: float, callback: Callable[[], None]) -> threading.Timer:
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+class StreamDeltaCoalescer:
+    """Coalesce provider stream chunks before they reach ``event_callback``.
+
+    Fast local models (llama.cpp / Ollama) yield hundreds of tiny chunks per
+    second; forwarding each one costs an enrich + JSON encode + HTTP write.
+    The first delta of a stream is forwarded at once (time-to-first-token);
+    later deltas of the same kind are buffered and flushed as one
+    ``streaming_chunk`` / ``streaming_thinking`` event when the buffer reaches
+    ``max_chars`` or, via a timer, ``max_interval`` seconds after the oldest
+    buffered delta arrived, so a pause in the provider stream never holds
+    text back longer than that.
+
+    Size-triggered flushes run synchronously on the thread that iterates the
+    provider stream, so a slow consumer throttles how fast the stream is read
+    (backpressure) and at most ``max_chars`` are ever buffered here. Persona /
+    node identifiers are resolved once per stream.
+    """
+
+    def __init__(
+        self,
+        event_callback: Callable[[Dict[str, Any]], None],
+        persona: Any,
+        node_id: str,
+        *,
+        max_chars: Optional[int] = None,
+        max_interval: Optional[float] = None,
+        schedule: Callable[[float, Callable[[], None]], Any] = _start_timer,
+    ) -> None:
+        self._callback = event_callback
+        self._base = {
+            "persona_id": getattr(persona, "persona_id", None),
+            "node_id": node_id,
+        }
+        self._max_chars = (
+            max_chars if max_chars is not None
+            else env_int("SAIVERSE_STREAM_CHUNK_MAX_CHARS", 48)
+        )
+        self._max_interval = (
+            max_interval if max_interval is not None
+            else env_int("SAIVERSE_STREAM_CHUNK_MAX_INTERVAL_MS", 50) / 1000.0
+        )
+        self._schedule = schedule
+        # タイマースレッドと SEA スレッドの両方から flush されるので、送信順をロックで守る
+        self._lock = threading.RLock()
+        self._timer: Any = None
+        self._kind: Optional[str] = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._emitted = False
+
+    def add_text(self, chunk: str) -> None:
+        self._add("streaming_chunk", chunk)
+
+    def add_thinking(self, chunk: str) -> None:
+        self._add("streaming_thinking", chunk)
+
+    def _add(self, kind: str, chunk: str) -> None:
+        if not chunk:
+            return
+        with self._lock:
+            if self._kind is not None and kind != self._kind:
+                self.flush()
+            was_empty = not self._parts
+            self._kind = kind
+            self._parts.append(chunk)
+            self._size += len(chunk)
+            if not self._emitted or self._size >= self._max_chars or self._max_interval <= 0:
+                self.flush()
+            elif was_empty:
+                self._timer = self._schedule(self._max_interval, self.flush)
+
+    def flush(self) -> None:
+        """Emit buffered deltas (if any) as a single event."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._parts:
+                return
+            event = {"type": self._kind, "content": "".join(self._parts), **self._base}
+            self._parts = []
+            self._size = 0
+            self._kind = None
+            self._emitted = True
+            self._callback(event)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from llm_clients.structured_output import (
+    compile_schema,
+    decode_json_object,
+    extract_json_object,
+)
+
+
+ROUTER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "playbook": {"type": "string"},
+        "args": {"type": "object", "properties": {"count": {"type": "int"}}},
+        "tags": {"type": "array", "items": {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]}},
+    },
+    "required": ["playbook"],
+}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"playbook": "basic_chat"}',
+        '```json\n{"playbook": "basic_chat"}\n```',
+        'Sure! Here you go: {"playbook": "basic_chat"} -- hope that helps {}',
+        'Prose {"ignored": 1}\n```json\n{"playbook": "basic_chat"}\n```',
+    ],
+)
+def test_extract_json_object_variants(text: str) -> None:
+    assert extract_json_object(text) == {"playbook": "basic_chat"}
+
+
+def test_decode_json_object_raises_without_object() -> None:
+    with pytest.raises(json.JSONDecodeError):
+        decode_json_object("no json here")
+    assert extract_json_object("[1, 2]") is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"playbook": "x", "args": {"q": 1},}',
+        '{"playbook": "x", "args": {"q": 1}',
+        '```json\n{"playbook": "x", "args": {"q": 1\n```',
+    ],
+)
+def test_decode_json_object_does_not_fall_back_to_nested_object(text: str) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        decode_json_object(text)
+    assert extract_json_object(text) is None
+
+
+def test_compiled_validator_checks_required_keys_recursively() -> None:
+    compiled = compile_schema(ROUTER_SCHEMA)
+
+    assert compiled.validate({"playbook": "x", "tags": [{"name": "a"}]})
+    assert not compiled.validate({"args": {}})
+    assert not compiled.validate({"playbook": "x", "tags": [{"label": "a"}]})
+    assert not compiled.validate({"playbook": "x", "tags": "a"})
+
+
+def test_compile_schema_is_cached_by_content_and_isolated_from_source() -> None:
+    schema = json.loads(json.dumps(ROUTER_SCHEMA))
+    compiled = compile_schema(schema)
+
+    assert compile_schema(json.loads(json.dumps(ROUTER_SCHEMA))) is compiled
+    strict = compiled.openai_strict
+    assert strict is compiled.openai_strict
+    assert strict["additionalProperties"] is False
+    assert set(strict["required"]) == {"playbook", "args", "tags"}
+    assert strict["properties"]["args"]["properties"]["count"]["type"] == "integer"
+    # The caller's dict is never touched
+    assert "additionalProperties" not in schema
+    assert schema["required"] == ["playbook"]
+
+
+def test_openai_strict_handles_union_types_and_property_named_type() -> None:
+    schema = {
+        "type": "object",
+        "properties": {
+            "note": {"type": ["string", "null"]},
+            "count": {"type": ["int", "null"]},
+            "type": {"type": "string", "enum": ["a", "b"]},
+        },
+        "required": ["type"],
+    }
+    compiled = compile_schema(schema)
+
+    strict = compiled.openai_strict
+    assert strict["properties"]["note"]["type"] == ["string", "null"]
+    assert strict["properties"]["count"]["type"] == ["integer", "null"]
+    assert strict["properties"]["type"] == {"type": "string", "enum": ["a", "b"]}
+    assert compiled.validate({"type": "a", "note": None})
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from sea.pulse_controller import PulseController
+from sea.pulse_trace import PulseTrace, get_pulse_trace_store, traced_node, traced_stream
+from sea.runtime import SEARuntime
+
+
+def test_breakdown_counts_nested_same_category_once_and_exports_chrome_trace() -> None:
+    trace = PulseTrace("p1", persona_id="pid", pulse_type="user", created_ns=0)
+    ms = 1_000_000
+    trace.add_span("playbook:meta", "playbook", 0, 100 * ms)
+    trace.add_span("playbook:sub", "playbook", 10 * ms, 40 * ms)  # nested, same category
+    trace.add_span("prepare_context", "context", 0, 20 * ms)
+    trace.add_span("llm.stream", "llm", 20 * ms, 90 * ms, node="chat", ttft_ms=15.0)
+    trace.finish()
+
+    assert trace.breakdown() == {"context": 20.0, "llm": 70.0, "playbook": 100.0}
+    assert trace.llm_calls() == [
+        {"node": "chat", "model": None, "streaming": True, "ttft_ms": 15.0, "total_ms": 70.0}
+    ]
+
+    chrome = trace.to_chrome_trace()
+    events = [e for e in chrome["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in events] == ["playbook:meta", "prepare_context", "playbook:sub", "llm.stream"]
+    assert events[3]["ts"] == 20_000 and events[3]["dur"] == 70_000
+    assert chrome["otherData"]["pulse_id"] == "p1"
+
+
+def test_traced_stream_and_node_record_spans() -> None:
+    trace = PulseTrace("p2")
+
+    def _stream():
+        time.sleep(0.01)
+        yield "a"
+        yield "b"
+
+    assert list(traced_stream(trace, _stream(), node="n", model="m")) == ["a", "b"]
+
+    async def _node(state: dict) -> dict:
+        return state
+
+    wrapped = traced_node(_node, "think1", "llm", "pb")
+    state = {"_pulse_trace": trace}
+    assert asyncio.run(wrapped(state)) is state
+
+    stream_span, node_span = trace.spans
+    assert stream_span["name"] == "llm.stream"
+    assert stream_span["args"]["chunks"] == 2
+    assert stream_span["args"]["ttft_ms"] >= 10
+    assert node_span["name"] == "llm:think1"
+    assert node_span["cat"] == "llm_node"
+
+
+def test_pulse_controller_records_trace_for_submitted_pulse() -> None:
+    manager = SimpleNamespace(building_histories={"b1": []}, occupants={})
+    runtime = SEARuntime(manager)
+    persona = SimpleNamespace(
+        persona_id="pid",
+        history_manager=SimpleNamespace(add_message=Mock()),
+        execution_state={},
+    )
+    manager.all_personas = {"pid": persona}
+    playbook = SimpleNamespace(name="meta_user", start_node="llm", context_requirements=None)
+    captured: dict = {}
+
+    def _compile(*args, **kwargs):
+        captured["pulse_id"] = args[6]
+        captured["trace"] = kwargs["parent_state"]["_pulse_trace"]
+        return ["hi"]
+
+    runtime._choose_playbook = Mock(return_value=playbook)
+    runtime._prepare_context = Mock(return_value=[])
+    runtime._compile_with_langgraph = Mock(side_effect=_compile)
+    runtime._maybe_run_metabolism = Mock()
+
+    controller = PulseController(runtime)
+    assert controller.submit_user("pid", "b1", "hello") == ["hi"]
+
+    trace = get_pulse_trace_store().get(captured["pulse_id"])
+    assert trace is captured["trace"]
+    assert trace.status == "completed"
+    assert trace.playbook == "meta_user"
+    assert {"queue", "playbook", "memory"} <= set(trace.breakdown())
+    summaries = get_pulse_trace_store().recent(persona_id="pid")
+    assert summaries[0].pulse_id == captured["pulse_id"]
@@ -164,6 +164,25 @@ def test_run_meta_auto_propagates_runtime_identifiers() -> None:
     assert captured["parent_state"]["_cancellation_token"] is token
 
 
+def test_request_pulse_id_is_used_with_tracing_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("SAIVERSE_PULSE_TRACE", "0")
+    runtime, persona = _runtime_and_persona()
+    captured: dict = {}
+
+    def _prepare_context(*args, **kwargs):
+        captured["prepare_pulse_id"] = kwargs["pulse_id"]
+        return []
+
+    runtime._choose_playbook = Mock(return_value=SimpleNamespace(name="meta_auto/think", start_node="think", context_requirements=None))
+    runtime._prepare_context = Mock(side_effect=_prepare_context)
+    runtime._compile_with_langgraph = Mock(return_value=[])
+    runtime._maybe_run_metabolism = Mock()
+
+    runtime.run_meta_auto(persona, "b1", occupants=[], pulse_id="request-pulse")
+
+    assert captured["prepare_pulse_id"] == "request-pulse"
+
+
 def test_run_meta_user_transitions_execution_state_running_to_idle() -> None:
     runtime, persona = _runtime_and_persona()
     playbook = SimpleNamespace(name="meta_user/exec", start_node="exec", context_requirements=None)
@@ -66,3 +66,32 @@ def test_resolve_set_value_and_eval_delegate() -> None:
     assert runtime._eval_arithmetic_expression("{count} + 3", state) == 5
     assert resolve_set_value("Hello {name}", state) == "Hello alice"
     assert runtime._resolve_set_value("={count} + 3", state) == 5
+
+
+def test_process_structured_output_caches_compiled_node() -> None:
+    from sea.playbook_models import LLMNodeDef
+
+    node_def = LLMNodeDef(
+        id="router",
+        type="llm",
+        response_schema={"type": "object", "properties": {"playbook": {"type": "string"}}},
+        output_mapping={"router.playbook": "selected_playbook", "args.0": "first_arg"},
+    )
+    state: dict[str, object] = {}
+
+    assert process_structured_output(node_def, 'ok {"playbook": "x", "args": ["a", "b"]}', state) is True
+    compiled = node_def._compiled_output
+    assert compiled is not None
+    assert process_structured_output(node_def, {"playbook": "y", "args": []}, {}) is True
+    assert node_def._compiled_output is compiled
+    # 別の output_mapping を与えられたら作り直す
+    node_def.output_mapping = {"router.playbook": "chosen"}
+    other: dict[str, object] = {}
+    assert process_structured_output(node_def, {"playbook": "z"}, other) is True
+    assert node_def._compiled_output is not compiled
+    assert other["chosen"] == "z"
+
+    assert state["selected_playbook"] == "x"
+    assert state["first_arg"] == "a"
+    assert state["router.args"] == '["a", "b"]'
+    assert state["router.args.1"] == "b"
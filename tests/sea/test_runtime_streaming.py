@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from sea.runtime_streaming import StreamDeltaCoalescer
+
+
+class _Scheduler:
+    """Captures deadline timers so tests can fire them by hand."""
+
+    def __init__(self):
+        self.timers = []
+
+    def __call__(self, delay, callback):
+        timer = SimpleNamespace(delay=delay, callback=callback, cancelled=False)
+        timer.cancel = lambda: setattr(timer, "cancelled", True)
+        self.timers.append(timer)
+        return timer
+
+    def fire(self):
+        for timer in self.timers:
+            if not timer.cancelled:
+                timer.callback()
+
+
+def _coalescer(events, scheduler, **kwargs):
+    persona = SimpleNamespace(persona_id="air")
+    return StreamDeltaCoalescer(events.append, persona, "speak", schedule=scheduler, **kwargs)
+
+
+def test_first_delta_is_immediate_then_flushes_by_size_and_kind_switch():
+    events = []
+    coalescer = _coalescer(events, _Scheduler(), max_chars=4, max_interval=10)
+    coalescer.add_thinking("hm")
+    assert [e["content"] for e in events] == ["hm"]
+    coalescer.add_text("ab")
+    coalescer.add_text("cd")
+    coalescer.add_text("e")
+    coalescer.flush()
+
+    assert [(e["type"], e["content"]) for e in events] == [
+        ("streaming_thinking", "hm"),
+        ("streaming_chunk", "abcd"),
+        ("streaming_chunk", "e"),
+    ]
+    assert all(e["persona_id"] == "air" and e["node_id"] == "speak" for e in events)
+
+
+def test_deadline_timer_flushes_without_a_new_chunk():
+    events = []
+    scheduler = _Scheduler()
+    coalescer = _coalescer(events, scheduler, max_chars=1000, max_interval=0.05)
+    coalescer.add_text("a")
+    coalescer.add_text("b")
+    coalescer.add_text("c")
+    assert [e["content"] for e in events] == ["a"]
+    assert [t.delay for t in scheduler.timers] == [0.05]
+
+    # プロバイダが止まっていてもタイマーで送られる
+    scheduler.fire()
+    assert [e["content"] for e in events] == ["a", "bc"]
+    coalescer.flush()
+    assert len(events) == 2
+
+
+def test_zero_limits_forward_every_chunk():
+    events = []
+    scheduler = _Scheduler()
+    coalescer = _coalescer(events, scheduler, max_chars=0, max_interval=0)
+    for token in ("x", "y"):
+        coalescer.add_text(token)
+    assert [e["content"] for e in events] == ["x", "y"]
+    assert scheduler.timers == []
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from persona.building_history import BuildingHistory, SeqRangeSet
+from persona.history_manager import HistoryManager
+from persona.mixins.history import PersonaHistoryMixin
+from tool_loader import load_builtin_tool
+from tools.context import persona_context
+
+
+def _history_manager(tmp_path, persona_id, histories):
+    return HistoryManager(
+        persona_id=persona_id,
+        persona_log_path=tmp_path / persona_id / "log.json",
+        building_memory_paths={"hall": tmp_path / "hall.json"},
+        initial_building_histories=histories,
+    )
+
+
+def test_shared_log_allocates_unique_seqs_and_bisects(tmp_path):
+    histories = {"hall": [{"role": "user", "content": "old", "seq": 3}]}
+    alice = _history_manager(tmp_path, "alice", histories)
+    bob = _history_manager(tmp_path, "bob", histories)
+    hist = histories["hall"]
+    assert isinstance(hist, BuildingHistory)
+
+    alice.add_to_building_only("hall", {"role": "assistant", "content": "a"}, heard_by=["bob"])
+    bob.add_to_building_only("hall", {"role": "assistant", "content": "b"}, heard_by=["alice"])
+    hist.append({"role": "host", "content": "note"})  # manager-side notes share the counter
+    assert [m["seq"] for m in hist] == [3, 4, 5, 6]
+    assert "ingested_by" not in hist[1]
+    assert [m["content"] for m in hist.since(4)] == ["b", "note"]
+
+    hist.insert(0, {"role": "host", "content": "late", "seq": 9})
+    assert not hist.monotonic
+    assert [m["content"] for m in hist.since(5)] == ["late", "note"]
+
+
+def test_seq_range_set_merges_and_prunes():
+    seqs = SeqRangeSet([[10, 12]])
+    for seq in (13, 20, 9):
+        seqs.add(seq)
+    assert seqs.to_list() == [[9, 13], [20, 20]]
+    assert 11 in seqs and 14 not in seqs
+    seqs.discard_through(11)
+    assert seqs.to_list() == [[12, 13], [20, 20]]
+
+
+class _Persona(PersonaHistoryMixin):
+    def __init__(self, history_manager):
+        self.persona_id = "alice"
+        self.current_building_id = "hall"
+        self.history_manager = history_manager
+        self.pulse_cursors = {"hall": 0}
+        self.entry_markers = {"hall": 0}
+        self.ingested_seqs = {}
+        self.id_to_name_map = {"bob": "Bob"}
+
+
+def test_get_building_messages_reads_only_new_entries_without_touching_them(tmp_path):
+    histories = {"hall": []}
+    persona = _Persona(_history_manager(tmp_path, "alice", histories))
+    hist = histories["hall"]
+    for content in ("hello", "again"):
+        hist.append({"role": "assistant", "persona_id": "bob", "content": content, "heard_by": ["alice"]})
+    hist.append({"role": "user", "content": "typed by user", "heard_by": ["alice"]})
+    persona.mark_building_ingested("hall", hist[-1])  # already recorded via _record_user_input
+    snapshot = [dict(m) for m in hist]
+
+    tool = load_builtin_tool("get_building_messages").get_building_messages
+    manager = SimpleNamespace(all_personas={"alice": persona})
+    with persona_context("alice", tmp_path, manager):
+        assert tool() == "2件の新規メッセージを認識しました（Bob: 2件）"
+        assert tool() == "新規メッセージはありません"
+
+    assert [m["content"] for m in persona.history_manager.messages] == ["Bob: hello", "Bob: again"]
+    assert [dict(m) for m in hist] == snapshot  # no ingested_by growth on shared entries
+    assert persona.pulse_cursors["hall"] == 3
+    assert not persona.ingested_seqs["hall"]  # marks behind the cursor are dropped
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from saiverse import data_paths
+
+
+def test_read_text_cached_rereads_only_after_change(tmp_path, monkeypatch):
+    target = tmp_path / "common.txt"
+    target.write_text("v1", encoding="utf-8")
+    reads = []
+    original = Path.read_text
+
+    def counting_read_text(self, *args, **kwargs):
+        reads.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", counting_read_text)
+
+    assert data_paths.read_text_cached(target) == "v1"
+    assert data_paths.read_text_cached(target) == "v1"
+    data_paths.expire_file_cache()
+    assert data_paths.read_text_cached(target) == "v1"
+    assert len(reads) == 1
+
+    target.write_text("version 2", encoding="utf-8")
+    data_paths.expire_file_cache()
+    assert data_paths.read_text_cached(target) == "version 2"
+    assert len(reads) == 2
+
+
+def test_load_json_cached_returns_independent_copies(tmp_path):
+    target = tmp_path / "model.json"
+    target.write_text('{"model": "m", "tags": []}', encoding="utf-8")
+    first = data_paths.load_json_cached(target)
+    first["tags"].append("mutated")
+    assert data_paths.load_json_cached(target) == {"model": "m", "tags": []}
+
+
+def test_find_file_sees_new_override_after_revalidation(tmp_path, monkeypatch):
+    user_dir = tmp_path / "user_data"
+    builtin_dir = tmp_path / "builtin"
+    (builtin_dir / "prompts").mkdir(parents=True)
+    (builtin_dir / "prompts" / "a.txt").write_text("builtin", encoding="utf-8")
+    monkeypatch.setattr(data_paths, "USER_DATA_DIR", user_dir)
+    monkeypatch.setattr(data_paths, "BUILTIN_DATA_DIR", builtin_dir)
+    monkeypatch.setattr(data_paths, "EXPANSION_DATA_DIR", tmp_path / "missing")
+
+    assert data_paths.find_file("prompts", "a.txt") == builtin_dir / "prompts" / "a.txt"
+    assert [p.name for p in data_paths.iter_files("prompts", "*.txt")] == ["a.txt"]
+
+    (user_dir / "prompts").mkdir(parents=True)
+    (user_dir / "prompts" / "a.txt").write_text("user", encoding="utf-8")
+    (user_dir / "prompts" / "b.txt").write_text("user", encoding="utf-8")
+    data_paths.expire_file_cache()
+
+    assert data_paths.find_file("prompts", "a.txt") == user_dir / "prompts" / "a.txt"
+    assert sorted(p.name for p in data_paths.iter_files("prompts", "*.txt")) == ["a.txt", "b.txt"]
+
+
+def test_cache_ttl_is_read_lazily_with_fallback(monkeypatch):
+    monkeypatch.setattr(data_paths, "_cache_ttl", None)
+    monkeypatch.setenv("SAIVERSE_FILE_CACHE_TTL_SEC", "soon")
+    assert data_paths._get_cache_ttl() == 2.0
+
+    monkeypatch.setattr(data_paths, "_cache_ttl", None)
+    monkeypatch.setenv("SAIVERSE_FILE_CACHE_TTL_SEC", "0.5")
+    assert data_paths._get_cache_ttl() == 0.5
@@ -0,0 +1,41 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+
+from database import migrate
+from database.models import Base
+from database.query_audit import audit_queries
+
+
+def test_catalogued_queries_use_indexes(tmp_path):
+    db_path = tmp_path / "saiverse.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    try:
+        plans = audit_queries(engine)
+    finally:
+        engine.dispose()
+
+    assert plans
+    flagged = {plan.name: plan.plan for plan in plans if plan.full_scans}
+    assert flagged == {}
+
+
+def test_ensure_indexes_adds_missing_indexes(tmp_path):
+    db_path = tmp_path / "saiverse.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP INDEX ix_thinking_request_city_status")
+    conn.commit()
+    conn.close()
+
+    created = migrate.ensure_indexes(str(db_path))
+    assert created == ["ix_thinking_request_city_status"]
+    assert migrate.ensure_indexes(str(db_path)) == []
+
+
+def test_ensure_indexes_skips_missing_db(tmp_path):
+    assert migrate.ensure_indexes(str(tmp_path / "missing.db")) == []
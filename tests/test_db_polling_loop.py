@@ -0,0 +1,42 @@
+"""Tests for manager/background.py — polling loop maintenance steps."""
+from manager.background import DatabasePollingMixin
+
+
+class _OneShotEvent:
+    def __init__(self):
+        self.calls = 0
+
+    def wait(self, timeout):
+        self.calls += 1
+        return self.calls > 1
+
+
+class _Poller(DatabasePollingMixin):
+    def __init__(self):
+        self.db_polling_stop_event = _OneShotEvent()
+        self.flushed = 0
+
+    def _check_for_visitors(self):
+        pass
+
+    def _process_thinking_requests(self):
+        pass
+
+    def _check_dispatch_status(self):
+        pass
+
+    def run_scheduled_prompts(self):
+        pass
+
+    def _maybe_compact_occupancy_history(self):
+        raise RuntimeError("database is locked")
+
+    def _flush_session_metadata(self):
+        self.flushed += 1
+
+
+def test_session_flush_runs_when_compaction_fails(monkeypatch):
+    monkeypatch.setenv("SAIVERSE_SESSION_FLUSH_INTERVAL_SEC", "often")
+    poller = _Poller()
+    poller._db_polling_loop()
+    assert poller.flushed == 1
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+import pytest
+
+from manager.document_index import DocumentIndex
+from manager.items import ItemService
+from tool_loader import load_builtin_tool
+from tools.context import persona_context
+
+
+@pytest.fixture
+def index(tmp_path):
+    instance = DocumentIndex(tmp_path / "cache" / "document_index.sqlite3")
+    yield instance
+    instance.close()
+
+
+def test_read_lines_matches_split_and_append_is_incremental(index, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes("一行目\r\nsecond line\nthird".encode("utf-8"))
+    expected = path.read_text(encoding="utf-8").split("\n")
+
+    assert index.read_lines("doc", path, 0, 100) == (expected, 3)
+    assert index.read_lines("doc", path, 1, 2) == (["second line"], 3)
+
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(" continued\nアペンド検索")
+    entry = index.append("doc", path)
+    assert entry.line_count == 4
+    assert index.read_lines("doc", path, 2, 4)[0] == ["third continued", "アペンド検索"]
+    assert [m.line_index for m in index.search("ペンド検", {"doc": path})] == [3]
+    assert index.search("third", {"doc": path})[0].text == "third continued"
+
+    # ItemService を通らない書き換えも size/mtime で検知して再索引する
+    path.write_text("rewritten\n", encoding="utf-8")
+    assert index.read_lines("doc", path, 0, 10) == (["rewritten", ""], 2)
+    assert index.search("third", {"doc": path}) == []
+
+
+def test_append_reindexes_when_file_was_rewritten(index, tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"one\r\ntwo\r\nthree\r\nfour\r\nfive")
+    assert index.read_lines("doc", path, 0, 10)[1] == 5
+
+    # 改行コードを変えつつ追記すると、既知の行オフセットは使えない
+    previous = path.stat()
+    path.write_bytes(path.read_bytes().replace(b"\r\n", b"\n") + b"\npatched with a longer line")
+    index.append("doc", path, previous=previous)
+    assert index.read_lines("doc", path, 0, 10) == (
+        ["one", "two", "three", "four", "five", "patched with a longer line"], 6
+    )
+    assert index.search("patched", {"doc": path})[0].line_index == 5
+
+    # 索引後に別経路で書き換えられていたら、追記前の stat と一致しない
+    # （行境界の位置にたまたま改行があり、サイズも増えている場合）
+    path.write_bytes(b"x" * 23 + b"\n" + b"y" * 40)
+    previous = path.stat()
+    with open(path, "ab") as handle:
+        handle.write(b"\ntail")
+    index.append("doc", path, previous=previous)
+    assert index.read_lines("doc", path, 0, 10) == (["x" * 23, "y" * 40, "tail"], 3)
+
+
+def test_document_tools_use_index_and_search_accessible_documents(tmp_path):
+    home = tmp_path / "home"
+    (home / "documents").mkdir(parents=True)
+    manager = SimpleNamespace(
+        saiverse_home=home,
+        personas={"air": SimpleNamespace(current_building_id="library")},
+    )
+    service = ItemService(manager, state=None)
+    manager.item_service = service
+    for item_id, owner, text in (
+        ("inv", "persona", "alpha\nThe Moonlit archive\nomega"),
+        ("shelf", "building", "moonlit garden\nother"),
+        ("elsewhere", "other", "moonlit but unreachable"),
+    ):
+        (home / "documents" / f"{item_id}.txt").write_text(text, encoding="utf-8")
+        service.items[item_id] = {
+            "item_id": item_id, "name": item_id.title(), "type": "document",
+            "file_path": f"documents/{item_id}.txt",
+        }
+        if owner == "persona":
+            service.items_by_persona["air"].append(item_id)
+        elif owner == "building":
+            service.items_by_building["library"].append(item_id)
+
+    search = load_builtin_tool("document_search").document_search
+    read = load_builtin_tool("document_read").document_read
+    with persona_context("air", tmp_path, manager):
+        result = search(pattern="moonlit", context_lines=0)
+        single = search(pattern="Moonlit", item_id="inv", case_sensitive=True)
+        page = read(item_id="inv", start_line=2, limit=5)
+
+    assert "2 matches across 2 documents" in result
+    assert "[Inv] (item_id: inv) Line 2" in result and "[Shelf] (item_id: shelf) Line 1" in result
+    assert "unreachable" not in result
+    assert "[Inv] Search results: 1 matches (total 3 lines)" in single
+    assert page == "[Inv] Lines 2-3 / Total 3 lines\n     2  The Moonlit archive\n     3  omega"
+    service.document_index.close()
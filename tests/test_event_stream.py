@@ -0,0 +1,128 @@
+"""Tests for manager/event_stream.py — async NDJSON event bridge."""
+import asyncio
+import json
+import threading
+
+from manager.event_stream import AsyncEventStream, coalesce_events
+
+
+def _collect(stream):
+    async def _run():
+        return [chunk async for chunk in stream]
+    return _run()
+
+
+def _decode(chunks):
+    return [json.loads(line) for chunk in chunks for line in chunk.splitlines() if line]
+
+
+def test_coalesce_merges_adjacent_deltas_only():
+    events = [
+        {"type": "streaming_chunk", "content": "He", "persona_id": "air", "node_id": "speak"},
+        {"type": "streaming_chunk", "content": "llo", "persona_id": "air", "node_id": "speak"},
+        {"type": "status", "content": "x"},
+        {"type": "streaming_chunk", "content": "!", "persona_id": "air", "node_id": "speak"},
+        {"type": "streaming_chunk", "content": "?", "persona_id": "eris", "node_id": "speak"},
+    ]
+    merged = coalesce_events(events)
+    assert [e["content"] for e in merged] == ["Hello", "x", "!", "?"]
+
+
+def test_stream_relays_events_from_worker_thread():
+    async def _run():
+        loop = asyncio.get_running_loop()
+        stream = AsyncEventStream(loop, heartbeat_interval=0, coalesce_window=0.01)
+
+        def _worker():
+            for token in ("a", "b", "c"):
+                stream.push({"type": "streaming_chunk", "content": token, "persona_id": "air"})
+            stream.push({"type": "streaming_complete", "persona_id": "air"})
+            stream.close()
+
+        threading.Thread(target=_worker).start()
+        return await _collect(stream)
+
+    events = _decode(asyncio.run(_run()))
+    assert "".join(e["content"] for e in events if e["type"] == "streaming_chunk") == "abc"
+    assert events[-1]["type"] == "streaming_complete"
+
+
+def test_stream_emits_ping_while_idle_and_stops_after_cancel():
+    async def _run():
+        loop = asyncio.get_running_loop()
+        stream = AsyncEventStream(loop, heartbeat_interval=0.02)
+
+        async def _producer():
+            await asyncio.sleep(0.07)
+            stream.push({"type": "cancelled", "content": "stop"})
+            stream.push({"type": "status", "content": "ignored"})
+            stream.close()
+
+        producer = asyncio.create_task(_producer())
+        chunks = await _collect(stream)
+        await producer
+        return chunks
+
+    events = _decode(asyncio.run(_run()))
+    assert events[0]["type"] == "ping"
+    assert events[-1]["type"] == "cancelled"
+    assert all(e["type"] != "status" for e in events)
+
+
+def test_push_blocks_until_consumer_drains():
+    async def _run():
+        loop = asyncio.get_running_loop()
+        stream = AsyncEventStream(loop, heartbeat_interval=0, max_pending=2, backpressure_timeout=5)
+        pushed = []
+
+        def _worker():
+            for index in range(5):
+                stream.push({"type": "status", "content": str(index)})
+                pushed.append(index)
+            stream.close()
+
+        thread = threading.Thread(target=_worker)
+        thread.start()
+        await asyncio.sleep(0.05)
+        blocked_at = len(pushed)
+        chunks = await _collect(stream)
+        thread.join()
+        return blocked_at, chunks
+
+    blocked_at, chunks = asyncio.run(_run())
+    assert blocked_at == 2
+    assert [e["content"] for e in _decode(chunks)] == ["0", "1", "2", "3", "4"]
+
+
+def test_first_delta_is_written_without_coalesce_delay():
+    async def _run():
+        loop = asyncio.get_running_loop()
+        stream = AsyncEventStream(loop, heartbeat_interval=0, coalesce_window=5.0)
+        stream.push({"type": "streaming_chunk", "content": "a", "persona_id": "air"})
+        iterator = stream.__aiter__()
+        first = await asyncio.wait_for(iterator.__anext__(), timeout=1.0)
+        stream.close()
+        await iterator.aclose()
+        return first
+
+    assert _decode([asyncio.run(_run())])[0]["content"] == "a"
+
+
+def test_heartbeat_continues_after_producer_stall():
+    async def _run():
+        loop = asyncio.get_running_loop()
+        stream = AsyncEventStream(loop, heartbeat_interval=0.02, max_pending=1, backpressure_timeout=0.01)
+        iterator = stream.__aiter__()
+        stream.push({"type": "status", "content": "0"})
+        # Nobody reads: the second push times out and stops throttling the producer
+        await loop.run_in_executor(None, stream.push, {"type": "status", "content": "1"})
+        events = []
+        while not events or events[-1]["type"] != "ping":
+            events.extend(_decode([await asyncio.wait_for(iterator.__anext__(), timeout=1.0)]))
+        stream.close()
+        await iterator.aclose()
+        return events
+
+    events = asyncio.run(_run())
+    assert [e["content"] for e in events if e["type"] == "status"] == ["0", "1"]
+    assert events[-1] == {"type": "ping"}
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from sai_memory.memopedia import Memopedia
+from sai_memory.memopedia import storage
+from sai_memory.memopedia.tree_cache import MemopediaTreeCache, cache_for, clear_caches
+
+
+@pytest.fixture
+def memopedia(tmp_path):
+    clear_caches()
+    conn = sqlite3.connect(str(tmp_path / "memory.db"))
+    yield Memopedia(conn)
+    conn.close()
+    clear_caches()
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    calls = []
+    original = MemopediaTreeCache.rebuild
+
+    def _counting(self, rows, version):
+        calls.append(version)
+        return original(self, rows, version)
+
+    monkeypatch.setattr(MemopediaTreeCache, "rebuild", _counting)
+    return calls
+
+
+def _uncached_tree(memopedia):
+    clear_caches()
+    return memopedia.get_tree()
+
+
+def test_writes_patch_cache_without_rebuilding(memopedia, rebuilds):
+    alice = memopedia.create_page(parent_id="root_people", title="Alice", summary="友人")
+    memopedia.get_tree()
+    assert len(rebuilds) == 1
+
+    trunk = memopedia.create_trunk(parent_id="root_people", title="友達")
+    bob = memopedia.create_page(parent_id="root_people", title="Bob")
+    memopedia.update_page(alice.id, summary="親友")
+    memopedia.move_pages_to_trunk([alice.id, bob.id], trunk.id)
+    memopedia.set_important(bob.id, True)
+    memopedia.delete_page(bob.id)
+    tree = memopedia.get_tree()
+
+    assert len(rebuilds) == 1
+    assert tree == _uncached_tree(memopedia)
+    people = tree["people"][0]["children"]
+    assert [p["title"] for p in people] == ["友達"]
+    assert [(p["title"], p["summary"]) for p in people[0]["children"]] == [("Alice", "親友")]
+
+
+def test_foreign_write_is_picked_up(memopedia, tmp_path, rebuilds):
+    memopedia.create_page(parent_id="root_terms", title="Weave")
+    memopedia.get_tree()
+
+    other = sqlite3.connect(str(tmp_path / "memory.db"))
+    try:
+        other.execute("UPDATE memopedia_pages SET title = 'Loom' WHERE title = 'Weave'")
+        other.commit()
+    finally:
+        other.close()
+    memopedia.create_page(parent_id="root_terms", title="Thread")
+
+    tree = memopedia.get_tree()
+    assert [p["title"] for p in tree["terms"][0]["children"]] == ["Loom", "Thread"]
+    assert len(rebuilds) == 2
+
+
+def test_ancestry_index_blocks_cycles(memopedia):
+    outer = memopedia.create_trunk(parent_id="root_plans", title="outer")
+    inner = memopedia.create_page(parent_id=outer.id, title="inner")
+    leaf = memopedia.create_page(parent_id=inner.id, title="leaf")
+
+    assert storage._is_descendant_of(memopedia.conn, leaf.id, outer.id)
+    assert memopedia.move_pages_to_trunk([outer.id], leaf.id)["moved_count"] == 0
+
+    memopedia.move_pages_to_trunk([leaf.id], outer.id)
+    cache = cache_for(memopedia.conn)
+    assert cache.ancestors(leaf.id) == {outer.id, "root_plans"}
+    assert not storage._is_descendant_of(memopedia.conn, leaf.id, inner.id)
+
+
+def test_markdown_depth_limit_matches_full_tree(memopedia):
+    parent = memopedia.create_page(parent_id="root_people", title="Alice", summary="友人")
+    memopedia.create_page(parent_id=parent.id, title="Alice の趣味")
+
+    shallow = memopedia.get_tree_markdown(max_depth=0, show_markers=False)
+    assert "Alice: 友人" in shallow
+    assert "Alice の趣味" not in shallow
+    assert "Alice の趣味" in memopedia.get_tree_markdown(max_depth=1, show_markers=False)
+
+
+def test_child_order_matches_uncached_queries(memopedia, tmp_path):
+    parent = memopedia.create_trunk(parent_id="root_terms", title="混在")
+    for title in ("b", "a", "c"):
+        memopedia.create_page(parent_id=parent.id, title=title)
+    other = sqlite3.connect(str(tmp_path / "memory.db"))
+    try:
+        # カテゴリが親と異なる子: get_children はタイトル順、build_tree は (category, title) 順
+        other.execute("UPDATE memopedia_pages SET category = 'people' WHERE title = 'c'")
+        other.commit()
+    finally:
+        other.close()
+
+    assert [p.title for p in storage.get_children(memopedia.conn, parent.id)] == ["a", "b", "c"]
+    tree = storage.build_tree(memopedia.conn)
+    trunk = next(p for p in tree["terms"][0].children if p.id == parent.id)
+    assert [p.title for p in trunk.children] == ["c", "a", "b"]
+
+    memopedia.create_page(parent_id=parent.id, title="0")
+    assert [p.title for p in storage.get_children(memopedia.conn, parent.id)] == ["0", "a", "b", "c"]
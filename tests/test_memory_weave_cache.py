@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+from sai_memory.arasuji import create_entry, init_arasuji_tables
+from sai_memory.change_tracking import get_data_versions
+from sai_memory.memopedia import Memopedia
+from tool_loader import load_builtin_tool
+
+
+@pytest.fixture
+def weave(monkeypatch, tmp_path):
+    monkeypatch.setenv("SAIVERSE_MEMORY_WEAVE_CACHE", "1")
+    module = load_builtin_tool("get_memory_weave_context")
+    persona_dir = tmp_path / "persona"
+    persona_dir.mkdir()
+    conn = sqlite3.connect(str(persona_dir / "memory.db"))
+    init_arasuji_tables(conn)
+    create_entry(conn, level=1, content="出会った", source_ids=["m1"], start_time=1_700_000_000,
+                 end_time=1_700_000_100, source_count=1, message_count=1)
+    Memopedia(conn).create_page(parent_id="root_people", title="Alice", summary="友人")
+    yield module, str(persona_dir), conn
+    conn.close()
+
+
+def test_write_triggers_bump_change_counters(weave):
+    _, _, conn = weave
+    before = get_data_versions(conn)
+    Memopedia(conn).create_page(parent_id="root_terms", title="Weave", summary="s")
+    after = get_data_versions(conn)
+    assert after["memopedia"] > before["memopedia"]
+    assert after["arasuji"] == before["arasuji"]
+
+
+def test_cache_returns_identical_messages_until_a_write(weave, monkeypatch):
+    module, persona_dir, conn = weave
+    first = module.get_memory_weave_context(persona_id="p", persona_dir=persona_dir)
+    assert [m["metadata"]["__memory_weave_type__"] for m in first] == ["chronicle", "memopedia"]
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("context was rebuilt on a cache hit")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(module, "_get_chronicle_context", _fail)
+        patch.setattr(module, "_get_memopedia_context", _fail)
+        second = module.get_memory_weave_context(persona_id="p", persona_dir=persona_dir)
+    assert second == first and second is not first
+
+    conn.execute("UPDATE memopedia_pages SET summary = '親友' WHERE title = 'Alice'")
+    conn.commit()
+    third = module.get_memory_weave_context(persona_id="p", persona_dir=persona_dir)
+    assert "Alice: 親友" in third[1]["content"]
+    assert third[0]["content"] == first[0]["content"]
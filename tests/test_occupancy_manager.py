@@ -0,0 +1,87 @@
+"""Tests for occupancy_manager.py — snapshot table and log compaction."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import (
+    Base,
+    BuildingOccupancyCurrent,
+    BuildingOccupancyDaily,
+    BuildingOccupancyLog,
+)
+from persona.building_history import BuildingHistory
+from saiverse.buildings import Building
+from saiverse.occupancy_manager import OccupancyManager, _split_interval_by_day
+
+
+@pytest.fixture
+def occupancy(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'saiverse.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    buildings = {bid: Building(bid, bid, capacity=5) for bid in ("lobby", "cafe")}
+    manager = OccupancyManager(
+        session_factory=session_factory,
+        city_id=1,
+        occupants={"lobby": ["air"], "cafe": []},
+        capacities={bid: 5 for bid in buildings},
+        building_map=buildings,
+        building_histories={},
+        id_to_name_map={"air": "Air"},
+        user_id=1,
+    )
+    yield manager, session_factory
+    engine.dispose()
+
+
+def test_snapshot_follows_moves(occupancy):
+    manager, session_factory = occupancy
+    with session_factory() as db:
+        db.add(BuildingOccupancyLog(CITYID=1, BUILDINGID="lobby", AIID="air", ENTRY_TIMESTAMP=datetime.now()))
+        db.commit()
+
+    ok, _ = manager.move_entity("air", "ai", "lobby", "cafe")
+    assert ok
+    # 入退室の通知も seq 付きの BuildingHistory に積まれる
+    assert all(isinstance(manager.building_histories[bid], BuildingHistory) for bid in ("lobby", "cafe"))
+    assert [msg["seq"] for msg in manager.building_histories["cafe"]] == [1]
+
+    with session_factory() as db:
+        current = db.query(BuildingOccupancyCurrent).all()
+        assert [(row.AIID, row.BUILDINGID) for row in current] == [("air", "cafe")]
+        assert db.query(BuildingOccupancyLog).count() == 2
+
+
+def test_compact_history_rolls_closed_intervals_into_daily(occupancy):
+    manager, session_factory = occupancy
+    now = datetime(2026, 3, 1, 12, 0, 0)
+    old_entry = datetime(2026, 1, 1, 23, 0, 0)
+    with session_factory() as db:
+        db.add(BuildingOccupancyLog(
+            CITYID=1, BUILDINGID="lobby", AIID="air",
+            ENTRY_TIMESTAMP=old_entry, EXIT_TIMESTAMP=old_entry + timedelta(hours=2),
+        ))
+        db.add(BuildingOccupancyLog(
+            CITYID=1, BUILDINGID="cafe", AIID="air",
+            ENTRY_TIMESTAMP=now - timedelta(days=1), EXIT_TIMESTAMP=now - timedelta(hours=1),
+        ))
+        db.add(BuildingOccupancyLog(CITYID=1, BUILDINGID="cafe", AIID="air", ENTRY_TIMESTAMP=now))
+        db.commit()
+
+    assert manager.compact_history(retention_days=30, now=now) == 1
+
+    with session_factory() as db:
+        assert db.query(BuildingOccupancyLog).count() == 2
+        assert db.query(BuildingOccupancyCurrent).count() == 1
+        daily = {
+            row.DAY: (row.VISIT_COUNT, row.TOTAL_SECONDS)
+            for row in db.query(BuildingOccupancyDaily).order_by(BuildingOccupancyDaily.DAY)
+        }
+    assert daily == {"2026-01-01": (1, 3600.0), "2026-01-02": (0, 3600.0)}
+
+
+def test_split_interval_by_day_handles_zero_length():
+    start = datetime(2026, 1, 1, 10, 0, 0)
+    assert _split_interval_by_day(start, start) == [("2026-01-01", 0.0)]
@@ -0,0 +1,129 @@
+"""Tests for bulk / deferred persona loading in manager/persona.py."""
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import manager.persona as persona_module
+from database.models import AI, Base, City, User, UserAiLink
+from manager.persona import PersonaMixin
+from persona.history_manager import HistoryManager
+
+
+class FakePersonaCore:
+    def __init__(self, *, persona_id, defer_memory=False, memory_executor=None, linked_user_name, **kwargs):
+        self.persona_id = persona_id
+        self.persona_name = kwargs["persona_name"]
+        self.linked_user_name = linked_user_name
+        self.defer_memory = defer_memory
+        self.sai_memory_future = None
+        if memory_executor is not None:
+            self.sai_memory_future = memory_executor.submit(lambda: f"memory:{persona_id}")
+
+    @property
+    def sai_memory(self):
+        return self.sai_memory_future.result() if self.sai_memory_future else None
+
+
+class Loader(PersonaMixin):
+    def __init__(self, session_factory):
+        self.SessionLocal = session_factory
+        self.city_id = 1
+        self.city_name = "city"
+        self.model = None
+        self._base_model = "gpt-4o"
+        self.default_avatar = ""
+        self.avatar_map = {}
+        self.personas = {}
+        self.buildings = []
+        self.building_map = {}
+        self.building_histories = {}
+        self.occupants = {}
+        self.id_to_name_map = {}
+        self.user_room_id = "user_room"
+        self.timezone_info = None
+        self.timezone_name = "UTC"
+        self.items = {}
+        self.items_by_persona = {}
+        self.startup_warnings = []
+        self.startup_diagnostics = []
+
+    def _move_persona(self, *args):  # pragma: no cover - callbacks are not invoked
+        return True, None
+
+    dispatch_persona = _explore_city = get_persona_pending_events = archive_persona_events = _move_persona
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'saiverse.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(User(USERID=1, PASSWORD="x", USERNAME="alice"))
+        db.add(City(CITYID=1, USERID=1, CITYNAME="city", UI_PORT=1, API_PORT=2))
+        for pid in ("p1", "p2", "p3"):
+            db.add(AI(AIID=pid, HOME_CITYID=1, AINAME=pid.upper()))
+        db.add(UserAiLink(USERID=1, AIID="p1"))
+        db.add(UserAiLink(USERID=1, AIID="p3"))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def test_fetch_linked_user_names_in_one_query(session_factory):
+    loader = Loader(session_factory)
+    with session_factory() as db:
+        names = loader._fetch_linked_user_names(db, ["p1", "p2", "p3"])
+    assert names == {"p1": "alice", "p3": "alice"}
+
+
+@pytest.mark.parametrize("mode", ["parallel", "lazy", "serial"])
+def test_load_personas_modes(session_factory, monkeypatch, mode):
+    monkeypatch.setenv("SAIVERSE_PERSONA_LOAD_MODE", mode)
+    monkeypatch.setattr(persona_module, "PersonaCore", FakePersonaCore)
+    monkeypatch.setattr(persona_module, "get_context_length", lambda _m: 1000)
+    monkeypatch.setattr(persona_module, "get_model_provider", lambda _m: "openai")
+    loader = Loader(session_factory)
+
+    loader._load_personas_from_db()
+
+    assert set(loader.personas) == {"p1", "p2", "p3"}
+    assert loader.personas["p1"].linked_user_name == "alice"
+    assert loader.personas["p2"].linked_user_name == "the user"
+    assert all(p.defer_memory == (mode != "serial") for p in loader.personas.values())
+    if mode == "parallel":
+        assert loader.personas["p2"].sai_memory == "memory:p2"
+        deadline = time.time() + 5
+        while time.time() < deadline and not any(
+            d["phase"] == "memory_adapters" for d in loader.startup_diagnostics
+        ):
+            time.sleep(0.01)
+    phases = {d["phase"] for d in loader.startup_diagnostics}
+    assert "persona_query" in phases
+    assert ("personas" if mode == "serial" else "persona_shells") in phases
+    if mode == "parallel":
+        assert "memory_adapters" in phases
+    assert not loader.startup_warnings
+
+
+def test_history_manager_resolves_deferred_adapter_once():
+    calls = []
+    adapter = object()
+
+    def resolver():
+        calls.append(1)
+        return adapter
+
+    manager = HistoryManager(
+        persona_id="p1",
+        persona_log_path=Path("/nonexistent/log.json"),
+        building_memory_paths={},
+        memory_resolver=resolver,
+    )
+    assert not calls
+    assert manager.memory_adapter is adapter
+    assert manager.memory_adapter is adapter
+    assert calls == [1]
@@ -164,3 +164,54 @@ def test_post_response_updates_records_emotion_summary():
     assert persona.history_manager.persona_messages, "summary should be logged"
     summary_entry = persona.history_manager.persona_messages[-1]
     assert summary_entry["role"] == "system"
+
+
+class RecordingSession:
+    def __init__(self, log):
+        self.log = log
+
+    def query(self, _model):
+        return self
+
+    def filter(self, *_args):
+        return self
+
+    def update(self, data):
+        self.log.append(dict(data))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_save_session_metadata_writes_only_changed_columns(tmp_path):
+    updates = []
+    persona = SimpleHistoryPersona()
+    persona.is_visitor = False
+    persona.messages = []
+    persona.conscious_log_path = tmp_path / "conscious.json"
+    persona.SessionLocal = lambda: RecordingSession(updates)
+    persona.emotion = {"affect": {"mean": 0}}
+    persona._mark_session_clean()
+
+    persona._save_session_metadata()
+    assert updates == []
+    assert not persona.conscious_log_path.exists()
+    assert not persona.session_dirty
+
+    persona.emotion["affect"]["mean"] = 1
+    assert persona.session_dirty
+    persona._save_session_metadata()
+    assert updates == [{"EMOTION": json.dumps({"affect": {"mean": 1}})}]
+
+    persona._save_session_metadata()
+    assert len(updates) == 1
+
+    persona.pulse_cursors["room"] = 3
+    persona._save_session_metadata()
+    assert json.loads(persona.conscious_log_path.read_text())["pulse_cursors"] == {"room": 3}
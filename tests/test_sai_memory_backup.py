@@ -0,0 +1,96 @@
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+from sai_memory.chunk_backup import (
+    ChunkBackupError,
+    latest_manifest,
+    list_manifests,
+    restore_chunk_backup,
+    run_chunk_backup,
+    verify_chunk_backup,
+)
+from sai_memory.memory.storage import add_message, get_or_create_thread, init_db
+
+
+class ChunkBackupTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.db_path = self.root / "persona" / "memory.db"
+        self.store = self.root / "backups"
+        self.conn = init_db(str(self.db_path))
+        get_or_create_thread(self.conn, "t1", resource_id="r1")
+        for i in range(200):
+            add_message(self.conn, thread_id="t1", role="user", content=f"message {i} " + "x" * 200)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def _backup(self, **kwargs):
+        return run_chunk_backup(persona_id="p", db_path=self.db_path, output_root=self.store, chunk_kb=8, **kwargs)
+
+    def _chunk_files(self):
+        return {path.name for path in (self.store / "p" / "chunks").glob("*/*")}
+
+    def test_skips_when_unchanged_and_dedups_on_change(self):
+        first = self._backup()
+        self.assertIsNotNone(first)
+        self.assertIsNone(self._backup())
+        chunks_before = self._chunk_files()
+
+        add_message(self.conn, thread_id="t1", role="assistant", content="new reply")
+        second = self._backup()
+        self.assertIsNotNone(second)
+        self.assertEqual(len(list_manifests("p", self.store)), 2)
+        manifest = latest_manifest("p", self.store)
+        self.assertEqual(manifest.high_water["messages_count"], 201)
+        # Only the touched chunks were added to the store
+        added = self._chunk_files() - chunks_before
+        self.assertLess(len(added), len(manifest.chunks))
+
+    def test_update_is_detected_without_triggers(self):
+        self._backup()
+        self.conn.execute("UPDATE messages SET content = 'edited' WHERE rowid = 1")
+        self.conn.commit()
+        self.assertIsNotNone(self._backup())
+        # バックアップはライブDBにトリガーを追加しない
+        triggers = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE '_saimemory_chg_%'"
+        ).fetchall()
+        self.assertEqual(triggers, [])
+
+    def test_reopen_without_writes_is_skipped(self):
+        self.assertIsNotNone(self._backup())
+        # 再起動相当: 接続を閉じて開き直す（-wal が作り直される）
+        self.conn.close()
+        self.conn = init_db(str(self.db_path))
+        self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()
+        self.assertIsNone(self._backup())
+        self.assertEqual(len(list_manifests("p", self.store)), 1)
+
+    def test_restore_round_trip(self):
+        self._backup(keep_count=5)
+        verify_chunk_backup("p", output_root=self.store)
+        dest = self.root / "restored" / "memory.db"
+        restore_chunk_backup("p", dest, output_root=self.store)
+        with closing(sqlite3.connect(dest)) as restored:
+            count = restored.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        self.assertEqual(count, 200)
+        with self.assertRaises(ChunkBackupError):
+            restore_chunk_backup("p", dest, output_root=self.store)
+
+    def test_verify_detects_corrupt_chunk(self):
+        self._backup()
+        manifest = latest_manifest("p", self.store)
+        victim = self.store / "p" / "chunks" / manifest.chunks[0][:2] / manifest.chunks[0]
+        victim.write_bytes(b"garbage")
+        with self.assertRaises(ChunkBackupError):
+            verify_chunk_backup("p", output_root=self.store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sai_memory.memory.bulk_import import BulkImporter, embed_pending
+from sai_memory.memory.storage import get_messages_last, init_db
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def _schema_objects(conn):
+    return {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+        )
+    }
+
+
+class TestBulkImporter(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.conn = init_db(str(Path(self._tmp.name) / "memory.db"))
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_batches_rows_and_restores_indexes(self):
+        before_schema = _schema_objects(self.conn)
+        progress = []
+
+        with BulkImporter(
+            self.conn, batch_size=4, total=10, progress_callback=lambda *args: progress.append(args)
+        ) as bulk:
+            self.assertNotIn("idx_messages_thread_created", _schema_objects(self.conn))
+            for i in range(10):
+                bulk.add_message("p:t", "user", f"message {i}", resource_id="p", created_at=1000 + i)
+            # 4件ずつコミット済み、残り2件はまだバッファ内
+            self.assertEqual(bulk.written, 8)
+
+        self.assertEqual(_schema_objects(self.conn), before_schema)
+        self.assertEqual([p[0] for p in progress if p[2].startswith("Imported")], [4, 8, 10])
+        rows = get_messages_last(self.conn, "p:t", 20)
+        self.assertEqual([m.content for m in rows], [f"message {i}" for i in range(10)])
+        self.assertEqual(
+            self.conn.execute("SELECT resource_id FROM threads WHERE id='p:t'").fetchone()[0], "p"
+        )
+
+    def test_abort_rolls_back_unflushed_batch(self):
+        before_schema = _schema_objects(self.conn)
+        with self.assertRaises(RuntimeError):
+            with BulkImporter(self.conn, batch_size=3) as bulk:
+                for i in range(4):
+                    bulk.add_message("p:t", "user", f"m{i}")
+                raise RuntimeError("boom")
+
+        self.assertEqual(_schema_objects(self.conn), before_schema)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0], 3)
+
+    def test_embed_pending_batches_across_messages(self):
+        with BulkImporter(self.conn) as bulk:
+            for i in range(5):
+                bulk.add_message("p:t", "user", f"text {i}", embed=True)
+            bulk.add_message("p:t", "user", "   ", embed=True)
+
+        embedder = CountingEmbedder()
+        count = embed_pending(
+            self.conn, embedder, bulk.pending_embeddings, min_chars=1, max_chars=100, batch_chunks=2
+        )
+
+        self.assertEqual(count, 5)
+        self.assertEqual([len(call) for call in embedder.calls], [2, 2, 1])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM message_embeddings").fetchone()[0], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sai_memory.memory.storage import (
+    add_message,
+    create_stelis_thread,
+    get_messages_last,
+    get_or_create_thread,
+    init_db,
+    set_thread_overview,
+)
+
+
+class NativeStreamExportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.home = Path(self._tmp.name)
+        patcher = patch("pathlib.Path.home", return_value=self.home)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+        db_path = self.home / ".saiverse" / "personas" / "src" / "memory.db"
+        conn = init_db(str(db_path))
+        get_or_create_thread(conn, "src:main", resource_id="src")
+        set_thread_overview(conn, "src:main", "overview text")
+        for i in range(5):
+            add_message(conn, "src:main", "user", f"main {i}", resource_id="src", created_at=100 + i,
+                        metadata={"tags": ["conversation"]} if i == 0 else None)
+        create_stelis_thread(conn, "src:side", parent_thread_id="src:main", label="side")
+        add_message(conn, "src:side", "assistant", "side 0", resource_id="src", created_at=200)
+        conn.close()
+
+    def _export(self, **kwargs) -> bytes:
+        from saiverse_memory.native_export import iter_export_native
+
+        return b"".join(iter_export_native("src", **kwargs))
+
+    def test_json_stream_matches_dict_export(self):
+        from saiverse_memory.native_export import export_threads_native
+
+        streamed = json.loads(self._export(fmt="json"))
+        expected = export_threads_native("src")
+        streamed.pop("exported_at")
+        expected.pop("exported_at")
+        self.assertEqual(streamed, expected)
+
+    def test_ndjson_gzip_round_trip(self):
+        from saiverse_memory.native_export import import_threads_native_stream
+
+        payload = self._export(fmt="ndjson", compress=True)
+        lines = gzip.decompress(payload).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line).get("type") for line in lines[1:3]], ["thread", "message"])
+
+        result = import_threads_native_stream("dst", io.BytesIO(payload), skip_embed=True)
+        self.assertEqual(result, {"threads_imported": 2, "messages_imported": 6})
+
+        conn = init_db(str(self.home / ".saiverse" / "personas" / "dst" / "memory.db"))
+        try:
+            rows = get_messages_last(conn, "src:main", 10)
+            self.assertEqual([m.content for m in rows], [f"main {i}" for i in range(5)])
+            self.assertEqual(rows[0].metadata, {"tags": ["conversation"]})
+            overview = conn.execute("SELECT overview FROM threads WHERE id='src:main'").fetchone()[0]
+            self.assertEqual(overview, "overview text")
+            label = conn.execute("SELECT label FROM stelis_threads WHERE thread_id='src:side'").fetchone()[0]
+            self.assertEqual(label, "side")
+        finally:
+            conn.close()
+
+    def test_stream_importer_accepts_v1_json(self):
+        from saiverse_memory.native_export import import_threads_native_stream
+
+        payload = self._export(fmt="json")
+        result = import_threads_native_stream("dst", io.BytesIO(payload), skip_embed=True)
+        self.assertEqual(result["messages_imported"], 6)
+
+    def test_import_into_live_connection_keeps_indexes(self):
+        import threading
+
+        from saiverse_memory.native_export import import_threads_native_stream
+
+        payload = self._export(fmt="ndjson")
+        conn = init_db(str(self.home / ".saiverse" / "personas" / "dst" / "memory.db"), check_same_thread=False)
+        lock = threading.RLock()
+        seen = []
+
+        def progress(current, total, message):
+            # 取り込み中も索引は残っている（ペルソナが並行して読むため）
+            seen.append(conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_messages_thread_created'"
+            ).fetchone() is not None)
+
+        try:
+            result = import_threads_native_stream(
+                "dst", io.BytesIO(payload), skip_embed=True, progress_callback=progress,
+                conn=conn, lock=lock, defer_indexes=False,
+            )
+            self.assertEqual(result["messages_imported"], 6)
+            self.assertTrue(seen and all(seen))
+            # 呼び出し側の接続は閉じられない
+            self.assertEqual(len(get_messages_last(conn, "src:main", 10)), 5)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
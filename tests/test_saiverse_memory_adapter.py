@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -129,6 +130,87 @@ class ActiveThreadAdapterTest(unittest.TestCase):
                 adapter.close()
         os.environ["SAIMEMORY_MEMORY"] = "0"
 
+    def test_reads_and_embedding_do_not_wait_for_writer_lock(self) -> None:
+        os.environ["SAIMEMORY_MEMORY"] = "1"
+        lock_held_during_embed: list[bool] = []
+        adapter_box: list = []
+
+        class DummyEmbedder:
+            def __init__(self, model: str | None = None, **kwargs) -> None:
+                self.model_name = model
+
+            def embed(self, texts, **kwargs):
+                if adapter_box:
+                    lock_held_during_embed.append(adapter_box[0]._db_lock._is_owned())
+                return [[1.0, 0.0, 0.0] for _ in texts]
+
+        with patch("saiverse_memory.adapter.Embedder", DummyEmbedder):
+            adapter = self.adapter_cls("tester", persona_dir=self.persona_dir)
+            adapter_box.append(adapter)
+            try:
+                self.assertIsNotNone(adapter._reader_pool)
+                adapter.append_persona_message(
+                    {"role": "user", "content": "hello there", "timestamp": "2025-01-01T00:00:00"}
+                )
+                adapter.recall_hybrid("hello", max_chars=2000)
+                self.assertTrue(lock_held_during_embed)
+                self.assertFalse(any(lock_held_during_embed))
+
+                # Another thread holds the writer lock; reads still complete
+                results: list = []
+                with adapter._db_lock:
+                    reader = threading.Thread(
+                        target=lambda: results.append(adapter.recent_persona_messages(5000))
+                    )
+                    reader.start()
+                    reader.join(timeout=5)
+                self.assertFalse(reader.is_alive())
+                self.assertEqual(results[0][0]["content"], "hello there")
+            finally:
+                adapter.close()
+        os.environ["SAIMEMORY_MEMORY"] = "0"
+
+    def test_bulk_import_defers_embedding(self) -> None:
+        os.environ["SAIMEMORY_MEMORY"] = "1"
+        embedded: list[list[str]] = []
+
+        class DummyEmbedder:
+            def __init__(self, model: str | None = None, **kwargs) -> None:
+                self.model_name = model
+
+            def embed(self, texts, **kwargs):
+                embedded.append(list(texts))
+                return [[1.0, 0.0, 0.0] for _ in texts]
+
+        with patch("saiverse_memory.adapter.Embedder", DummyEmbedder):
+            adapter = self.adapter_cls("tester", persona_dir=self.persona_dir)
+            try:
+                progress: list = []
+                with adapter.bulk_import(total=3, progress_callback=lambda *a: progress.append(a)) as bulk:
+                    bulk.append_persona_message(
+                        {"role": "user", "content": "first", "timestamp": "2025-01-01T00:00:00"},
+                        thread_suffix="import",
+                    )
+                    bulk.append_persona_message(
+                        {"role": "assistant", "content": "second", "timestamp": "2025-01-01T00:01:00"},
+                        thread_suffix="import",
+                    )
+                    bulk.append_persona_message(
+                        {"role": "user", "content": "skipped", "embedding_chunks": 0},
+                        thread_suffix="import",
+                    )
+                    self.assertEqual(embedded, [])
+
+                self.assertEqual(len(embedded), 1)
+                self.assertEqual(len(embedded[0]), 2)
+                self.assertEqual(progress[-1][:2], (2, 2))
+                with adapter._db_lock:
+                    rows = get_messages_last(adapter.conn, "tester:import", 5)
+                self.assertEqual([m.content for m in rows], ["first", "second", "skipped"])
+            finally:
+                adapter.close()
+        os.environ["SAIMEMORY_MEMORY"] = "0"
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from saiverse import sql_profiler
+from saiverse.sql_profiler import SQLProfiler, connect_kwargs, instrument_engine, normalize_sql
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setenv("SAIVERSE_SQL_PROFILE", "1")
+    instance = SQLProfiler(slow_ms=0.0)  # every statement counts as slow
+    monkeypatch.setattr(sql_profiler, "_profiler", instance)
+    return instance
+
+
+def test_normalize_sql_replaces_literals_and_collapses_in_lists():
+    sql = "SELECT *  FROM messages WHERE id IN (?, ?, ?) AND role = 'user' AND created_at > 1700000000"
+    assert normalize_sql(sql) == "SELECT * FROM messages WHERE id IN (?, …) AND role = ? AND created_at > ?"
+    assert normalize_sql("SELECT * FROM t2 WHERE idx_1 = 5") == "SELECT * FROM t2 WHERE idx_1 = ?"
+
+
+def test_sqlite3_factory_times_statement_through_fetch_and_explains(profiler, tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "m.db"), **connect_kwargs("saimemory"))
+    conn.execute("CREATE TABLE messages (id TEXT PRIMARY KEY, content TEXT)")
+    conn.executemany("INSERT INTO messages VALUES (?, ?)", [(str(i), "x") for i in range(50)])
+    rows = [row for row in conn.execute("SELECT id FROM messages WHERE content LIKE ?", ("%x%",))]
+    assert len(rows) == 50
+    assert conn.execute("SELECT content FROM messages WHERE id = ?", ("3",)).fetchone() == ("x",)
+    conn.close()
+
+    report = profiler.report()
+    by_sql = {row["sql"]: row for row in report["statements"]}
+    scan = by_sql["SELECT id FROM messages WHERE content LIKE ?"]
+    assert scan["db"] == "saimemory"
+    assert scan["count"] == 1
+    assert any(line.startswith("SCAN") for line in scan["plan"])
+    assert by_sql["INSERT INTO messages VALUES (?, ?)"]["count"] == 1
+    assert by_sql["SELECT content FROM messages WHERE id = ?"]["count"] == 1
+    full_scans = [entry for entry in report["slow_queries"] if entry["full_scan"]]
+    assert full_scans and full_scans[0]["sql"].startswith("SELECT id FROM messages")
+
+
+def test_instrument_engine_records_sqlalchemy_statements(profiler, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+    instrument_engine(engine, "main")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE ai (AIID TEXT PRIMARY KEY, HOME_CITYID INTEGER)"))
+        conn.execute(text("INSERT INTO ai VALUES ('a', 1)"))
+        assert conn.execute(text("SELECT AIID FROM ai WHERE HOME_CITYID = 1")).fetchall() == [("a",)]
+    engine.dispose()
+
+    rows = {row["sql"]: row for row in profiler.report()["statements"]}
+    select = rows["SELECT AIID FROM ai WHERE HOME_CITYID = ?"]
+    assert select["db"] == "main"
+    assert select["plan"] and select["plan"][0].startswith("SCAN ai")
+
+
+def test_connect_kwargs_empty_when_disabled(monkeypatch):
+    monkeypatch.delenv("SAIVERSE_SQL_PROFILE", raising=False)
+    assert connect_kwargs("saimemory") == {}
@@ -0,0 +1,47 @@
+import importlib
+import sys
+
+from saiverse.startup_profiler import PhaseClock, StartupProfiler, profiling_requested
+
+
+def test_phase_clock_sends_laps_to_sink():
+    laps = []
+    clock = PhaseClock("manager", sink=lambda phase, seconds, **extra: laps.append((phase, seconds, extra)))
+    clock.lap("database")
+    clock.lap("personas", count=3)
+    assert [lap[0] for lap in laps] == ["manager.database", "manager.personas"]
+    assert all(lap[1] >= 0 for lap in laps)
+    assert laps[1][2] == {"count": 3}
+
+
+def test_import_hook_records_module_time(tmp_path, monkeypatch):
+    (tmp_path / "profiled_outer.py").write_text("import profiled_inner\nVALUE = 1\n", encoding="utf-8")
+    (tmp_path / "profiled_inner.py").write_text("VALUE = 2\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profiler = StartupProfiler()
+    profiler.install_import_hook()
+    try:
+        module = importlib.import_module("profiled_outer")
+    finally:
+        profiler.uninstall_import_hook()
+        sys.modules.pop("profiled_outer", None)
+        sys.modules.pop("profiled_inner", None)
+
+    assert module.VALUE == 1
+    assert {"profiled_outer", "profiled_inner"} <= set(profiler.imports)
+    outer = profiler.imports["profiled_outer"]
+    assert outer["cumulative"] >= profiler.imports["profiled_inner"]["cumulative"]
+    assert outer["self"] <= outer["cumulative"]
+
+    profiler.record_phase("main.manager", 0.5)
+    report = profiler.report()
+    assert report["phases"][0]["phase"] == "main.manager"
+    assert any(entry["module"] == "profiled_outer" for entry in report["top_imports"])
+
+
+def test_profiling_requested(monkeypatch):
+    monkeypatch.delenv("SAIVERSE_PROFILE_STARTUP", raising=False)
+    assert profiling_requested(["main.py", "--profile-startup"])
+    assert not profiling_requested(["main.py"])
+    monkeypatch.setenv("SAIVERSE_PROFILE_STARTUP", "1")
+    assert profiling_requested(["main.py"])
@@ -0,0 +1,93 @@
+import sys
+import textwrap
+
+import pytest
+
+import tools
+
+TOOL_SOURCE = textwrap.dedent(
+    '''
+    from tools.core import ToolSchema
+
+    LOADED = True
+
+    def schema():
+        return ToolSchema(
+            name="echo_tool",
+            description="Echo the input",
+            parameters={"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+            result_type="string",
+        )
+
+    def echo_tool(text):
+        return text.upper()
+    '''
+)
+
+
+@pytest.fixture
+def fresh_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(tools, "TOOL_REGISTRY", {})
+    monkeypatch.setattr(tools, "OPENAI_TOOLS_SPEC", [])
+    monkeypatch.setattr(tools, "TOOL_SCHEMAS", [])
+    monkeypatch.delitem(tools.__dict__, "GEMINI_TOOLS_SPEC", raising=False)
+    monkeypatch.setattr(tools, "_manifest_path", lambda: tmp_path / "cache" / "tool_manifest.json")
+    monkeypatch.delenv("SAIVERSE_LAZY_TOOLS", raising=False)
+    tools.clear_provider_tools_cache()
+    tool_dir = tmp_path / "tools"
+    tool_dir.mkdir()
+    (tool_dir / "echo_tool.py").write_text(TOOL_SOURCE, encoding="utf-8")
+    yield tool_dir
+    sys.modules.pop("tools._loaded.echo_tool", None)
+    tools.clear_provider_tools_cache()
+
+
+def _reset(monkeypatch):
+    monkeypatch.setattr(tools, "TOOL_REGISTRY", {})
+    monkeypatch.setattr(tools, "OPENAI_TOOLS_SPEC", [])
+    monkeypatch.setattr(tools, "TOOL_SCHEMAS", [])
+    sys.modules.pop("tools._loaded.echo_tool", None)
+
+
+def test_second_discovery_registers_from_manifest_without_import(fresh_registry, monkeypatch):
+    tools._autodiscover_tools([fresh_registry])
+    assert tools.TOOL_REGISTRY["echo_tool"]("hi") == "HI"
+    assert (fresh_registry.parent / "cache" / "tool_manifest.json").exists()
+
+    _reset(monkeypatch)
+    tools._autodiscover_tools([fresh_registry])
+    lazy = tools.TOOL_REGISTRY["echo_tool"]
+    assert isinstance(lazy, tools.LazyTool)
+    assert "tools._loaded.echo_tool" not in sys.modules
+    assert tools.OPENAI_TOOLS_SPEC[0]["function"]["name"] == "echo_tool"
+    assert tools.TOOL_SCHEMAS[0].parameters["required"] == ["text"]
+
+    assert lazy(text="abc") == "ABC"
+    assert "tools._loaded.echo_tool" in sys.modules
+
+
+def test_changed_source_is_reimported(fresh_registry, monkeypatch):
+    tools._autodiscover_tools([fresh_registry])
+    _reset(monkeypatch)
+    (fresh_registry / "echo_tool.py").write_text(
+        TOOL_SOURCE.replace("Echo the input", "Echo the input loudly"), encoding="utf-8"
+    )
+    tools._autodiscover_tools([fresh_registry])
+    assert not isinstance(tools.TOOL_REGISTRY["echo_tool"], tools.LazyTool)
+    assert tools.TOOL_SCHEMAS[0].description == "Echo the input loudly"
+
+
+def test_provider_spec_is_cached_per_tool_set(fresh_registry):
+    tools._autodiscover_tools([fresh_registry])
+    first = tools.build_provider_tools_spec(["echo_tool", "missing"], "openai")
+    second = tools.build_provider_tools_spec(["missing", "echo_tool"], "openai")
+    assert first == second and first is not second
+    assert first[0] is second[0]
+
+    gemini = tools.build_provider_tools_spec(["echo_tool"], "gemini")
+    assert [d.name for d in gemini[0].function_declarations] == ["echo_tool"]
+    assert tools.build_provider_tools_spec(["echo_tool"], "gemini")[0] is gemini[0]
+    assert tools.build_provider_tools_spec(["missing"], "gemini") == []
+
+    with pytest.raises(ValueError):
+        tools.build_provider_tools_spec(["echo_tool"], "unknown")
@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+
+from unity_gateway.protocol import GatewayMessage, SpatialUpdateMessage
+from unity_gateway.server import UnityClient, UnityGatewayServer
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.release = asyncio.Event()
+
+    async def send(self, data: str) -> None:
+        if self.delay:
+            await self.release.wait()
+        self.sent.append(data)
+
+    async def close(self, *args) -> None:
+        pass
+
+
+def test_slow_client_does_not_block_others_and_drops_oldest(monkeypatch):
+    monkeypatch.setenv("SAIVERSE_UNITY_SEND_QUEUE_SIZE", "3")
+
+    async def scenario():
+        server = UnityGatewayServer(SimpleNamespace(personas={}))
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=1)
+        for client_id, ws in (("fast", fast), ("slow", slow)):
+            client = UnityClient(client_id=client_id, user_id=1, websocket=ws)
+            client.writer = asyncio.create_task(server._client_writer(client))
+            server.clients[client_id] = client
+
+        for i in range(6):
+            await server._broadcast(GatewayMessage(type="persona_speak", payload={"i": i}))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        assert len(fast.sent) == 6  # 遅いクライアントの送信完了を待たない
+
+        stats = {c["client_id"]: c for c in server.get_stats()["clients"]}
+        # slow は 1 フレーム送信中、キューには最新 3 件、残り 2 件は破棄
+        assert stats["slow"]["dropped"] == 2 and stats["slow"]["queue_depth"] == 3
+        assert stats["fast"]["dropped"] == 0 and stats["fast"]["sent"] == 6
+
+        slow.release.set()
+        await asyncio.sleep(0.01)
+        received = [GatewayMessage.from_json(raw).payload["i"] for raw in slow.sent]
+        assert received == [0, 3, 4, 5]
+        for client in server.clients.values():
+            client.writer.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_spatial_updates_keep_latest_value_per_persona():
+    async def scenario():
+        server = UnityGatewayServer(SimpleNamespace(personas={}))
+        for distance in (5.0, 3.0, 1.5):
+            await server._on_spatial_update(SpatialUpdateMessage(personas=[
+                {"persona_id": "air", "distance_to_player": distance, "is_visible": True},
+            ]))
+        await server._on_spatial_update(SpatialUpdateMessage(personas=[{"persona_id": "eris"}]))
+
+        assert server.get_player_distance("air") == 1.5
+        assert server.is_player_visible("eris") is False
+        state = server.spatial_state["air"]
+        await server._on_spatial_update(SpatialUpdateMessage(personas=[
+            {"persona_id": "air", "distance_to_player": 9.0, "is_visible": False},
+        ]))
+        assert server.get_player_distance("air") == 9.0
+        assert server.spatial_state["air"] is state  # 再生成せず更新する
+        assert server.get_stats()["spatial_updates"] == {"received": 5, "coalesced": 2, "pending_personas": 0}
+
+    asyncio.run(scenario())
+
+
+class ConnectionWebSocket(FakeWebSocket):
+    """Handshake, then stays open until ``disconnect`` is set."""
+
+    def __init__(self, client_id: str):
+        super().__init__()
+        self.client_id = client_id
+        self.disconnect = asyncio.Event()
+
+    async def recv(self) -> str:
+        return GatewayMessage(type="handshake", payload={"client_id": self.client_id, "user_id": 1}).to_json()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        await self.disconnect.wait()
+        raise StopAsyncIteration
+
+
+def test_stale_connection_cleans_up_after_reconnect():
+    async def scenario():
+        server = UnityGatewayServer(SimpleNamespace(personas={}))
+        first, second = ConnectionWebSocket("c1"), ConnectionWebSocket("c1")
+        first_task = asyncio.create_task(server._handle_client(first))
+        await asyncio.sleep(0.01)
+        stale = server.clients["c1"]
+        second_task = asyncio.create_task(server._handle_client(second))
+        await asyncio.sleep(0.01)
+
+        first.disconnect.set()  # 再接続の後に古い接続が閉じる
+        await first_task
+        await asyncio.sleep(0)
+        assert stale.writer.cancelled()
+        assert server.clients["c1"].websocket is second
+
+        second.disconnect.set()
+        await second_task
+        assert server.clients == {}
+
+    asyncio.run(scenario())
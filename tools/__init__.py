@@ -7,118 +7,172 @@ Autodiscovers tools from:
 Supports both:
   - Direct .py files with schema() function
   - Subdirectories with schema.py file (for git-cloned tool repos)
+
+Schemas of discovered tools are cached in a manifest
+(``~/.saiverse/cache/tool_manifest.json``) keyed by each source file's
+mtime/size. On later starts a tool whose source is unchanged is registered
+from the manifest as a :class:`LazyTool`, and its module is only imported
+on the first call. ``SAIVERSE_LAZY_TOOLS=0`` imports every tool eagerly.
+
+Provider-formatted tool payloads (OpenAI / Gemini) for a given tool set are
+built once and reused via :func:`build_provider_tools_spec`.
 """
 import importlib.util
+import json
 import logging
 import os
 import pkgutil
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from tools.core import ToolSchema
-from tools.adapters import openai as oa, gemini as gm
+from tools.adapters import openai as oa
 
 LOGGER = logging.getLogger(__name__)
 
 TOOL_REGISTRY: Dict[str, Callable] = {}
 OPENAI_TOOLS_SPEC: List[Dict[str, Any]] = []
-GEMINI_TOOLS_SPEC: List[Any] = []
 TOOL_SCHEMAS: List[ToolSchema] = []
+# GEMINI_TOOLS_SPEC is built from TOOL_SCHEMAS on first access (see __getattr__)
+# so that google-genai is not imported just to discover tools.
 
+_MANIFEST_VERSION = 1
+_registry_version = 0
 
-def _register_multiple_tools(module: Any) -> bool:
-    """Register multiple tools from a module with schemas() function.
 
-    This supports tool packages that export multiple tools from a single module,
-    such as user_data/discord/tools/schema.py.
-    """
-    try:
-        tool_schemas: List[ToolSchema] = module.schemas()
-        registered = False
-        for meta in tool_schemas:
-            impl: Callable = getattr(module, meta.name, None)
-            if not impl or not callable(impl):
-                LOGGER.warning("Tool '%s' has schema but no implementation function", meta.name)
-                continue
+def _lazy_tools_enabled() -> bool:
+    return os.getenv("SAIVERSE_LAZY_TOOLS", "1").strip().lower() not in {"0", "false", "no", "off"}
 
-            # Skip if already registered (user_data takes priority)
-            if meta.name in TOOL_REGISTRY:
-                LOGGER.debug("Tool '%s' already registered, skipping", meta.name)
-                continue
 
-            TOOL_REGISTRY[meta.name] = impl
-            OPENAI_TOOLS_SPEC.append(oa.to_openai(meta))
-            GEMINI_TOOLS_SPEC.append(gm.to_gemini(meta))
-            TOOL_SCHEMAS.append(meta)
-            registered = True
-            LOGGER.debug("Registered tool '%s' from schemas()", meta.name)
+def _manifest_path() -> Path:
+    from saiverse.data_paths import get_saiverse_home
 
-        return registered
-    except Exception as e:
-        LOGGER.warning("Failed to register tools from schemas(): %s", e)
-        return False
+    return get_saiverse_home() / "cache" / "tool_manifest.json"
 
 
-def _register_tool(module: Any) -> bool:
-    """Register a tool from a module if it has schema() or schemas() function."""
-    # Multiple tools support: schemas() takes priority
-    if hasattr(module, "schemas") and callable(module.schemas):
-        return _register_multiple_tools(module)
+class LazyTool:
+    """Registry entry that imports its tool module on the first call."""
+
+    _lock = threading.Lock()
 
-    # Single tool: schema() function
-    if not hasattr(module, "schema") or not callable(module.schema):
+    def __init__(self, name: str, impl_name: str, module_name: str, file_path: Path) -> None:
+        self.name = name
+        self.impl_name = impl_name
+        self.module_name = module_name
+        self.file_path = Path(file_path)
+        self._impl: Optional[Callable] = None
+
+    def resolve(self) -> Callable:
+        if self._impl is None:
+            with LazyTool._lock:
+                if self._impl is None:
+                    module = sys.modules.get(self.module_name)
+                    if module is None or getattr(module, "__file__", None) != str(self.file_path):
+                        module = _load_module_from_path(self.module_name, self.file_path)
+                    impl = getattr(module, self.impl_name, None) if module else None
+                    if not callable(impl):
+                        raise RuntimeError(
+                            f"Tool '{self.name}' has no implementation '{self.impl_name}' in {self.file_path}"
+                        )
+                    self._impl = impl
+                    LOGGER.debug("Loaded tool '%s' from %s on first use", self.name, self.file_path)
+        return self._impl
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._impl is not None else "not loaded"
+        return f"<LazyTool {self.name} ({state}) from {self.file_path}>"
+
+
+def _add_tool(meta: ToolSchema, impl: Callable) -> bool:
+    """Add one tool to the registry. Returns False if the name is already taken."""
+    global _registry_version
+    # Skip if already registered (user_data takes priority)
+    if meta.name in TOOL_REGISTRY:
+        LOGGER.debug("Tool '%s' already registered, skipping", meta.name)
         return False
+    TOOL_REGISTRY[meta.name] = impl
+    OPENAI_TOOLS_SPEC.append(oa.to_openai(meta))
+    TOOL_SCHEMAS.append(meta)
+    gemini_spec = globals().get("GEMINI_TOOLS_SPEC")
+    if gemini_spec is not None:
+        converted = _to_gemini_or_none(meta)
+        if converted is not None:
+            gemini_spec.append(converted)
+    _registry_version += 1
+    return True
 
-    try:
-        meta: ToolSchema = module.schema()
-        impl: Callable = getattr(module, meta.name, None)
+
+def _describe_module(module: Any) -> Optional[Tuple[List[Tuple[ToolSchema, str]], Dict[str, str]]]:
+    """Return ``([(schema, impl_name), ...], aliases)`` for a tool module, or None.
+
+    ``schemas()`` (multiple tools per module) takes priority over ``schema()``.
+    Schemas without a callable implementation are dropped with a warning.
+    """
+    if hasattr(module, "schemas") and callable(module.schemas):
+        metas: List[ToolSchema] = list(module.schemas())
+        aliases: Dict[str, str] = {}
+    elif hasattr(module, "schema") and callable(module.schema):
+        metas = [module.schema()]
+        alias = getattr(module, "ALIASES", None)
+        aliases = dict(alias) if isinstance(alias, dict) else {}
+    else:
+        return None
+
+    tools: List[Tuple[ToolSchema, str]] = []
+    for meta in metas:
+        impl = getattr(module, meta.name, None)
         if not impl or not callable(impl):
             LOGGER.warning("Tool '%s' has schema but no implementation function", meta.name)
-            return False
-        
-        # Skip if already registered (user_data takes priority)
-        if meta.name in TOOL_REGISTRY:
-            LOGGER.debug("Tool '%s' already registered, skipping", meta.name)
-            return False
-        
-        TOOL_REGISTRY[meta.name] = impl
-        OPENAI_TOOLS_SPEC.append(oa.to_openai(meta))
-        GEMINI_TOOLS_SPEC.append(gm.to_gemini(meta))
-        TOOL_SCHEMAS.append(meta)
-        
-        # Handle aliases
-        alias = getattr(module, "ALIASES", None)
-        if isinstance(alias, dict):
-            for alt_name, alt_impl_name in alias.items():
-                function_ref = getattr(module, alt_impl_name, None)
-                if callable(function_ref):
-                    TOOL_REGISTRY[alt_name] = function_ref
-        
-        return True
+            continue
+        tools.append((meta, meta.name))
+    aliases = {alt: impl_name for alt, impl_name in aliases.items() if callable(getattr(module, impl_name, None))}
+    return tools, aliases
+
+
+def _register_tool(module: Any) -> bool:
+    """Register a tool from a module if it has schema() or schemas() function."""
+    try:
+        described = _describe_module(module)
     except Exception as e:
         LOGGER.warning("Failed to register tool from module: %s", e)
         return False
+    if described is None:
+        return False
+    tools, aliases = described
+    registered = False
+    for meta, impl_name in tools:
+        if _add_tool(meta, getattr(module, impl_name)):
+            registered = True
+            LOGGER.debug("Registered tool '%s'", meta.name)
+    # Aliases only apply when the primary tool itself was registered
+    if registered:
+        for alt_name, alt_impl_name in aliases.items():
+            TOOL_REGISTRY[alt_name] = getattr(module, alt_impl_name)
+    return registered
 
 
 def _load_module_from_path(module_name: str, file_path: Path) -> Any:
     """Dynamically load a Python module from a file path.
-    
+
     For subdirectory modules (schema.py), the parent directory is temporarily
     added to sys.path to allow local imports (e.g., from .helper import ...).
     """
-    import sys
-    
     parent_dir = str(file_path.parent)
     added_to_path = False
-    
+
     # Add parent directory to sys.path for local imports
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
         added_to_path = True
-    
+
     try:
         spec = importlib.util.spec_from_file_location(
-            module_name, 
+            module_name,
             file_path,
             submodule_search_locations=[parent_dir]
         )
@@ -134,13 +188,122 @@ def _load_module_from_path(module_name: str, file_path: Path) -> Any:
             sys.path.remove(parent_dir)
 
 
-def _autodiscover_tools() -> None:
-    """Discover and register tools from user_data and builtin_data directories."""
+# ---------------------------------------------------------------------------
+# Manifest (schema cache keyed by source signature)
+# ---------------------------------------------------------------------------
+
+def _source_signature(file_path: Path, package_dir: Optional[Path]) -> List[int]:
+    """mtime/size of a tool's sources; package tools cover every .py in their directory."""
+    if package_dir is None:
+        st = file_path.stat()
+        return [st.st_mtime_ns, st.st_size]
+    latest = 0
+    total = 0
+    count = 0
+    for py_file in package_dir.rglob("*.py"):
+        st = py_file.stat()
+        latest = max(latest, st.st_mtime_ns)
+        total += st.st_size
+        count += 1
+    return [latest, total, count]
+
+
+def _load_manifest() -> Dict[str, Any]:
+    path = _manifest_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _MANIFEST_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_manifest(entries: Dict[str, Any]) -> None:
+    path = _manifest_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": _MANIFEST_VERSION, "entries": entries}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError as e:
+        LOGGER.warning("Failed to write tool manifest %s: %s", path, e)
+
+
+def _manifest_entry(module_name: str, signature: List[int], described: Any) -> Optional[Dict[str, Any]]:
+    """Serialisable manifest entry, or None if the schema can't be stored as JSON."""
+    tools, aliases = described if described is not None else ([], {})
+    entry = {
+        "module": module_name,
+        "signature": signature,
+        "tools": [
+            {
+                "name": meta.name,
+                "description": meta.description,
+                "parameters": meta.parameters,
+                "result_type": meta.result_type,
+                "impl": impl_name,
+            }
+            for meta, impl_name in tools
+        ],
+        "aliases": aliases,
+    }
+    try:
+        json.dumps(entry)
+    except (TypeError, ValueError):
+        return None
+    return entry
+
+
+def _register_from_manifest(entry: Dict[str, Any], file_path: Path) -> bool:
+    registered = False
+    lazy_by_impl: Dict[str, LazyTool] = {}
+    for tool in entry["tools"]:
+        meta = ToolSchema(
+            name=tool["name"],
+            description=tool["description"],
+            parameters=tool["parameters"],
+            result_type=tool["result_type"],
+        )
+        lazy = LazyTool(meta.name, tool["impl"], entry["module"], file_path)
+        lazy_by_impl[tool["impl"]] = lazy
+        if _add_tool(meta, lazy):
+            registered = True
+    if registered:
+        for alt_name, alt_impl_name in entry.get("aliases", {}).items():
+            TOOL_REGISTRY[alt_name] = lazy_by_impl.get(alt_impl_name) or LazyTool(
+                alt_name, alt_impl_name, entry["module"], file_path
+            )
+    return registered
+
+
+def _tool_sources(tools_path: Path) -> Iterable[Tuple[str, Path, Optional[Path]]]:
+    """Yield ``(name, file, package_dir)`` for every candidate tool in a directory."""
+    # 1. Direct .py files in the directory
+    for modinfo in pkgutil.iter_modules([str(tools_path)]):
+        if modinfo.name.startswith("_"):
+            continue
+        py_file = tools_path / f"{modinfo.name}.py"
+        if py_file.exists():
+            yield modinfo.name, py_file, None
+
+    # 2. Subdirectories with schema.py (for git-cloned tool repos)
+    for subdir in tools_path.iterdir():
+        if not subdir.is_dir() or subdir.name.startswith("_"):
+            continue
+        schema_file = subdir / "schema.py"
+        if schema_file.exists():
+            yield subdir.name, schema_file, subdir
+
+
+def _default_tool_dirs() -> List[Path]:
     # Import here to avoid circular imports at module load time
     from saiverse.data_paths import iter_project_subdirs, TOOLS_DIR
 
-    registered_names: set[str] = set()
-
     # Get tool directories from all projects (user_data/<project>/tools/) + builtin_data/tools/
     tool_dirs = list(iter_project_subdirs(TOOLS_DIR))
 
@@ -148,46 +311,157 @@ def _autodiscover_tools() -> None:
     legacy_defs = Path(__file__).parent / "defs"
     if legacy_defs.exists() and legacy_defs not in tool_dirs:
         tool_dirs.append(legacy_defs)
-    
+    return tool_dirs
+
+
+def _autodiscover_tools(tool_dirs: Optional[List[Path]] = None) -> None:
+    """Discover and register tools from user_data and builtin_data directories."""
+    if tool_dirs is None:
+        tool_dirs = _default_tool_dirs()
+
+    use_manifest = _lazy_tools_enabled()
+    manifest = _load_manifest() if use_manifest else {}
+    new_manifest: Dict[str, Any] = {}
+    lazy_count = 0
+
     for tools_path in tool_dirs:
         if not tools_path.exists():
             continue
-        
-        # 1. Direct .py files in the directory
-        for modinfo in pkgutil.iter_modules([str(tools_path)]):
-            if modinfo.name.startswith("_"):
-                continue
-            
-            py_file = tools_path / f"{modinfo.name}.py"
-            if not py_file.exists():
-                continue
-            
+
+        for name, file_path, package_dir in _tool_sources(tools_path):
+            module_name = f"tools._loaded.{name}"
+            key = str(file_path)
             try:
-                module = _load_module_from_path(f"tools._loaded.{modinfo.name}", py_file)
-                if module and _register_tool(module):
-                    registered_names.add(modinfo.name)
-                    LOGGER.debug("Registered tool from %s", py_file)
-            except Exception as e:
-                LOGGER.warning("Failed to load tool from %s: %s", py_file, e)
-        
-        # 2. Subdirectories with schema.py (for git-cloned tool repos)
-        for subdir in tools_path.iterdir():
-            if not subdir.is_dir() or subdir.name.startswith("_"):
+                signature = _source_signature(file_path, package_dir)
+            except OSError as e:
+                LOGGER.warning("Failed to stat tool source %s: %s", file_path, e)
                 continue
-            
-            schema_file = subdir / "schema.py"
-            if not schema_file.exists():
+
+            cached = manifest.get(key)
+            if (
+                cached
+                and cached.get("signature") == signature
+                and cached.get("module") == module_name
+            ):
+                new_manifest[key] = cached
+                if _register_from_manifest(cached, file_path):
+                    lazy_count += 1
+                    LOGGER.debug("Registered tool from manifest: %s", file_path)
                 continue
-            
+
             try:
-                module = _load_module_from_path(f"tools._loaded.{subdir.name}", schema_file)
-                if module and _register_tool(module):
-                    registered_names.add(subdir.name)
-                    LOGGER.debug("Registered tool from %s", schema_file)
+                module = _load_module_from_path(module_name, file_path)
+                if not module:
+                    continue
+                if _register_tool(module):
+                    LOGGER.debug("Registered tool from %s", file_path)
+                if use_manifest:
+                    entry = _manifest_entry(module_name, signature, _describe_module(module))
+                    if entry is not None:
+                        new_manifest[key] = entry
             except Exception as e:
-                LOGGER.warning("Failed to load tool from %s: %s", schema_file, e)
-    
-    LOGGER.info("Autodiscovered %d tools", len(TOOL_REGISTRY))
+                LOGGER.warning("Failed to load tool from %s: %s", file_path, e)
+
+    if use_manifest and new_manifest != manifest:
+        _save_manifest(new_manifest)
+
+    LOGGER.info(
+        "Autodiscovered %d tools (%d modules deferred via manifest)",
+        len(TOOL_REGISTRY),
+        lazy_count,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Provider-formatted tool specs
+# ---------------------------------------------------------------------------
+
+def _to_gemini_or_none(meta: ToolSchema) -> Any:
+    from tools.adapters import gemini as gm
+
+    try:
+        return gm.to_gemini(meta)
+    except Exception as e:
+        LOGGER.warning("Failed to convert tool '%s' to Gemini format: %s", meta.name, e)
+        return None
+
+
+def _build_gemini_tools_spec() -> List[Any]:
+    return [spec for spec in (_to_gemini_or_none(meta) for meta in TOOL_SCHEMAS) if spec is not None]
+
+
+def _gemini_tools_spec() -> List[Any]:
+    spec = globals().get("GEMINI_TOOLS_SPEC")
+    if spec is None:
+        spec = globals()["GEMINI_TOOLS_SPEC"] = _build_gemini_tools_spec()
+    return spec
+
+
+def __getattr__(name: str) -> Any:
+    if name == "GEMINI_TOOLS_SPEC":
+        return _gemini_tools_spec()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_SPEC_CACHE_MAX = 256
+_provider_spec_cache: Dict[Tuple[str, FrozenSet[str], Tuple[int, ...]], List[Any]] = {}
+_provider_spec_lock = threading.Lock()
+
+
+def _filter_openai(tool_names: FrozenSet[str]) -> List[Dict[str, Any]]:
+    return [
+        tool for tool in OPENAI_TOOLS_SPEC
+        if tool.get("function", {}).get("name") in tool_names
+    ]
+
+
+def _filter_gemini(tool_names: FrozenSet[str]) -> List[Any]:
+    # Gemini requires all function_declarations in a single Tool object
+    from google.genai import types
+
+    matching = [
+        decl
+        for tool in _gemini_tools_spec()
+        if getattr(tool, "function_declarations", None)
+        for decl in tool.function_declarations
+        if decl.name in tool_names
+    ]
+    return [types.Tool(function_declarations=matching)] if matching else []
+
+
+def build_provider_tools_spec(tool_names: Iterable[str], provider: str) -> List[Any]:
+    """Tool payload for ``provider`` ("openai" or "gemini") restricted to ``tool_names``.
+
+    The result is cached per (provider, tool set) and invalidated when the
+    registry or the spec lists change, so agentic loops reuse the same
+    payload on every step. A new list is returned each time; the tool
+    objects inside are shared and must not be mutated.
+    """
+    names = frozenset(tool_names)
+    if provider == "gemini":
+        source = _gemini_tools_spec()
+        build = _filter_gemini
+    elif provider == "openai":
+        source = OPENAI_TOOLS_SPEC
+        build = _filter_openai
+    else:
+        raise ValueError(f"Unknown tool spec provider: {provider}")
+
+    key = (provider, names, (_registry_version, id(source), len(source)))
+    with _provider_spec_lock:
+        cached = _provider_spec_cache.get(key)
+    if cached is None:
+        cached = build(names)
+        with _provider_spec_lock:
+            if len(_provider_spec_cache) >= _SPEC_CACHE_MAX:
+                _provider_spec_cache.clear()
+            _provider_spec_cache[key] = cached
+    return list(cached)
+
+
+def clear_provider_tools_cache() -> None:
+    with _provider_spec_lock:
+        _provider_spec_cache.clear()
 
 
 if os.getenv("SAIVERSE_SKIP_TOOL_IMPORTS") != "1":
@@ -1,7 +1,20 @@
-﻿"""
+"""
 tools.adapters  ― ToolSchema → プロバイダー固有フォーマット変換
+
+gemini アダプタは google-genai を読み込むため、初回アクセス時に import する。
 """
+import importlib
+from typing import Any
+
 from .openai import to_openai
-from .gemini import to_gemini
 
-__all__ = ["to_openai", "to_gemini"]
\ No newline at end of file
+
+def __getattr__(name: str) -> Any:
+    if name == "to_gemini":
+        value = importlib.import_module(".gemini", __name__).to_gemini
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["to_openai", "to_gemini"]
@@ -7,7 +7,9 @@ SAIVerseとUnityクライアント間のリアルタイム通信を管理
 import asyncio
 import json
 import logging
-from typing import TYPE_CHECKING, Optional
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Optional
 from dataclasses import dataclass, field
 
 try:
@@ -38,13 +40,42 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _send_queue_size() -> int:
+    """クライアントごとの送信キュー上限（SAIVERSE_UNITY_SEND_QUEUE_SIZE）"""
+    try:
+        return max(1, int(os.getenv("SAIVERSE_UNITY_SEND_QUEUE_SIZE", "256")))
+    except ValueError:
+        return 256
+
+
 @dataclass
 class UnityClient:
-    """接続中のUnityクライアント情報"""
+    """接続中のUnityクライアント情報
+
+    送信は ``queue`` に積まれ、クライアント専用の writer タスクが順に
+    ``websocket.send`` する。遅いクライアントが他のクライアントへの配信を
+    止めないよう、キューが溢れたら最も古いフレームを捨てる。
+    """
     client_id: str
     user_id: int
     websocket: WebSocketServerProtocol
     connected_at: float = field(default_factory=lambda: asyncio.get_event_loop().time())
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=_send_queue_size()))
+    writer: Optional[asyncio.Task] = None
+    sent: int = 0
+    dropped: int = 0
+    max_queue_depth: int = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "client_id": self.client_id,
+            "user_id": self.user_id,
+            "queue_depth": self.queue.qsize(),
+            "queue_limit": self.queue.maxsize,
+            "max_queue_depth": self.max_queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
 
 
 @dataclass
@@ -68,6 +99,14 @@ class UnityGatewayServer:
         self.spatial_state: dict[str, PersonaSpatialState] = {}
         self._server = None
         self._running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 空間情報は最新値だけが意味を持つので、受信時はペルソナ単位で
+        # 上書きしておき、参照されたときにまとめて spatial_state へ反映する
+        self._spatial_lock = threading.Lock()
+        self._pending_spatial: dict[str, dict] = {}
+        self._spatial_received = 0
+        self._spatial_coalesced = 0
+        self._dropped_total = 0
         
     @property
     def is_available(self) -> bool:
@@ -90,6 +129,7 @@ class UnityGatewayServer:
         
         logger.info(f"Starting Unity Gateway on ws://{host}:{port}")
         self._running = True
+        self._loop = asyncio.get_running_loop()
         
         async with websockets.serve(
             self._handle_client, 
@@ -122,6 +162,8 @@ class UnityGatewayServer:
         
         # 全クライアントを切断
         for client in list(self.clients.values()):
+            if client.writer:
+                client.writer.cancel()
             try:
                 await client.websocket.close()
             except Exception as e:
@@ -133,6 +175,7 @@ class UnityGatewayServer:
     async def _handle_client(self, websocket: WebSocketServerProtocol):
         """クライアント接続を処理"""
         client_id = None
+        client = None
         
         try:
             # ハンドシェイクを待機
@@ -167,6 +210,8 @@ class UnityGatewayServer:
             
             ack = HandshakeAckMessage(success=True, personas=personas_info)
             await websocket.send(ack.to_gateway_message().to_json())
+            # ハンドシェイク応答の後から送信キューの消化を始める
+            client.writer = asyncio.create_task(self._client_writer(client))
             
             # メッセージループ
             async for raw_message in websocket:
@@ -182,8 +227,9 @@ class UnityGatewayServer:
         except Exception as e:
             logger.error(f"Error in client handler: {e}")
         finally:
-            if client_id and client_id in self.clients:
-                del self.clients[client_id]
+            if client is not None:
+                # 同じ client_id で再接続済みでも、この接続の writer とキューは片付ける
+                self._remove_client(client)
                 logger.info(f"Client removed: {client_id}")
     
     async def _handle_message(self, client: UnityClient, raw_message: str):
@@ -233,18 +279,33 @@ class UnityGatewayServer:
             logger.error(f"Error handling user input: {e}")
     
     async def _on_spatial_update(self, msg: SpatialUpdateMessage):
-        """空間情報の更新を処理"""
-        for persona_data in msg.personas:
-            persona_id = persona_data.get("persona_id")
-            if not persona_id:
-                continue
-            
-            self.spatial_state[persona_id] = PersonaSpatialState(
-                distance_to_player=persona_data.get("distance_to_player", 0.0),
-                is_visible=persona_data.get("is_visible", False)
-            )
-        
-        logger.debug(f"Spatial update received: {len(msg.personas)} personas")
+        """空間情報の更新を処理（最新値で上書きするだけ。反映は参照時）"""
+        with self._spatial_lock:
+            self._spatial_received += 1
+            for persona_data in msg.personas:
+                persona_id = persona_data.get("persona_id")
+                if not persona_id:
+                    continue
+                if persona_id in self._pending_spatial:
+                    self._spatial_coalesced += 1
+                self._pending_spatial[persona_id] = persona_data
+    
+    def _apply_spatial_updates(self) -> None:
+        """溜まった空間情報を spatial_state に反映する（呼び出し側でロック取得済み）"""
+        if not self._pending_spatial:
+            return
+        for persona_id, persona_data in self._pending_spatial.items():
+            state = self.spatial_state.get(persona_id)
+            if state is None:
+                state = self.spatial_state[persona_id] = PersonaSpatialState()
+            state.distance_to_player = persona_data.get("distance_to_player", 0.0)
+            state.is_visible = persona_data.get("is_visible", False)
+        self._pending_spatial.clear()
+    
+    def _spatial(self, persona_id: str) -> Optional[PersonaSpatialState]:
+        with self._spatial_lock:
+            self._apply_spatial_updates()
+            return self.spatial_state.get(persona_id)
     
     # =====================
     # 外部から呼び出すAPI
@@ -252,12 +313,12 @@ class UnityGatewayServer:
     
     def get_player_distance(self, persona_id: str) -> Optional[float]:
         """ペルソナとプレイヤーの距離を取得"""
-        state = self.spatial_state.get(persona_id)
+        state = self._spatial(persona_id)
         return state.distance_to_player if state else None
     
     def is_player_visible(self, persona_id: str) -> Optional[bool]:
         """プレイヤーがペルソナの視界内にいるか"""
-        state = self.spatial_state.get(persona_id)
+        state = self._spatial(persona_id)
         return state.is_visible if state else None
     
     async def send_speak(self, persona_id: str, message: str):
@@ -287,22 +348,77 @@ class UnityGatewayServer:
         await self._broadcast(msg.to_gateway_message())
         logger.info(f"Sent emote to Unity: {persona_id} -> {emote}")
     
+    def get_stats(self) -> dict[str, Any]:
+        """送信キューの深さ・破棄フレーム数・空間情報の集約状況"""
+        with self._spatial_lock:
+            spatial = {
+                "received": self._spatial_received,
+                "coalesced": self._spatial_coalesced,
+                "pending_personas": len(self._pending_spatial),
+            }
+        return {
+            "running": self._running,
+            "clients": [client.stats() for client in list(self.clients.values())],
+            "dropped_total": self._dropped_total,
+            "spatial_updates": spatial,
+        }
+    
     async def _broadcast(self, message: GatewayMessage):
-        """全クライアントにメッセージを送信"""
+        """全クライアントの送信キューにメッセージを積む（送信完了は待たない）"""
         json_data = message.to_json()
-        
-        disconnected = []
-        for client_id, client in self.clients.items():
-            try:
+        loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is not None and running is not loop and loop.is_running():
+            # 別スレッド・別ループからの呼び出し（control_body等）はサーバーのループへ渡す
+            loop.call_soon_threadsafe(self._enqueue_all, json_data)
+        else:
+            self._enqueue_all(json_data)
+    
+    def _enqueue_all(self, json_data: str) -> None:
+        for client in list(self.clients.values()):
+            self._enqueue(client, json_data)
+    
+    def _enqueue(self, client: UnityClient, json_data: str) -> None:
+        queue = client.queue
+        if queue.full():
+            # 溢れたら最も古いフレームを捨てて最新を優先する
+            queue.get_nowait()
+            client.dropped += 1
+            self._dropped_total += 1
+            if client.dropped == 1 or client.dropped % 100 == 0:
+                logger.warning(
+                    f"Unity client {client.client_id} is falling behind: "
+                    f"dropped {client.dropped} frames (queue limit {queue.maxsize})"
+                )
+        queue.put_nowait(json_data)
+        client.max_queue_depth = max(client.max_queue_depth, queue.qsize())
+    
+    async def _client_writer(self, client: UnityClient):
+        """クライアント専用の送信ループ"""
+        try:
+            while True:
+                json_data = await client.queue.get()
                 await client.websocket.send(json_data)
-            except websockets.ConnectionClosed:
-                disconnected.append(client_id)
+                client.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except websockets.ConnectionClosed:
+            logger.info(f"Client disconnected while sending: {client.client_id}")
+        except Exception as e:
+            logger.error(f"Error sending to {client.client_id}: {e}")
+        if self.clients.get(client.client_id) is client:
+            self._remove_client(client)
+            logger.info(f"Client removed (disconnected): {client.client_id}")
+            try:
+                await client.websocket.close()
             except Exception as e:
-                logger.error(f"Error sending to {client_id}: {e}")
-                disconnected.append(client_id)
-        
-        # 切断されたクライアントを削除
-        for client_id in disconnected:
-            if client_id in self.clients:
-                del self.clients[client_id]
-                logger.info(f"Client removed (disconnected): {client_id}")
+                logger.debug(f"Error closing client {client.client_id}: {e}")
+    
+    def _remove_client(self, client: UnityClient) -> None:
+        if self.clients.get(client.client_id) is client:
+            del self.clients[client.client_id]
+        if client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()